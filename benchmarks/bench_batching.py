@@ -0,0 +1,120 @@
+"""batch 메시지 처리량 비교: 이벤트마다 데이터그램 vs BatchBuilder 로 묶은 데이터그램
+
+실제 UDPServerProtocol 디스패치 경로로 제스처 버스트(상대 이동 + 클릭 + 키)를
+처리하며 이벤트/초, 수신 데이터그램 수(= recvfrom 호출 수), 응답 송신 수를 비교한다.
+OS 입력 주입 핸들러만 no-op 으로 대체한다. 배치 확인 응답은 지연 타이머로도 나가므로
+이벤트 루프 안에서 처리하고, 마지막 타이머가 지난 뒤 응답 수를 센다. 크기별 실행을
+--rounds 번 번갈아 반복해 가장 빠른 실행을 비교한다 (CPU 주파수/이웃 부하 변화 완화).
+
+    python benchmarks/bench_batching.py [--events N] [--codec binary] [--batch 8 16 32] [--rounds 5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from remote_server import ClientInfo, Constants, MessageType, ServerMetrics, UDPServerProtocol
+from wire_protocol import CODECS, JSON_CODEC, BatchBuilder
+
+CLIENT_ADDR = ('127.0.0.1', 50000)
+
+class _CountingTransport:
+    def __init__(self):
+        self.sent = 0
+
+    def sendto(self, data, addr):
+        self.sent += 1
+
+class _BenchServer:
+    """인증 상태만 흉내내는 서버 스텁"""
+    def __init__(self, codec: str):
+        self.metrics = ServerMetrics()
+        self.tracer = None
+        self.websockets = None
+        self.recorder = None
+        self.client = ClientInfo(address=CLIENT_ADDR, last_activity=time.monotonic(),
+                                 authenticated=True, codec=codec)
+        self.activity_updates = 0
+
+    def is_client_authenticated(self, addr):
+        return True
+
+    def update_client_activity(self, addr, now):
+        self.activity_updates += 1
+        self.client.last_activity = now
+
+    def get_client(self, addr):
+        return self.client
+
+def _gesture_events(count: int) -> list:
+    """스와이프 버스트: 상대 이동 14개 + 클릭 + 키 반복"""
+    pattern = [{'type': 'mouse_move_relative', 'dx': 1.5, 'dy': -0.75}] * 14
+    pattern += [{'type': 'mouse_click', 'click_type': 'left'}, {'type': 'keyboard', 'key': 'right'}]
+    events = (pattern * (count // len(pattern) + 1))[:count]
+    return [dict(event, seq=seq) for seq, event in enumerate(events)]
+
+def _encode(codec, message: dict, seq: int) -> bytes:
+    return codec.encode(message, seq) or JSON_CODEC.encode(message)
+
+async def run(codec, events: list, batch_size: int) -> dict:
+    server = _BenchServer(codec.name)
+    protocol = UDPServerProtocol(server)
+    transport = _CountingTransport()
+    protocol.connection_made(transport)
+    noop = lambda message, addr: None
+    for msg_type in (MessageType.MOUSE_MOVE, MessageType.MOUSE_CLICK, MessageType.KEYBOARD):
+        protocol._message_handlers[msg_type] = noop
+
+    if batch_size <= 1:
+        datagrams = [_encode(codec, event, event['seq']) for event in events]
+    else:
+        builder = BatchBuilder(batch_size)
+        messages = [message for message in map(builder.add, events) if message]
+        if builder.events:
+            messages.append(builder.flush())
+        # 헤더 seq 는 패킷 번호, 배치 번호는 BatchBuilder 가 batch_seq 로 따로 붙임
+        datagrams = [_encode(codec, message, seq) for seq, message in enumerate(messages)]
+
+    start = time.perf_counter()
+    for data in datagrams:
+        protocol.datagram_received(data, CLIENT_ADDR)
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(Constants.BATCH_ACK_DELAY * 2)
+    return {
+        'events_per_sec': len(events) / elapsed,
+        'datagrams': len(datagrams),
+        'bytes': sum(map(len, datagrams)),
+        'responses': transport.sent,
+        'activity_updates': server.activity_updates,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=200_000)
+    parser.add_argument('--codec', choices=sorted(CODECS), default='binary')
+    parser.add_argument('--batch', type=int, nargs='+', default=[4, 8, 16, Constants.MAX_BATCH_EVENTS])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    codec = CODECS[args.codec]
+    events = _gesture_events(args.events)
+    sizes = [1] + args.batch
+    best = {}
+    for _ in range(args.rounds):
+        for size in sizes:
+            result = asyncio.run(run(codec, events, size))
+            if size not in best or result['events_per_sec'] > best[size]['events_per_sec']:
+                best[size] = result
+    baseline = best[1]
+    for size in sizes:
+        result = best[size]
+        print(f"batch {size:>3}: {result['events_per_sec']:12,.0f} events/sec "
+              f"({result['events_per_sec'] / baseline['events_per_sec']:.2f}x)  "
+              f"datagrams {result['datagrams']:>7}  bytes {result['bytes']:>9}  "
+              f"responses {result['responses']:>7}  activity updates {result['activity_updates']:>7}")
+
+if __name__ == '__main__':
+    main()
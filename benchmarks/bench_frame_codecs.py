@@ -0,0 +1,56 @@
+"""프레임 코덱 매트릭스: 해상도 x 코덱 x 품질 x 리사이즈 방식별 인코딩 시간과 크기
+
+    python benchmarks/bench_frame_codecs.py [--repeat N] [--scale S]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_frame_diff import slide_frame
+from frame_codecs import CODECS, RESIZE_MODES, available_codecs, bgra_to_image, encode_frame
+
+RESOLUTIONS = ((1280, 720), (1920, 1080), (2560, 1440))
+QUALITIES = (30, 50, 80)
+
+class SyntheticFrame:
+    """CapturedFrame 과 같은 인터페이스의 합성 프레임"""
+    def __init__(self, bgra: np.ndarray):
+        self.bgra = bgra
+        self.size = (bgra.shape[1], bgra.shape[0])
+
+    def to_image(self):
+        return bgra_to_image(self.bgra)
+
+def measure(frame, quality, scale, codec, resize_mode, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        data = encode_frame(frame, quality, scale, codec, resize_mode)
+    return (time.perf_counter() - start) / repeat * 1000, len(data)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=float, default=0.5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'resolution':>10} {'codec':>5} {'quality':>7} {'resize':>9} {'encode ms':>10} {'KB':>8}")
+    for width, height in RESOLUTIONS:
+        frame = SyntheticFrame(slide_frame(rng, height, width))
+        for codec in available_codecs():
+            # PNG 는 무손실이라 품질 값이 의미 없음
+            qualities = QUALITIES if CODECS[codec].pil_format != 'PNG' else (0,)
+            for quality in qualities:
+                for resize_mode in RESIZE_MODES:
+                    ms, size = measure(frame, quality, args.scale, codec, resize_mode, args.repeat)
+                    print(f"{width}x{height:<5} {codec:>5} {quality:>7} {resize_mode:>9} "
+                          f"{ms:>10.2f} {size / 1024:>8.1f}")
+
+if __name__ == '__main__':
+    main()
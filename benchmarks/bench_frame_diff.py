@@ -0,0 +1,108 @@
+"""전체 프레임 인코딩 vs 타일 델타 인코딩: 프레임당 CPU 시간과 바이트 수
+
+정적(커서만 이동), 스크롤, 동영상 유사 화면 시퀀스를 합성하여 비교한다.
+
+    python benchmarks/bench_frame_diff.py [--frames N] [--width W] [--height H]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_diff import TileDiffer, encode_tiles, pack_delta_frame
+
+SCALE = 0.5
+QUALITY = 50
+
+def slide_frame(rng: np.random.Generator, height: int, width: int) -> np.ndarray:
+    """텍스트 줄이 있는 슬라이드 모양의 BGRA 화면"""
+    frame = np.full((height, width, 4), 245, dtype=np.uint8)
+    for y in range(80, height - 40, 36):
+        length = int(rng.integers(width // 4, width - 160))
+        frame[y:y + 14, 80:80 + length, :3] = rng.integers(0, 80, size=(14, length, 3), dtype=np.uint8)
+    return frame
+
+def static_sequence(rng, frames, height, width):
+    """변하지 않는 슬라이드 위에서 레이저 커서만 이동"""
+    base = slide_frame(rng, height, width)
+    for i in range(frames):
+        frame = base.copy()
+        x, y = 100 + i * 7 % (width - 120), height // 2
+        frame[y:y + 12, x:x + 12, :3] = (0, 0, 255)
+        yield frame
+
+def scrolling_sequence(rng, frames, height, width):
+    """긴 문서를 프레임마다 8픽셀씩 스크롤"""
+    canvas = slide_frame(rng, height + frames * 8, width)
+    for i in range(frames):
+        yield np.ascontiguousarray(canvas[i * 8:i * 8 + height])
+
+def video_sequence(rng, frames, height, width):
+    """슬라이드 중앙의 640x360 영역에서 동영상 재생"""
+    base = slide_frame(rng, height, width)
+    top, left = (height - 360) // 2, (width - 640) // 2
+    for _ in range(frames):
+        frame = base.copy()
+        frame[top:top + 360, left:left + 640, :3] = rng.integers(0, 255, size=(360, 640, 3), dtype=np.uint8)
+        yield frame
+
+def _to_image(bgra: np.ndarray) -> Image.Image:
+    height, width = bgra.shape[:2]
+    return Image.frombuffer('RGB', (width, height), bgra.tobytes(), 'raw', 'BGRX', 0, 1)
+
+def encode_full(bgra: np.ndarray) -> int:
+    img = _to_image(bgra)
+    img = img.resize((int(img.width * SCALE), int(img.height * SCALE)), Image.LANCZOS)
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=QUALITY)
+    return len(buffer.getvalue())
+
+def encode_delta(differ: TileDiffer, bgra: np.ndarray) -> int:
+    rects, keyframe = differ.diff(bgra)
+    if not rects:
+        return 0
+    if keyframe:
+        return encode_full(bgra)
+    img = _to_image(bgra)
+    size = (int(img.width * SCALE), int(img.height * SCALE))
+    return len(pack_delta_frame(size, encode_tiles(img, rects, SCALE, size, QUALITY)))
+
+def measure(frames, encode) -> tuple:
+    total_cpu, total_bytes = 0.0, 0
+    for frame in frames:
+        start = time.process_time()
+        total_bytes += encode(frame)
+        total_cpu += time.process_time() - start
+    return total_cpu, total_bytes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=60)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--tile-size', type=int, default=64)
+    parser.add_argument('--keyframe-interval', type=int, default=120)
+    args = parser.parse_args()
+
+    sequences = {
+        'static': static_sequence,
+        'scrolling': scrolling_sequence,
+        'video': video_sequence,
+    }
+    print(f"{'sequence':>10} {'mode':>6} {'cpu ms/frame':>13} {'KB/frame':>9}")
+    for name, generate in sequences.items():
+        frames = list(generate(np.random.default_rng(0), args.frames, args.height, args.width))
+        differ = TileDiffer(tile_size=args.tile_size, keyframe_interval=args.keyframe_interval)
+        for mode, encode in (('full', encode_full), ('delta', lambda f: encode_delta(differ, f))):
+            cpu, size = measure(frames, encode)
+            print(f"{name:>10} {mode:>6} {cpu / len(frames) * 1000:>13.2f} "
+                  f"{size / len(frames) / 1024:>9.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""청크 프레임 전송 루프백 하네스: 모의 패킷 손실 하에서 프레임 완성률 측정
+
+NACK 을 켠 경우 손실률마다 프레임 완성률이 --min-completion 이상이고, 재전송한
+청크 수가 송신 쪽에서 버려진 청크 수의 --max-retransmit-ratio 배 이하여야 하며
+(불필요한 재전송 검출), 아니면 0이 아닌 코드로 종료한다.
+
+    python benchmarks/bench_frame_transport.py [--frames N] [--frame-size BYTES]
+        [--min-completion 0.98] [--max-retransmit-ratio 1.5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_transport import FrameReassembler, FrameSender
+
+class LossyTransport:
+    """sendto 호출을 확률적으로 버리는 전송 래퍼"""
+    def __init__(self, transport, loss: float, rng: random.Random):
+        self.transport = transport
+        self.loss = loss
+        self.rng = rng
+        self.dropped = 0
+
+    def sendto(self, data, addr):
+        if self.rng.random() >= self.loss:
+            self.transport.sendto(data, addr)
+        else:
+            self.dropped += 1
+
+class SenderProtocol(asyncio.DatagramProtocol):
+    def __init__(self, sender: FrameSender):
+        self.sender = sender
+
+    def datagram_received(self, data, addr):
+        message = json.loads(data)
+        asyncio.ensure_future(self.sender.retransmit(addr, message['frame_id'], message['missing']))
+
+class ReceiverProtocol(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.reassembler = FrameReassembler(max_pending=8)
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.reassembler.add(data)
+
+async def _nack_loop(receiver: ReceiverProtocol, sender_addr, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        for frame_id, missing in receiver.reassembler.missing(min_age=interval).items():
+            receiver.transport.sendto(json.dumps({
+                'type': 'frame_nack', 'frame_id': frame_id, 'missing': missing
+            }).encode(), sender_addr)
+
+async def run(loss: float, nack: bool, frames: int, frame_size: int, fps: float, seed: int) -> dict:
+    loop = asyncio.get_running_loop()
+
+    receiver = ReceiverProtocol()
+    recv_transport, _ = await loop.create_datagram_endpoint(lambda: receiver, local_addr=('127.0.0.1', 0))
+    sender = FrameSender(rate=32 * 1024 * 1024, history=8)
+    send_transport, _ = await loop.create_datagram_endpoint(
+        lambda: SenderProtocol(sender), local_addr=('127.0.0.1', 0))
+    # 방향마다 별도 난수열 (전송 순서가 바뀌어도 같은 방향의 손실 패턴은 같음)
+    sender.transport = LossyTransport(send_transport, loss, random.Random(seed))
+    # NACK 경로도 같은 손실률 적용
+    receiver.transport = LossyTransport(recv_transport, loss, random.Random(seed + 1))
+
+    nack_task = None
+    if nack:
+        nack_task = asyncio.ensure_future(
+            _nack_loop(receiver, send_transport.get_extra_info('sockname'), interval=0.02))
+
+    payload = os.urandom(frame_size)
+    dest = recv_transport.get_extra_info('sockname')
+    start = time.perf_counter()
+    for _ in range(frames):
+        await sender.send(dest, payload)
+        await asyncio.sleep(1 / fps)
+    await asyncio.sleep(0.2)  # 마지막 재전송 대기
+    elapsed = time.perf_counter() - start
+
+    if nack_task:
+        nack_task.cancel()
+    send_transport.close()
+    recv_transport.close()
+
+    return {
+        'completion': receiver.reassembler.completed / frames,
+        'retransmitted': sender.chunks_retransmitted,
+        'dropped': sender.transport.dropped,
+        'elapsed': elapsed,
+    }
+
+async def main_async(args) -> bool:
+    print(f"{'loss':>6} {'nack':>5} {'completion':>11} {'dropped':>8} {'retransmit':>11}")
+    ok = True
+    for loss in (0.0, 0.01, 0.05, 0.10):
+        for nack in (False, True):
+            result = await run(loss, nack, args.frames, args.frame_size, args.fps, args.seed)
+            print(f"{loss:>6.0%} {str(nack):>5} {result['completion']:>11.1%} "
+                  f"{result['dropped']:>8} {result['retransmitted']:>11}")
+            if not nack:
+                continue
+            if result['completion'] < args.min_completion:
+                print(f"FAIL: completion {result['completion']:.1%} < {args.min_completion:.1%} at {loss:.0%} loss")
+                ok = False
+            if result['retransmitted'] > args.max_retransmit_ratio * result['dropped']:
+                print(f"FAIL: {result['retransmitted']} chunks retransmitted for {result['dropped']} dropped "
+                      f"(> {args.max_retransmit_ratio}x) at {loss:.0%} loss")
+                ok = False
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=60)
+    parser.add_argument('--frame-size', type=int, default=80 * 1024)
+    parser.add_argument('--fps', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--min-completion', type=float, default=0.98)
+    parser.add_argument('--max-retransmit-ratio', type=float, default=1.5)
+    if not asyncio.run(main_async(parser.parse_args())):
+        sys.exit(1)
+    print("OK")
+
+if __name__ == '__main__':
+    main()
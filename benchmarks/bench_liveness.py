@@ -0,0 +1,110 @@
+"""타이밍 휠 만료 스케줄러 벤치마크: 활동 갱신 비용과 tick 당 처리량
+
+가상 시계로 클라이언트 수를 바꿔 가며 시뮬레이션한다. 매 tick 일부 클라이언트가
+패킷을 보내고(활동 갱신), 일부는 중간에 조용해져 keepalive 마감으로 만료된다.
+활동 갱신당 비용이 클라이언트 수와 무관하고(O(1)), 만료가 tick 단위로 늦지 않게
+처리되는지 확인한다. 비교용으로 기존 60초 전체 순회 방식의 비용도 출력한다.
+
+    python benchmarks/bench_liveness.py [--clients 1000,10000] [--seconds 120]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from liveness import TimingWheel
+from sessions import ClientInfo
+
+TICK = 0.25
+KEEPALIVE_TIMEOUT = 15.0
+INACTIVITY_TIMEOUT = 600.0
+
+def run(clients: int, seconds: float, active_fraction: float, silent_fraction: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    wheel = TimingWheel(tick=TICK)
+    now = 0.0
+    wheel.advance(now)
+
+    records = {}
+    for index in range(clients):
+        addr = ('10.0.0.1', 10000 + index)
+        # 접속 시각을 keepalive 마감 구간에 고르게 분산
+        client = ClientInfo(addr, now - rng.uniform(0, KEEPALIVE_TIMEOUT))
+        client.keepalive_seen = True
+        records[addr] = client
+        wheel.add(addr, client.last_activity + KEEPALIVE_TIMEOUT)
+
+    addrs = list(records)
+    silent_at = {addr: rng.uniform(0, seconds / 2) for addr in rng.sample(addrs, int(clients * silent_fraction))}
+
+    updates = 0
+    update_time = 0.0
+    advance_time = 0.0
+    max_examined = 0
+    lateness = []
+    ticks = int(seconds / TICK)
+    for _ in range(ticks):
+        now += TICK
+        # 활동 갱신: 서버의 update_client_activity 와 같은 대입 한 번
+        active = [addr for addr in rng.sample(addrs, int(clients * active_fraction))
+                  if addr in records and silent_at.get(addr, seconds) > now]
+        started = time.perf_counter()
+        for addr in active:
+            records[addr].last_activity = now
+        update_time += time.perf_counter() - started
+        updates += len(active)
+
+        examined_before = wheel.examined
+        started = time.perf_counter()
+        for addr in wheel.advance(now):
+            client = records[addr]
+            deadline = client.last_activity + KEEPALIVE_TIMEOUT
+            if deadline > now:
+                wheel.add(addr, deadline)
+            else:
+                lateness.append(now - deadline)
+                del records[addr]
+        advance_time += time.perf_counter() - started
+        max_examined = max(max_examined, wheel.examined - examined_before)
+
+    # 기존 방식: 60초마다 전체 순회 (만료 지연 최대 60초)
+    started = time.perf_counter()
+    scans = int(seconds / 60) or 1
+    for _ in range(scans):
+        for client in list(records.values()):
+            _ = now - client.last_activity > INACTIVITY_TIMEOUT
+    scan_time = time.perf_counter() - started
+
+    return {
+        'clients': clients,
+        'updates': updates,
+        'ns_per_update': 1e9 * update_time / max(1, updates),
+        'us_per_tick': 1e6 * advance_time / ticks,
+        'max_examined_per_tick': max_examined,
+        'expired': len(lateness),
+        'max_lateness_s': max(lateness) if lateness else 0.0,
+        'scan_ms': 1e3 * scan_time / scans,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', default='1000,10000')
+    parser.add_argument('--seconds', type=float, default=120.0)
+    parser.add_argument('--active', type=float, default=0.2, help='tick 당 패킷을 보내는 클라이언트 비율')
+    parser.add_argument('--silent', type=float, default=0.1, help='도중에 응답이 끊기는 클라이언트 비율')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'clients':>8} {'ns/update':>10} {'us/tick':>9} {'max exam/tick':>14} "
+          f"{'expired':>8} {'max late':>9} {'full scan':>10}")
+    for clients in [int(value) for value in args.clients.split(',')]:
+        result = run(clients, args.seconds, args.active, args.silent, args.seed)
+        print(f"{result['clients']:>8} {result['ns_per_update']:>10.1f} {result['us_per_tick']:>9.1f} "
+              f"{result['max_examined_per_tick']:>14} {result['expired']:>8} "
+              f"{result['max_lateness_s']:>8.2f}s {result['scan_ms']:>8.2f}ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,509 @@
+"""제어 프로토콜 기록/재생 벤치마크: 클라이언트 트레이스를 로컬호스트 UDP 로 재생
+
+서버는 별도 프로세스에서 실제 RemoteControlServer / UDPServerProtocol 로 실행하고,
+입력은 주입 시각을 기록하는 FakeInputBackend, 화면은 FakeScreenSource 로 대체하여
+헤드리스 리눅스에서도 돈다. 트레이스는 합성(60Hz 상대 이동, 레이저 절대 이동,
+클릭 버스트, 키보드, 프레임 요청, keepalive)하거나 record 모드로 실제 앱 트래픽을
+기록한 파일을 쓴다.
+
+종류별 종단 지연은 다음과 같이 잰다 (서버/클라이언트 프로세스가 같은
+time.monotonic() 시계를 공유하는 것을 이용):
+- move / laser: 송신부터 그 이후 첫 포인터 주입까지 (병합되므로 가장 가까운 주입)
+- click / key: 송신부터 해당 이벤트 주입까지 (FIFO 대응)
+- keepalive: 응답까지 왕복, frame: 요청부터 프레임 수신까지
+
+처리량, p50/p99, 서버 CPU 시간/패킷을 출력하고 저장된 기준값보다 --tolerance 이상
+나빠진 항목이 있으면 REGRESSION 으로 표시하고 0이 아닌 코드로 종료한다.
+
+    python benchmarks/bench_replay.py run [--trace FILE] [--codec binary] [--speed 1.0] [--save-baseline]
+    python benchmarks/bench_replay.py generate --out trace.jsonl [--duration 10]
+    python benchmarks/bench_replay.py record --listen 9080 --server 127.0.0.1:8080 --out trace.jsonl
+"""
+import argparse
+import asyncio
+import base64
+import bisect
+import collections
+import json
+import math
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from wire_protocol import BINARY_CODEC, CODECS, JSON_CODEC, PROTOCOL_VERSION, is_binary
+
+BASELINE_FILE = os.path.join(ROOT, 'benchmarks', 'baselines', 'bench_replay.json')
+
+# 메시지 타입 -> 지연 측정 종류
+KINDS = {
+    'mouse_move_relative': 'move',
+    'mouse_click': 'click',
+    'keyboard': 'key',
+    'keepalive': 'keepalive',
+    'request_frame': 'frame',
+}
+
+def _decode(data: bytes) -> dict:
+    return BINARY_CODEC.decode(data) if is_binary(data) else JSON_CODEC.decode(data)
+
+def _kind(message: dict) -> str:
+    kind = KINDS.get(message.get('type'), 'other')
+    if kind == 'move' and message.get('is_laser'):
+        return 'laser'
+    return kind
+
+# ---------------------------------------------------------------- 트레이스
+
+class Trace:
+    """클라이언트별 인증 옵션과 (시각, 클라이언트, 데이터그램) 목록
+
+    파일 형식 (JSON Lines): 첫 줄 {"clients": [{"role": ..., "auth": {...}}]},
+    이후 {"t": 초, "client": 번호, "data": base64 데이터그램}. 인증 메시지는 재생기가
+    현재 서버의 연결 코드로 다시 만들므로 트레이스에 넣지 않는다.
+    """
+
+    def __init__(self, clients: list, events: list):
+        self.clients = clients
+        self.events = sorted(events, key=lambda event: event[0])
+
+    @property
+    def duration(self) -> float:
+        return self.events[-1][0] if self.events else 0.0
+
+    def save(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'clients': self.clients}) + '\n')
+            for t, client, data in self.events:
+                f.write(json.dumps({'t': round(t, 6), 'client': client,
+                                    'data': base64.b64encode(data).decode('ascii')}) + '\n')
+
+    @classmethod
+    def load(cls, path: str) -> 'Trace':
+        with open(path, encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            events = [(entry['t'], entry['client'], base64.b64decode(entry['data']))
+                      for entry in map(json.loads, f) if entry]
+        return cls(header['clients'], events)
+
+def synthetic_trace(duration: float, viewers: int, codec_name: str) -> Trace:
+    """발표 제어 세션과 비슷한 합성 트레이스 (컨트롤러 1명 + 프레임을 받는 뷰어)"""
+    codec = CODECS[codec_name]
+    auth = {'codecs': [codec_name], 'protocol_version': PROTOCOL_VERSION}
+    clients = [{'role': 'controller', 'auth': auth}]
+    clients += [{'role': 'viewer', 'auth': auth} for _ in range(viewers)]
+    seqs = collections.Counter()
+    events = []
+
+    def add(t, client, message):
+        seq = seqs[client]
+        seqs[client] += 1
+        data = codec.encode(dict(message, seq=seq), seq)
+        if data is None:
+            # 바이너리 레이아웃이 없는 메시지는 JSON 으로
+            data = JSON_CODEC.encode(message)
+        events.append((t, client, data))
+
+    # 컨트롤러: 60Hz 포인터 (4초 주기로 상대 이동 3초 + 레이저 1초)
+    for i in range(int(duration * 60)):
+        t = i / 60
+        phase = t % 4.0
+        if phase < 3.0:
+            add(t, 0, {'type': 'mouse_move_relative',
+                       'dx': round(2.0 * math.cos(t * 3), 3), 'dy': round(1.5 * math.sin(t * 2), 3)})
+        else:
+            add(t, 0, {'type': 'mouse_move_relative', 'is_laser': True,
+                       'x': round(0.5 + 0.3 * math.cos(t * 5), 4),
+                       'y': round(0.5 + 0.3 * math.sin(t * 5), 4)})
+    # 2초마다 30ms 간격 클릭 5번, 1초마다 슬라이드 넘김 키
+    for burst in range(int(duration / 2)):
+        for i in range(5):
+            add(burst * 2 + 0.5 + i * 0.03, 0, {'type': 'mouse_click', 'click_type': 'left'})
+    for i in range(int(duration)):
+        add(i + 0.25, 0, {'type': 'keyboard', 'key': 'right' if i % 4 else 'left'})
+    # 모든 클라이언트: 5Hz 프레임 요청, 1Hz keepalive
+    for client in range(len(clients)):
+        offset = client * 0.013
+        for i in range(int(duration * 5)):
+            add(i / 5 + offset, client, {'type': 'request_frame'})
+        for i in range(int(duration)):
+            add(i + 0.1 + offset, client, {'type': 'keepalive', 'timestamp': int(time.time() * 1000)})
+    return Trace(clients, events)
+
+# ---------------------------------------------------------------- 서버 프로세스
+
+def _serve(conn, verbose: bool):
+    """서버 프로세스: 준비되면 접속 정보를 보내고 stop 메시지까지 실행"""
+    import logging
+    logging.basicConfig(level=logging.INFO if verbose else logging.CRITICAL)
+    os.chdir(tempfile.mkdtemp(prefix='bench_replay_'))
+
+    from frame_pipeline import FakeScreenSource
+    from input_injector import FakeInputBackend
+    from remote_server import RemoteControlServer, UDPServerProtocol
+
+    class RecordingBackend(FakeInputBackend):
+        """주입 시각(time.monotonic)을 종류별로 기록"""
+
+        def __init__(self):
+            super().__init__()
+            self.injected = collections.defaultdict(list)
+
+        def move_to(self, x, y):
+            super().move_to(x, y)
+            self.injected['move'].append(time.monotonic())
+
+        def click(self, click_type, x=None, y=None):
+            super().click(click_type, x, y)
+            self.injected['click'].append(time.monotonic())
+
+        def press(self, key):
+            super().press(key)
+            self.injected['key'].append(time.monotonic())
+
+    async def run():
+        backend = RecordingBackend()
+        server = RemoteControlServer(input_backend=backend, screen_source=FakeScreenSource())
+        loop = asyncio.get_running_loop()
+        server.input_injector.start()
+        server.transport, server.protocol = await loop.create_datagram_endpoint(
+            lambda: UDPServerProtocol(server), local_addr=('127.0.0.1', 0))
+        server.frame_sender.transport = server.transport
+
+        session = server.default_session
+        conn.send({'port': server.transport.get_extra_info('sockname')[1],
+                   'codes': {'controller': session.controller_code, 'viewer': session.viewer_code}})
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        await loop.run_in_executor(None, conn.recv)
+        cpu, wall = time.process_time() - cpu_started, time.perf_counter() - wall_started
+
+        server.pointer_pipeline.cancel()
+        server.motion_engine.cancel()
+        server.input_injector.stop()
+        server.frame_pipeline.shutdown()
+        server.transport.close()
+        conn.send({
+            'cpu': cpu,
+            'wall': wall,
+            'datagrams': server.metrics.datagrams.total(),
+            'errors': {key[0]: value for key, value in server.metrics.errors.values().items()},
+            'injected': dict(backend.injected),
+        })
+
+    asyncio.run(run())
+
+# ---------------------------------------------------------------- 재생 클라이언트
+
+class ReplayClient(asyncio.DatagramProtocol):
+    def __init__(self, options: dict):
+        self.options = options
+        self.transport = None
+        self.authenticated = asyncio.Event()
+        self.sent = collections.defaultdict(list)  # 종류 -> 송신 시각
+        self.latencies = collections.defaultdict(list)
+        self._keepalives = collections.deque()
+        self._frames = collections.deque()
+        self.errors = collections.Counter()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def send(self, data: bytes, kind: str):
+        now = time.monotonic()
+        self.sent[kind].append(now)
+        if kind == 'keepalive':
+            self._keepalives.append(now)
+        elif kind == 'frame':
+            self._frames.append(now)
+        self.transport.sendto(data)
+
+    def datagram_received(self, data, addr):
+        now = time.monotonic()
+        message = _decode(data)
+        msg_type = message.get('type')
+        if msg_type == 'auth_response':
+            self.authenticated.set()
+        elif msg_type == 'keepalive_response' and self._keepalives:
+            self.latencies['keepalive'].append(now - self._keepalives.popleft())
+        elif msg_type in ('frame', 'frame_delta'):
+            # 이전 요청이 전송 중이면 최신 프레임 한 장으로 합쳐지므로 대기 중인 요청 모두 충족
+            while self._frames and self._frames[0] <= now:
+                self.latencies['frame'].append(now - self._frames.popleft())
+        elif msg_type == 'error':
+            self.errors[message.get('message')] += 1
+
+def _injection_latencies(sent: list, injected: list, kind: str) -> list:
+    """송신 시각과 서버 주입 시각 대응"""
+    injected = sorted(injected)
+    if kind in ('click', 'key'):
+        return [done - start for start, done in zip(sorted(sent), injected)]
+    latencies = []
+    for start in sent:
+        index = bisect.bisect_left(injected, start)
+        if index < len(injected):
+            latencies.append(injected[index] - start)
+    return latencies
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def replay(trace: Trace, speed: float, verbose: bool) -> dict:
+    parent_conn, child_conn = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=_serve, args=(child_conn, verbose))
+    server.start()
+    info = parent_conn.recv()
+    server_addr = ('127.0.0.1', info['port'])
+
+    loop = asyncio.get_running_loop()
+    clients = []
+    for spec in trace.clients:
+        _, client = await loop.create_datagram_endpoint(
+            lambda: ReplayClient(spec), remote_addr=server_addr)
+        clients.append(client)
+    for client, spec in zip(clients, trace.clients):
+        auth = dict(spec.get('auth', {}), type='auth', code=info['codes'][spec['role']])
+        client.transport.sendto(JSON_CODEC.encode(auth))
+    await asyncio.wait_for(asyncio.gather(*[c.authenticated.wait() for c in clients]), 10)
+
+    events = [(t, clients[index], data, _kind(_decode(data))) for t, index, data in trace.events]
+    started = loop.time()
+    for count, (t, client, data, kind) in enumerate(events):
+        if speed > 0:
+            delay = started + t / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        elif count % 64 == 0:
+            # 최대 속도 재생: 응답 수신이 밀리지 않도록 주기적으로 양보
+            await asyncio.sleep(0)
+        client.send(data, kind)
+    elapsed = loop.time() - started
+    await asyncio.sleep(0.5)
+
+    parent_conn.send('stop')
+    result = parent_conn.recv()
+    server.join()
+    for client in clients:
+        client.transport.close()
+
+    latencies = collections.defaultdict(list)
+    for client in clients:
+        for kind, values in client.latencies.items():
+            latencies[kind].extend(values)
+    controller_sent = clients[0].sent
+    injected = result['injected']
+    latencies['move'] = _injection_latencies(
+        controller_sent['move'] + controller_sent['laser'], injected.get('move', []), 'move')
+    for kind in ('click', 'key'):
+        latencies[kind] = _injection_latencies(controller_sent[kind], injected.get(kind, []), kind)
+
+    packets = len(events)
+    summary = {
+        'packets': packets,
+        'server_datagrams': result['datagrams'],
+        'throughput_pps': packets / elapsed if elapsed else 0.0,
+        'cpu_us_per_packet': 1e6 * result['cpu'] / max(1, result['datagrams']),
+        'server_cpu_pct': 100 * result['cpu'] / result['wall'],
+        'errors': result['errors'],
+        'client_errors': dict(sum((client.errors for client in clients), collections.Counter())),
+        'latency': {},
+    }
+    for kind, values in sorted(latencies.items()):
+        if values:
+            summary['latency'][kind] = {
+                'count': len(values),
+                'p50_ms': statistics.median(values) * 1000,
+                'p99_ms': _percentile(values, 0.99) * 1000,
+            }
+    return summary
+
+# ---------------------------------------------------------------- 기준값 비교
+
+def _comparable(summary: dict) -> dict:
+    """(지표 이름 -> (값, 클수록 좋은지))"""
+    values = {
+        'throughput_pps': (summary['throughput_pps'], True),
+        'cpu_us_per_packet': (summary['cpu_us_per_packet'], False),
+    }
+    for kind, stats in summary['latency'].items():
+        values[f'{kind}.p50_ms'] = (stats['p50_ms'], False)
+        values[f'{kind}.p99_ms'] = (stats['p99_ms'], False)
+    return values
+
+def compare(summary: dict, baseline: dict, tolerance: float, slack_ms: float) -> list:
+    """기준값보다 tolerance 비율 이상 나빠진 지표 목록 (지연은 slack_ms 이하 차이 무시)"""
+    regressions = []
+    for name, (value, higher_is_better) in _comparable(summary).items():
+        if name not in baseline:
+            continue
+        reference = baseline[name]
+        if higher_is_better:
+            worse = value < reference * (1 - tolerance)
+        else:
+            slack = slack_ms if name.endswith('_ms') else 0.0
+            worse = value > reference * (1 + tolerance) + slack
+        if worse:
+            regressions.append((name, value, reference))
+    return regressions
+
+def _load_baselines() -> dict:
+    if not os.path.exists(BASELINE_FILE):
+        return {}
+    with open(BASELINE_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+def _save_baseline(key: str, summary: dict):
+    baselines = _load_baselines()
+    baselines[key] = {name: round(value, 4) for name, (value, _) in _comparable(summary).items()}
+    os.makedirs(os.path.dirname(BASELINE_FILE), exist_ok=True)
+    with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+# ---------------------------------------------------------------- 기록 (UDP 프록시)
+
+class _RecordingProxy(asyncio.DatagramProtocol):
+    """앱 -> 서버 데이터그램을 기록하며 중계 (클라이언트 주소마다 서버 쪽 소켓 하나)"""
+
+    def __init__(self, server_addr: tuple):
+        self.server_addr = server_addr
+        self.transport = None
+        self.started = time.monotonic()
+        self.clients = []
+        self.events = []
+        self._upstreams = {}
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        asyncio.ensure_future(self._forward(data, addr))
+
+    async def _forward(self, data, addr):
+        upstream = self._upstreams.get(addr)
+        if upstream is None:
+            index = len(self.clients)
+            self.clients.append({'role': 'controller', 'auth': {}})
+            proxy = self
+
+            class Upstream(asyncio.DatagramProtocol):
+                def datagram_received(self, reply, _):
+                    if not is_binary(reply):
+                        message = JSON_CODEC.decode(reply)
+                        if message.get('type') == 'auth_response':
+                            proxy.clients[index]['role'] = message.get('role', 'controller')
+                    proxy.transport.sendto(reply, addr)
+
+            transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                Upstream, remote_addr=self.server_addr)
+            upstream = self._upstreams[addr] = (index, transport)
+        index, transport = upstream
+
+        message = _decode(data)
+        if message.get('type') == 'auth':
+            self.clients[index]['auth'] = {key: value for key, value in message.items()
+                                           if key not in ('type', 'code')}
+        else:
+            self.events.append((time.monotonic() - self.started, index, data))
+        transport.sendto(data)
+
+async def record(listen: int, server: str, out: str):
+    host, port = server.rsplit(':', 1)
+    loop = asyncio.get_running_loop()
+    transport, proxy = await loop.create_datagram_endpoint(
+        lambda: _RecordingProxy((host, int(port))), local_addr=('0.0.0.0', listen))
+    print(f"Recording on UDP {listen} -> {server}, press Ctrl+C to stop")
+    try:
+        await asyncio.Future()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        transport.close()
+        events = proxy.events
+        start = events[0][0] if events else 0.0
+        Trace(proxy.clients, [(t - start, index, data) for t, index, data in events]).save(out)
+        print(f"Saved {len(events)} datagrams from {len(proxy.clients)} clients to {out}")
+
+# ---------------------------------------------------------------- main
+
+def _print_summary(summary: dict):
+    print(f"packets: {summary['packets']} sent, {summary['server_datagrams']:.0f} processed by server")
+    print(f"throughput: {summary['throughput_pps']:,.0f} packets/sec")
+    print(f"server CPU: {summary['cpu_us_per_packet']:.1f} us/packet ({summary['server_cpu_pct']:.1f}%)")
+    for kind, stats in summary['latency'].items():
+        print(f"  {kind:<9} n={stats['count']:<6} p50 {stats['p50_ms']:7.2f} ms  p99 {stats['p99_ms']:7.2f} ms")
+    if summary['errors'] or summary['client_errors']:
+        print(f"errors: server {summary['errors']} client {summary['client_errors']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command')
+
+    run_parser = commands.add_parser('run', help='replay a trace and compare with the baseline')
+    run_parser.add_argument('--trace', help='recorded trace (default: synthetic)')
+    run_parser.add_argument('--codec', choices=sorted(CODECS), default=BINARY_CODEC.name)
+    run_parser.add_argument('--duration', type=float, default=10.0)
+    run_parser.add_argument('--viewers', type=int, default=2)
+    run_parser.add_argument('--speed', type=float, default=1.0, help='0: as fast as possible')
+    run_parser.add_argument('--tolerance', type=float, default=0.25)
+    run_parser.add_argument('--slack-ms', type=float, default=0.5)
+    run_parser.add_argument('--save-baseline', action='store_true')
+    run_parser.add_argument('--verbose', action='store_true')
+
+    generate_parser = commands.add_parser('generate', help='write a synthetic trace')
+    generate_parser.add_argument('--out', required=True)
+    generate_parser.add_argument('--codec', choices=sorted(CODECS), default=BINARY_CODEC.name)
+    generate_parser.add_argument('--duration', type=float, default=10.0)
+    generate_parser.add_argument('--viewers', type=int, default=2)
+
+    record_parser = commands.add_parser('record', help='record app traffic through a UDP proxy')
+    record_parser.add_argument('--listen', type=int, default=9080)
+    record_parser.add_argument('--server', default='127.0.0.1:8080')
+    record_parser.add_argument('--out', required=True)
+
+    args = parser.parse_args()
+    if args.command == 'generate':
+        synthetic_trace(args.duration, args.viewers, args.codec).save(args.out)
+        return
+    if args.command == 'record':
+        try:
+            asyncio.run(record(args.listen, args.server, args.out))
+        except KeyboardInterrupt:
+            pass
+        return
+    if args.command is None:
+        args = run_parser.parse_args([])
+
+    if args.trace:
+        trace = Trace.load(args.trace)
+        key = f"{os.path.basename(args.trace)}@{args.speed}"
+    else:
+        trace = synthetic_trace(args.duration, args.viewers, args.codec)
+        key = f"synthetic-{args.codec}-{args.viewers}v@{args.speed}"
+
+    summary = asyncio.run(replay(trace, args.speed, args.verbose))
+    print(f"[{key}] {len(trace.clients)} clients, {trace.duration:.1f} s trace")
+    _print_summary(summary)
+
+    if args.save_baseline:
+        _save_baseline(key, summary)
+        print(f"baseline saved to {BASELINE_FILE}")
+        return
+    baseline = _load_baselines().get(key)
+    if baseline is None:
+        print("no baseline for this configuration (run with --save-baseline)")
+        return
+    regressions = compare(summary, baseline, args.tolerance, args.slack_ms)
+    for name, value, reference in regressions:
+        print(f"REGRESSION {name}: {value:.3f} (baseline {reference:.3f})")
+    if not regressions:
+        print(f"no regressions against baseline (tolerance {args.tolerance:.0%})")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
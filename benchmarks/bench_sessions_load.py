@@ -0,0 +1,226 @@
+"""멀티 세션 부하 테스트: 로컬호스트 UDP 로 수백 개의 모의 클라이언트 구동
+
+서버는 별도 프로세스에서 실제 UDPServerProtocol 과 FakeInputBackend 로 실행한다.
+세션마다 컨트롤러 한 명(마우스 이동 + keepalive)과 뷰어 여러 명(keepalive)이
+접속하며, keepalive 왕복 시간으로 클라이언트별 지연을, 서버 프로세스 CPU
+시간으로 패킷당 처리 비용을 측정한다.
+
+    python benchmarks/bench_sessions_load.py [--clients N] [--sessions N] [--duration S]
+"""
+import argparse
+import asyncio
+import collections
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def _serve(conn, sessions: int, verbose: bool):
+    """서버 프로세스: 준비되면 접속 정보를 보내고 stop 메시지까지 실행"""
+    import logging
+    logging.basicConfig(level=logging.INFO if verbose else logging.CRITICAL)
+    # QR 코드 등 서버가 만드는 파일은 임시 디렉터리에
+    os.chdir(tempfile.mkdtemp(prefix='bench_sessions_'))
+
+    from input_injector import FakeInputBackend
+    from remote_server import RemoteControlServer, UDPServerProtocol
+
+    async def run():
+        server = RemoteControlServer(input_backend=FakeInputBackend())
+        loop = asyncio.get_running_loop()
+        server.input_injector.start()
+        server.transport, server.protocol = await loop.create_datagram_endpoint(
+            lambda: UDPServerProtocol(server), local_addr=('127.0.0.1', 0))
+        server.frame_sender.transport = server.transport
+
+        codes = [(server.default_session.controller_code, server.default_session.viewer_code)]
+        for _ in range(sessions - 1):
+            session = server.sessions.create_session()
+            codes.append((session.controller_code, session.viewer_code))
+
+        conn.send({'port': server.transport.get_extra_info('sockname')[1], 'codes': codes})
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        await loop.run_in_executor(None, conn.recv)
+        cpu, wall = time.process_time() - cpu_started, time.perf_counter() - wall_started
+
+        server.pointer_pipeline.cancel()
+        server.motion_engine.cancel()
+        server.input_injector.stop()
+        server.frame_pipeline.shutdown()
+        server.transport.close()
+        conn.send({
+            'cpu': cpu,
+            'wall': wall,
+            'clients': len(server.sessions),
+            'pointer': server.pointer_pipeline.stats(),
+            'injector': server.input_injector.stats(),
+        })
+
+    asyncio.run(run())
+
+class SimClient(asyncio.DatagramProtocol):
+    """keepalive 왕복 시간을 기록하는 모의 클라이언트"""
+
+    def __init__(self, code: str, controller: bool):
+        self.code = code
+        self.controller = controller
+        self.transport = None
+        self.authenticated = asyncio.Event()
+        self.role = None
+        self._sent_at = collections.deque()
+        self.latencies = []
+        self.errors = collections.Counter()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def send(self, message):
+        self.transport.sendto(json.dumps(message).encode())
+
+    def send_keepalive(self):
+        self._sent_at.append(time.perf_counter())
+        self.send({'type': 'keepalive'})
+
+    def datagram_received(self, data, addr):
+        message = json.loads(data)
+        msg_type = message.get('type')
+        if msg_type == 'auth_response':
+            self.role = message.get('role')
+            self.authenticated.set()
+        elif msg_type == 'keepalive_response' and self._sent_at:
+            self.latencies.append(time.perf_counter() - self._sent_at.popleft())
+        elif msg_type == 'error':
+            self.errors[message.get('message')] += 1
+
+async def _authenticate(client: SimClient, timeout: float, retry: float = 0.25):
+    """auth_response 가 올 때까지 auth 재전송 (루프백에서도 수신 버퍼가 차면 데이터그램이 버려짐)"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not client.authenticated.is_set():
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise TimeoutError(f"No auth_response for {client.code} within {timeout:.0f}s")
+        client.send({'type': 'auth', 'code': client.code})
+        try:
+            await asyncio.wait_for(client.authenticated.wait(), min(retry, remaining))
+        except asyncio.TimeoutError:
+            pass
+
+async def _client_loop(client: SimClient, duration: float, keepalive_hz: float, move_hz: float):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+    next_keepalive = loop.time()
+    seq = 0
+    interval = 1 / move_hz if client.controller else 1 / keepalive_hz
+    while loop.time() < deadline:
+        now = loop.time()
+        if now >= next_keepalive:
+            client.send_keepalive()
+            next_keepalive = now + 1 / keepalive_hz
+        if client.controller:
+            seq += 1
+            client.send({'type': 'mouse_move_relative', 'dx': 0.01, 'dy': -0.01, 'seq': seq})
+        await asyncio.sleep(interval)
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def run(args) -> dict:
+    parent_conn, child_conn = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=_serve, args=(child_conn, args.sessions, args.verbose))
+    server.start()
+    loop = asyncio.get_running_loop()
+    clients = []
+    stopped = False
+    try:
+        info = await loop.run_in_executor(None, parent_conn.recv)
+        server_addr = ('127.0.0.1', info['port'])
+
+        for index in range(args.clients):
+            controller_code, viewer_code = info['codes'][index % args.sessions]
+            controller = index < args.sessions
+            _, client = await loop.create_datagram_endpoint(
+                lambda: SimClient(controller_code if controller else viewer_code, controller),
+                remote_addr=server_addr)
+            clients.append(client)
+
+        await asyncio.gather(*[_authenticate(c, args.auth_timeout) for c in clients])
+
+        # 뷰어 입력은 거부되어야 함
+        viewer = next(c for c in clients if not c.controller) if args.clients > args.sessions else None
+        if viewer:
+            viewer.send({'type': 'mouse_click', 'click_type': 'left'})
+
+        await asyncio.gather(*[
+            _client_loop(c, args.duration, args.keepalive_hz, args.move_hz) for c in clients
+        ])
+        await asyncio.sleep(0.2)
+
+        parent_conn.send('stop')
+        stopped = True
+        result = await loop.run_in_executor(None, parent_conn.recv)
+    finally:
+        for client in clients:
+            client.transport.close()
+        # 실패 경로에서도 서버 프로세스를 남기지 않음
+        if not stopped and server.is_alive():
+            parent_conn.send('stop')
+        server.join(5)
+        if server.is_alive():
+            server.terminate()
+            server.join()
+
+    samples = [latency for c in clients for latency in c.latencies]
+    per_client_p99 = [_percentile(c.latencies, 0.99) for c in clients if c.latencies]
+    sent = sum(len(c.latencies) + len(c._sent_at) for c in clients)
+    moves = result['pointer']['received']
+    packets = sent + moves
+    return {
+        'clients': args.clients,
+        'sessions': args.sessions,
+        'roles': collections.Counter(c.role for c in clients),
+        'keepalives': sent,
+        'lost': sum(len(c._sent_at) for c in clients),
+        'p50_ms': statistics.median(samples) * 1000,
+        'p99_ms': _percentile(samples, 0.99) * 1000,
+        'worst_client_p99_ms': max(per_client_p99) * 1000,
+        'viewer_rejected': bool(viewer and viewer.errors),
+        'server_cpu_s': result['cpu'],
+        'server_cpu_pct': 100 * result['cpu'] / result['wall'],
+        'cpu_us_per_packet': 1e6 * result['cpu'] / max(1, packets),
+        'pointer': result['pointer'],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=300)
+    parser.add_argument('--sessions', type=int, default=3)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--keepalive-hz', type=float, default=5.0)
+    parser.add_argument('--move-hz', type=float, default=60.0)
+    parser.add_argument('--auth-timeout', type=float, default=10.0)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    try:
+        result = asyncio.run(run(args))
+    except TimeoutError as e:
+        sys.exit(f"Load test failed: {e}")
+    print(f"clients: {result['clients']} in {result['sessions']} sessions {dict(result['roles'])}")
+    print(f"keepalives: {result['keepalives']} (lost {result['lost']})")
+    print(f"latency p50: {result['p50_ms']:.2f} ms  p99: {result['p99_ms']:.2f} ms  "
+          f"worst client p99: {result['worst_client_p99_ms']:.2f} ms")
+    print(f"viewer input rejected: {result['viewer_rejected']}")
+    print(f"server CPU: {result['server_cpu_s']:.2f} s ({result['server_cpu_pct']:.1f}%), "
+          f"{result['cpu_us_per_packet']:.1f} us/packet")
+    print(f"pointer pipeline: {result['pointer']}")
+
+if __name__ == '__main__':
+    main()
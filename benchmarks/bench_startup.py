@@ -0,0 +1,160 @@
+"""서버 시작 시간 측정: remote_server import 시간과 첫 인증까지의 시간 (예산 초과 시 실패)
+
+- import: python -X importtime -c "import remote_server" 의 누적 시간과 무거운
+  최상위 import 목록
+- first auth: 빈 임시 디렉터리에서 서버 프로세스를 실행한 시점부터 UDP 인증 응답을
+  받을 때까지의 시간 (인증은 서버가 포트를 열 때까지 짧은 간격으로 재전송)
+- 연결 페이지/QR 이 ETag 로 304 를 돌려주는지, 작업 디렉터리에 파일을 쓰지 않는지
+
+를 확인하고, 중앙값이 예산을 넘거나 확인에 실패하면 0이 아닌 코드로 종료한다.
+
+    python benchmarks/bench_startup.py [--runs 5] [--import-budget-ms 250] [--auth-budget-ms 1500]
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+SERVER_SCRIPT = """
+import asyncio, sys
+sys.path.insert(0, {root!r})
+import remote_server
+remote_server.Constants.OPEN_BROWSER = False
+server = remote_server.RemoteControlServer(udp_port={udp_port}, http_port={http_port})
+print(server.connection_code, flush=True)
+asyncio.run(server.start())
+"""
+
+def measure_import() -> tuple:
+    """(remote_server 누적 import 시간 ms, [(최상위 모듈, 누적 ms)])"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import remote_server'],
+                            cwd=ROOT, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import remote_server failed:\n{result.stderr[-2000:]}")
+    total = None
+    top_level = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        cumulative, indent, name = int(match.group(2)) / 1000, match.group(3), match.group(4)
+        if name == 'remote_server':
+            total = cumulative
+        elif len(indent) == 3:
+            # remote_server 가 직접 import 한 모듈 (들여쓰기 한 단계)
+            top_level.append((name, cumulative))
+    if total is None:
+        raise RuntimeError("remote_server not found in -X importtime output")
+    return total, sorted(top_level, key=lambda item: -item[1])
+
+def _free_port(kind: int) -> int:
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def _get(url: str, headers: dict = None) -> tuple:
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, b''
+
+def measure_first_auth(timeout: float) -> dict:
+    """서버 프로세스 실행부터 인증 응답까지의 시간과 연결 페이지 확인 결과"""
+    udp_port, http_port = _free_port(socket.SOCK_DGRAM), _free_port(socket.SOCK_STREAM)
+    workdir = tempfile.mkdtemp(prefix='bench_startup_')
+    script = SERVER_SCRIPT.format(root=ROOT, udp_port=udp_port, http_port=http_port)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(0.005)
+
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', script], cwd=workdir,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        code = process.stdout.readline().strip()
+        constructed = time.perf_counter() - started
+        auth = json.dumps({'type': 'auth', 'code': code}).encode('utf-8')
+        first_auth = None
+        while first_auth is None:
+            if time.perf_counter() - started > timeout or process.poll() is not None:
+                raise RuntimeError("server did not answer auth")
+            sock.sendto(auth, ('127.0.0.1', udp_port))
+            try:
+                while True:
+                    message = json.loads(sock.recv(65536))
+                    if message.get('type') == 'auth_response' and message.get('status') == 'success':
+                        first_auth = time.perf_counter() - started
+                        break
+            except (socket.timeout, ConnectionRefusedError, ValueError):
+                pass
+        sock.sendto(json.dumps({'type': 'disconnect'}).encode('utf-8'), ('127.0.0.1', udp_port))
+
+        # 연결 페이지: 첫 요청은 렌더링, 같은 ETag 재요청은 304
+        url = f'http://127.0.0.1:{http_port}'
+        checks = []
+        for path, content_type in (('/', 'text/html'), ('/connection_qr.png', 'image/png')):
+            request_started = time.perf_counter()
+            status, headers, body = _get(url + path)
+            first_ms = (time.perf_counter() - request_started) * 1000
+            etag = headers.get('ETag')
+            revalidated, _, _ = _get(url + path, {'If-None-Match': etag or ''})
+            checks.append((f'GET {path} ({first_ms:.1f} ms) 200 + ETag, revalidation 304',
+                           status == 200 and bool(body) and etag is not None
+                           and headers.get('Content-Type', '').startswith(content_type)
+                           and revalidated == 304))
+    finally:
+        process.terminate()
+        process.wait()
+        sock.close()
+    written = os.listdir(workdir)
+    checks.append((f'no files written to working directory {written or ""}', not written))
+    return {'constructed': constructed, 'first_auth': first_auth, 'checks': checks}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--import-budget-ms', type=float, default=250.0)
+    parser.add_argument('--auth-budget-ms', type=float, default=1500.0)
+    parser.add_argument('--timeout', type=float, default=15.0)
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    import_ms = statistics.median(total for total, _ in imports)
+    print(f"import remote_server: median {import_ms:.1f} ms over {args.runs} runs")
+    for name, cumulative in imports[-1][1][:8]:
+        print(f"  {name:<24} {cumulative:8.1f} ms")
+
+    runs = [measure_first_auth(args.timeout) for _ in range(args.runs)]
+    constructed_ms = statistics.median(run['constructed'] for run in runs) * 1000
+    auth_ms = statistics.median(run['first_auth'] for run in runs) * 1000
+    print(f"server constructed: median {constructed_ms:.1f} ms, first auth: median {auth_ms:.1f} ms "
+          f"(from process start)")
+
+    checks = [
+        (f'import within budget ({import_ms:.1f} <= {args.import_budget_ms:.0f} ms)',
+         import_ms <= args.import_budget_ms),
+        (f'first auth within budget ({auth_ms:.1f} <= {args.auth_budget_ms:.0f} ms)',
+         auth_ms <= args.auth_budget_ms),
+    ] + runs[-1]['checks']
+    failed = False
+    for label, ok in checks:
+        failed |= not ok
+        print(f"  {label}: {'ok' if ok else 'FAIL'}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
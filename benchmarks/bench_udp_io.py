@@ -0,0 +1,182 @@
+"""UDP I/O 백엔드 루프백 비교: asyncio 기본 전송 vs BatchedDatagramTransport
+
+세 가지 부하에서 초당 패킷 수와 서버 CPU(패킷당 µs)를 측정한다.
+
+- echo: 클라이언트 프로세스들이 창 크기만큼 요청을 겹쳐 보내고 서버가 응답
+  (입력 + keepalive 응답 경로)
+- ingest: 클라이언트가 응답 없이 최대 속도로 전송 (포인터 이동 홍수)
+- fanout: 서버가 FrameSender 로 프레임 청크를 여러 시청자 소켓에 브로드캐스트
+
+batched 는 준비 이벤트당 recvfrom 반복 수신, batched+mmsg 는 (Linux 에서)
+recvmmsg/sendmmsg 로 시스템 호출 한 번에 여러 데이터그램을 처리한다.
+
+    python benchmarks/bench_udp_io.py [--duration 3] [--clients 2] [--window 32] [--viewers 8]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_transport import FrameSender
+from udp_io import configure_socket_buffers, create_batched_endpoint, mmsg_available
+
+PAYLOAD = b'\x01' + bytes(31)  # 바이너리 포인터 이동과 비슷한 크기
+BUFFER = 4 * 1024 * 1024
+
+class EchoProtocol(asyncio.DatagramProtocol):
+    def __init__(self, echo: bool):
+        self.echo = echo
+        self.received = 0
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.received += 1
+        if self.echo:
+            self.transport.sendto(data, addr)
+
+def _client(port: int, mode: str, window: int, duration: float, ready, results):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, BUFFER)
+    sock.connect(('127.0.0.1', port))
+    sock.settimeout(0.2)
+    ready.wait()
+    deadline = time.monotonic() + duration
+    sent = replies = 0
+    if mode == 'echo':
+        for _ in range(window):
+            sock.send(PAYLOAD)
+            sent += 1
+        while time.monotonic() < deadline:
+            try:
+                sock.recv(2048)
+            except socket.timeout:
+                # 손실된 요청만큼 창을 다시 채움
+                for _ in range(window):
+                    sock.send(PAYLOAD)
+                    sent += 1
+                continue
+            replies += 1
+            sock.send(PAYLOAD)
+            sent += 1
+    else:
+        while time.monotonic() < deadline:
+            for _ in range(64):
+                try:
+                    sock.send(PAYLOAD)
+                    sent += 1
+                except OSError:
+                    pass
+    results.put((sent, replies))
+
+async def _serve(backend: str, use_mmsg: bool, echo: bool):
+    local_addr = ('127.0.0.1', 0)
+    if backend == 'asyncio':
+        loop = asyncio.get_running_loop()
+        transport, protocol = await loop.create_datagram_endpoint(lambda: EchoProtocol(echo), local_addr=local_addr)
+        configure_socket_buffers(transport.get_extra_info('socket'), BUFFER, BUFFER)
+    else:
+        transport, protocol = await create_batched_endpoint(lambda: EchoProtocol(echo), local_addr,
+                                                            rcvbuf=BUFFER, sndbuf=BUFFER, use_mmsg=use_mmsg)
+    await asyncio.sleep(0)
+    return transport, protocol
+
+async def run_clients(backend: str, use_mmsg: bool, mode: str, clients: int, window: int,
+                      duration: float) -> dict:
+    transport, protocol = await _serve(backend, use_mmsg, echo=mode == 'echo')
+    port = transport.get_extra_info('sockname')[1]
+    ctx = multiprocessing.get_context('spawn')
+    ready = ctx.Event()
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_client, args=(port, mode, window, duration, ready, results))
+             for _ in range(clients)]
+    for proc in procs:
+        proc.start()
+    await asyncio.sleep(0.5)  # 클라이언트 프로세스 기동 대기
+
+    ready.set()
+    started, cpu = time.perf_counter(), time.process_time()
+    await asyncio.sleep(duration)
+    elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu
+    received = protocol.received
+
+    totals = [0, 0]
+    for _ in procs:
+        sent, replies = await asyncio.get_running_loop().run_in_executor(None, results.get)
+        totals[0] += sent
+        totals[1] += replies
+    for proc in procs:
+        proc.join()
+    transport.close()
+    await asyncio.sleep(0)
+
+    packets = received + (totals[1] if mode == 'echo' else 0)
+    return {
+        'pps': received / elapsed,
+        'replies_per_sec': totals[1] / elapsed,
+        'loss': 1 - received / totals[0] if totals[0] else 0.0,
+        'cpu_us_per_packet': cpu / max(1, packets) * 1e6,
+    }
+
+async def run_fanout(backend: str, use_mmsg: bool, viewers: int, duration: float,
+                     frame_size: int) -> dict:
+    transport, _ = await _serve(backend, use_mmsg, echo=False)
+    sinks = []
+    for _ in range(viewers):
+        sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sink.bind(('127.0.0.1', 0))
+        sinks.append(sink)
+    addrs = [sink.getsockname() for sink in sinks]
+    sender = FrameSender(transport, rate=1e12, burst=1e12)
+    frame = os.urandom(frame_size)
+
+    started, cpu = time.perf_counter(), time.process_time()
+    while time.perf_counter() - started < duration:
+        await sender.broadcast(addrs, frame)
+        await asyncio.sleep(0)  # 모아 둔 송신이 나가도록 루프 한 바퀴
+    elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu
+    transport.close()
+    for sink in sinks:
+        sink.close()
+    await asyncio.sleep(0)
+    return {
+        'pps': sender.chunks_sent / elapsed,
+        'replies_per_sec': 0.0,
+        'loss': 0.0,
+        'cpu_us_per_packet': cpu / max(1, sender.chunks_sent) * 1e6,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--clients', type=int, default=2)
+    parser.add_argument('--window', type=int, default=32)
+    parser.add_argument('--viewers', type=int, default=8)
+    parser.add_argument('--frame-size', type=int, default=60_000)
+    args = parser.parse_args()
+
+    backends = [('asyncio', 'asyncio', False), ('batched', 'batched', False)]
+    if mmsg_available():
+        backends.append(('batched+mmsg', 'batched', True))
+    print(f"recvmmsg/sendmmsg available: {mmsg_available()}")
+    for mode in ('echo', 'ingest', 'fanout'):
+        baseline = None
+        for label, backend, use_mmsg in backends:
+            if mode == 'fanout':
+                result = asyncio.run(run_fanout(backend, use_mmsg, args.viewers, args.duration, args.frame_size))
+            else:
+                result = asyncio.run(run_clients(backend, use_mmsg, mode, args.clients, args.window, args.duration))
+            baseline = baseline or result
+            print(f"{mode:<7} {label:<16} {result['pps']:>10,.0f} pps ({result['pps'] / baseline['pps']:.2f}x)  "
+                  f"replies {result['replies_per_sec']:>10,.0f}/s  loss {result['loss']:6.1%}  "
+                  f"cpu {result['cpu_us_per_packet']:6.2f} us/packet")
+
+if __name__ == '__main__':
+    main()
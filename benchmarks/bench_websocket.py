@@ -0,0 +1,236 @@
+"""WebSocket(/ws) 과 UDP 경로의 지연/처리량 비교 (루프백)
+
+서버(가짜 입력 백엔드 + FakeScreenSource)를 자식 프로세스로 띄우고 같은 메시지
+형식으로 UDP 클라이언트와 WebSocket 클라이언트를 각각 붙여
+
+- keepalive 왕복 지연 p50/p99 (하나씩 순차)
+- keepalive 처리량 (창 크기만큼 겹쳐 보냄)
+- request_frame 프레임 지연 p50/p99 와 처리량 (UDP 는 청크 + 페이싱, /ws 는 바이너리 메시지 하나)
+
+을 출력한다.
+
+    python benchmarks/bench_websocket.py [--pings 500] [--window 32] [--duration 2] [--frames 100]
+"""
+import argparse
+import asyncio
+import collections
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+
+from frame_transport import FrameReassembler
+from wire_protocol import Opcode, is_binary
+
+# ---------------------------------------------------------------- 서버 프로세스
+
+def _serve(conn):
+    """서버 프로세스: UDP 포트와 /ws 만 열고 stop 메시지까지 실행"""
+    os.chdir(tempfile.mkdtemp(prefix='bench_websocket_'))
+
+    from aiohttp import web
+    from frame_pipeline import FakeScreenSource
+    from input_injector import FakeInputBackend
+    from remote_server import RemoteControlServer, UDPServerProtocol
+
+    async def run():
+        server = RemoteControlServer(input_backend=FakeInputBackend(), screen_source=FakeScreenSource())
+        loop = asyncio.get_running_loop()
+        server.input_injector.start()
+        server.transport, server.protocol = await loop.create_datagram_endpoint(
+            lambda: UDPServerProtocol(server), local_addr=('127.0.0.1', 0))
+        server.frame_sender.transport = server.transport
+
+        app = web.Application()
+        app.router.add_get('/ws', server._handle_websocket)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+
+        conn.send({'udp_port': server.transport.get_extra_info('sockname')[1],
+                   'http_port': runner.addresses[0][1],
+                   'code': server.default_session.controller_code})
+        await loop.run_in_executor(None, conn.recv)
+        conn.send(server.websockets.stats())
+
+        server.websockets.close_all()
+        await runner.cleanup()
+        server.pointer_pipeline.cancel()
+        server.motion_engine.cancel()
+        server.input_injector.stop()
+        server.frame_pipeline.shutdown()
+        server.transport.close()
+
+    asyncio.run(run())
+
+# ---------------------------------------------------------------- 클라이언트
+
+class BenchClient:
+    """UDP/WebSocket 공통 요청-응답 대기 (응답 타입별 FIFO)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.reassembler = FrameReassembler(max_pending=8)
+        self._waiters = collections.defaultdict(collections.deque)
+        self.frame_bytes = 0
+
+    def send(self, data: bytes):
+        raise NotImplementedError
+
+    def handle(self, data: bytes):
+        if is_binary(data) and data[1] == Opcode.FRAME_CHUNK:
+            completed = self.reassembler.add(data)
+            if completed is not None:
+                self.frame_bytes += len(completed[1])
+                self._resolve('frame', completed)
+            return
+        if is_binary(data):
+            return
+        message = json.loads(data)
+        self._resolve(message.get('type'), message)
+
+    def _resolve(self, msg_type: str, value):
+        waiters = self._waiters.get(msg_type)
+        while waiters:
+            future = waiters.popleft()
+            if not future.done():
+                future.set_result(value)
+                return
+
+    def request(self, message: dict, response_type: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[response_type].append(future)
+        self.send(json.dumps(message).encode('utf-8'))
+        return future
+
+class UdpClient(BenchClient, asyncio.DatagramProtocol):
+    def __init__(self):
+        super().__init__('udp')
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.handle(data)
+
+    def send(self, data: bytes):
+        self.transport.sendto(data)
+
+class WebSocketClient(BenchClient):
+    def __init__(self, ws):
+        super().__init__('websocket')
+        self.ws = ws
+        self.reader = asyncio.create_task(self._read())
+
+    async def _read(self):
+        async for message in self.ws:
+            if message.type == aiohttp.WSMsgType.BINARY:
+                self.handle(message.data)
+            elif message.type == aiohttp.WSMsgType.TEXT:
+                # JSON 코덱 메시지는 텍스트 프레임 (웹 클라이언트와 같음)
+                self.handle(message.data.encode('utf-8'))
+
+    def send(self, data: bytes):
+        asyncio.ensure_future(self.ws.send_bytes(data))
+
+# ---------------------------------------------------------------- 측정
+
+def _percentiles(values: list) -> str:
+    values = sorted(values)
+    p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+    return f"p50 {statistics.median(values) * 1000:7.3f} ms  p99 {p99 * 1000:7.3f} ms"
+
+async def measure(client: BenchClient, code: str, args) -> dict:
+    response = await asyncio.wait_for(
+        client.request({'type': 'auth', 'code': code, 'frame_transport': 'chunked'}, 'auth_response'), 5)
+    if response.get('status') != 'success':
+        raise RuntimeError(f"auth failed: {response}")
+
+    rtts = []
+    for _ in range(args.pings):
+        started = time.perf_counter()
+        await asyncio.wait_for(client.request({'type': 'keepalive'}, 'keepalive_response'), 2)
+        rtts.append(time.perf_counter() - started)
+
+    # 창 크기만큼 겹쳐 보내는 keepalive 처리량
+    completed = 0
+    deadline = time.perf_counter() + args.duration
+    pending = collections.deque(client.request({'type': 'keepalive'}, 'keepalive_response')
+                                for _ in range(args.window))
+    started = time.perf_counter()
+    while time.perf_counter() < deadline:
+        await asyncio.wait_for(pending.popleft(), 2)
+        completed += 1
+        pending.append(client.request({'type': 'keepalive'}, 'keepalive_response'))
+    throughput = completed / (time.perf_counter() - started)
+    await asyncio.gather(*pending)
+
+    frame_latencies = []
+    client.frame_bytes = 0
+    started = time.perf_counter()
+    for _ in range(args.frames):
+        requested = time.perf_counter()
+        await asyncio.wait_for(client.request({'type': 'request_frame', 'keyframe': True}, 'frame'), 5)
+        frame_latencies.append(time.perf_counter() - requested)
+    frame_elapsed = time.perf_counter() - started
+
+    return {
+        'rtt': _percentiles(rtts),
+        'throughput': throughput,
+        'frame': _percentiles(frame_latencies),
+        'fps': args.frames / frame_elapsed,
+        'mbps': client.frame_bytes * 8 / frame_elapsed / 1e6,
+    }
+
+async def run(info: dict, args) -> dict:
+    loop = asyncio.get_running_loop()
+    results = {}
+
+    _, udp = await loop.create_datagram_endpoint(UdpClient, remote_addr=('127.0.0.1', info['udp_port']))
+    results['udp'] = await measure(udp, info['code'], args)
+    udp.send(json.dumps({'type': 'disconnect'}).encode('utf-8'))
+    udp.transport.close()
+
+    async with aiohttp.ClientSession() as session:
+        async with session.ws_connect(f"http://127.0.0.1:{info['http_port']}/ws") as ws:
+            client = WebSocketClient(ws)
+            results['websocket'] = await measure(client, info['code'], args)
+            client.reader.cancel()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pings', type=int, default=500)
+    parser.add_argument('--window', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=2.0)
+    parser.add_argument('--frames', type=int, default=100)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context('spawn')
+    parent, child = ctx.Pipe()
+    process = ctx.Process(target=_serve, args=(child,))
+    process.start()
+    try:
+        info = parent.recv()
+        results = asyncio.run(run(info, args))
+    finally:
+        parent.send('stop')
+        server_stats = parent.recv()
+        process.join()
+
+    for name, result in results.items():
+        print(f"{name:<10} keepalive rtt {result['rtt']}  throughput {result['throughput']:10,.0f} msg/s")
+        print(f"{'':<10} frame         {result['frame']}  {result['fps']:6.1f} fps  {result['mbps']:7.1f} Mbit/s")
+    print(f"server websocket stats: {server_stats}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""JSON / 바이너리 코덱 처리량 비교 (실제 디스패치 테이블 경유)
+
+    python benchmarks/bench_wire_protocol.py [--packets N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from remote_server import ClientInfo, MessageType, ServerMetrics, UDPServerProtocol
+from wire_protocol import BINARY_CODEC, JSON_CODEC
+
+CLIENT_ADDR = ('127.0.0.1', 50000)
+
+class _NullTransport:
+    def __init__(self):
+        self.sent = 0
+
+    def sendto(self, data, addr):
+        self.sent += 1
+
+class _BenchServer:
+    """인증 상태만 흉내내는 서버 스텁"""
+    def __init__(self, codec: str):
+        self.metrics = ServerMetrics()
+        self.tracer = None
+        self.websockets = None
+        self.recorder = None
+        self.client = ClientInfo(address=CLIENT_ADDR, last_activity=time.monotonic(),
+                                 authenticated=True, codec=codec)
+
+    def is_client_authenticated(self, addr):
+        return True
+
+    def update_client_activity(self, addr, now):
+        self.client.last_activity = now
+
+    def client_keepalive(self, addr, message, received_at):
+        self.client.keepalive_seen = True
+        self.client.link.on_keepalive(received_at, message.get('seq'), message.get('timestamp'))
+
+    def get_client(self, addr):
+        return self.client
+
+def _sample_messages():
+    """60Hz 제스처 스트림과 비슷한 메시지 혼합"""
+    messages = [{'type': 'mouse_move_relative', 'dx': 1.5, 'dy': -0.75}] * 16
+    messages.append({'type': 'mouse_move_relative', 'is_laser': True, 'x': 0.4, 'y': 0.6})
+    messages.append({'type': 'mouse_click', 'click_type': 'left'})
+    messages.append({'type': 'keyboard', 'key': 'right'})
+    messages.append({'type': 'keepalive', 'timestamp': int(time.time() * 1000)})
+    return messages
+
+def run(codec, packets: int) -> float:
+    server = _BenchServer(codec.name)
+    protocol = UDPServerProtocol(server)
+    protocol.connection_made(_NullTransport())
+
+    # OS 입력 주입 핸들러만 no-op으로 대체 (디코드, 조회, 응답 인코딩은 실제 경로)
+    noop = lambda message, addr: None
+    for msg_type in (MessageType.MOUSE_MOVE, MessageType.MOUSE_CLICK, MessageType.KEYBOARD):
+        protocol._message_handlers[msg_type] = noop
+
+    datagrams = [codec.encode(message, seq) for seq, message in enumerate(_sample_messages())]
+    datagrams = (datagrams * (packets // len(datagrams) + 1))[:packets]
+
+    start = time.perf_counter()
+    for data in datagrams:
+        protocol.datagram_received(data, CLIENT_ADDR)
+    elapsed = time.perf_counter() - start
+    return packets / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--packets', type=int, default=200_000)
+    args = parser.parse_args()
+
+    results = {codec.name: run(codec, args.packets) for codec in (JSON_CODEC, BINARY_CODEC)}
+    for name, rate in results.items():
+        print(f"{name:>6}: {rate:12,.0f} packets/sec")
+    print(f"speedup: {results['binary'] / results['json']:.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""커서 위치 스트림 점검: 레이저 이동 중 메시지 수/크기와 프레임 기반 포인터 표시 비교
+
+PointerMotionEngine 을 가상 시계로 구동하고 출력 위치를 CursorPublisher 로 보내
+(JSON/바이너리 구독자 각각)
+
+- 초당 커서 메시지 수가 모션 엔진 주기 이하인지
+- 메시지 크기와 구독자당 대역폭 (같은 빈도로 프레임을 보낼 때와 비교)
+- 구독자 모두가 같은 순번을 순서대로 받는지, 같은 위치는 다시 보내지 않는지
+- 구독 시 현재 위치를 바로 받고, 구독 해제 후에는 받지 않는지
+
+를 확인하고, 실패하면 0이 아닌 코드로 종료한다.
+
+    python benchmarks/check_cursor_stream.py [--seconds 2] [--packet-rate 60] [--frame-bytes 60000]
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cursor_stream import CursorPublisher
+from pointer_motion import PointerMotionEngine
+from wire_protocol import BINARY_CODEC, JSON_CODEC, is_binary
+
+SCREEN = (1920, 1080)
+ENGINE_RATE = 120.0
+
+class RecordingTransport:
+    def __init__(self):
+        self.sent = {}
+
+    def sendto(self, data, addr):
+        self.sent.setdefault(addr, []).append(bytes(data))
+
+def _decode(data: bytes) -> dict:
+    return BINARY_CODEC.decode(data) if is_binary(data) else JSON_CODEC.decode(data)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--packet-rate', type=float, default=60.0)
+    parser.add_argument('--frame-bytes', type=int, default=60000)
+    args = parser.parse_args()
+
+    transport = RecordingTransport()
+    publisher = CursorPublisher(transport)
+    binary_client, json_client, late_client = ('10.0.0.2', 1), ('10.0.0.3', 1), ('10.0.0.4', 1)
+    publisher.subscribe(binary_client, BINARY_CODEC.name)
+    publisher.subscribe(json_client, JSON_CODEC.name)
+
+    engine = PointerMotionEngine(lambda x, y, received_at: publisher.publish(x, y, engine.laser),
+                                 SCREEN, rate=ENGINE_RATE)
+
+    # 레이저 포인터가 화면에 원을 그리는 입력 (패킷 속도 packet_rate, 엔진 틱 120Hz)
+    now, next_packet = 0.0, 0.0
+    started = time.perf_counter()
+    while now < args.seconds:
+        if now >= next_packet:
+            angle = 2 * math.pi * now / 1.5
+            engine.update(960 + 400 * math.cos(angle), 540 + 300 * math.sin(angle), laser=True, now=now)
+            next_packet += 1 / args.packet_rate
+        engine.step(now)
+        if now > args.seconds / 2 and late_client not in publisher.subscribers:
+            publisher.subscribe(late_client, BINARY_CODEC.name)
+        now += 1 / ENGINE_RATE
+    elapsed_cpu = time.perf_counter() - started
+
+    publisher.unsubscribe(json_client)
+    json_before = len(transport.sent[json_client])
+    publisher.publish(1, 1, True)
+    publisher.publish(1, 1, True)  # 같은 위치/모드는 보내지 않음
+
+    binary = [_decode(data) for data in transport.sent[binary_client]]
+    as_json = [_decode(data) for data in transport.sent[json_client]]
+    late = [_decode(data) for data in transport.sent[late_client]]
+    binary_size = len(transport.sent[binary_client][0])
+    json_size = sum(map(len, transport.sent[json_client])) / len(transport.sent[json_client])
+    rate = len(as_json) / args.seconds
+
+    print(f"cursor messages: {rate:.1f}/s (engine {ENGINE_RATE:.0f} Hz, packets {args.packet_rate:.0f}/s), "
+          f"engine + publish {elapsed_cpu / max(1, publisher.updates) * 1e6:.2f} us/update")
+    print(f"message size: binary {binary_size} B, json {json_size:.0f} B -> "
+          f"{binary_size * rate / 1024:.2f} / {json_size * rate / 1024:.2f} KiB/s per subscriber")
+    print(f"frame-based pointer feedback at the same rate: {args.frame_bytes * rate / 1024 / 1024:.1f} MiB/s "
+          f"per viewer ({args.frame_bytes / binary_size:,.0f}x binary cursor bytes)")
+    print(f"publisher {publisher.stats()}")
+
+    seqs = [message['seq'] for message in binary]
+    checks = [
+        ('rate within engine rate', 0 < rate <= ENGINE_RATE),
+        ('laser flag carried', all(message['laser'] for message in as_json)),
+        ('same sequence for every codec', seqs[:len(as_json)] == [message['seq'] for message in as_json]),
+        ('sequence strictly increasing', all(b > a for a, b in zip(seqs, seqs[1:]))),
+        ('positions within screen', all(0 <= m['x'] < SCREEN[0] and 0 <= m['y'] < SCREEN[1]
+                                        for m in binary[:-1])),
+        ('late subscriber gets current position first', bool(late) and late[0]['seq'] in seqs
+         and late[-1]['seq'] == seqs[-1]),
+        ('unsubscribed client receives nothing', len(transport.sent[json_client]) == json_before),
+        ('duplicate position suppressed', seqs.count(seqs[-1]) == 1 and binary[-1]['x'] == 1),
+    ]
+    failed = False
+    for label, ok in checks:
+        failed |= not ok
+        print(f"  {label}: {'ok' if ok else 'FAIL'}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
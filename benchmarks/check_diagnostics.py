@@ -0,0 +1,247 @@
+"""진단 모드 점검: 비활성 오버헤드, 구간 기록, Chrome trace, 루프 정지 감지
+
+실제 UDPServerProtocol 디스패치 경로로 패킷을 처리하면서
+1) 진단 모드를 켰다 끈 프로토콜의 패킷당 처리 시간이, 같은 메서드 소스에서
+   tracer 확인을 모두 뺀 기준선보다 --max-overhead 에 측정 잡음을 더한 비율 이상
+   느리지 않은지 (양쪽을 같은 방식으로 다시 컴파일해 여러 번 만들고, 기준선과
+   비교 대상을 짝지어 연달아 처리한 비율의 중앙값. 잡음은 따로 만든 기준선 두 개를
+   같은 방식으로 비교한 A/A 비율에서 추정),
+2) 켜져 있을 때 패킷마다 receive/decode/dispatch 구간이 기록되고 Chrome trace
+   JSON 으로 직렬화되는지,
+3) 핸들러가 루프를 막으면 정지가 감지되고 메시지 타입이 보고되는지
+확인하고, 하나라도 실패하면 0이 아닌 코드로 종료한다.
+
+    python benchmarks/check_diagnostics.py [--packets 2000] [--builds 20] [--trials 10] [--max-overhead 0.01]
+                                           [--noise-floor 0.01]
+"""
+import argparse
+import ast
+import asyncio
+import inspect
+import json
+import os
+import random
+import statistics
+import sys
+import textwrap
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from diagnostics import LoopStallMonitor, TraceRecorder
+from remote_server import ClientInfo, MessageType, ServerMetrics, UDPServerProtocol
+from wire_protocol import BINARY_CODEC
+
+CLIENT_ADDR = ('127.0.0.1', 50000)
+
+# 패킷마다 지나는 메서드 (기준선은 여기서 tracer 확인을 뺀 같은 소스)
+PACKET_PATH_METHODS = ('datagram_received', '_process_message', '_dispatch', '_send_message')
+
+class _NullTransport:
+    def sendto(self, data, addr):
+        pass
+
+class _CheckServer:
+    """인증 상태만 흉내내는 서버 스텁"""
+    def __init__(self):
+        self.metrics = ServerMetrics()
+        self.tracer = None
+        self.websockets = None
+        self.recorder = None
+        self.client = ClientInfo(address=CLIENT_ADDR, last_activity=time.monotonic(),
+                                 authenticated=True, codec=BINARY_CODEC.name)
+
+    def is_client_authenticated(self, addr):
+        return True
+
+    def update_client_activity(self, addr, now):
+        self.client.last_activity = now
+
+    def client_keepalive(self, addr, message, received_at):
+        self.client.link.on_keepalive(received_at, message.get('seq'), message.get('timestamp'))
+
+    def get_client(self, addr):
+        return self.client
+
+def _tracer_test(node: ast.AST):
+    """'tracer is (not) None' / 'self.tracer is (not) None' 이면 None 일 때 남는 쪽 ('body'/'orelse')"""
+    if not (isinstance(node, ast.Compare) and len(node.ops) == 1 and _is_tracer(node.left)
+            and isinstance(node.comparators[0], ast.Constant) and node.comparators[0].value is None):
+        return None
+    return 'body' if isinstance(node.ops[0], ast.Is) else 'orelse'
+
+def _is_tracer(node: ast.AST) -> bool:
+    return ((isinstance(node, ast.Name) and node.id == 'tracer')
+            or (isinstance(node, ast.Attribute) and node.attr == 'tracer'))
+
+class _StripTracing(ast.NodeTransformer):
+    """tracer 대입과 tracer None 비교 분기를 제거 (계측 전 코드와 같은 기준선)"""
+
+    def visit_Assign(self, node):
+        if any(_is_tracer(target) for target in node.targets):
+            return None
+        return self.generic_visit(node)
+
+    def visit_If(self, node):
+        self.generic_visit(node)
+        kept = _tracer_test(node.test)
+        if kept is None:
+            return node
+        return getattr(node, kept) or None
+
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        kept = _tracer_test(node.test)
+        return node if kept is None else getattr(node, kept)
+
+def _recompiled_class(strip: bool) -> type:
+    """패킷 경로 메서드를 다시 컴파일한 하위 클래스
+
+    모듈의 원래 함수와 다시 컴파일한 함수는 코드 배치 차이로 수 % 차이가 나므로
+    기준선(strip=True)과 비교 대상을 같은 방식으로 만든다.
+    """
+    namespace = {}
+    for name in PACKET_PATH_METHODS:
+        func = getattr(UDPServerProtocol, name)
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+        if strip:
+            tree = _StripTracing().visit(tree)
+            if any(_is_tracer(node) for node in ast.walk(tree)):
+                raise RuntimeError(f"Could not strip tracing from {name}")
+        code = compile(ast.fix_missing_locations(tree), inspect.getsourcefile(func), 'exec')
+        exec(code, func.__globals__, namespace)
+    return type('UninstrumentedProtocol' if strip else 'InstrumentedProtocol', (UDPServerProtocol,), namespace)
+
+def _protocol(server, cls: type = UDPServerProtocol) -> UDPServerProtocol:
+    protocol = cls(server)
+    protocol.connection_made(_NullTransport())
+    # OS 입력 주입 핸들러만 no-op으로 대체
+    noop = lambda message, addr: None
+    for msg_type in (MessageType.MOUSE_MOVE, MessageType.MOUSE_CLICK, MessageType.KEYBOARD):
+        protocol._message_handlers[msg_type] = noop
+    return protocol
+
+def _datagrams(packets: int) -> list:
+    messages = [{'type': 'mouse_move_relative', 'dx': 1.5, 'dy': -0.75}] * 8
+    messages.append({'type': 'keepalive', 'timestamp': int(time.time() * 1000)})
+    datagrams = [BINARY_CODEC.encode(message, seq) for seq, message in enumerate(messages)]
+    return (datagrams * (packets // len(datagrams) + 1))[:packets]
+
+def per_packet(protocol, datagrams) -> float:
+    start = time.perf_counter()
+    for data in datagrams:
+        protocol.datagram_received(data, CLIENT_ADDR)
+    return (time.perf_counter() - start) / len(datagrams)
+
+def _overhead_protocols(packets: int) -> dict:
+    protocols = {
+        'baseline': _protocol(_CheckServer(), _recompiled_class(strip=True)),
+        # 진단 모드를 한 번 켰다 끈 상태 (계측 없는 경로로 완전히 돌아와야 함)
+        'disabled': _protocol(_CheckServer(), _recompiled_class(strip=False)),
+        'enabled': _protocol(_CheckServer(), _recompiled_class(strip=False)),
+        # 잡음 추정용: 기준선과 같은 코드를 따로 컴파일
+        'a/a': _protocol(_CheckServer(), _recompiled_class(strip=True)),
+    }
+    protocols['disabled'].set_tracing(TraceRecorder(capacity=1024))
+    protocols['disabled'].set_tracing(None)
+    protocols['enabled'].set_tracing(TraceRecorder(capacity=packets * 4))
+    return protocols
+
+def _paired_ratio(baseline, other, datagrams) -> float:
+    """기준선과 비교 대상을 무작위 순서로 연달아 처리한 시간 비율 - 1 (부하 변화가 둘에 같이 걸리게)"""
+    pair = [baseline, other]
+    random.shuffle(pair)
+    elapsed = {id(protocol): per_packet(protocol, datagrams) for protocol in pair}
+    return elapsed[id(other)] / elapsed[id(baseline)] - 1
+
+def check_overhead(packets: int, builds: int, trials: int, max_overhead: float, noise_floor: float) -> bool:
+    datagrams = _datagrams(packets)
+    # 같은 코드라도 클래스/인스턴스마다 배치 차이로 ±1% 정도 달라지므로 여러 번 새로 만들어
+    # 빌드별 짝 비율의 중앙값을 구하고, 그 중앙값들의 중앙값을 사용
+    ratios = {'disabled': [], 'enabled': [], 'a/a': []}
+    best = float('inf')
+    for _ in range(builds):
+        protocols = _overhead_protocols(packets)
+        baseline = protocols['baseline']
+        build_ratios = {name: [] for name in ratios}
+        for _ in range(trials):
+            for name in random.sample(list(build_ratios), len(build_ratios)):
+                build_ratios[name].append(_paired_ratio(baseline, protocols[name], datagrams))
+            best = min(best, per_packet(baseline, datagrams))
+        for name, values in build_ratios.items():
+            ratios[name].append(statistics.median(values))
+
+    overhead = {name: statistics.median(values) for name, values in ratios.items()}
+    # 잡음: 같은 코드끼리(A/A)의 빌드별 흩어짐으로 추정한 빌드 중앙값의 표준 오차 3배
+    # (MAD * 1.4826 = 표준편차 추정, 중앙값의 표준 오차는 평균의 1.2533 배). 20개 빌드로는
+    # 이 추정도 흔들리므로 유휴 머신에서 잰 실행 간 중앙값 흩어짐(약 ±1%)을 하한으로
+    spread = statistics.median(abs(ratio - overhead['a/a']) for ratio in ratios['a/a']) * 1.4826
+    noise = max(noise_floor, 3 * 1.2533 * spread / builds ** 0.5)
+    bound = max_overhead + noise
+    print(f"uninstrumented: {best * 1e6:.3f} us/packet (best of {builds * trials} runs)")
+    print(f"disabled: {overhead['disabled']:+.2%}, enabled: {overhead['enabled']:+.1%}, "
+          f"a/a: {overhead['a/a']:+.2%} (median paired ratio to uninstrumented over "
+          f"{builds} builds x {trials} rounds, noise {noise:.2%})")
+    ok = overhead['disabled'] <= bound
+    print(f"  disabled overhead <= {max_overhead:.2%} + noise = {bound:.2%}: {'ok' if ok else 'FAIL'}")
+    return ok
+
+def check_trace(packets: int) -> bool:
+    server = _CheckServer()
+    server.tracer = TraceRecorder(capacity=1024)
+    protocol = _protocol(server)
+    for data in _datagrams(packets):
+        protocol.datagram_received(data, CLIENT_ADDR)
+
+    trace = json.loads(json.dumps(server.tracer.to_chrome_trace()))
+    events = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+    names = {event['name'] for event in events}
+    ok = (server.tracer.recorded >= packets * 3 and len(events) == 1024
+          and {'receive', 'decode', 'mouse_move_relative', 'send'} <= names
+          and all(event['dur'] >= 0 for event in events))
+    print(f"trace: {server.tracer.recorded} spans recorded, {len(events)} kept, names {sorted(names)}")
+    print(f"  ring buffer + chrome trace: {'ok' if ok else 'FAIL'}")
+    return ok
+
+async def _stall(threshold: float) -> LoopStallMonitor:
+    server = _CheckServer()
+    server.tracer = TraceRecorder()
+    protocol = _protocol(server)
+    protocol._message_handlers[MessageType.MOUSE_CLICK] = lambda message, addr: time.sleep(threshold * 4)
+
+    monitor = LoopStallMonitor(threshold, server.tracer)
+    monitor.start()
+    await asyncio.sleep(threshold * 2)
+    protocol.datagram_received(BINARY_CODEC.encode({'type': 'mouse_click', 'click_type': 'left'}, 0),
+                               CLIENT_ADDR)
+    await asyncio.sleep(threshold * 2)
+    monitor.stop()
+    return monitor
+
+def check_stall(threshold: float) -> bool:
+    monitor = asyncio.run(_stall(threshold))
+    stats = monitor.stats()
+    ok = stats['stalls'] >= 1 and 'mouse_click' in stats['recent'][-1]['handler']
+    print(f"stalls: {stats}")
+    print(f"  loop stall attributed to handler: {'ok' if ok else 'FAIL'}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--packets', type=int, default=2000)
+    parser.add_argument('--builds', type=int, default=20)
+    parser.add_argument('--trials', type=int, default=10)
+    parser.add_argument('--max-overhead', type=float, default=0.01)
+    parser.add_argument('--noise-floor', type=float, default=0.01)
+    parser.add_argument('--stall-ms', type=float, default=50.0)
+    args = parser.parse_args()
+
+    results = [
+        check_overhead(args.packets, args.builds, args.trials, args.max_overhead, args.noise_floor),
+        check_trace(2000),
+        check_stall(args.stall_ms / 1000),
+    ]
+    sys.exit(0 if all(results) else 1)
+
+if __name__ == '__main__':
+    main()
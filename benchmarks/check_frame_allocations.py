@@ -0,0 +1,106 @@
+"""프레임당 최대 메모리 할당 점검 (tracemalloc)
+
+캡처 버퍼를 미리 만든 뒤, 인코딩부터 청크 송신 버퍼 기록까지 한 프레임을
+처리하는 동안의 최대 할당량이 상한을 넘으면 0이 아닌 코드로 종료한다.
+상한은 축소된 RGB 프레임 한 장 크기의 --frame-fraction 배 (해상도에 비례,
+프레임 전체 복사가 하나라도 다시 생기면 넘음). --limit-kb 로 직접 지정할 수 있다.
+비교용으로 기존 경로(screen.rgb -> frombytes -> base64 -> json)도 측정한다.
+
+    python benchmarks/check_frame_allocations.py [--frame-fraction 0.5] [--limit-kb N]
+"""
+import argparse
+import asyncio
+import base64
+import io
+import json
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_frame_diff import slide_frame
+from frame_codecs import encode_frame
+from frame_pipeline import CapturedFrame
+from frame_transport import FrameSender
+
+class _FakeScreenShot:
+    """mss ScreenShot 과 같은 속성을 가진 캡처"""
+    def __init__(self, bgra: np.ndarray):
+        self.height, self.width = bgra.shape[:2]
+        self.size = (self.width, self.height)
+        self.raw = bytearray(bgra.tobytes())
+
+    @property
+    def rgb(self) -> bytes:
+        # mss 와 동일하게 BGRA -> RGB 바이트를 새로 만든다
+        return bytes(np.frombuffer(self.raw, np.uint8).reshape(-1, 4)[:, 2::-1].tobytes())
+
+class _NullTransport:
+    def sendto(self, data, addr):
+        pass
+
+def legacy_frame(screen: _FakeScreenShot, quality: int, scale: float) -> bytes:
+    img = Image.frombytes('RGB', screen.size, screen.rgb)
+    img = img.resize((int(screen.width * scale), int(screen.height * scale)), Image.LANCZOS)
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=quality)
+    return json.dumps({'type': 'frame', 'data': base64.b64encode(buffer.getvalue()).decode('utf-8')}).encode()
+
+async def pipeline_frame(sender: FrameSender, frame: CapturedFrame, quality: int, scale: float):
+    data = encode_frame(frame, quality, scale)
+    await sender.send(('127.0.0.1', 9), data)
+
+def peak_per_frame(run, frames: int) -> int:
+    # 워밍업: 송신 링 버퍼 등 재사용 버퍼 확보
+    for _ in range(3):
+        run()
+    tracemalloc.start()
+    peak = 0
+    try:
+        for _ in range(frames):
+            tracemalloc.reset_peak()
+            run()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--quality', type=int, default=50)
+    parser.add_argument('--scale', type=float, default=0.5)
+    parser.add_argument('--frames', type=int, default=10)
+    parser.add_argument('--frame-fraction', type=float, default=0.5)
+    parser.add_argument('--limit-kb', type=int, default=None)
+    args = parser.parse_args()
+    scaled_rgb = int(args.width * args.scale) * int(args.height * args.scale) * 3
+    limit = args.limit_kb * 1024 if args.limit_kb is not None else int(scaled_rgb * args.frame_fraction)
+
+    screen = _FakeScreenShot(slide_frame(np.random.default_rng(0), args.height, args.width))
+    frame = CapturedFrame(screen, tick=0, captured_at=0.0)
+    sender = FrameSender(transport=_NullTransport(), rate=1e12, burst=1e12)
+    loop = asyncio.new_event_loop()
+
+    legacy = peak_per_frame(lambda: legacy_frame(screen, args.quality, args.scale), args.frames)
+    pipeline = peak_per_frame(
+        lambda: loop.run_until_complete(pipeline_frame(sender, frame, args.quality, args.scale)),
+        args.frames)
+    loop.close()
+
+    print(f"legacy   peak/frame: {legacy / 1024:10.1f} KB")
+    print(f"pipeline peak/frame: {pipeline / 1024:10.1f} KB (limit {limit / 1024:.1f} KB, "
+          f"scaled RGB frame {scaled_rgb / 1024:.1f} KB)")
+    if pipeline > limit:
+        print("FAIL: per-frame allocation exceeds limit")
+        sys.exit(1)
+    print("OK")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""keepalive 링크 추정기 점검: 손실/지연을 넣은 로컬호스트 UDP 루프백
+
+클라이언트는 시퀀스 번호, 송신 타임스탬프, 마지막 server_ts echo 와 보관 시간을
+실은 keepalive 를 보내고, 서버 측은 LinkEstimator 로 RTT/지터/손실을 추정한다.
+양방향 송신 경로에 고정 지연 + 균등 분포 지터, 클라이언트->서버 경로에 손실을
+넣어 추정치가 허용 오차 안에 드는지 확인한다. 기대값은 이번 실행에서 실제로
+주입한 지연과 손실로 계산한 도착 순서/왕복 시간을 새 LinkEstimator 에 넣은
+기준값이다 (표본 편차는 기준값도 같이 가지므로 남는 차이는 루프백 전달 지연과
+ms 타임스탬프 해상도뿐, 방향마다 난수열이 따로라 같은 seed 면 같은 손실 패턴).
+바이너리 코덱 확장 keepalive 레이아웃으로도 같은 점검을 수행한다. 이어서 네트워크
+없이 정해진 입력으로 RFC 6298 (alpha=1/8, beta=1/4) 과 RFC 3550 (1/16) 평활 이득을
+닫힌 식과 비교한다. 벗어나면 0이 아닌 코드로 종료한다.
+
+    python benchmarks/check_link_stats.py [--delay-ms 20] [--jitter-ms 10] [--loss 0.1]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from link_stats import LinkEstimator, timestamp_ms
+from wire_protocol import BINARY_CODEC, JSON_CODEC, is_binary
+
+class ImpairedTransport:
+    """sendto 를 고정 지연 + 지터 후 전달하고 확률적으로 버리는 전송 래퍼"""
+
+    def __init__(self, transport, delay: float, jitter: float, loss: float, rng: random.Random):
+        self.transport = transport
+        self.delay = delay
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = rng
+        self.dropped: List[bool] = []  # 보낸 순서대로 버렸는지 여부
+        self.sent: List[Tuple[float, Optional[float]]] = []  # 보낸 순서대로 (보낸 시각, 주입 지연 또는 None)
+
+    def sendto(self, data, addr=None):
+        sent_at = time.monotonic()
+        dropped = self.rng.random() < self.loss
+        self.dropped.append(dropped)
+        if dropped:
+            self.sent.append((sent_at, None))
+            return
+        delay = self.delay + self.rng.uniform(0, self.jitter)
+        self.sent.append((sent_at, delay))
+        asyncio.get_running_loop().call_later(delay, self.transport.sendto, data, addr)
+
+class ServerSide(asyncio.DatagramProtocol):
+    """remote_server 의 keepalive 처리와 같은 필드로 응답하는 서버 측"""
+
+    def __init__(self, codec, delay, jitter, rng):
+        self.codec = codec
+        self.link = LinkEstimator()
+        self.delay, self.jitter, self.rng = delay, jitter, rng
+        self.out = None
+        self.tx_seq = 0
+        self.server_ts: List[int] = []  # 보낸 순서대로 (out.sent 와 같은 순서)
+
+    def connection_made(self, transport):
+        self.out = ImpairedTransport(transport, self.delay, self.jitter, 0.0, self.rng)
+
+    def datagram_received(self, data, addr):
+        received_at = time.monotonic()
+        message = BINARY_CODEC.decode(data) if is_binary(data) else JSON_CODEC.decode(data)
+        self.link.on_keepalive(received_at, message.get('seq'), message.get('timestamp'),
+                               message.get('echo'), message.get('echo_delay'))
+        response = {
+            'type': 'keepalive_response',
+            'timestamp': int(time.time() * 1000),
+            'server_ts': timestamp_ms(),
+            'echo': message['timestamp'],
+            'echo_delay': int((time.monotonic() - received_at) * 1000),
+        }
+        self.server_ts.append(response['server_ts'])
+        self.out.sendto(self.codec.encode(response, self.tx_seq), addr)
+        self.tx_seq += 1
+
+class ClientSide(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.last_server_ts = None
+        self.received_at = 0.0
+
+    def datagram_received(self, data, addr):
+        message = BINARY_CODEC.decode(data) if is_binary(data) else JSON_CODEC.decode(data)
+        # 바이너리 응답은 server_ts 를 timestamp 자리에 싣는다
+        self.last_server_ts = message.get('server_ts', message.get('timestamp'))
+        self.received_at = time.monotonic()
+
+async def run(codec, count: int, interval: float, delay: float, jitter: float,
+              loss: float, seed: int) -> Tuple[LinkEstimator, LinkEstimator, List[bool]]:
+    loop = asyncio.get_running_loop()
+    server = ServerSide(codec, delay, jitter, random.Random(seed + 1))
+    server_transport, _ = await loop.create_datagram_endpoint(
+        lambda: server, local_addr=('127.0.0.1', 0))
+    client = ClientSide()
+    client_transport, _ = await loop.create_datagram_endpoint(
+        lambda: client, remote_addr=server_transport.get_extra_info('sockname'))
+    out = ImpairedTransport(client_transport, delay, jitter, loss, random.Random(seed))
+
+    timestamps, echoes = [], []
+    for seq in range(count):
+        message = {'type': 'keepalive', 'seq': seq, 'timestamp': timestamp_ms()}
+        timestamps.append(message['timestamp'])
+        if client.last_server_ts is not None:
+            message['echo'] = client.last_server_ts
+            message['echo_delay'] = int((time.monotonic() - client.received_at) * 1000)
+        echoes.append(message.get('echo'))
+        out.sendto(codec.encode(message, seq))
+        await asyncio.sleep(interval)
+
+    await asyncio.sleep(delay + jitter + 0.05)
+    client_transport.close()
+    server_transport.close()
+    # echo 한 응답의 서버->클라이언트 주입 지연 (같은 ms 에 보낸 응답은 없다고 봄)
+    response_delays = {ts: delay for ts, (_, delay) in zip(server.server_ts, server.out.sent)}
+    rtts = [None if echo is None or delay is None else delay + response_delays[echo]
+            for echo, (_, delay) in zip(echoes, out.sent)]
+    return server.link, reference(out.sent, timestamps, rtts, server.link.loss_window), out.dropped
+
+def reference(sent: List[Tuple[float, Optional[float]]], timestamps: List[int],
+              rtts: List[Optional[float]], loss_window: int) -> LinkEstimator:
+    """주입한 지연으로 계산한 도착 시각 순서대로 keepalive 와 왕복 표본을 넣은 기준 추정기 (소켓/루프 없음)"""
+    link = LinkEstimator(loss_window=loss_window)
+    arrivals = sorted((sent_at + delay, seq) for seq, (sent_at, delay) in enumerate(sent) if delay is not None)
+    for arrived_at, seq in arrivals:
+        link.on_keepalive(arrived_at, seq=seq, timestamp=timestamps[seq])
+        if rtts[seq] is not None:
+            link.on_rtt_sample(rtts[seq])
+    return link
+
+def _close(value: float, expected: float, relative: float, absolute: float = 0.0) -> bool:
+    return abs(value - expected) <= relative * abs(expected) + absolute
+
+def check(link: LinkEstimator, expected: LinkEstimator, dropped: List[bool]) -> list:
+    """루프백 추정치의 (이름, 추정값, 기대값, 통과 여부) 목록 (expected: 주입값 기준 추정기)"""
+    # 마지막으로 도착한 것 뒤에 버려진 keepalive 는 시퀀스 공백으로 알 수 없음
+    detectable = len(dropped) - next(i for i, d in enumerate(reversed(dropped)) if not d)
+    return [
+        # 왕복 표본은 ms 값 두 개(경과, 보관 시간)의 차라서 표본마다 최대 2 ms 의 해상도 오차
+        ('srtt', link.srtt, expected.srtt, _close(link.srtt, expected.srtt, 0.05, 2 * link.granularity)),
+        ('jitter', link.jitter, expected.jitter, _close(link.jitter, expected.jitter, 0.15, link.granularity / 2)),
+        ('lost', link.lost, sum(dropped[:detectable]), link.lost == sum(dropped[:detectable])),
+        ('loss', link.loss_rate, expected.loss_rate, abs(link.loss_rate - expected.loss_rate) <= 0.02),
+    ]
+
+def check_gains() -> list:
+    """정해진 입력에 대한 (이름, 추정값, 기대값, 통과 여부) 목록 (평활 이득이 틀리면 실패)"""
+    results = []
+
+    # RFC 6298: 첫 표본 R 로 SRTT=R, RTTVAR=R/2. 이후 2R 이 n 번이면
+    # SRTT = 2R - R*(7/8)^n, RTTVAR = (3/4)^n * R/2 + sum_k (1/4)(3/4)^(n-1-k) |SRTT_k - 2R|
+    link = LinkEstimator(min_rto=0.0)
+    r, n = 0.1, 6
+    link.on_rtt_sample(r)
+    srtt, rttvar = r, r / 2
+    for _ in range(n):
+        link.on_rtt_sample(2 * r)
+        rttvar = 0.75 * rttvar + 0.25 * abs(srtt - 2 * r)
+        srtt = 2 * r - (2 * r - srtt) * 7 / 8
+    results.append(('srtt', link.srtt, 2 * r - r * (7 / 8) ** n, _close(link.srtt, 2 * r - r * (7 / 8) ** n, 1e-6)))
+    results.append(('rttvar', link.rttvar, rttvar, _close(link.rttvar, rttvar, 1e-6)))
+    results.append(('rto', link.rto, srtt + 4 * rttvar, _close(link.rto, srtt + 4 * rttvar, 1e-6)))
+
+    # RFC 3550: 도착 간격 변화가 매번 D 이면 k 번 뒤 J = D * (1 - (15/16)^k)
+    link = LinkEstimator()
+    d, k = 0.004, 8
+    for seq in range(k + 1):
+        link.on_keepalive(seq * 0.01 + (d if seq % 2 else 0.0), seq=seq, timestamp=seq * 10)
+    expected = d * (1 - (15 / 16) ** k)
+    results.append(('jitter', link.jitter, expected, _close(link.jitter, expected, 0.01)))
+
+    # 10 개 중 하나씩 빠지는 시퀀스: 손실률 0.1 (window 감쇠 시점에 따라 한 주기 안에서 흔들림)
+    link = LinkEstimator()
+    for seq in range(400):
+        if seq % 10 != 9:
+            link.on_keepalive(0.0, seq=seq)
+    results.append(('loss', link.loss_rate, 0.1, _close(link.loss_rate, 0.1, 0.15)))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=400)
+    parser.add_argument('--interval-ms', type=float, default=10.0)
+    parser.add_argument('--delay-ms', type=float, default=20.0)
+    parser.add_argument('--jitter-ms', type=float, default=10.0)
+    parser.add_argument('--loss', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    delay, jitter = args.delay_ms / 1000, args.jitter_ms / 1000
+    failed = False
+    for codec in (JSON_CODEC, BINARY_CODEC):
+        link, reference_link, dropped = asyncio.run(run(codec, args.count, args.interval_ms / 1000, delay,
+                                                        jitter, args.loss, args.seed))
+        print(f"[{codec.name}] {link.stats()}")
+        for name, value, expected, ok in check(link, reference_link, dropped):
+            failed |= not ok
+            print(f"  {name:<7} estimated {value:.4f}  expected {expected:.4f}  {'ok' if ok else 'FAIL'}")
+    print("[gains]")
+    for name, value, expected, ok in check_gains():
+        failed |= not ok
+        print(f"  {name:<7} estimated {value:.6f}  expected {expected:.6f}  {'ok' if ok else 'FAIL'}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""매크로 엔진 점검: 설정 컴파일, 실행 결과, 취소, 실행 중 다른 입력 비차단
+
+macros.json 을 컴파일하고 FakeInputBackend 위의 실제 InputInjector 스레드로
+매크로를 실행하여
+
+- 컴파일/실행 준비 시간 (매개변수 확장 포함)
+- 주입된 이벤트가 정의와 같은지 (goto_slide, restart_presentation)
+- 지연 중인 매크로가 다른 클라이언트의 포인터 이동/키를 막지 않는지
+- 긴 텍스트 입력 매크로를 취소하면 남은 단계가 주입되지 않는지
+- 매크로 move 뒤 상대 이동이 이전 추적 위치가 아니라 매크로가 옮긴 위치에서 이어지는지
+  (FakeInputBackend 위의 RemoteControlServer 포인터 경로)
+- 잘못된 설정/인자가 거부되는지
+
+를 확인하고, 실패하면 0이 아닌 코드로 종료한다.
+
+    python benchmarks/check_macros.py [--config macros.json] [--iterations 10000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from input_injector import FakeInputBackend, InputInjector
+from macros import MacroError, MacroLibrary, MacroRunner
+
+SCREEN = (1920, 1080)
+PRESENTER = ('10.0.0.2', 50000)
+OTHER = ('10.0.0.3', 50000)
+
+def _rejects(func) -> bool:
+    try:
+        func()
+    except MacroError:
+        return True
+    return False
+
+async def _wait(runner: MacroRunner, owner: tuple, timeout: float = 5.0):
+    run = runner.running.get(owner)
+    if run is not None:
+        await asyncio.wait_for(asyncio.shield(run.task), timeout)
+
+async def run_checks(library: MacroLibrary) -> list:
+    backend = FakeInputBackend(SCREEN)
+    injector = InputInjector(backend)
+    finished = []
+    runner = MacroRunner(library, injector, on_finished=finished.append)
+    injector.start()
+    checks = []
+    try:
+        # 매개변수 텍스트 + 키
+        runner.start(PRESENTER, 'goto_slide', {'n': 42})
+        await _wait(runner, PRESENTER)
+        checks.append(('goto_slide events', backend.events == [('write', '42'), ('key', 'enter')]))
+
+        # 지연이 있는 매크로 실행 중 다른 클라이언트 입력
+        backend.events.clear()
+        started = time.monotonic()
+        runner.start(PRESENTER, 'restart_presentation')
+        await asyncio.sleep(0.05)
+        injector.submit_move(10, 20)
+        injector.submit_key('right')
+        await asyncio.sleep(0.05)
+        during = list(backend.events)
+        await _wait(runner, PRESENTER)
+        elapsed = time.monotonic() - started
+        # 이산 이벤트는 원래대로 포인터 이동보다 먼저 처리됨
+        checks.append(('input during macro delay', during[0] == ('key', 'esc')
+                       and sorted(during[1:]) == [('key', 'right'), ('move', 10, 20)]))
+        checks.append(('restart_presentation events', backend.events[-1] == ('key', 'f5') and elapsed >= 0.3))
+
+        # 한 클라이언트에 하나만, 다른 클라이언트는 동시에 실행 가능
+        runner.start(PRESENTER, 'restart_presentation')
+        checks.append(('one run per client', _rejects(lambda: runner.start(PRESENTER, 'black_screen'))))
+        runner.start(OTHER, 'black_screen')
+        await _wait(runner, OTHER)
+        checks.append(('other client runs concurrently', backend.events[-1] == ('key', 'b')
+                       and PRESENTER in runner.running))
+        runner.cancel(PRESENTER)
+        await asyncio.sleep(0.01)
+        checks.append(('cancel during delay', finished[-1].status == 'cancelled'
+                       and backend.events.count(('key', 'f5')) == 1))
+
+        # 긴 텍스트 입력 취소: 주입 스레드를 느리게 하여 중간에 취소
+        backend.events.clear()
+        write = backend.write
+        backend.write = lambda text: (time.sleep(0.005), write(text))
+        runner.start(PRESENTER, 'type_note', {'text': 'x' * 200})
+        await asyncio.sleep(0.03)
+        runner.cancel(PRESENTER)
+        await asyncio.sleep(0.05)
+        backend.write = write
+        typed = sum(len(event[1]) for event in backend.events if event[0] == 'write')
+        checks.append((f'cancel mid-text ({typed}/200 chars typed)', 0 < typed < 200
+                       and finished[-1].status == 'cancelled'))
+
+        checks.append(('bad args rejected', all(_rejects(call) for call in (
+            lambda: runner.start(PRESENTER, 'goto_slide', {'n': 0}),
+            lambda: runner.start(PRESENTER, 'goto_slide', {}),
+            lambda: runner.start(PRESENTER, 'goto_slide', {'n': 1, 'x': 2}),
+            lambda: runner.start(PRESENTER, 'type_note', {'text': 'é'}),
+            lambda: runner.start(PRESENTER, 'missing'),
+        ))))
+    finally:
+        runner.cancel_all()
+        injector.stop()
+    print(f"  runner {runner.stats()}, injector {injector.stats()}")
+    return checks
+
+async def check_pointer_resync() -> list:
+    from frame_pipeline import FakeScreenSource
+    from remote_server import RemoteControlServer
+
+    backend = FakeInputBackend(SCREEN)
+    server = RemoteControlServer(input_backend=backend, screen_source=FakeScreenSource(), recording_dir=None)
+    server.macros = server.macro_runner.library = MacroLibrary.compile(
+        {'macros': {'corner': {'steps': [{'move': 0.25, 'y': 0.25}]}}}, SCREEN)
+    server.input_injector.start()
+    try:
+        move = lambda seq, dx: server.pointer_pipeline.submit(
+            PRESENTER, {'type': 'mouse_move_relative', 'seq': seq, 'dx': dx, 'dy': 0}, None)
+        move(1, 200)
+        await asyncio.sleep(0.05)
+        server.macro_runner.start(PRESENTER, 'corner')
+        await _wait(runner=server.macro_runner, owner=PRESENTER)
+        target = backend.position()
+        backend.events.clear()
+        move(2, 5)
+        await asyncio.sleep(0.3)
+        moves = [event[1:] for event in backend.events if event[0] == 'move']
+    finally:
+        server.pointer_pipeline.cancel()
+        server.motion_engine.cancel()
+        server.input_injector.stop()
+    # 이전 위치(화면 중앙 + 200)로 미끄러져 돌아가지 않고 매크로 위치 근처에서만 움직임
+    return [('relative move after macro move', bool(moves) and all(
+        abs(x - target[0]) <= 20 and abs(y - target[1]) <= 20 for x, y in moves))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--config', default=os.path.join(ROOT, 'macros.json'))
+    parser.add_argument('--iterations', type=int, default=10000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    library = MacroLibrary.load(args.config, SCREEN)
+    compile_ms = (time.perf_counter() - start) * 1000
+    macro = library.get('goto_slide')
+    start = time.perf_counter()
+    for n in range(args.iterations):
+        macro.expand({'n': n % 9999 + 1})
+    expand_us = (time.perf_counter() - start) / args.iterations * 1e6
+    print(f"compiled {len(library)} macros in {compile_ms:.2f} ms, goto_slide expand {expand_us:.2f} us")
+
+    checks = asyncio.run(run_checks(library))
+    checks += asyncio.run(check_pointer_resync())
+    checks.append(('invalid config rejected', all(_rejects(lambda config=config: MacroLibrary.compile(config, SCREEN, {'a'}))
+                                                  for config in (
+        {'macros': {'m': {'steps': [{'key': 'nope'}]}}},
+        {'macros': {'m': {'steps': [{'text': '{undeclared}'}]}}},
+        {'macros': {'m': {'steps': [{'delay': 60}]}}},
+        {'macros': {'m': {'steps': [{'key': 'a', 'hotkey': ['a']}]}}},
+        {'macros': {'m': {'steps': []}}},
+    ))))
+
+    failed = False
+    for label, ok in checks:
+        failed |= not ok
+        print(f"  {label}: {'ok' if ok else 'FAIL'}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""포인터 모션 엔진 점검: 합성 이동 궤적을 흔들리는 60Hz 패킷으로 보내 120Hz 출력 비교
+
+가상 시계에서 실제 궤적(원, 지그재그, 직선 후 정지)을 60Hz 로 샘플링하고 고정
+지연 + 정규 분포 지터 + 가끔 늦게 도착하는 패킷을 넣어 PointerMotionEngine 에
+전달한다. 기존 동작(도착한 위치를 그대로 주입)과 같은 120Hz 틱에서 비교하여
+
+- 지연: 출력과 지연된 실제 궤적의 RMS 오차가 최소가 되는 시간 차이
+- 오차: 그 지연에서의 RMS 오차 (계단/떨림 정도)
+- 저크: 틱 간 2차 차분의 RMS (매끄러움)
+- 정지 틱: 이동 중인데 출력이 그대로인 틱 비율
+
+을 출력하고, 엔진이 더 매끄럽지 않거나 지연이 --max-added-latency-ms 보다 많이
+늘거나, 멈추는 궤적에서 정지 지점을 정지 직전 속도 x prediction 보다 더 지나치거나
+(dead reckoning 상한), 정지 후 목표 위치에 정확히 멈추지 않으면 0이 아닌 코드로
+종료한다. 특정 지터 표본에 맞춘 통과가 아니도록 --seed 부터 --seeds 개 난수열 모두
+통과해야 한다.
+
+    python benchmarks/check_pointer_motion.py [--jitter-ms 4] [--late 0.05] [--seed 3] [--seeds 5]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pointer_motion import PointerMotionEngine
+
+SCREEN = (1920, 1080)
+INPUT_HZ = 60.0
+OUTPUT_HZ = 120.0
+
+def circle(t):
+    return 960 + 300 * math.cos(math.pi * t), 540 + 300 * math.sin(math.pi * t)
+
+def zigzag(t):
+    # 0.5초마다 방향이 바뀌는 삼각파 (급격한 방향 전환)
+    phase = (t * 2) % 2
+    return 400 + 800 * (phase if phase < 1 else 2 - phase), 540 + 100 * math.sin(3 * t)
+
+def fling(t):
+    # 1초 동안 등속 이동 후 정지
+    return 300 + 1000 * min(t, 1.0), 300 + 400 * min(t, 1.0)
+
+# 이름: (궤적, 길이, 정지 시각 또는 None)
+TRAJECTORIES = {'circle': (circle, 2.0, None), 'zigzag': (zigzag, 2.0, None), 'fling': (fling, 1.5, 1.0)}
+
+def packets(path, duration: float, delay: float, jitter: float, late: float, rng: random.Random):
+    """(도착 시각, 송신 시각, x, y), 도착 순서대로 (역순 패킷은 병합 단계처럼 폐기)"""
+    sent = []
+    for k in range(int(duration * INPUT_HZ) + 1):
+        t = k / INPUT_HZ
+        arrival = t + delay + abs(rng.gauss(0, jitter))
+        if rng.random() < late:
+            arrival += rng.uniform(0.02, 0.04)
+        sent.append((arrival, t) + path(t))
+    arrived = []
+    newest = -1.0
+    for packet in sorted(sent):
+        if packet[1] > newest:
+            newest = packet[1]
+            arrived.append(packet)
+    return arrived
+
+def simulate(arrived, duration: float, engine: bool, **options):
+    """120Hz 틱마다 (시각, 주입 위치) 목록"""
+    outputs = []
+    position = [None]
+
+    def move_to(x, y, received_at):
+        position[0] = (x, y)
+
+    motion = PointerMotionEngine(move_to, SCREEN, rate=OUTPUT_HZ, **options)
+    index = 0
+    ticks = int((duration + 0.5) * OUTPUT_HZ)
+    for i in range(ticks):
+        now = i / OUTPUT_HZ
+        while index < len(arrived) and arrived[index][0] <= now:
+            arrival, _, x, y = arrived[index]
+            if engine:
+                motion.update(x, y, arrival, now=arrival)
+            else:
+                position[0] = (int(x), int(y))
+            index += 1
+        if engine:
+            motion.step(now)
+        if position[0] is not None:
+            outputs.append((now, position[0]))
+    return outputs, motion
+
+def measure(outputs, path, duration: float) -> dict:
+    window = [(t, p) for t, p in outputs if 0.1 <= t <= duration]
+
+    def rms_at(shift):
+        total = 0.0
+        for t, (x, y) in window:
+            ex, ey = path(t - shift)
+            total += (x - ex) ** 2 + (y - ey) ** 2
+        return math.sqrt(total / len(window))
+
+    shifts = [i / 2000 for i in range(0, 161)]  # 0 ~ 80ms, 0.5ms 간격
+    errors = [(rms_at(shift), shift) for shift in shifts]
+    error, latency = min(errors)
+
+    points = [p for _, p in window]
+    jerk = math.sqrt(sum(
+        (a[0] - 2 * b[0] + c[0]) ** 2 + (a[1] - 2 * b[1] + c[1]) ** 2
+        for a, b, c in zip(points, points[1:], points[2:])) / max(1, len(points) - 2))
+    stalled = sum(a == b for a, b in zip(points, points[1:])) / max(1, len(points) - 1)
+    return {'latency_ms': latency * 1000, 'error_px': error, 'jerk': jerk, 'stalled': stalled}
+
+def overshoot(outputs, path, stop: float):
+    """(정지 지점을 이동 방향으로 지나친 최대 거리 px, 정지 직전 속도 px/s)"""
+    dt = 0.01
+    (x0, y0), (x1, y1) = path(stop - dt), path(stop)
+    distance = math.hypot(x1 - x0, y1 - y0)
+    ux, uy = (x1 - x0) / distance, (y1 - y0) / distance
+    past = max((x - x1) * ux + (y - y1) * uy for _, (x, y) in outputs)
+    return max(0.0, past), distance / dt
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--delay-ms', type=float, default=10.0)
+    parser.add_argument('--jitter-ms', type=float, default=4.0)
+    parser.add_argument('--late', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=3)
+    parser.add_argument('--seeds', type=int, default=5)
+    parser.add_argument('--max-added-latency-ms', type=float, default=10.0)
+    args = parser.parse_args()
+
+    failed = False
+    runs = [(name, seed) for seed in range(args.seed, args.seed + args.seeds) for name in TRAJECTORIES]
+    for name, seed in runs:
+        path, duration, stop = TRAJECTORIES[name]
+        rng = random.Random(seed)
+        arrived = packets(path, duration, args.delay_ms / 1000, args.jitter_ms / 1000, args.late, rng)
+        raw_outputs, _ = simulate(arrived, duration, engine=False)
+        engine_outputs, engine = simulate(arrived, duration, engine=True)
+        raw = measure(raw_outputs, path, duration)
+        smooth = measure(engine_outputs, path, duration)
+
+        final_target = tuple(int(v) for v in arrived[-1][2:])
+        checks = [
+            ('smoother', smooth['jerk'] < raw['jerk'] * 0.5),
+            ('fewer stalled ticks', smooth['stalled'] < raw['stalled']),
+            ('latency', smooth['latency_ms'] <= raw['latency_ms'] + args.max_added_latency_ms),
+            ('settles on target', engine_outputs[-1][1] == final_target),
+        ]
+        if stop is not None:
+            past, speed = overshoot(engine_outputs, path, stop)
+            # 정수 좌표 반올림 1 px 허용
+            checks.append((f'overshoot {past:.1f} px <= {speed * engine.prediction:.1f} px',
+                           past <= speed * engine.prediction + 1))
+        print(f"[{name} seed {seed}] {len(arrived)} packets, engine {engine.stats()}")
+        for label, stats in (('raw', raw), ('engine', smooth)):
+            print(f"  {label:<6} latency {stats['latency_ms']:5.1f} ms  error {stats['error_px']:6.2f} px  "
+                  f"jerk {stats['jerk']:6.2f}  stalled {stats['stalled']:.1%}")
+        for label, ok in checks:
+            failed |= not ok
+            print(f"  {label}: {'ok' if ok else 'FAIL'}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
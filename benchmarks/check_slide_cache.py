@@ -0,0 +1,120 @@
+"""슬라이드 감지/캐시 점검: 지각 해시 구분력, 해시 vs 인코딩 비용, LRU 메모리 상한
+
+합성 텍스트 슬라이드(같은 레이아웃 템플릿)로
+
+- 같은 슬라이드의 변형(JPEG 압축 잡음, 레이저 점, 커서 크기 변화)은 threshold 이하인지
+- 서로 다른 슬라이드는 threshold 를 넘는지 (최소 거리 출력)
+- 지각 해시 계산 시간과 썸네일/원본 JPEG 인코딩 시간
+- 앞뒤로 오가는 탐색에서 인코딩은 새 슬라이드에만 일어나고, 메모리 상한을 지키며,
+  최근에 다시 본 슬라이드가 제거되지 않는지
+
+를 확인하고, 실패하면 0이 아닌 코드로 종료한다.
+
+    python benchmarks/check_slide_cache.py [--slides 40] [--cap-slides 12] [--threshold 10]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_frame_diff import slide_frame
+from frame_codecs import encode_frame, perceptual_hash
+from frame_pipeline import CapturedFrame, FakeScreenShot
+from slide_cache import SlideCache, hamming_distance
+
+WIDTH, HEIGHT = 1920, 1080
+
+def captured(bgra: np.ndarray) -> CapturedFrame:
+    return CapturedFrame(FakeScreenShot(bgra.tobytes(), bgra.shape[1], bgra.shape[0]), 0, 0.0)
+
+def jpeg_roundtrip(bgra: np.ndarray, quality: int = 50) -> np.ndarray:
+    buffer = io.BytesIO()
+    Image.fromarray(bgra[:, :, 2::-1].copy()).save(buffer, format='JPEG', quality=quality)
+    rgb = np.asarray(Image.open(io.BytesIO(buffer.getvalue())).convert('RGB'))
+    out = np.empty_like(bgra)
+    out[:, :, :3] = rgb[:, :, ::-1]
+    out[:, :, 3] = 255
+    return out
+
+def variants(bgra: np.ndarray) -> list:
+    laser = bgra.copy()
+    laser[500:516, 900:916, :3] = (0, 0, 255)
+    pointer = bgra.copy()
+    pointer[300:332, 1200:1220, :3] = 0
+    return [jpeg_roundtrip(bgra), laser, pointer]
+
+def _ms(func, repeat: int = 10) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, default=40)
+    parser.add_argument('--cap-slides', type=int, default=12, help='memory cap expressed in slides')
+    parser.add_argument('--threshold', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    slides = [slide_frame(rng, HEIGHT, WIDTH) for _ in range(args.slides)]
+    frames = [captured(slide) for slide in slides]
+    hashes = [perceptual_hash(frame) for frame in frames]
+
+    same = [hamming_distance(hashes[i], perceptual_hash(captured(variant)))
+            for i in range(min(10, args.slides)) for variant in variants(slides[i])]
+    different = [hamming_distance(a, b) for i, a in enumerate(hashes) for b in hashes[i + 1:]]
+    print(f"hamming distance: same slide max {max(same)}, different slides min {min(different)} "
+          f"(threshold {args.threshold}, 256-bit hash)")
+
+    frame = frames[0]
+    hash_ms = _ms(lambda: perceptual_hash(frame))
+    thumb_ms = _ms(lambda: encode_frame(frame, 70, 320 / WIDTH, 'jpeg'))
+    full_ms = _ms(lambda: encode_frame(frame, 85, 1.0, 'jpeg'))
+    print(f"perceptual hash {hash_ms:.2f} ms, thumbnail {thumb_ms:.2f} ms, full JPEG {full_ms:.2f} ms")
+
+    # 앞으로 끝까지, 처음 몇 장으로 돌아갔다가, 다시 앞으로 (재방문은 인코딩 없음)
+    encoded = {i: (encode_frame(f, 70, 320 / WIDTH, 'jpeg'), encode_frame(f, 85, 1.0, 'jpeg'))
+               for i, f in enumerate(frames)}
+    per_slide = max(len(thumb) + len(full) for thumb, full in encoded.values())
+    cache = SlideCache(max_bytes=per_slide * args.cap_slides, threshold=args.threshold)
+    path = list(range(args.slides)) + list(range(args.slides - 1, args.slides - 6, -1)) + \
+        list(range(args.slides - 5, args.slides))
+    encodes = 0
+    peak = 0
+    for index in path:
+        entry = cache.match(hashes[index])
+        if entry is None:
+            encodes += 1
+            thumb, full = encoded[index]
+            cache.add(hashes[index], (WIDTH, HEIGHT), thumb, full)
+        else:
+            cache.touch(entry)
+        peak = max(peak, cache.nbytes)
+    recent = {cache.match(hashes[index]) is not None for index in path[-args.cap_slides // 2:]}
+    print(f"navigation of {len(path)} steps: {encodes} encodes, peak {peak / 1024 / 1024:.1f} MiB "
+          f"(cap {cache.max_bytes / 1024 / 1024:.1f} MiB), {cache.stats()}")
+
+    checks = [
+        ('variants of a slide match', max(same) <= args.threshold),
+        ('different slides do not match', min(different) > args.threshold),
+        ('hash cheaper than thumbnail encode', hash_ms < thumb_ms),
+        ('revisits are not re-encoded', encodes == args.slides),
+        ('memory cap respected', peak <= cache.max_bytes),
+        ('recently shown slides kept', recent == {True}),
+    ]
+    failed = False
+    for label, ok in checks:
+        failed |= not ok
+        print(f"  {label}: {'ok' if ok else 'FAIL'}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
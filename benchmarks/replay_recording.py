@@ -0,0 +1,163 @@
+"""세션 기록 도구: 기록 요약, 키프레임 내보내기, 프로토콜 핸들러로 입력 재생
+
+RemoteControlServer(recording_dir=...) 또는 Constants.RECORDING_DIR 로 남긴 기록
+디렉터리를 읽는다.
+
+- info: 세그먼트/프레임/키프레임/입력/클라이언트 수와 기록 길이
+- export: 색인의 키프레임을 이미지 파일로 저장 (--at 초를 주면 그 시점 화면 한 장)
+- replay: 프로세스 안의 RemoteControlServer(FakeInputBackend, FakeScreenSource,
+  가짜 전송)에 JOIN 레코드로 클라이언트를 인증시키고 INPUT 데이터그램을
+  UDPServerProtocol.datagram_received 로 기록 시각에 맞춰 다시 넣는다.
+  --speed 2 는 두 배속, 0 은 기다리지 않고 최대한 빠르게.
+  처리량, 주입된 입력 이벤트 수, 오류 수를 출력하고 오류가 있으면 0이 아닌 코드로 종료한다.
+
+    python benchmarks/replay_recording.py info DIR
+    python benchmarks/replay_recording.py export DIR --out frames/ [--at 12.5]
+    python benchmarks/replay_recording.py replay DIR [--speed 1.0] [--verbose]
+"""
+import argparse
+import asyncio
+import collections
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_recorder import KIND_INPUT, KIND_JOIN, KIND_LEAVE, RecordingReader
+
+class NullTransport:
+    """서버가 보내는 데이터그램을 세기만 하는 전송"""
+
+    def __init__(self):
+        self.sent = 0
+        self.bytes_sent = 0
+
+    def sendto(self, data, addr):
+        self.sent += 1
+        self.bytes_sent += len(data)
+
+    def get_extra_info(self, name, default=None):
+        return default
+
+    def close(self):
+        pass
+
+def info(args):
+    reader = RecordingReader(args.directory)
+    for key, value in reader.summary().items():
+        print(f"{key}: {value}")
+
+def export(args):
+    reader = RecordingReader(args.directory)
+    os.makedirs(args.out, exist_ok=True)
+    if args.at is not None:
+        found = reader.keyframe_at(args.at)
+        if found is None:
+            sys.exit(f"No keyframe before {args.at}s")
+        entries = [found]
+    else:
+        entries = [(entry, reader.keyframe_data(entry)) for entry in reader.keyframes()]
+    for entry, data in entries:
+        path = os.path.join(args.out, f'keyframe-{entry.t:010.3f}.{entry.codec}')
+        with open(path, 'wb') as f:
+            f.write(data)
+    print(f"Wrote {len(entries)} keyframes to {args.out}")
+
+async def _replay(args) -> dict:
+    from frame_pipeline import FakeScreenSource
+    from input_injector import FakeInputBackend
+    from remote_server import RemoteControlServer, UDPServerProtocol
+
+    backend = FakeInputBackend()
+    server = RemoteControlServer(input_backend=backend, screen_source=FakeScreenSource(), recording_dir=None)
+    server.input_injector.start()
+    transport = NullTransport()
+    server.transport, server.protocol = transport, UDPServerProtocol(server)
+    server.protocol.connection_made(transport)
+    server.frame_sender.transport = transport
+    server.cursor.transport = server.protocol.transport
+
+    # 기록된 세션 ID -> 재생 서버의 세션 (처음 본 세션은 기본 세션)
+    sessions = {}
+    reader = RecordingReader(args.directory)
+    started = time.perf_counter()
+    inputs = 0
+    for record in reader.records((KIND_JOIN, KIND_INPUT, KIND_LEAVE)):
+        if args.speed > 0:
+            delay = started + record.t / args.speed - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        addr = (f'replay-{record.source}', record.source)
+        if record.kind == KIND_JOIN:
+            joined = json.loads(record.data)
+            session_id = joined.pop('session_id')
+            if session_id not in sessions:
+                sessions[session_id] = server.default_session if not sessions else server.sessions.create_session()
+            server.authenticate_client(addr, sessions[session_id], **joined)
+        elif record.kind == KIND_LEAVE:
+            server.remove_client(addr)
+        else:
+            server.protocol.datagram_received(record.data, addr)
+            inputs += 1
+        # 주입 큐/스트림 태스크가 진행할 기회
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+
+    await asyncio.sleep(0.1)
+    for client in server.sessions.clients():
+        server.stop_streaming(client.address)
+    server.pointer_pipeline.cancel()
+    server.motion_engine.cancel()
+    server.macro_runner.cancel_all()
+    server.input_injector.stop()
+    if server._frame_pipeline is not None:
+        server._frame_pipeline.shutdown()
+    return {
+        'elapsed': elapsed,
+        'inputs': inputs,
+        'sessions': len(sessions),
+        'injected': collections.Counter(event[0] for event in backend.events),
+        'errors': {key[0]: value for key, value in server.metrics.errors.values().items()},
+        'sent': (transport.sent, transport.bytes_sent),
+    }
+
+def replay(args):
+    import logging
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    result = asyncio.run(_replay(args))
+    elapsed = result['elapsed']
+    print(f"replayed {result['inputs']} input datagrams from {result['sessions']} sessions in {elapsed:.2f}s "
+          f"({result['inputs'] / max(elapsed, 1e-9):,.0f}/s, speed {args.speed or 'max'})")
+    print(f"injected events: {dict(result['injected'])}")
+    print(f"server sent {result['sent'][0]} datagrams ({result['sent'][1] / 1024:.1f} KiB)")
+    errors = {key: value for key, value in result['errors'].items() if value}
+    print(f"errors: {errors or 'none'}")
+    sys.exit(1 if errors else 0)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('info')
+    command.add_argument('directory')
+    command.set_defaults(func=info)
+
+    command = commands.add_parser('export')
+    command.add_argument('directory')
+    command.add_argument('--out', required=True)
+    command.add_argument('--at', type=float, help='only the frame on screen at this many seconds')
+    command.set_defaults(func=export)
+
+    command = commands.add_parser('replay')
+    command.add_argument('directory')
+    command.add_argument('--speed', type=float, default=1.0, help='playback speed, 0 = as fast as possible')
+    command.add_argument('--verbose', action='store_true')
+    command.set_defaults(func=replay)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import logging
+import platform
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger('CaptureRegions')
+
+# 캡처 모드
+#   full: 모든 모니터를 합친 가상 화면 (mss monitors[0], 기존 동작)
+#   monitor: 특정 모니터 하나
+#   window: 현재 활성 창(프레젠테이션 창)의 사각형
+#   pointer: 포인터 주변을 zoom 배율로 확대한 영역
+CAPTURE_MODES = ('full', 'monitor', 'window', 'pointer')
+
+Region = Dict[str, int]
+
+def region_key(region: Optional[Region]) -> Optional[Tuple[int, int, int, int]]:
+    if region is None:
+        return None
+    return region['left'], region['top'], region['width'], region['height']
+
+def clamp_region(region: Region, bounds: Region) -> Optional[Region]:
+    """bounds 안으로 잘라낸 영역 (겹치지 않으면 None)"""
+    left = max(region['left'], bounds['left'])
+    top = max(region['top'], bounds['top'])
+    right = min(region['left'] + region['width'], bounds['left'] + bounds['width'])
+    bottom = min(region['top'] + region['height'], bounds['top'] + bounds['height'])
+    if right <= left or bottom <= top:
+        return None
+    return {'left': left, 'top': top, 'width': right - left, 'height': bottom - top}
+
+def read_monitors(screen_source=None) -> List[Region]:
+    """모니터 배치 (0번은 모든 모니터를 합친 가상 화면)
+
+    screen_source 가 없으면 mss 로 읽는다 (mss 만 import, numpy/PIL 은 필요 없음).
+    """
+    if screen_source is not None:
+        return [dict(monitor) for monitor in screen_source.monitors]
+    from mss import mss
+    with mss() as screen_capture:
+        return [{key: monitor[key] for key in ('left', 'top', 'width', 'height')}
+                for monitor in screen_capture.monitors]
+
+def monitor_at(monitors: List[Region], x: int, y: int) -> Region:
+    """좌표를 포함하는 모니터 (monitors[0] 은 전체 화면)"""
+    for monitor in monitors[1:]:
+        if (monitor['left'] <= x < monitor['left'] + monitor['width']
+                and monitor['top'] <= y < monitor['top'] + monitor['height']):
+            return monitor
+    return monitors[0]
+
+def pointer_region(monitors: List[Region], position: Tuple[int, int], zoom: float) -> Region:
+    """포인터를 중심으로 모니터 크기의 1/zoom 인 영역 (모니터 밖으로 나가지 않게 이동)"""
+    x, y = position
+    monitor = monitor_at(monitors, x, y)
+    zoom = max(1.0, zoom)
+    width = max(1, int(monitor['width'] / zoom))
+    height = max(1, int(monitor['height'] / zoom))
+    left = min(max(x - width // 2, monitor['left']), monitor['left'] + monitor['width'] - width)
+    top = min(max(y - height // 2, monitor['top']), monitor['top'] + monitor['height'] - height)
+    return {'left': left, 'top': top, 'width': width, 'height': height}
+
+def active_window_rect() -> Optional[Region]:
+    """활성 창의 화면 좌표 사각형 (지원하지 않는 플랫폼이면 None)"""
+    system = platform.system()
+    try:
+        if system == 'Windows':
+            import win32gui
+            hwnd = win32gui.GetForegroundWindow()
+            left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+            return {'left': left, 'top': top, 'width': right - left, 'height': bottom - top}
+
+        if system == 'Darwin':
+            import Quartz
+            windows = Quartz.CGWindowListCopyWindowInfo(
+                Quartz.kCGWindowListOptionOnScreenOnly | Quartz.kCGWindowListExcludeDesktopElements,
+                Quartz.kCGNullWindowID)
+            # 앞쪽 창부터 나열되므로 일반 레이어(0)의 첫 창이 활성 창
+            for window in windows:
+                if window.get('kCGWindowLayer') == 0:
+                    bounds = window['kCGWindowBounds']
+                    return {'left': int(bounds['X']), 'top': int(bounds['Y']),
+                            'width': int(bounds['Width']), 'height': int(bounds['Height'])}
+    except Exception as e:
+        logger.debug(f"Could not determine active window: {e}")
+    return None
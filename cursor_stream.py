@@ -0,0 +1,85 @@
+import logging
+from typing import Dict, Optional, Tuple
+
+from wire_protocol import BINARY_CODEC, JSON_CODEC
+
+class CursorPublisher:
+    """포인터/레이저 위치를 구독 클라이언트에 작은 메시지로 전송
+
+    프레임은 커서 없이 캡처하고 클라이언트가 마지막 프레임 위에 포인터를 직접
+    그리므로, 포인터가 움직일 때마다 화면 전체를 캡처/인코딩하지 않아도 된다.
+    위치는 모션 엔진이 주입하는 주기 그대로 보내며, 메시지는 코덱별로 한 번만
+    인코딩하여 모든 구독자에게 같은 바이트를 보낸다. seq 는 커서 스트림 자체
+    순번이므로 클라이언트는 더 오래된 seq 의 위치를 버리면 된다.
+    """
+
+    def __init__(self, transport=None):
+        self.logger = logging.getLogger('CursorPublisher')
+        self.transport = transport
+        self.subscribers: Dict[tuple, str] = {}  # 주소 -> 와이어 코덱 이름
+        self.seq = 0
+        self.position: Optional[Tuple[int, int]] = None
+        self.laser = False
+
+        # 통계
+        self.updates = 0
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.errors = 0
+
+    def subscribe(self, addr: tuple, codec: str):
+        """구독 시작 (알고 있는 위치가 있으면 바로 보내 다음 이동 전에도 그릴 수 있게 함)"""
+        self.subscribers[addr] = codec
+        if self.position is not None:
+            self._send(self._encode(codec), addr)
+
+    def unsubscribe(self, addr: tuple):
+        self.subscribers.pop(addr, None)
+
+    def _message(self) -> dict:
+        x, y = self.position
+        return {'type': 'cursor', 'seq': self.seq, 'x': x, 'y': y, 'laser': self.laser}
+
+    def _encode(self, codec: str) -> bytes:
+        message = self._message()
+        if codec == BINARY_CODEC.name:
+            data = BINARY_CODEC.encode(message, self.seq)
+            if data is not None:
+                return data
+        return JSON_CODEC.encode(message)
+
+    def _send(self, data: bytes, addr: tuple):
+        try:
+            self.transport.sendto(data, addr)
+            self.messages_sent += 1
+            self.bytes_sent += len(data)
+        except Exception as e:
+            self.errors += 1
+            self.logger.error(f"Error sending cursor to {addr}: {e}")
+
+    def publish(self, x: int, y: int, laser: bool = False):
+        """새 포인터 위치 (같은 위치/모드는 다시 보내지 않음)"""
+        position = (int(x), int(y))
+        if position == self.position and laser == self.laser:
+            return
+        self.position = position
+        self.laser = laser
+        self.seq += 1
+        self.updates += 1
+        if not self.subscribers or self.transport is None:
+            return
+        encoded: Dict[str, bytes] = {}
+        for addr, codec in self.subscribers.items():
+            data = encoded.get(codec)
+            if data is None:
+                data = encoded[codec] = self._encode(codec)
+            self._send(data, addr)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'updates': self.updates,
+            'messages_sent': self.messages_sent,
+            'bytes_sent': self.bytes_sent,
+            'errors': self.errors,
+            'subscribers': len(self.subscribers),
+        }
@@ -0,0 +1,211 @@
+import asyncio
+import collections
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Deque, Dict, List, Optional
+
+class TraceRecorder:
+    """고정 크기 링 버퍼에 구간(span)을 기록하고 Chrome trace 포맷으로 내보내는 기록기
+
+    시각은 time.perf_counter() 초 단위로 받는다. 오래된 구간은 덮어쓰므로 메모리
+    사용량이 일정하다. 비활성 상태에서는 서버가 기록기 자체를 None 으로 두므로
+    핫 패스 비용은 None 비교 한 번이다.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        self.capacity = capacity
+        self._spans: List[Optional[tuple]] = [None] * capacity
+        # 인젝터 스레드도 기록하므로 슬롯 번호는 GIL 아래 원자적인 count() 로 배정
+        self._counter = itertools.count()
+        self.recorded = 0
+        self._origin = time.perf_counter()
+        # 스레드가 아닌 비동기 작업(프레임 파이프라인 등)을 그릴 가상 트랙
+        self._tracks: Dict[str, int] = {}
+        # 이벤트 루프에서 처리 중인 메시지 (루프 정지 보고용)
+        self.current: Optional[str] = None
+
+    def track(self, name: str) -> int:
+        """이름 붙은 가상 트랙 ID (await 를 사이에 둔 구간이 루프 스레드 구간과 겹치지 않도록)"""
+        tid = self._tracks.get(name)
+        if tid is None:
+            tid = self._tracks[name] = len(self._tracks) + 1
+        return tid
+
+    def record(self, name: str, category: str, start: float, end: float,
+               args: Optional[Dict[str, Any]] = None, tid: Optional[int] = None):
+        n = next(self._counter)
+        self._spans[n % self.capacity] = (name, category, start, end, tid or threading.get_ident(), args)
+        self.recorded = n + 1
+
+    def spans(self) -> List[tuple]:
+        """오래된 순서의 기록된 구간"""
+        recorded = self.recorded
+        if recorded < self.capacity:
+            return [span for span in self._spans[:recorded] if span is not None]
+        head = recorded % self.capacity
+        return [span for span in self._spans[head:] + self._spans[:head] if span is not None]
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        pid = os.getpid()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        names.update({tid: name for name, tid in self._tracks.items()})
+        events = []
+        tids = set()
+        for name, category, start, end, tid, args in self.spans():
+            event = {
+                'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': tid,
+                'ts': round((start - self._origin) * 1e6, 3),
+                'dur': round((end - start) * 1e6, 3),
+            }
+            if args:
+                event['args'] = args
+            events.append(event)
+            tids.add(tid)
+        for tid in tids:
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                           'args': {'name': names.get(tid, str(tid))}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def dump(self, path: str) -> str:
+        """Chrome trace 파일로 저장 (chrome://tracing, Perfetto 에서 열기)"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+class TracingInputBackend:
+    """입력 백엔드 호출을 구간으로 기록하는 래퍼 (인젝터 스레드에서 실행)"""
+
+    def __init__(self, backend, tracer: TraceRecorder):
+        self.backend = backend
+        self.tracer = tracer
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def _traced(self, name: str, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.tracer.record(name, 'inject', start, time.perf_counter())
+
+    def move_to(self, x: int, y: int):
+        return self._traced('inject:move', self.backend.move_to, x, y)
+
+    def click(self, click_type: str, x: Optional[int] = None, y: Optional[int] = None):
+        return self._traced('inject:click', self.backend.click, click_type, x, y)
+
+    def press(self, key: str):
+        return self._traced('inject:key', self.backend.press, key)
+
+    def hotkey(self, *keys: str):
+        return self._traced('inject:hotkey', self.backend.hotkey, *keys)
+
+    def write(self, text: str):
+        return self._traced('inject:write', self.backend.write, text)
+
+class LoopStall:
+    __slots__ = ('started', 'duration', 'handler', 'stack')
+
+    def __init__(self, started: float, duration: float, handler: str, stack: List[str]):
+        self.started = started
+        self.duration = duration
+        self.handler = handler
+        self.stack = stack
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'duration_ms': round(self.duration * 1000, 2), 'handler': self.handler,
+                'stack': self.stack}
+
+class LoopStallMonitor:
+    """이벤트 루프 정지 감지기
+
+    루프에서 도는 하트비트 태스크가 깨어난 시각의 지연으로 정지 시간을 재고,
+    감시 스레드가 정지가 진행 중일 때 루프 스레드의 스택을 떠서 원인 코드를 찾는다.
+    """
+
+    def __init__(self, threshold: float = 0.05, tracer: Optional[TraceRecorder] = None,
+                 history: int = 64):
+        self.logger = logging.getLogger('LoopStallMonitor')
+        self.threshold = threshold
+        self.interval = threshold / 2
+        self.tracer = tracer
+        self.stalls: Deque[LoopStall] = collections.deque(maxlen=history)
+
+        self._beat = time.perf_counter()
+        self._suspect: Optional[tuple] = None  # (하트비트 시각, 처리 중 메시지, 스택)
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self):
+        self._loop_thread = threading.get_ident()
+        self._running = True
+        self._beat = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name='LoopStallWatchdog', daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _heartbeat(self):
+        try:
+            while self._running:
+                expected = time.perf_counter() + self.interval
+                self._beat = expected
+                await asyncio.sleep(self.interval)
+                lag = time.perf_counter() - expected
+                if lag > self.threshold:
+                    self._report(expected, lag)
+        except asyncio.CancelledError:
+            pass
+
+    def _watch(self):
+        while self._running:
+            time.sleep(self.interval)
+            beat = self._beat
+            if time.perf_counter() - beat <= self.threshold:
+                continue
+            suspect = self._suspect
+            if suspect is not None and suspect[0] == beat:
+                continue
+            # 정지 진행 중: 루프 스레드가 지금 실행 중인 코드 기록
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = []
+            if frame is not None:
+                stack = [f"{os.path.basename(entry.filename)}:{entry.lineno} {entry.name}"
+                         for entry in traceback.extract_stack(frame)[-8:]]
+            current = self.tracer.current if self.tracer else None
+            self._suspect = (beat, current, stack)
+
+    def _report(self, started: float, lag: float):
+        suspect = self._suspect
+        handler, stack = 'unknown', []
+        if suspect is not None and suspect[0] == started:
+            # 처리 중이던 메시지 타입과 정지 중 실행하던 가장 안쪽 코드
+            current, stack = suspect[1], suspect[2]
+            parts = (current, stack[-1] if stack else None)
+            handler = ' @ '.join(part for part in parts if part) or 'unknown'
+        stall = LoopStall(started, lag, handler, stack)
+        self.stalls.append(stall)
+        self.logger.warning(f"Event loop stalled for {lag * 1000:.1f} ms in {handler}")
+        if self.tracer is not None:
+            self.tracer.record('loop_stall', 'loop', started, started + lag, stall.to_dict())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'stalls': len(self.stalls),
+            'worst_ms': round(max((s.duration for s in self.stalls), default=0.0) * 1000, 2),
+            'recent': [stall.to_dict() for stall in list(self.stalls)[-5:]],
+        }
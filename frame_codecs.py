@@ -0,0 +1,97 @@
+import io
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from frame_formats import DEFAULT_CODEC, available_codecs
+
+class FrameCodec:
+    """PIL 기반 프레임 출력 포맷"""
+
+    def __init__(self, name: str, pil_format: str, mime: str, **save_options):
+        self.name = name
+        self.pil_format = pil_format
+        self.mime = mime
+        self.save_options = save_options
+
+    def available(self) -> bool:
+        return self.name in available_codecs()
+
+    def encode(self, img: Image.Image, quality: int) -> bytes:
+        buffer = io.BytesIO()
+        if self.pil_format == 'PNG':
+            # 무손실 포맷: quality 는 무시 (텍스트 위주 슬라이드용)
+            img.save(buffer, format='PNG', **self.save_options)
+        else:
+            img.save(buffer, format=self.pil_format, quality=quality, **self.save_options)
+        return buffer.getvalue()
+
+CODECS: Dict[str, FrameCodec] = {
+    'jpeg': FrameCodec('jpeg', 'JPEG', 'image/jpeg'),
+    'webp': FrameCodec('webp', 'WEBP', 'image/webp', method=0),
+    'png': FrameCodec('png', 'PNG', 'image/png', compress_level=1),
+}
+
+# 리사이즈 방식
+#   lanczos: 기존 방식, 가장 느리지만 품질 최고
+#   fast: 정수 배율이면 Image.reduce (박스 평균), 아니면 reducing_gap 을 둔 BILINEAR
+#   decimate: NumPy 스트라이드로 n 픽셀마다 하나씩 추출 (가장 빠름, 앨리어싱 있음)
+RESIZE_MODES = ('lanczos', 'fast', 'decimate')
+DEFAULT_RESIZE_MODE = 'fast'
+
+def scaled_size(size: Tuple[int, int], scale: float) -> Tuple[int, int]:
+    return int(size[0] * scale), int(size[1] * scale)
+
+def _integer_factor(scale: float) -> Optional[int]:
+    """1/scale 이 정수면 그 값"""
+    factor = round(1 / scale)
+    if factor >= 1 and abs(factor * scale - 1) < 1e-6:
+        return factor
+    return None
+
+def bgra_to_image(bgra: np.ndarray) -> Image.Image:
+    """BGRA 배열을 RGB 이미지로 변환 (채널 순서 변환은 PIL 디코더에서 처리)"""
+    height, width = bgra.shape[:2]
+    return Image.frombuffer('RGB', (width, height), np.ascontiguousarray(bgra), 'raw', 'BGRX', 0, 1)
+
+def resize_image(img: Image.Image, size: Tuple[int, int], mode: str) -> Image.Image:
+    if img.size == size:
+        return img
+    if mode == 'lanczos':
+        return img.resize(size, Image.LANCZOS)
+    factor = _integer_factor(size[0] / img.width)
+    if factor and img.width // factor == size[0] and img.height // factor == size[1]:
+        return img.reduce(factor)
+    return img.resize(size, Image.BILINEAR, reducing_gap=2.0)
+
+def downscale_frame(frame, scale: float, mode: str = DEFAULT_RESIZE_MODE) -> Image.Image:
+    """캡처 프레임을 출력 해상도 이미지로 변환"""
+    size = scaled_size(frame.size, scale)
+    if mode == 'decimate':
+        factor = _integer_factor(scale)
+        if factor:
+            return bgra_to_image(frame.bgra[::factor, ::factor][:size[1], :size[0]])
+        mode = 'fast'
+    return resize_image(frame.to_image(), size, mode)
+
+def encode_frame(frame, quality: int, scale: float, codec: str = DEFAULT_CODEC,
+                 resize_mode: str = DEFAULT_RESIZE_MODE) -> bytes:
+    """캡처 프레임 리사이즈 + 인코딩 (워커 스레드에서 실행)"""
+    return CODECS[codec].encode(downscale_frame(frame, scale, resize_mode), quality)
+
+def perceptual_hash(frame, hash_size: int = 16, dead_band: int = 2) -> int:
+    """프레임의 difference hash (dHash, hash_size² 비트, 워커 스레드에서 실행)
+
+    회색조로 (hash_size + 1) x hash_size 까지 줄인 뒤 가로로 이웃한 픽셀이 dead_band
+    보다 밝아지는지를 비트로 만든다. 압축 잡음/포인터 같은 작은 변화에는 몇 비트만
+    바뀌므로 해밍 거리로 같은 슬라이드인지 판단할 수 있다. 같은 템플릿의 텍스트
+    슬라이드도 구분되도록 흔히 쓰는 8x8(64비트) 대신 16x16(256비트)을 기본으로 한다.
+    슬라이드 배경처럼 밝기가 거의 같은 이웃은 압축 잡음만으로 대소가 뒤집히므로
+    dead_band 이하 차이는 0 으로 둔다 (없으면 같은 슬라이드 변형의 거리가 30 까지 커짐).
+    """
+    small = frame.bgra[::4, ::4]  # 해시 크기로 줄이기 전 1/16 로 추려 변환 비용 절감
+    img = bgra_to_image(small).convert('L').resize((hash_size + 1, hash_size), Image.BILINEAR)
+    pixels = np.asarray(img, dtype=np.int16)
+    bits = ((pixels[:, 1:] - pixels[:, :-1]) > dead_band).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
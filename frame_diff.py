@@ -0,0 +1,139 @@
+import struct
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from frame_codecs import CODECS, DEFAULT_CODEC, DEFAULT_RESIZE_MODE, resize_image
+
+# 델타 프레임 컨테이너: 매직(4B), 타일 수(2B), 출력 프레임 크기(2B x 2)
+# 이어서 타일마다 x, y, w, h (2B 씩), 이미지 길이(4B), 이미지 바이트
+# 타일 포맷은 인증 시 협상한 프레임 코덱, 키프레임은 컨테이너 없이 이미지 그대로 전송
+DELTA_MAGIC = b'DLT1'
+DELTA_HEADER = struct.Struct('!4sHHH')
+DELTA_TILE = struct.Struct('!HHHHI')
+
+Rect = Tuple[int, int, int, int]
+
+class TileDiffer:
+    """연속된 BGRA 캡처를 타일 단위로 비교하여 변경 영역 검출"""
+
+    def __init__(self, tile_size: int = 64, keyframe_interval: int = 120):
+        self.tile_size = tile_size
+        self.keyframe_interval = keyframe_interval
+        # 이전 프레임과 변경 마스크는 해상도가 바뀔 때만 새로 할당
+        self._previous: Optional[np.ndarray] = None
+        self._changed: Optional[np.ndarray] = None
+        self._frames_since_keyframe = 0
+        self._force_keyframe = True
+
+        # 통계
+        self.frames = 0
+        self.skipped = 0
+        self.keyframes = 0
+
+    def request_keyframe(self):
+        self._force_keyframe = True
+
+    def diff(self, bgra: np.ndarray) -> Tuple[List[Rect], bool]:
+        """(변경 사각형 목록, 키프레임 여부) 반환, 변경이 없으면 빈 목록"""
+        self.frames += 1
+        height, width = bgra.shape[:2]
+        # 픽셀당 4바이트를 uint32 하나로 비교하여 비교 연산 수를 1/4 로 줄임
+        current = np.ascontiguousarray(bgra).view(np.uint32).reshape(height, width)
+
+        previous = self._previous
+        keyframe = (
+            self._force_keyframe
+            or previous is None
+            or previous.shape != current.shape
+            or self._frames_since_keyframe >= self.keyframe_interval
+        )
+        if keyframe:
+            if previous is None or previous.shape != current.shape:
+                self._previous = current.copy()
+                self._changed = np.empty(current.shape, dtype=bool)
+            else:
+                np.copyto(previous, current)
+            self._force_keyframe = False
+            self._frames_since_keyframe = 0
+            self.keyframes += 1
+            return [(0, 0, width, height)], True
+
+        changed = np.not_equal(current, previous, out=self._changed)
+        tiles = self._changed_tiles(changed)
+        self._frames_since_keyframe += 1
+        if not tiles.any():
+            self.skipped += 1
+            return [], False
+
+        np.copyto(previous, current)
+        return self._merge_rows(tiles, width, height), False
+
+    def _changed_tiles(self, changed: np.ndarray) -> np.ndarray:
+        """픽셀 변경 마스크를 (타일 행, 타일 열) 불리언 격자로 축약
+
+        타일 크기로 나누어떨어지지 않는 가장자리는 패딩 복사 없이 따로 축약한다.
+        """
+        ts = self.tile_size
+        height, width = changed.shape
+        full_rows, full_cols = height // ts, width // ts
+        rem_h, rem_w = height - full_rows * ts, width - full_cols * ts
+        main_h, main_w = full_rows * ts, full_cols * ts
+
+        tiles = np.zeros((full_rows + bool(rem_h), full_cols + bool(rem_w)), dtype=bool)
+        tiles[:full_rows, :full_cols] = changed[:main_h, :main_w].reshape(
+            full_rows, ts, full_cols, ts).any(axis=(1, 3))
+        if rem_h:
+            tiles[full_rows, :full_cols] = changed[main_h:, :main_w].reshape(
+                rem_h, full_cols, ts).any(axis=(0, 2))
+        if rem_w:
+            tiles[:full_rows, full_cols] = changed[:main_h, main_w:].reshape(
+                full_rows, ts, rem_w).any(axis=(1, 2))
+        if rem_h and rem_w:
+            tiles[full_rows, full_cols] = changed[main_h:, main_w:].any()
+        return tiles
+
+    def _merge_rows(self, tiles: np.ndarray, width: int, height: int) -> List[Rect]:
+        """같은 행에서 이어진 변경 타일을 하나의 사각형으로 병합"""
+        ts = self.tile_size
+        rects = []
+        for row in np.flatnonzero(tiles.any(axis=1)):
+            line = tiles[row]
+            # 변경 구간의 시작/끝 열 인덱스
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], line.view(np.int8), [0]))))
+            y = int(row) * ts
+            h = min(ts, height - y)
+            for start, end in zip(edges[::2], edges[1::2]):
+                x = int(start) * ts
+                rects.append((x, y, min(int(end) * ts, width) - x, h))
+        return rects
+
+def scale_rect(rect: Rect, scale: float, size: Tuple[int, int]) -> Rect:
+    """원본 좌표 사각형을 출력 해상도로 변환 (이웃 타일과 경계가 맞도록 모두 내림)"""
+    x, y, w, h = rect
+    left, top = int(x * scale), int(y * scale)
+    right = min(size[0], max(left + 1, int((x + w) * scale)))
+    bottom = min(size[1], max(top + 1, int((y + h) * scale)))
+    return left, top, right - left, bottom - top
+
+def encode_tiles(img: Image.Image, rects: List[Rect], scale: float,
+                 size: Tuple[int, int], quality: int, codec: str = DEFAULT_CODEC,
+                 resize_mode: str = DEFAULT_RESIZE_MODE) -> List[Tuple[Rect, bytes]]:
+    """변경 사각형만 잘라 출력 해상도로 줄인 뒤 개별 압축"""
+    frame_codec = CODECS[codec]
+    tiles = []
+    for rect in rects:
+        x, y, w, h = rect
+        out_rect = scale_rect(rect, scale, size)
+        tile = resize_image(img.crop((x, y, x + w, y + h)), out_rect[2:], resize_mode)
+        tiles.append((out_rect, frame_codec.encode(tile, quality)))
+    return tiles
+
+def pack_delta_frame(size: Tuple[int, int], tiles: List[Tuple[Rect, bytes]]) -> bytes:
+    """변경 타일 JPEG 들을 하나의 델타 프레임 컨테이너로 묶음"""
+    parts = [DELTA_HEADER.pack(DELTA_MAGIC, len(tiles), size[0], size[1])]
+    for (x, y, w, h), data in tiles:
+        parts.append(DELTA_TILE.pack(x, y, w, h, len(data)))
+        parts.append(data)
+    return b''.join(parts)
@@ -0,0 +1,42 @@
+import importlib
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger('FrameFormats')
+
+# 협상 가능한 프레임 이미지 포맷 -> 필요한 PIL 확장 모듈 (None 이면 항상 사용 가능)
+# 인증 경로에서 쓰므로 numpy/PIL.Image 를 import 하지 않는다 (인코딩은 frame_codecs)
+FRAME_FORMATS: Dict[str, Optional[str]] = {
+    'jpeg': None,
+    'webp': 'PIL._webp',
+    'png': None,
+}
+DEFAULT_CODEC = 'jpeg'
+
+_available: Optional[List[str]] = None
+
+def available_codecs() -> List[str]:
+    """이 서버에서 인코딩할 수 있는 포맷 (확장 모듈 확인은 처음 한 번)"""
+    global _available
+    if _available is None:
+        _available = [name for name, module in FRAME_FORMATS.items()
+                      if module is None or _module_available(module)]
+    return _available
+
+def _module_available(module: str) -> bool:
+    try:
+        importlib.import_module(module)
+        return True
+    except ImportError as e:
+        logger.debug(f"{module} unavailable: {e}")
+        return False
+
+def negotiate_frame_codec(offered) -> str:
+    """클라이언트가 지원하는 포맷 중 서버에서 사용 가능한 첫 번째 포맷"""
+    if not isinstance(offered, (list, tuple)):
+        return DEFAULT_CODEC
+    available = available_codecs()
+    for name in offered:
+        if name in available:
+            return name
+    return DEFAULT_CODEC
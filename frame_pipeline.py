@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from mss import mss
+from PIL import Image
+
+from frame_codecs import DEFAULT_CODEC, DEFAULT_RESIZE_MODE, encode_frame, scaled_size
+from frame_diff import TileDiffer, encode_tiles, pack_delta_frame
+from capture_regions import Region, read_monitors, region_key
+
+class CapturedFrame:
+    """한 번의 화면 캡처 (여러 인코딩 요청이 공유, 읽기 전용)"""
+    __slots__ = ('screen', 'tick', 'captured_at', 'region')
+
+    def __init__(self, screen, tick: int, captured_at: float, region: Optional[tuple] = None):
+        self.screen = screen
+        self.tick = tick
+        self.captured_at = captured_at
+        self.region = region  # (left, top, width, height), None 이면 기본 모니터
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.screen.size
+
+    @property
+    def bgra(self) -> np.ndarray:
+        """원본 BGRA 버퍼를 복사 없이 참조하는 배열"""
+        return np.frombuffer(self.screen.raw, dtype=np.uint8).reshape(
+            self.screen.height, self.screen.width, 4)
+
+    def to_image(self) -> Image.Image:
+        # screen.rgb 로 BGRA->RGB 바이트를 따로 만들지 않고 원본 버퍼를 바로 디코드
+        return Image.frombuffer('RGB', self.screen.size, self.screen.raw, 'raw', 'BGRX', 0, 1)
+
+class FakeScreenShot:
+    """mss ScreenShot 과 같은 속성(raw, width, height, size)만 가진 캡처 결과"""
+    __slots__ = ('raw', 'width', 'height', 'size')
+
+    def __init__(self, raw: bytes, width: int, height: int):
+        self.raw = raw
+        self.width = width
+        self.height = height
+        self.size = (width, height)
+
+class FakeScreenSource:
+    """메모리 기반 가짜 화면 (헤드리스 테스트/벤치마크용)
+
+    캡처할 때마다 밝은 사각형이 옆으로 이동하므로 델타 인코딩에도 변경 타일이 생긴다.
+    """
+
+    def __init__(self, screen_size: Tuple[int, int] = (1920, 1080), block: int = 64):
+        width, height = screen_size
+        monitor = {'left': 0, 'top': 0, 'width': width, 'height': height}
+        # mss 와 같이 0번은 전체 가상 화면, 1번부터 개별 모니터
+        self.monitors = [dict(monitor), dict(monitor)]
+        self.block = block
+        self.grabs = 0
+
+    def grab(self, region: Region) -> FakeScreenShot:
+        width, height = region['width'], region['height']
+        pixels = np.full((height, width, 4), 48, dtype=np.uint8)
+        block = min(self.block, width, height)
+        x = (self.grabs * block) % max(1, width - block + 1)
+        pixels[:block, x:x + block, :3] = 255
+        self.grabs += 1
+        return FakeScreenShot(pixels.tobytes(), width, height)
+
+class FramePipeline:
+    """캡처/리사이즈/JPEG 인코딩을 워커 풀에서 수행하는 프레임 파이프라인
+
+    같은 프레임 간격(tick) 안에 들어온 요청은 캡처 한 번과, 같은 인코딩
+    파라미터라면 인코딩 결과 하나를 공유한다 (single-flight).
+    """
+
+    def __init__(self, max_workers: int = 2, cache_interval: float = 1 / 30,
+                 monitor_index: int = 0, screen_source=None):
+        self.logger = logging.getLogger('FramePipeline')
+        self.cache_interval = cache_interval
+        self.monitor_index = monitor_index
+        # grab(region) 과 monitors 를 제공하는 캡처 소스 (None 이면 mss)
+        self.screen_source = screen_source
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='FramePipeline')
+        # mss 핸들은 스레드 간 공유할 수 없으므로 워커 스레드마다 생성
+        self._local = threading.local()
+
+        self._captures: Dict[tuple, asyncio.Future] = {}
+        self._encodes: Dict[tuple, asyncio.Future] = {}
+        self._monitors: Optional[List[Region]] = None
+
+        # 통계
+        self.captures = 0
+        self.capture_hits = 0
+        self.encodes = 0
+        self.encode_hits = 0
+
+    def _grab(self, region: Optional[Region]):
+        screen_capture = self.screen_source or getattr(self._local, 'mss', None)
+        if screen_capture is None:
+            # 커서는 프레임에 넣지 않음 (클라이언트가 cursor 메시지로 직접 그림)
+            screen_capture = self._local.mss = mss(with_cursor=False)
+        return screen_capture.grab(region or screen_capture.monitors[self.monitor_index])
+
+    def monitors(self, refresh: bool = False) -> List[Region]:
+        """모니터 배치 (0번은 모든 모니터를 합친 가상 화면)"""
+        if self._monitors is None or refresh:
+            self._monitors = read_monitors(self.screen_source)
+        return self._monitors
+
+    def _current_tick(self) -> int:
+        return int(time.monotonic() / self.cache_interval)
+
+    def _evict(self, tick: int):
+        for key in [key for key in self._captures if key[0] < tick]:
+            del self._captures[key]
+        for key in [key for key in self._encodes if key[0] < tick]:
+            del self._encodes[key]
+
+    async def capture(self, region: Optional[Region] = None) -> CapturedFrame:
+        """현재 tick 의 캡처 (같은 영역의 진행 중이거나 완료된 캡처가 있으면 공유)
+
+        region 을 지정하면 그 영역만 캡처하므로 캡처/인코딩 비용이 영역 크기에 비례한다.
+        """
+        tick = self._current_tick()
+        key = (tick, region_key(region))
+        future = self._captures.get(key)
+        if future is not None:
+            self.capture_hits += 1
+            return await asyncio.shield(future)
+
+        self._evict(tick)
+        loop = asyncio.get_running_loop()
+        future = self._captures[key] = loop.run_in_executor(
+            self._executor,
+            lambda: CapturedFrame(self._grab(region), tick, time.monotonic(), key[1]))
+        self.captures += 1
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            self._captures.pop(key, None)
+            raise
+
+    async def encode(self, frame: CapturedFrame, quality: int, scale: float,
+                     codec: str = DEFAULT_CODEC, resize_mode: str = DEFAULT_RESIZE_MODE) -> bytes:
+        """전체 프레임 리사이즈 + 인코딩 (같은 캡처/파라미터 결과 공유)"""
+        key = (frame.tick, frame.region, quality, scale, codec, resize_mode)
+        future = self._encodes.get(key)
+        if future is not None:
+            self.encode_hits += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = self._encodes[key] = loop.run_in_executor(
+            self._executor, encode_frame, frame, quality, scale, codec, resize_mode)
+        self.encodes += 1
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            self._encodes.pop(key, None)
+            raise
+
+    async def run(self, func: Callable, *args):
+        """클라이언트별 상태가 필요한 작업(델타 인코딩 등)을 워커에서 실행"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'captures': self.captures,
+            'capture_hits': self.capture_hits,
+            'encodes': self.encodes,
+            'encode_hits': self.encode_hits,
+        }
+
+def encode_delta(differ: TileDiffer, frame: CapturedFrame, quality: int, scale: float,
+                 codec: str = DEFAULT_CODEC, resize_mode: str = DEFAULT_RESIZE_MODE
+                 ) -> Optional[Tuple[bool, bytes, List[tuple], Tuple[int, int]]]:
+    """클라이언트별 변경 영역 인코딩 (워커 스레드에서 실행)
+
+    (키프레임 여부, 페이로드, 타일 목록, 출력 크기) 반환, 변화가 없으면 None
+    """
+    rects, keyframe = differ.diff(frame.bgra)
+    if not rects:
+        return None
+
+    new_size = scaled_size(frame.size, scale)
+    if keyframe:
+        return True, encode_frame(frame, quality, scale, codec, resize_mode), [], new_size
+
+    tiles = encode_tiles(frame.to_image(), rects, scale, new_size, quality, codec, resize_mode)
+    return False, pack_delta_frame(new_size, tiles), tiles, new_size
@@ -0,0 +1,208 @@
+import asyncio
+import collections
+import logging
+import struct
+import time
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from wire_protocol import PROTOCOL_VERSION, Opcode
+
+# 청크 헤더: 버전(1B), 오프코드(1B), 프레임 ID(4B), 청크 인덱스(2B), 청크 수(2B)
+# 앞 6바이트는 wire_protocol.HEADER 와 같은 배치 (시퀀스 자리에 프레임 ID)
+CHUNK_HEADER = struct.Struct('!BBIHH')
+FRAME_ID_MODULO = 1 << 32
+MAX_CHUNKS = 0xFFFF
+
+class TokenBucket:
+    """바이트 단위 토큰 버킷 (부족분은 빚으로 두고 대기 시간 반환)"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+
+    def reserve(self, amount: int) -> float:
+        """amount 바이트를 예약하고 전송 전 대기해야 할 시간(초) 반환"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        self._tokens -= amount
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+def pack_chunks(buffer: bytearray, frame_id: int, data: bytes, chunk_size: int) -> List[memoryview]:
+    """송신 버퍼에 청크 헤더와 페이로드를 이어 쓰고 청크별 memoryview 반환
+
+    버퍼가 작으면 호출자가 더 큰 버퍼를 넘겨야 한다 (required_buffer_size 참고).
+    """
+    count = max(1, -(-len(data) // chunk_size))
+    if count > MAX_CHUNKS:
+        raise ValueError(f"Frame too large: {len(data)} bytes")
+
+    source = memoryview(data)
+    target = memoryview(buffer)
+    chunks = []
+    offset = 0
+    for index in range(count):
+        payload = source[index * chunk_size:(index + 1) * chunk_size]
+        end = offset + CHUNK_HEADER.size + len(payload)
+        CHUNK_HEADER.pack_into(buffer, offset, PROTOCOL_VERSION, Opcode.FRAME_CHUNK,
+                               frame_id, index, count)
+        target[offset + CHUNK_HEADER.size:end] = payload
+        chunks.append(target[offset:end])
+        offset = end
+    return chunks
+
+def required_buffer_size(data_size: int, chunk_size: int) -> int:
+    count = max(1, -(-data_size // chunk_size))
+    return data_size + count * CHUNK_HEADER.size
+
+def split_frame(frame_id: int, data: bytes, chunk_size: int) -> List[memoryview]:
+    """프레임을 MTU 크기 청크 데이터그램으로 분할 (새 버퍼 할당)"""
+    buffer = bytearray(required_buffer_size(len(data), chunk_size))
+    return pack_chunks(buffer, frame_id, data, chunk_size)
+
+class FrameSender:
+    """청크 분할 + 페이싱 프레임 송신기, NACK 선택 재전송 지원
+
+    청크는 재전송 보관 개수만큼의 송신 버퍼를 돌려 쓰며 기록하므로 프레임마다
+    청크 객체를 새로 만들지 않는다. 버퍼는 그 버퍼를 쓰던 프레임이 보관
+    목록에서 밀려난 뒤에만 재사용된다. 세션 시청자들에게 같은 프레임을 보낼
+    때는 청크를 한 번만 기록하고 모든 수신자가 공유한다.
+    """
+
+    def __init__(self, transport=None, chunk_size: int = 1200,
+                 rate: float = 4 * 1024 * 1024, burst: float = 64 * 1024,
+                 history: int = 8):
+        self.logger = logging.getLogger('FrameSender')
+        self.transport = transport
+        self.chunk_size = chunk_size
+        self.bucket = TokenBucket(rate, burst)
+        # frame_id -> (수신자 주소 집합, 청크 목록)
+        self._history: 'collections.OrderedDict[int, Tuple[Set[tuple], List[memoryview]]]' = collections.OrderedDict()
+        self._history_size = history
+        self._buffers = [bytearray() for _ in range(history)]
+        self._next_buffer = 0
+        self._next_frame_id = 0
+
+        # 통계
+        self.frames_sent = 0
+        self.chunks_sent = 0
+        self.chunks_retransmitted = 0
+        self.bytes_sent = 0
+
+    def allocate_frame_id(self) -> int:
+        frame_id = self._next_frame_id
+        self._next_frame_id = (frame_id + 1) % FRAME_ID_MODULO
+        return frame_id
+
+    async def send(self, addr: tuple, data: bytes, frame_id: Optional[int] = None) -> int:
+        """프레임 전송 후 프레임 ID 반환"""
+        return await self.broadcast([addr], data, frame_id)
+
+    async def broadcast(self, addrs: List[tuple], data: bytes,
+                        frame_id: Optional[int] = None) -> int:
+        """같은 프레임을 여러 수신자에게 전송 (청크 기록은 한 번, 청크 단위로 번갈아 송신)"""
+        if frame_id is None:
+            frame_id = self.allocate_frame_id()
+
+        self._history[frame_id] = (set(addrs), [])
+        while len(self._history) > self._history_size:
+            self._history.popitem(last=False)
+
+        slot = self._next_buffer
+        self._next_buffer = (slot + 1) % len(self._buffers)
+        needed = required_buffer_size(len(data), self.chunk_size)
+        if len(self._buffers[slot]) < needed:
+            # 기존 버퍼를 참조하는 memoryview 가 남아 있을 수 있으므로 크기 변경 대신 교체
+            self._buffers[slot] = bytearray(needed)
+        chunks = pack_chunks(self._buffers[slot], frame_id, data, self.chunk_size)
+        self._history[frame_id] = (set(addrs), chunks)
+
+        await self._send_chunks(frame_id, chunks, addrs)
+        self.frames_sent += len(addrs)
+        return frame_id
+
+    async def retransmit(self, addr: tuple, frame_id: int, missing: List[int]) -> int:
+        """NACK 로 보고된 청크만 재전송 (이미 만료된 프레임은 무시)"""
+        entry = self._history.get(frame_id)
+        if entry is None or addr not in entry[0]:
+            return 0
+        chunks = entry[1]
+        selected = [chunks[index] for index in missing if 0 <= index < len(chunks)]
+        await self._send_chunks(frame_id, selected, [addr])
+        self.chunks_retransmitted += len(selected)
+        return len(selected)
+
+    async def _send_chunks(self, frame_id: int, chunks: List[memoryview], addrs: List[tuple]):
+        for chunk in chunks:
+            delay = self.bucket.reserve(len(chunk) * len(addrs))
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if frame_id not in self._history:
+                # 대기 중에 보관 목록에서 밀려남: 송신 버퍼가 재사용되었을 수 있음
+                break
+            for addr in addrs:
+                self.transport.sendto(chunk, addr)
+            self.chunks_sent += len(addrs)
+            self.bytes_sent += len(chunk) * len(addrs)
+
+    def forget(self, addr: tuple):
+        for addrs, _ in self._history.values():
+            addrs.discard(addr)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'frames_sent': self.frames_sent,
+            'chunks_sent': self.chunks_sent,
+            'chunks_retransmitted': self.chunks_retransmitted,
+            'bytes_sent': self.bytes_sent,
+        }
+
+class FrameReassembler:
+    """수신 측 청크 재조립기 (클라이언트 구현 및 루프백 측정용)"""
+
+    def __init__(self, max_pending: int = 4):
+        self.max_pending = max_pending
+        # frame_id -> [청크 목록, 남은 청크 수, 첫 청크 수신 시각]
+        self._frames: 'collections.OrderedDict[int, list]' = collections.OrderedDict()
+        self._done: Deque[int] = collections.deque(maxlen=32)
+        self.completed = 0
+        self.abandoned = 0
+
+    def add(self, datagram: bytes) -> Optional[Tuple[int, bytes]]:
+        """청크 추가, 프레임이 완성되면 (frame_id, data) 반환"""
+        _, _, frame_id, index, count = CHUNK_HEADER.unpack_from(datagram)
+        if frame_id in self._done:
+            return None  # 완성 후 도착한 중복 재전송
+
+        entry = self._frames.get(frame_id)
+        if entry is None:
+            entry = self._frames[frame_id] = [[None] * count, count, time.monotonic()]
+            while len(self._frames) > self.max_pending:
+                self._frames.popitem(last=False)
+                self.abandoned += 1
+        chunks = entry[0]
+        if index >= len(chunks) or chunks[index] is not None:
+            return None
+
+        chunks[index] = datagram[CHUNK_HEADER.size:]
+        entry[1] -= 1
+        if entry[1]:
+            return None
+
+        del self._frames[frame_id]
+        self._done.append(frame_id)
+        self.completed += 1
+        return frame_id, b''.join(chunks)
+
+    def missing(self, min_age: float = 0.0) -> Dict[int, List[int]]:
+        """min_age 초 이상 미완성인 프레임별 누락 청크 인덱스 (NACK 페이로드)"""
+        deadline = time.monotonic() - min_age
+        return {
+            frame_id: [index for index, chunk in enumerate(entry[0]) if chunk is None]
+            for frame_id, entry in self._frames.items()
+            if entry[2] <= deadline
+        }
@@ -0,0 +1,340 @@
+import collections
+import logging
+import threading
+import time
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+class PyAutoGUIBackend:
+    """pyautogui 기반 OS 입력 백엔드"""
+
+    def __init__(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+        pyautogui.FAILSAFE = False
+        pyautogui.PAUSE = 0  # 기본값(0.1초)은 호출마다 sleep 을 추가함
+
+    def size(self) -> Tuple[int, int]:
+        return tuple(self._pyautogui.size())
+
+    def position(self) -> Tuple[int, int]:
+        return tuple(self._pyautogui.position())
+
+    def move_to(self, x: int, y: int):
+        self._pyautogui.moveTo(x, y, duration=0)
+
+    def click(self, click_type: str, x: Optional[int] = None, y: Optional[int] = None):
+        if click_type == 'double':
+            self._pyautogui.doubleClick(x=x, y=y)
+        elif click_type == 'right':
+            self._pyautogui.rightClick(x=x, y=y)
+        else:
+            self._pyautogui.click(x=x, y=y)
+
+    def press(self, key: str):
+        self._pyautogui.press(key)
+
+    def hotkey(self, *keys: str):
+        self._pyautogui.hotkey(*keys)
+
+    def write(self, text: str):
+        self._pyautogui.write(text)
+
+    def key_names(self):
+        """매크로 검증에 사용할 유효한 키 이름"""
+        return set(self._pyautogui.KEYBOARD_KEYS)
+
+class FakeInputBackend:
+    """메모리 기반 가짜 백엔드 (헤드리스 테스트/벤치마크용)"""
+
+    def __init__(self, screen_size: Tuple[int, int] = (1920, 1080)):
+        self._size = screen_size
+        self._position = (screen_size[0] // 2, screen_size[1] // 2)
+        self.events: List[tuple] = []
+
+    def size(self) -> Tuple[int, int]:
+        return self._size
+
+    def position(self) -> Tuple[int, int]:
+        return self._position
+
+    def move_to(self, x: int, y: int):
+        self._position = (x, y)
+        self.events.append(('move', x, y))
+
+    def click(self, click_type: str, x: Optional[int] = None, y: Optional[int] = None):
+        if x is not None and y is not None:
+            self._position = (x, y)
+        self.events.append(('click', click_type, self._position))
+
+    def press(self, key: str):
+        self.events.append(('key', key))
+
+    def hotkey(self, *keys: str):
+        self.events.append(('hotkey',) + keys)
+
+    def write(self, text: str):
+        self.events.append(('write', text))
+
+    def key_names(self):
+        return None  # 모든 키 이름 허용
+
+class LazyInputBackend:
+    """첫 호출 때 factory() 로 실제 백엔드를 만드는 래퍼
+
+    pyautogui import 와 화면 크기 조회를 서버 시작 경로에서 빼기 위해 사용한다.
+    여러 스레드(이벤트 루프, 인젝터, 워밍업)가 동시에 불러도 factory 는 한 번만
+    실행되고, on_load(backend) 는 첫 호출이 반환되기 전에 로드한 스레드에서 실행된다.
+    로드 실패는 기억해 두고 이후 호출에서 다시 발생시킨다 (매번 import 재시도 방지).
+    """
+
+    def __init__(self, factory: Callable[[], object], on_load: Optional[Callable[[object], None]] = None):
+        self._factory = factory
+        self._on_load = on_load
+        self._backend = None
+        self._error: Optional[Exception] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._backend is not None
+
+    def load(self):
+        backend = self._backend
+        if backend is not None:
+            return backend
+        with self._lock:
+            if self._backend is None:
+                if self._error is not None:
+                    raise self._error
+                try:
+                    backend = self._factory()
+                    if self._on_load is not None:
+                        self._on_load(backend)
+                except Exception as e:
+                    self._error = e
+                    raise
+                self._backend = backend
+            return self._backend
+
+    def size(self) -> Tuple[int, int]:
+        return self.load().size()
+
+    def position(self) -> Tuple[int, int]:
+        return self.load().position()
+
+    def move_to(self, x: int, y: int):
+        self.load().move_to(x, y)
+
+    def click(self, click_type: str, x: Optional[int] = None, y: Optional[int] = None):
+        self.load().click(click_type, x, y)
+
+    def press(self, key: str):
+        self.load().press(key)
+
+    def hotkey(self, *keys: str):
+        self.load().hotkey(*keys)
+
+    def write(self, text: str):
+        self.load().write(text)
+
+    def key_names(self):
+        return self.load().key_names()
+
+class InputEvent:
+    __slots__ = ('kind', 'args', 'received_at')
+
+    def __init__(self, kind: str, args: tuple, received_at: float):
+        self.kind = kind
+        self.args = args
+        self.received_at = received_at
+
+class InputSequence:
+    """순서대로 주입할 이벤트 묶음 (매크로 구간)
+
+    한 번에 한 단계씩 주입하고 다시 큐 앞에 넣으므로 단계 사이에 대기 중인 포인터
+    이동이 처리되고 취소(run.cancelled)가 바로 반영된다. 끝나면 on_done(성공 여부)을
+    인젝터 스레드에서 호출한다.
+    """
+    __slots__ = ('kind', 'steps', 'index', 'run', 'on_done', 'received_at')
+
+    def __init__(self, steps: List[Tuple[str, tuple]], run, on_done: Callable[[bool], None],
+                 received_at: float):
+        self.kind = 'sequence'
+        self.steps = steps
+        self.index = 0
+        self.run = run
+        self.on_done = on_done
+        self.received_at = received_at
+
+class InputInjector:
+    """전용 스레드에서 OS 입력을 주입하는 인젝터
+
+    - 클릭/키 같은 이산 이벤트는 제한된 큐에 쌓이며 포인터 이동보다 우선 처리
+    - 포인터 이동은 단일 슬롯으로, 처리 전에 도착한 새 이동이 이전 이동을 대체
+    - 이산 큐가 가득 차면 새 이벤트를 거부 (호출자가 클라이언트에 오류 통지)
+    - 매크로 시퀀스는 큐의 한 항목으로 순서를 지키되, 단계 사이에 포인터 이동을 처리
+    """
+
+    def __init__(self, backend, max_queue: int = 64, latency_window: int = 1024,
+                 observer: Optional[Callable[[str, float], None]] = None):
+        self.logger = logging.getLogger('InputInjector')
+        self.backend = backend
+        self.max_queue = max_queue
+        self.observer = observer  # (이벤트 종류, 수신부터 주입까지 지연) 을 받는 콜백, 인젝터 스레드에서 호출
+
+        self._cond = threading.Condition()
+        self._discrete: Deque[InputEvent] = collections.deque()
+        self._pending_move: Optional[InputEvent] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # 통계 (수신부터 주입까지 지연, 초 단위)
+        self._latencies: Deque[float] = collections.deque(maxlen=latency_window)
+        self.injected = 0
+        self.moves_superseded = 0
+        self.rejected = 0
+        self.errors = 0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='InputInjector', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit_move(self, x: int, y: int, received_at: Optional[float] = None):
+        event = InputEvent('move', (x, y), received_at or time.monotonic())
+        with self._cond:
+            if self._pending_move is not None:
+                self.moves_superseded += 1
+                # 가장 오래된 수신 시각을 유지하여 실제 지연을 측정
+                event.received_at = min(event.received_at, self._pending_move.received_at)
+            self._pending_move = event
+            self._cond.notify()
+
+    def submit_click(self, click_type: str, received_at: Optional[float] = None) -> bool:
+        return self._submit_discrete('click', (click_type,), received_at)
+
+    def submit_key(self, key: str, received_at: Optional[float] = None) -> bool:
+        return self._submit_discrete('key', (key,), received_at)
+
+    def submit_sequence(self, steps: List[Tuple[str, tuple]], run, on_done: Callable[[bool], None],
+                        received_at: Optional[float] = None) -> bool:
+        with self._cond:
+            if len(self._discrete) >= self.max_queue:
+                self.rejected += 1
+                return False
+            self._discrete.append(InputSequence(steps, run, on_done, received_at or time.monotonic()))
+            self._cond.notify()
+            return True
+
+    def _submit_discrete(self, kind: str, args: tuple, received_at: Optional[float]) -> bool:
+        with self._cond:
+            if len(self._discrete) >= self.max_queue:
+                self.rejected += 1
+                return False
+            if kind == 'click' and self._pending_move is not None:
+                # 클릭이 먼저 처리되더라도 대기 중인 이동 위치에서 클릭되도록 좌표 고정
+                args = args + self._pending_move.args
+            self._discrete.append(InputEvent(kind, args, received_at or time.monotonic()))
+            self._cond.notify()
+            return True
+
+    def _next_event(self) -> Optional[InputEvent]:
+        with self._cond:
+            while self._running and not self._discrete and self._pending_move is None:
+                self._cond.wait()
+            if self._discrete and (self._pending_move is None or self._discrete[0].kind != 'sequence'):
+                return self._discrete.popleft()
+            event, self._pending_move = self._pending_move, None
+            return event
+
+    def _inject(self, kind: str, args: tuple):
+        if kind == 'move':
+            self.backend.move_to(*args)
+        elif kind == 'click':
+            self.backend.click(*args)
+        elif kind == 'hotkey':
+            self.backend.hotkey(*args)
+        elif kind == 'write':
+            self.backend.write(*args)
+        else:
+            self.backend.press(*args)
+
+    def _observe(self, kind: str, received_at: float):
+        self.injected += 1
+        latency = time.monotonic() - received_at
+        self._latencies.append(latency)
+        if self.observer is not None:
+            self.observer(kind, latency)
+
+    def _step_sequence(self, sequence: InputSequence):
+        if sequence.run.cancelled:
+            self._finish_sequence(sequence, False)
+            return
+        kind, args = sequence.steps[sequence.index]
+        try:
+            self._inject(kind, args)
+        except Exception as e:
+            self.errors += 1
+            self.logger.error(f"Input injection failed (macro {kind}): {e}")
+            self._finish_sequence(sequence, False)
+            return
+        sequence.index += 1
+        if sequence.index < len(sequence.steps):
+            with self._cond:
+                self._discrete.appendleft(sequence)
+            return
+        self._observe('macro', sequence.received_at)
+        self._finish_sequence(sequence, True)
+
+    def _finish_sequence(self, sequence: InputSequence, ok: bool):
+        # on_done 은 이벤트 루프로 넘기므로 종료 중 루프가 닫혀 있어도 워커 스레드는 계속
+        try:
+            sequence.on_done(ok)
+        except Exception as e:
+            self.errors += 1
+            self.logger.error(f"Input sequence callback failed: {e}")
+
+    def _run(self):
+        while self._running:
+            event = self._next_event()
+            if event is None:
+                continue
+            if event.kind == 'sequence':
+                self._step_sequence(event)
+                continue
+            try:
+                self._inject(event.kind, event.args)
+                self._observe(event.kind, event.received_at)
+            except Exception as e:
+                self.errors += 1
+                self.logger.error(f"Input injection failed ({event.kind}): {e}")
+
+    def queue_depth(self) -> int:
+        return len(self._discrete) + (1 if self._pending_move is not None else 0)
+
+    def stats(self) -> Dict[str, float]:
+        latencies = sorted(self._latencies)
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+        return {
+            'injected': self.injected,
+            'moves_superseded': self.moves_superseded,
+            'rejected': self.rejected,
+            'errors': self.errors,
+            'queue_depth': self.queue_depth(),
+            'latency_p50_ms': percentile(0.5),
+            'latency_p99_ms': percentile(0.99),
+        }
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from wire_protocol import seq_delta
+
+class PointerInputPipeline:
+    """디스패치와 OS 입력 주입 사이의 포인터 이동 병합 단계
+
+    - 클라이언트별 시퀀스 번호로 중복/역순 이동 패킷 폐기
+    - 상대 이동에 가속 곡선, 레이저 절대 좌표에 감도 적용
+    - 한 주입 틱 안에 도착한 dx/dy 를 하나의 이동으로 합산
+    - 포인터 위치를 직접 추적하여 매 패킷마다 OS 에 위치를 묻지 않음
+
+    move_to 는 (x, y, 수신 시각, 레이저 여부) 로 목표 위치를 받는다 (서브픽셀 float).
+    """
+
+    def __init__(self,
+                 screen_size: Tuple[int, int],
+                 get_position: Callable[[], Tuple[int, int]],
+                 move_to: Callable[[float, float, Optional[float], bool], None],
+                 tick_interval: float = 0.008,
+                 resync_interval: float = 1.0,
+                 acceleration=None,
+                 laser_sensitivity: float = 1.0):
+        self.logger = logging.getLogger('PointerInputPipeline')
+        self.screen_width, self.screen_height = screen_size
+        self._get_position = get_position
+        self._move_to = move_to
+        self.tick_interval = tick_interval
+        self.resync_interval = resync_interval
+        self.acceleration = acceleration  # apply(dx, dy) -> (dx, dy), None 이면 그대로
+        self.laser_sensitivity = laser_sensitivity
+
+        # 추적 중인 포인터 위치 (서브픽셀 누적을 위해 float 유지)
+        self._x: Optional[float] = None
+        self._y: Optional[float] = None
+
+        # 다음 틱에 주입할 대기 이동
+        self._pending_abs: Optional[Tuple[float, float]] = None
+        self._pending_dx = 0.0
+        self._pending_dy = 0.0
+        self._pending_count = 0
+        self._pending_received_at: Optional[float] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._last_inject_time = 0.0
+
+        # 클라이언트별 마지막 이동 시퀀스 번호
+        self._last_seq: Dict[tuple, int] = {}
+
+        # 통계
+        self.received = 0
+        self.coalesced = 0
+        self.dropped_duplicate = 0
+        self.dropped_reordered = 0
+        self.injected = 0
+
+    def submit(self, addr: tuple, message: Dict[str, Any],
+               received_at: Optional[float] = None) -> bool:
+        """이동 메시지 등록 (폐기되면 False)"""
+        self.received += 1
+
+        seq = message.get('seq')
+        if seq is not None:
+            seq = int(seq)
+            last = self._last_seq.get(addr)
+            if last is not None:
+                delta = seq_delta(seq, last)
+                if delta == 0:
+                    self.dropped_duplicate += 1
+                    return False
+                if delta < 0:
+                    self.dropped_reordered += 1
+                    return False
+            self._last_seq[addr] = seq
+
+        if message.get('is_laser', False):
+            # 레이저 모드: 절대 좌표는 마지막 값만 유효, 이전 상대 이동은 무시
+            # 감도는 화면 중심 기준 배율
+            x = (0.5 + (float(message.get('x', 0.5)) - 0.5) * self.laser_sensitivity) * self.screen_width
+            y = (0.5 + (float(message.get('y', 0.5)) - 0.5) * self.laser_sensitivity) * self.screen_height
+            self._pending_abs = (x, y)
+            self._pending_dx = self._pending_dy = 0.0
+        else:
+            dx = float(message.get('dx', 0))
+            dy = float(message.get('dy', 0))
+            if self.acceleration is not None:
+                # 곡선은 패킷 단위 이동량 기준이므로 병합 전에 적용
+                dx, dy = self.acceleration.apply(dx, dy)
+            self._pending_dx += dx
+            self._pending_dy += dy
+
+        if self._pending_count == 0:
+            self._pending_received_at = received_at
+        self._pending_count += 1
+        self._schedule_flush()
+        return True
+
+    def _schedule_flush(self):
+        if self._flush_handle is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        due = self._last_inject_time + self.tick_interval
+        if now >= due:
+            # 직전 틱 이후 첫 이동은 지연 없이 바로 주입
+            self.flush()
+        else:
+            self._flush_handle = loop.call_at(due, self.flush)
+
+    def flush(self):
+        """대기 중인 이동을 한 번의 moveTo 로 주입"""
+        self._flush_handle = None
+        if self._pending_count == 0:
+            return
+
+        loop_time = asyncio.get_running_loop().time()
+        if self._x is None or loop_time - self._last_inject_time > self.resync_interval:
+            # 한동안 입력이 없었다면 로컬 마우스 이동을 반영하기 위해 재동기화
+            self.resync()
+
+        laser = self._pending_abs is not None
+        if laser:
+            self._x, self._y = self._pending_abs
+        x = max(0.0, min(self._x + self._pending_dx, self.screen_width - 1))
+        y = max(0.0, min(self._y + self._pending_dy, self.screen_height - 1))
+        self._x, self._y = x, y
+
+        self.coalesced += self._pending_count - 1
+        self._pending_abs = None
+        self._pending_dx = self._pending_dy = 0.0
+        self._pending_count = 0
+        self._last_inject_time = loop_time
+
+        self._move_to(x, y, self._pending_received_at, laser)
+        self.injected += 1
+
+    @property
+    def position(self) -> Optional[Tuple[int, int]]:
+        """추적 중인 포인터 위치 (아직 이동이 없었다면 None)"""
+        if self._x is None:
+            return None
+        return int(self._x), int(self._y)
+
+    def resync(self):
+        """OS 포인터 위치로 추적 위치 재설정"""
+        self._x, self._y = (float(v) for v in self._get_position())
+
+    def forget(self, addr: tuple):
+        """연결 해제된 클라이언트의 시퀀스 상태 제거"""
+        self._last_seq.pop(addr, None)
+
+    def cancel(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'received': self.received,
+            'coalesced': self.coalesced,
+            'dropped_duplicate': self.dropped_duplicate,
+            'dropped_reordered': self.dropped_reordered,
+            'injected': self.injected,
+        }
@@ -12,7 +12,7 @@ class WebSocketService extends GetxService {
       // 기존 연결이 있다면 해제
       disconnect();
 
-      final wsUrl = 'ws://$ip:$port';
+      final wsUrl = 'ws://$ip:$port/ws';
       print('Connecting to WebSocket server at: $wsUrl');
 
       _channel = WebSocketChannel.connect(Uri.parse(wsUrl));
@@ -0,0 +1,137 @@
+import time
+from typing import Dict, Optional
+
+from wire_protocol import seq_delta
+
+# keepalive 타임스탬프는 ms 단위, 32비트에서 순환 (TCP 타임스탬프 옵션과 같은 방식)
+TIMESTAMP_MODULO = 1 << 32
+
+def timestamp_ms(now: Optional[float] = None) -> int:
+    """단조 시계(초)를 keepalive 타임스탬프(ms, 32비트)로 변환"""
+    if now is None:
+        now = time.monotonic()
+    return int(now * 1000) % TIMESTAMP_MODULO
+
+class LinkEstimator:
+    """keepalive 로 측정하는 클라이언트별 RTT / 지터 / 손실 추정기
+
+    - RTT: 서버가 보낸 server_ts 를 클라이언트가 다음 keepalive 에 echo 로
+      돌려주고, 클라이언트 보관 시간(echo_delay)을 빼서 표본을 얻는다.
+      평활화와 RTO 계산은 RFC 6298 (alpha=1/8, beta=1/4, K=4).
+    - 지터: 클라이언트 송신 타임스탬프 기준 도착 간격 변화 (RFC 3550 6.4.1).
+      두 시계의 오프셋은 차분에서 상쇄된다.
+    - 손실: keepalive 시퀀스 번호 공백을 최근 window 개 기대값 기준 비율로 계산.
+    """
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+
+    def __init__(self, min_rto: float = 0.2, max_rto: float = 60.0,
+                 initial_rto: float = 1.0, granularity: float = 0.001,
+                 loss_window: int = 64):
+        self.min_rto = min_rto
+        self.max_rto = max_rto
+        self.granularity = granularity
+        self.loss_window = loss_window
+
+        self.srtt: Optional[float] = None
+        self.rttvar: Optional[float] = None
+        self.rto = initial_rto
+        self.jitter = 0.0
+
+        self._last_seq: Optional[int] = None
+        self._last_transit: Optional[float] = None
+        self._expected = 0.0
+        self._received = 0.0
+
+        # 통계
+        self.samples = 0
+        self.keepalives = 0
+        self.lost = 0
+        self.reordered = 0
+
+    def on_keepalive(self, received_at: float, seq: Optional[int] = None,
+                     timestamp: Optional[int] = None, echo: Optional[int] = None,
+                     echo_delay: Optional[int] = None):
+        """keepalive 수신 (received_at: time.monotonic 초, 나머지는 메시지 필드)"""
+        self.keepalives += 1
+
+        in_order = True
+        if seq is not None:
+            in_order = self._on_seq(int(seq))
+
+        if timestamp is not None and in_order:
+            # 송신 시각은 클라이언트 시계, 도착 시각은 서버 시계: 차이의 변화만 사용
+            transit = received_at - int(timestamp) / 1000
+            if self._last_transit is not None:
+                self.jitter += (abs(transit - self._last_transit) - self.jitter) / 16
+            self._last_transit = transit
+
+        if echo is not None:
+            elapsed = (timestamp_ms(received_at) - int(echo)) % TIMESTAMP_MODULO
+            sample = (elapsed - int(echo_delay or 0)) / 1000
+            if 0 <= sample < self.max_rto:
+                self.on_rtt_sample(sample)
+
+    def _on_seq(self, seq: int) -> bool:
+        if self._last_seq is None:
+            self._last_seq = seq
+            self._expected += 1
+            self._received += 1
+            return True
+        delta = seq_delta(seq, self._last_seq)
+        if delta == 0:
+            return False
+        if delta < 0:
+            # 늦게 도착한 이전 keepalive: 손실로 셌던 것 하나 회수
+            self.reordered += 1
+            self.lost = max(0, self.lost - 1)
+            self._received = min(self._expected, self._received + 1)
+            return False
+        self.lost += delta - 1
+        self._last_seq = seq
+        self._expected += delta
+        self._received += 1
+        if self._expected > self.loss_window:
+            # 최근 구간 위주로 반영되도록 누적값을 절반으로 감쇠
+            self._expected /= 2
+            self._received /= 2
+        return True
+
+    def on_rtt_sample(self, sample: float):
+        """RFC 6298 2.2 / 2.3"""
+        self.samples += 1
+        if self.srtt is None:
+            self.srtt = sample
+            self.rttvar = sample / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - sample)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * sample
+        rto = self.srtt + max(self.granularity, self.K * self.rttvar)
+        self.rto = max(self.min_rto, min(rto, self.max_rto))
+
+    @property
+    def loss_rate(self) -> float:
+        if self._expected <= 0:
+            return 0.0
+        return max(0.0, 1 - self._received / self._expected)
+
+    @property
+    def latency_bound(self) -> Optional[float]:
+        """대부분의 왕복이 끝나는 시간 (SRTT + 4 * RTTVAR), 표본이 없으면 None"""
+        if self.srtt is None:
+            return None
+        return self.srtt + self.K * self.rttvar
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'srtt_ms': round((self.srtt or 0.0) * 1000, 2),
+            'rttvar_ms': round((self.rttvar or 0.0) * 1000, 2),
+            'rto_ms': round(self.rto * 1000, 2),
+            'jitter_ms': round(self.jitter * 1000, 2),
+            'loss_rate': round(self.loss_rate, 4),
+            'rtt_samples': self.samples,
+            'keepalives': self.keepalives,
+            'keepalives_lost': self.lost,
+        }
@@ -0,0 +1,81 @@
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+class TimingWheel:
+    """해시 타이밍 휠 기반 만료 스케줄러
+
+    마감 시각을 tick 단위 슬롯에 해시하여 보관하고, advance 는 지나간 슬롯만
+    훑는다. 휠 한 바퀴보다 먼 마감은 같은 슬롯에 남아 다음 회전 때 다시 확인한다.
+    활동 갱신은 휠을 건드리지 않고 호출자가 만료 시점에 실제 마감을 다시 계산해
+    재등록하는 방식(lazy re-arm)을 전제로 한다.
+    """
+
+    def __init__(self, tick: float = 0.25, slots: int = 4096):
+        self.tick = tick
+        self._slots: List[Set[Hashable]] = [set() for _ in range(slots)]
+        self._entries: Dict[Hashable, Tuple[float, int]] = {}  # key -> (마감 시각, 슬롯 번호)
+        self._cursor = None  # 다음에 처리할 절대 tick 번호
+
+        # 통계
+        self.scheduled = 0
+        self.expired = 0
+        self.examined = 0
+
+    def add(self, key: Hashable, deadline: float):
+        """key 의 마감 시각 등록 (이미 있으면 교체)"""
+        self.discard(key)
+        tick = int(deadline / self.tick)
+        if self._cursor is not None and tick < self._cursor:
+            # 이미 지나간 슬롯이면 다음 advance 에서 바로 확인되도록 현재 슬롯에
+            tick = self._cursor
+        index = tick % len(self._slots)
+        self._entries[key] = (deadline, index)
+        self._slots[index].add(key)
+        self.scheduled += 1
+
+    def discard(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._slots[entry[1]].discard(key)
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def advance(self, now: float, budget: int = 1024) -> List[Hashable]:
+        """now 까지 마감된 key 목록 (제거 후 반환)
+
+        한 번에 만료시키는 항목 수를 budget 으로 제한하며, 남은 항목은 다음
+        호출에서 이어서 처리한다.
+        """
+        target = int(now / self.tick)
+        if self._cursor is None:
+            self._cursor = target
+        expired = []
+        while self._cursor <= target:
+            slot = self._slots[self._cursor % len(self._slots)]
+            for key in list(slot):
+                self.examined += 1
+                if self._entries[key][0] <= now:
+                    slot.discard(key)
+                    del self._entries[key]
+                    expired.append(key)
+                    if len(expired) >= budget:
+                        self.expired += len(expired)
+                        return expired
+            if self._cursor == target:
+                # 현재 tick 슬롯은 이후 마감이 남아 있을 수 있으므로 다음 호출에서 다시 확인
+                break
+            self._cursor += 1
+        self.expired += len(expired)
+        return expired
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'pending': len(self._entries),
+            'scheduled': self.scheduled,
+            'expired': self.expired,
+            'examined': self.examined,
+        }
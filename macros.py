@@ -0,0 +1,397 @@
+import asyncio
+import itertools
+import json
+import logging
+import string
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# 매크로 단계 종류 -> 인젝터 이벤트 종류
+STEP_KINDS = ('key', 'hotkey', 'text', 'click', 'move', 'delay')
+CLICK_TYPES = ('left', 'right', 'double')
+
+MAX_STEPS = 256  # 매크로 하나의 최대 단계 수 (텍스트 확장 후)
+MAX_DELAY = 10.0  # 단계 사이 최대 지연 (초)
+TEXT_CHUNK = 8  # 텍스트 입력을 나누는 단위 (단위 사이에 포인터 이동/취소 확인)
+
+class MacroError(Exception):
+    """매크로 설정 오류 또는 잘못된 실행 요청 (메시지는 클라이언트에 그대로 전달)"""
+
+class MacroParam:
+    """매크로 매개변수 정의 (int: min/max, str: max_length, choice: choices)"""
+    __slots__ = ('name', 'kind', 'minimum', 'maximum', 'max_length', 'choices', 'default')
+
+    def __init__(self, name: str, spec: Dict[str, Any]):
+        self.name = name
+        self.kind = spec.get('type', 'str')
+        if self.kind not in ('int', 'str', 'choice'):
+            raise MacroError(f"Unknown parameter type: {self.kind}")
+        self.minimum = spec.get('min')
+        self.maximum = spec.get('max')
+        self.max_length = int(spec.get('max_length', 200))
+        self.choices = [str(choice) for choice in spec.get('choices', [])]
+        if self.kind == 'choice' and not self.choices:
+            raise MacroError(f"Parameter {name} needs choices")
+        self.default = spec.get('default')
+        if self.default is not None:
+            self.default = self.coerce(self.default)
+
+    def coerce(self, value) -> str:
+        """검증 후 텍스트에 넣을 문자열로 변환"""
+        if self.kind == 'int':
+            if isinstance(value, bool) or not isinstance(value, (int, str)):
+                raise MacroError(f"{self.name} must be an integer")
+            try:
+                number = int(value)
+            except ValueError:
+                raise MacroError(f"{self.name} must be an integer") from None
+            if (self.minimum is not None and number < self.minimum) or \
+                    (self.maximum is not None and number > self.maximum):
+                raise MacroError(f"{self.name} must be between {self.minimum} and {self.maximum}")
+            return str(number)
+        text = str(value)
+        if self.kind == 'choice':
+            if text not in self.choices:
+                raise MacroError(f"{self.name} must be one of {self.choices}")
+            return text
+        if len(text) > self.max_length:
+            raise MacroError(f"{self.name} is longer than {self.max_length} characters")
+        if not all(char in string.printable and char not in '\x0b\x0c' for char in text):
+            # OS 입력 백엔드는 ASCII 텍스트만 입력 가능
+            raise MacroError(f"{self.name} must be printable ASCII")
+        return text
+
+    def info(self) -> Dict[str, Any]:
+        info = {'type': self.kind}
+        for key, value in (('min', self.minimum), ('max', self.maximum), ('default', self.default)):
+            if value is not None:
+                info[key] = value
+        if self.kind == 'choice':
+            info['choices'] = self.choices
+        if self.kind == 'str':
+            info['max_length'] = self.max_length
+        return info
+
+# 컴파일된 단계: (인젝터 이벤트 종류, 인자) 또는 매개변수 텍스트 ('template', (템플릿,))
+Step = Tuple[str, tuple]
+Segment = Union[float, List[Step]]
+
+def _text_steps(text: str) -> List[Step]:
+    return [('write', (text[i:i + TEXT_CHUNK],)) for i in range(0, len(text), TEXT_CHUNK)]
+
+class CompiledMacro:
+    """검증을 마친 매크로: 지연으로 나뉜 인젝터 이벤트 구간 목록"""
+
+    def __init__(self, name: str, description: str, params: Dict[str, MacroParam],
+                 segments: List[Segment]):
+        self.name = name
+        self.description = description
+        self.params = params
+        self.segments = segments
+        self.templated = any(kind == 'template' for segment in segments
+                             if not isinstance(segment, float) for kind, _ in segment)
+        # 포인터를 직접 옮기는 단계 (move, 좌표가 있는 click): 실행 후 포인터 추적 위치 재동기화
+        self.moves_pointer = any(kind == 'move' or (kind == 'click' and len(args) > 1) for segment in segments
+                                 if not isinstance(segment, float) for kind, args in segment)
+
+    def expand(self, args: Optional[Dict[str, Any]]) -> List[Segment]:
+        """인자를 검증하고 실행할 구간 목록 반환 (매개변수가 없으면 미리 컴파일된 목록 그대로)"""
+        args = args or {}
+        if not isinstance(args, dict):
+            raise MacroError("Macro args must be an object")
+        unknown = set(args) - set(self.params)
+        if unknown:
+            raise MacroError(f"Unknown macro args: {sorted(unknown)}")
+        if not self.templated:
+            return self.segments
+
+        values = {}
+        for name, param in self.params.items():
+            if name in args:
+                values[name] = param.coerce(args[name])
+            elif param.default is not None:
+                values[name] = param.default
+            else:
+                raise MacroError(f"Missing macro arg: {name}")
+
+        segments: List[Segment] = []
+        for segment in self.segments:
+            if isinstance(segment, float):
+                segments.append(segment)
+                continue
+            steps = []
+            for kind, step_args in segment:
+                if kind == 'template':
+                    steps.extend(_text_steps(step_args[0].format(**values)))
+                else:
+                    steps.append((kind, step_args))
+            segments.append(steps)
+        return segments
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'description': self.description,
+            'params': {name: param.info() for name, param in self.params.items()},
+        }
+
+class MacroLibrary:
+    """설정 파일의 매크로를 시작 시 한 번 검증/컴파일한 목록
+
+    설정 형식 (JSON)::
+
+        {"macros": {"goto_slide": {
+            "description": "...",
+            "params": {"n": {"type": "int", "min": 1, "max": 999}},
+            "steps": [{"text": "{n}"}, {"key": "enter"}]}}}
+
+    단계: key, hotkey (키 목록), text ({매개변수} 치환), click (종류, 선택 x/y 0~1),
+    move (x/y 0~1), delay (초).
+    """
+
+    def __init__(self, macros: Optional[Dict[str, CompiledMacro]] = None):
+        self.macros = macros or {}
+
+    @classmethod
+    def load(cls, path: str, screen_size: Tuple[int, int], valid_keys=None) -> 'MacroLibrary':
+        with open(path, encoding='utf-8') as f:
+            try:
+                config = json.load(f)
+            except json.JSONDecodeError as e:
+                raise MacroError(f"Invalid macro file {path}: {e}") from e
+        return cls.compile(config, screen_size, valid_keys)
+
+    @classmethod
+    def compile(cls, config: Dict[str, Any], screen_size: Tuple[int, int],
+                valid_keys=None) -> 'MacroLibrary':
+        macros = config.get('macros') if isinstance(config, dict) else None
+        if not isinstance(macros, dict):
+            raise MacroError("Macro config needs a 'macros' object")
+        compiled = {}
+        for name, spec in macros.items():
+            try:
+                compiled[name] = _compile_macro(name, spec, screen_size, valid_keys)
+            except MacroError as e:
+                raise MacroError(f"Macro '{name}': {e}") from None
+        return cls(compiled)
+
+    def get(self, name) -> CompiledMacro:
+        macro = self.macros.get(name)
+        if macro is None:
+            raise MacroError(f"Unknown macro: {name}")
+        return macro
+
+    def __contains__(self, name) -> bool:
+        return name in self.macros
+
+    def __len__(self) -> int:
+        return len(self.macros)
+
+    def info(self) -> List[Dict[str, Any]]:
+        return [macro.info() for macro in self.macros.values()]
+
+def _check_key(key, valid_keys) -> str:
+    if not isinstance(key, str) or not key:
+        raise MacroError(f"Invalid key: {key!r}")
+    if valid_keys is not None and key not in valid_keys:
+        raise MacroError(f"Unknown key: {key}")
+    return key
+
+def _coordinate(value, size: int) -> int:
+    if not isinstance(value, (int, float)) or not 0 <= value <= 1:
+        raise MacroError(f"Coordinates must be between 0 and 1: {value!r}")
+    return int(value * (size - 1))
+
+def _compile_step(step: Dict[str, Any], params: Dict[str, MacroParam],
+                  screen_size: Tuple[int, int], valid_keys) -> Union[float, Step]:
+    kinds = [kind for kind in STEP_KINDS if kind in step] if isinstance(step, dict) else []
+    if len(kinds) != 1:
+        raise MacroError(f"Each step needs exactly one of {STEP_KINDS}: {step!r}")
+    kind = kinds[0]
+    value = step[kind]
+
+    if kind == 'key':
+        return 'key', (_check_key(value, valid_keys),)
+    if kind == 'hotkey':
+        if not isinstance(value, list) or not value:
+            raise MacroError(f"hotkey needs a list of keys: {value!r}")
+        return 'hotkey', tuple(_check_key(key, valid_keys) for key in value)
+    if kind == 'text':
+        if not isinstance(value, str):
+            raise MacroError(f"text must be a string: {value!r}")
+        try:
+            fields = [field for _, field, spec, conversion in string.Formatter().parse(value)
+                      if field is not None]
+        except ValueError as e:
+            raise MacroError(f"Invalid text template {value!r}: {e}") from None
+        for field in fields:
+            if field not in params:
+                raise MacroError(f"Undeclared parameter in text: {{{field}}}")
+        if fields:
+            return 'template', (value,)
+        # 매개변수가 없는 텍스트는 검증 후 그대로 입력 단계로
+        MacroParam('text', {'type': 'str', 'max_length': MAX_STEPS * TEXT_CHUNK}).coerce(value)
+        return 'text', (value,)
+    if kind == 'click':
+        if value not in CLICK_TYPES:
+            raise MacroError(f"click must be one of {CLICK_TYPES}")
+        if 'x' in step or 'y' in step:
+            return 'click', (value, _coordinate(step.get('x'), screen_size[0]),
+                             _coordinate(step.get('y'), screen_size[1]))
+        return 'click', (value,)
+    if kind == 'move':
+        return 'move', (_coordinate(value, screen_size[0]), _coordinate(step.get('y'), screen_size[1]))
+    if not isinstance(value, (int, float)) or not 0 <= value <= MAX_DELAY:
+        raise MacroError(f"delay must be between 0 and {MAX_DELAY} seconds")
+    return float(value)
+
+def _compile_macro(name: str, spec: Dict[str, Any], screen_size: Tuple[int, int],
+                   valid_keys) -> CompiledMacro:
+    if not isinstance(spec, dict) or not isinstance(spec.get('steps'), list) or not spec['steps']:
+        raise MacroError("needs a non-empty 'steps' list")
+    params_spec = spec.get('params', {})
+    if not isinstance(params_spec, dict):
+        raise MacroError("'params' must be an object")
+    params = {param: MacroParam(param, param_spec or {}) for param, param_spec in params_spec.items()}
+
+    segments: List[Segment] = []
+    current: List[Step] = []
+    count = 0
+    for step in spec['steps']:
+        compiled = _compile_step(step, params, screen_size, valid_keys)
+        if isinstance(compiled, float):
+            # 지연은 이벤트 루프에서 기다리므로 인젝터 구간을 여기서 나눔
+            if current:
+                segments.append(current)
+                current = []
+            segments.append(compiled)
+            continue
+        if compiled[0] == 'text':
+            expanded = _text_steps(compiled[1][0])
+        else:
+            expanded = [compiled]
+        current.extend(expanded)
+        count += len(expanded)
+    if current:
+        segments.append(current)
+
+    # 매개변수 텍스트는 최대 길이까지 확장된다고 보고 크기 제한
+    for kind, args in (step for segment in segments if not isinstance(segment, float) for step in segment):
+        if kind == 'template':
+            longest = sum(params[field].max_length if params[field].kind == 'str' else 16
+                          for _, field, _, _ in string.Formatter().parse(args[0]) if field)
+            count += (len(args[0]) + longest) // TEXT_CHUNK
+    if count > MAX_STEPS:
+        raise MacroError(f"more than {MAX_STEPS} steps")
+    return CompiledMacro(name, str(spec.get('description', '')), params, segments)
+
+class MacroRun:
+    """실행 중인 매크로 (cancelled 는 인젝터 스레드에서도 읽음)"""
+    __slots__ = ('run_id', 'owner', 'name', 'moves_pointer', 'cancelled', 'status', 'task')
+
+    def __init__(self, run_id: int, owner: tuple, name: str, moves_pointer: bool = False):
+        self.run_id = run_id
+        self.owner = owner
+        self.name = name
+        self.moves_pointer = moves_pointer
+        self.cancelled = False
+        self.status = 'running'
+        self.task: Optional[asyncio.Task] = None
+
+class MacroRunner:
+    """매크로 실행기
+
+    지연 없는 구간은 인젝터에 순서가 보장되는 시퀀스 하나로 넘기고, 지연은 이벤트
+    루프에서 기다리므로 실행 중에도 인젝터 스레드와 다른 클라이언트 입력이 막히지
+    않는다. 클라이언트마다 동시에 하나만 실행한다.
+    """
+
+    def __init__(self, library: MacroLibrary, injector,
+                 on_finished: Optional[Callable[[MacroRun], None]] = None):
+        self.logger = logging.getLogger('MacroRunner')
+        self.library = library
+        self.injector = injector
+        self.on_finished = on_finished
+        self.running: Dict[tuple, MacroRun] = {}
+        self._ids = itertools.count(1)
+
+        # 통계
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.failed = 0
+
+    def start(self, owner: tuple, name, args: Optional[Dict[str, Any]] = None,
+              received_at: Optional[float] = None) -> MacroRun:
+        macro = self.library.get(name)
+        if owner in self.running:
+            raise MacroError(f"Macro already running: {self.running[owner].name}")
+        segments = macro.expand(args)
+
+        run = MacroRun(next(self._ids), owner, macro.name, macro.moves_pointer)
+        self.running[owner] = run
+        run.task = asyncio.create_task(self._execute(run, segments, received_at))
+        self.started += 1
+        return run
+
+    async def _execute(self, run: MacroRun, segments: List[Segment], received_at: Optional[float]):
+        loop = asyncio.get_running_loop()
+        try:
+            for segment in segments:
+                if run.cancelled:
+                    break
+                if isinstance(segment, float):
+                    await asyncio.sleep(segment)
+                    continue
+                done = loop.create_future()
+                finished = lambda ok, done=done: loop.call_soon_threadsafe(_resolve, done, ok)
+                if not self.injector.submit_sequence(segment, run, finished, received_at):
+                    raise MacroError("Input queue full")
+                if not await done:
+                    if not run.cancelled:
+                        raise MacroError("Input injection failed")
+                    break
+            run.status = 'cancelled' if run.cancelled else 'done'
+        except asyncio.CancelledError:
+            run.cancelled = True
+            run.status = 'cancelled'
+        except MacroError as e:
+            run.status = 'failed'
+            self.logger.warning(f"Macro {run.name} failed: {e}")
+        finally:
+            if self.running.get(run.owner) is run:
+                del self.running[run.owner]
+            if run.status == 'done':
+                self.completed += 1
+            elif run.status == 'cancelled':
+                self.cancelled += 1
+            else:
+                self.failed += 1
+            if self.on_finished is not None:
+                self.on_finished(run)
+
+    def cancel(self, owner: tuple) -> bool:
+        """클라이언트의 실행 중 매크로 취소 (아직 주입되지 않은 단계는 버려짐)"""
+        run = self.running.get(owner)
+        if run is None:
+            return False
+        run.cancelled = True
+        if run.task is not None:
+            run.task.cancel()
+        return True
+
+    def cancel_all(self):
+        for owner in list(self.running):
+            self.cancel(owner)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'started': self.started,
+            'completed': self.completed,
+            'cancelled': self.cancelled,
+            'failed': self.failed,
+            'running': len(self.running),
+        }
+
+def _resolve(future: asyncio.Future, ok: bool):
+    if not future.done():
+        future.set_result(ok)
@@ -0,0 +1,189 @@
+import bisect
+import math
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, Union
+
+# 지연 히스토그램 기본 버킷 (초): 50us ~ 1s
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+_INF_LABEL = 'le="+Inf"'
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class _CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.bounds, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.label_names:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """라벨 값별 시계열 (핫 패스에서는 미리 받아 둔 자식을 재사용)"""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}")
+            child = self._children[key] = self._new_child()
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        """라벨 값 -> 현재 값"""
+        return {key: child.value for key, child in self._children.items()}
+
+    def total(self) -> float:
+        """모든 라벨 시계열의 합"""
+        return sum(child.value for child in self._children.values())
+
+    def _render_child(self, key, child):
+        return [f'{self.name}{_format_labels(self.label_names, key)} {_format_value(child.value)}']
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램 (관측 시에는 해당 버킷 하나만 증가, 누적은 렌더링 때 계산)
+
+    자식 시계열 하나는 한 스레드에서만 기록한다는 전제로 잠금을 두지 않는다.
+    """
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, help_text, labels)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def _render_child(self, key, child):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds, child.counts):
+            cumulative += count
+            le = 'le="' + _format_value(bound) + '"'
+            lines.append(f'{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}')
+        lines.append(f'{self.name}_bucket{_format_labels(self.label_names, key, _INF_LABEL)} {child.count}')
+        lines.append(f'{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(child.sum)}')
+        lines.append(f'{self.name}_count{_format_labels(self.label_names, key)} {child.count}')
+        return lines
+
+class CallbackMetric:
+    """스크레이프 시점에 기존 통계 함수에서 값을 읽는 지표 (gauge 또는 counter)"""
+
+    def __init__(self, name: str, help_text: str, kind: str,
+                 func: Callable[[], Union[float, Dict[Tuple[str, ...], float]]],
+                 labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.func = func
+        self.label_names = tuple(labels)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        value = self.func()
+        if isinstance(value, dict):
+            for key, child in sorted(value.items()):
+                lines.append(f'{self.name}{_format_labels(self.label_names, key)} {_format_value(child)}')
+        else:
+            lines.append(f'{self.name} {_format_value(value)}')
+        return lines
+
+class MetricsRegistry:
+    """Prometheus 텍스트 포맷(0.0.4)으로 노출하는 지표 모음"""
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, namespace: str = ''):
+        self.namespace = namespace
+        self._metrics: List[object] = []
+
+    def _name(self, name: str) -> str:
+        return f'{self.namespace}_{name}' if self.namespace else name
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        metric = Counter(self._name(name), help_text, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(self._name(name), help_text, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def callback(self, name: str, help_text: str, kind: str, func: Callable,
+                 labels: Sequence[str] = ()) -> CallbackMetric:
+        metric = CallbackMetric(self._name(name), help_text, kind, func, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import math
+from typing import Callable, Dict, Optional, Tuple
+
+class AccelerationCurve:
+    """패킷당 이동량에 따른 포인터 감도 곡선
+
+    - 미세 이동 (< slow_threshold): 감도 * slow_factor 로 정밀 조작
+    - 일반 이동: 기본 감도
+    - 빠른 이동 (> fast_threshold): 이동량에 비례해 최대 max_factor 배까지 가속
+    """
+
+    def __init__(self, sensitivity: float = 0.8, slow_threshold: float = 0.1,
+                 fast_threshold: float = 0.5, slow_factor: float = 0.3,
+                 ramp: float = 0.3, max_factor: float = 1.5):
+        self.sensitivity = sensitivity
+        self.slow_threshold = slow_threshold
+        self.fast_threshold = fast_threshold
+        self.slow_factor = slow_factor
+        self.ramp = ramp
+        self.max_factor = max_factor
+
+    def gain(self, dx: float, dy: float) -> float:
+        movement = math.hypot(dx, dy)
+        if movement < self.slow_threshold:
+            return self.sensitivity * self.slow_factor
+        if movement < self.fast_threshold:
+            return self.sensitivity
+        return self.sensitivity * min(self.max_factor, 1.0 + (movement - self.fast_threshold) * self.ramp)
+
+    def apply(self, dx: float, dy: float) -> Tuple[float, float]:
+        gain = self.gain(dx, dy)
+        return dx * gain, dy * gain
+
+class OneEuroFilter:
+    """One Euro 필터 (Casiez et al., CHI 2012)
+
+    속도가 느릴 때는 min_cutoff 로 떨림을 줄이고, 빠를 때는 beta * |속도| 만큼
+    차단 주파수를 올려 지연을 줄이는 적응형 저역 통과 필터.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.0, d_cutoff: float = 1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self, value: Optional[float] = None, t: Optional[float] = None):
+        self.value = value
+        self.derivative = 0.0
+        self.t = t
+
+    @staticmethod
+    def _alpha(cutoff: float, dt: float) -> float:
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, value: float, t: float) -> float:
+        if self.value is None or self.t is None or t <= self.t:
+            self.value, self.t = value, t
+            return value
+        dt = t - self.t
+        derivative = (value - self.value) / dt
+        self.derivative += self._alpha(self.d_cutoff, dt) * (derivative - self.derivative)
+        cutoff = self.min_cutoff + self.beta * abs(self.derivative)
+        self.value += self._alpha(cutoff, dt) * (value - self.value)
+        self.t = t
+        return self.value
+
+def smoothing_cutoff(smoothing: float, base: float = 1.0) -> Optional[float]:
+    """부드러움 계수(0~1)를 One Euro 최소 차단 주파수(Hz)로 변환 (0 이면 필터 없음)"""
+    if smoothing <= 0:
+        return None
+    return base / smoothing
+
+class PointerMotionEngine:
+    """패킷 도착과 분리된 고정 주기 포인터 주입 엔진
+
+    병합 단계가 넘겨준 목표 위치를 rate Hz 로 출력한다. 새 패킷이 없는 틱에서는
+    최근 속도로 최대 prediction 초만큼 앞선 위치를 추정(dead reckoning)하고, 출력은
+    모드별 One Euro 필터로 평활화한다. 입력이 멈추고 출력이 목표에 수렴하면
+    틱을 멈추므로 유휴 시 비용이 없다.
+    """
+
+    def __init__(self,
+                 move_to: Callable[[int, int, Optional[float]], None],
+                 screen_size: Tuple[int, int],
+                 rate: float = 120.0,
+                 min_cutoff: Optional[float] = 3.0,
+                 laser_min_cutoff: Optional[float] = 5.0,
+                 beta: float = 0.005,
+                 prediction: float = 0.025,
+                 idle_timeout: float = 0.1):
+        self.logger = logging.getLogger('PointerMotionEngine')
+        self._move_to = move_to
+        self.screen_width, self.screen_height = screen_size
+        self.interval = 1.0 / rate
+        self.prediction = prediction
+        self.idle_timeout = idle_timeout
+        self.beta = beta
+        self._cutoffs = {False: min_cutoff, True: laser_min_cutoff}
+        self._filters = (OneEuroFilter(), OneEuroFilter())
+
+        # 목표(병합 단계가 추적하는 실제 위치)와 속도 추정
+        self._target: Optional[Tuple[float, float]] = None
+        self._target_at = 0.0
+        self._received_at: Optional[float] = None
+        self._velocity = (0.0, 0.0)
+        self._laser = False
+
+        # 마지막 출력
+        self._output: Optional[Tuple[float, float]] = None
+        self._injected: Optional[Tuple[int, int]] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+        # 통계
+        self.updates = 0
+        self.ticks = 0
+        self.injected = 0
+        self.predicted = 0
+        self.filter_lag = 0.0  # 이동 중 출력이 목표를 따라가는 지연 추정 (초, 평활값)
+
+    @property
+    def laser(self) -> bool:
+        """현재 출력이 레이저 모드 이동인지"""
+        return self._laser
+
+    def _configure_filters(self, laser: bool):
+        cutoff = self._cutoffs[laser]
+        for axis_filter in self._filters:
+            axis_filter.min_cutoff = cutoff or 0.0
+            axis_filter.beta = self.beta
+
+    def update(self, x: float, y: float, received_at: Optional[float] = None,
+               laser: bool = False, now: Optional[float] = None):
+        """새 목표 위치 (now 를 주지 않으면 이벤트 루프 시계와 타이머로 틱 구동)"""
+        scheduled = now is None
+        if scheduled:
+            now = asyncio.get_running_loop().time()
+        self.updates += 1
+
+        previous, previous_at = self._target, self._target_at
+        idle = previous is None or now - previous_at > self.idle_timeout
+        if idle or laser != self._laser:
+            # 정지 후 첫 이동이나 모드 전환은 속도를 이어받지 않음
+            self._velocity = (0.0, 0.0)
+            self._laser = laser
+            self._configure_filters(laser)
+        elif now - previous_at > 0.002:
+            dt = now - previous_at
+            vx = (x - previous[0]) / dt
+            vy = (y - previous[1]) / dt
+            self._velocity = (self._velocity[0] + 0.5 * (vx - self._velocity[0]),
+                              self._velocity[1] + 0.5 * (vy - self._velocity[1]))
+
+        self._target = (x, y)
+        self._target_at = now
+        self._received_at = received_at
+
+        if scheduled and self._handle is None:
+            # 정지 상태에서 온 첫 이동은 다음 틱을 기다리지 않고 바로 출력
+            self._tick()
+
+    def _tick(self):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self.step(now):
+            self._handle = loop.call_at(now + self.interval, self._tick)
+        else:
+            self._handle = None
+
+    def step(self, now: float) -> bool:
+        """한 틱 출력 (계속 틱이 필요하면 True)"""
+        if self._target is None:
+            return False
+        self.ticks += 1
+        tx, ty = self._target
+        since = now - self._target_at
+
+        if self._output is None:
+            for axis_filter, value in zip(self._filters, (tx, ty)):
+                axis_filter.reset(value, now)
+
+        # 마지막 패킷 이후 경과 시간만큼 최근 속도로 추정, prediction 을 넘기면 같은
+        # 시간에 걸쳐 목표로 되돌아와 입력이 멈춘 경우 튀어나간 채 멈추지 않게 함
+        ahead = since if since <= self.prediction else max(0.0, 2 * self.prediction - since)
+        px = tx + self._velocity[0] * ahead
+        py = ty + self._velocity[1] * ahead
+        if since > self.interval:
+            self.predicted += 1
+        px = max(0.0, min(px, self.screen_width - 1))
+        py = max(0.0, min(py, self.screen_height - 1))
+
+        if self._cutoffs[self._laser] is None:
+            ox, oy = px, py
+        else:
+            ox = self._filters[0](px, now)
+            oy = self._filters[1](py, now)
+
+        speed = math.hypot(*self._velocity)
+        if speed > 50.0 and since <= self.prediction:
+            lag = math.hypot(px - ox, py - oy) / speed
+            self.filter_lag += 0.05 * (lag - self.filter_lag)
+
+        settled = since > self.idle_timeout and math.hypot(tx - ox, ty - oy) < 0.5
+        if settled:
+            # 입력이 끝나면 추정/필터 잔차 없이 정확히 목표 위치로
+            ox, oy = tx, ty
+        self._output = (ox, oy)
+
+        position = (int(ox), int(oy))
+        if position != self._injected:
+            self._injected = position
+            self._move_to(position[0], position[1], self._received_at)
+            self.injected += 1
+            # 지연 측정은 패킷이 처음 반영된 주입에만 적용
+            self._received_at = None
+        return not settled
+
+    def reset(self, x: float, y: float):
+        """다른 경로(매크로)로 옮겨진 포인터 위치에서 다시 시작 (이전 목표로 미끄러지지 않게)"""
+        self.cancel()
+        # 다음 목표에서 정지 후 첫 이동처럼 속도/필터를 새로 시작
+        self._target = None
+        self._output = None
+        self._received_at = None
+        self._velocity = (0.0, 0.0)
+        self._injected = (int(x), int(y))
+
+    def cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'updates': self.updates,
+            'ticks': self.ticks,
+            'injected': self.injected,
+            'predicted': self.predicted,
+            'filter_lag_ms': round(self.filter_lag * 1000, 2),
+        }
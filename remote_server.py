@@ -2,35 +2,123 @@ import asyncio
 import json
 import random
 import string
-import math
-import pyautogui
 from aiohttp import web
 import os
-import qrcode
+import hashlib
+import importlib
+import io
+import ipaddress
 import socket
-import psutil
 import platform
 import time
 import base64
-from mss import mss
-from PIL import Image
-import io
 import logging
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
 from enum import Enum
+from wire_protocol import (
+    JSON_CODEC, BINARY_CODEC, PROTOCOL_VERSION, ProtocolError,
+    is_binary, negotiate_codec
+)
+from input_pipeline import PointerInputPipeline
+from pointer_motion import AccelerationCurve, PointerMotionEngine, smoothing_cutoff
+from input_injector import InputInjector, LazyInputBackend, PyAutoGUIBackend
+from frame_transport import FrameSender
+from streaming import AdaptiveStreamController
+from capture_regions import (
+    CAPTURE_MODES, active_window_rect, clamp_region, pointer_region, read_monitors, region_key
+)
+from frame_formats import available_codecs, negotiate_frame_codec
+from sessions import ClientInfo, Session, SessionError, SessionManager
+from liveness import TimingWheel
+from link_stats import timestamp_ms
+from metrics import MetricsRegistry
+from diagnostics import LoopStallMonitor, TraceRecorder, TracingInputBackend
+from macros import MacroError, MacroLibrary, MacroRun, MacroRunner
+from udp_io import BatchedDatagramTransport, configure_socket_buffers, create_batched_endpoint, mmsg_available
+from ws_transport import WebSocketHub
+from cursor_stream import CursorPublisher
+from slide_cache import SlideCache
+from session_recorder import SessionRecorder
+
+if TYPE_CHECKING:
+    # numpy/PIL/mss 를 끌어오는 모듈은 첫 사용 시 import (시작 시간 단축)
+    from frame_diff import TileDiffer
+    from frame_pipeline import FramePipeline
 
 # 상수 정의
 class Constants:
     INACTIVITY_TIMEOUT = 600  # 10분
     AUTH_TIMEOUT = 10  # 10초
     KEEPALIVE_INTERVAL = 5  # 5초
+    KEEPALIVE_MISSES = 3  # keepalive 를 보내던 클라이언트는 이만큼 놓치면 연결 종료 (+ RTO)
+    MAX_AUTH_ATTEMPTS = 5  # AUTH_TIMEOUT 동안 허용하는 인증 실패 횟수
+    SESSION_IDLE_TIMEOUT = 300  # 추가 세션의 마지막 참가자가 나간 뒤 세션을 닫기까지 (초)
+    LIVENESS_TICK = 0.25  # 만료 타이밍 휠 tick (초)
+    LIVENESS_BUDGET = 256  # tick 당 최대 만료 처리 수
     QR_CODE_SIZE = 10
     QR_CODE_BORDER = 5
+    OPEN_BROWSER = True  # 시작 후 연결 페이지를 기본 브라우저로 열기
+    STARTUP_WARMUP = True  # 포트를 연 뒤 백그라운드 스레드에서 입력 백엔드/캡처 모듈 미리 로드
+    DEFAULT_SCREEN_SIZE = (1920, 1080)  # 입력 백엔드가 로드되기 전까지 쓰는 임시 화면 크기
     SCREEN_COMPRESSION_QUALITY = 50
     SCREEN_SCALE_FACTOR = 0.5
     MOUSE_SPEED_MULTIPLIER = 2.0
     CONNECTION_CODE_LENGTH = 6
+    INPUT_TICK_INTERVAL = 0.008  # 포인터 주입 틱 (125Hz)
+    POINTER_MOTION_RATE = 120.0  # 포인터 모션 엔진 출력 주기 (Hz, 패킷 도착과 무관)
+    POINTER_PREDICTION = 0.025  # 패킷 사이 속도 기반 위치 추정 최대 구간 (초)
+    POINTER_PREDICTION_MAX = 0.05  # 컨트롤러 지터가 클 때 늘어나는 추정 구간 상한
+    POINTER_FILTER_CUTOFF = 1.0  # 부드러움 계수 1.0 일 때 One Euro 최소 차단 주파수 (Hz)
+    POINTER_FILTER_BETA = 0.005  # 속도(px/s)에 따른 차단 주파수 증가량
+    POINTER_RESYNC_INTERVAL = 1.0  # 유휴 후 OS 포인터 위치 재동기화
+    INPUT_QUEUE_SIZE = 64  # 주입 대기 이산 이벤트(클릭/키) 최대 수
+    FRAME_CHUNK_SIZE = 1200  # 청크당 JPEG 바이트 (IP 단편화 방지)
+    UDP_IO_BACKEND = 'asyncio'  # 'asyncio' (기본 전송) 또는 'batched' (준비 이벤트당 여러 데이터그램 수신, 송신 모음)
+    UDP_IO_BATCH = 64  # batched 전송의 준비 이벤트/시스템 호출당 최대 데이터그램 수
+    UDP_IO_MMSG = False  # batched 전송에서 recvmmsg/sendmmsg 사용 (Linux, 루프백에서는 더 느림)
+    UDP_RECV_BUFFER = 4 * 1024 * 1024  # SO_RCVBUF (None 이면 OS 기본값, 커널 상한에 따라 줄어듦)
+    UDP_SEND_BUFFER = 4 * 1024 * 1024  # SO_SNDBUF (시청자 팬아웃 버스트 흡수)
+    WS_MAX_MESSAGES = 256  # WebSocket 연결당 대기 제어 메시지 수 (넘으면 새 메시지 폐기)
+    WS_HIGH_WATER = 256 * 1024  # 쓰기 버퍼가 이보다 크면 프레임 송신 보류 (오래된 프레임은 최신으로 대체)
+    WS_MAX_MESSAGE_SIZE = 64 * 1024  # 클라이언트가 보낼 수 있는 최대 메시지 크기
+    FRAME_PACING_RATE = 4 * 1024 * 1024  # 프레임 송신 속도 (bytes/s)
+    FRAME_PACING_BURST = 64 * 1024  # 토큰 버킷 버스트 크기
+    FRAME_HISTORY = 8  # NACK 재전송용으로 보관하는 최근 프레임 수
+    STREAM_TARGET_LATENCY = 0.1  # 푸시 스트리밍 목표 지연 (초)
+    STREAM_FPS_RANGE = (2.0, 30.0)
+    STREAM_QUALITY_RANGE = (20, 80)
+    STREAM_SCALE_RANGE = (0.25, 1.0)
+    FRAME_TILE_SIZE = 64  # 변경 영역 검출 타일 크기 (픽셀)
+    KEYFRAME_INTERVAL = 120  # 델타 프레임 사이 주기적 키프레임 간격 (프레임 수)
+    FRAME_WORKERS = 2  # 캡처/인코딩 워커 스레드 수
+    FRAME_CACHE_INTERVAL = 1 / 30  # 이 간격 안의 요청은 같은 캡처/인코딩 결과 공유
+    FRAME_RESIZE_MODE = 'fast'  # 'lanczos', 'fast' (reduce/박스), 'decimate' (NumPy 스트라이드)
+    POINTER_ZOOM = 2.0  # pointer 캡처 모드의 기본 확대 배율
+    MAX_BATCH_EVENTS = 32  # batch 메시지 하나에 담을 수 있는 최대 이벤트 수 (인증 응답으로 알림)
+    BATCH_ACK_EVERY = 4  # 이 수의 배치마다 누적 확인 응답 (TCP 지연 ACK 처럼 배치마다 보내지 않음)
+    BATCH_ACK_DELAY = 0.025  # 배치가 덜 모여도 이 시간(초) 안에 확인 응답 (인증 응답으로 알림)
+    MAX_SESSION_VIEWERS = 256  # 세션당 보기 전용 클라이언트 최대 수
+    LOG_POINTER_MOVES = False  # 포인터 이동마다 콘솔 출력 (디버깅용, 핫 패스 비용 큼)
+    DIAGNOSTICS_ENABLED = False  # 시작 시 구간 기록/루프 정지 감지 활성화 (/debug/diagnostics 로도 전환)
+    TRACE_CAPACITY = 65536  # 링 버퍼에 보관하는 최근 구간 수
+    LOOP_STALL_THRESHOLD = 0.05  # 이 시간 이상 이벤트 루프가 멈추면 원인 핸들러 기록 (초)
+    TRACE_FILE = 'remote_server_trace.json'
+    SLIDE_CACHE_ENABLED = True  # right/left 키 입력 후 슬라이드 변화 감지 및 썸네일 저장
+    SLIDE_KEYS = ('right', 'left')  # 슬라이드 변화 확인을 예약하는 키
+    SLIDE_SETTLE_DELAY = 0.3  # 키 입력 후 첫 캡처까지 대기 (주입 + 전환 효과, 초)
+    SLIDE_STABLE_INTERVAL = 0.15  # 화면이 안정됐는지 확인하는 캡처 간격 (초)
+    SLIDE_STABLE_ATTEMPTS = 4  # 연속 캡처 해시가 같아질 때까지의 최대 캡처 수 (계속 변하면 저장 안 함)
+    SLIDE_HASH_THRESHOLD = 10  # 256비트 지각 해시의 해밍 거리가 이 이하면 같은 슬라이드
+    SLIDE_CACHE_BYTES = 48 * 1024 * 1024  # 슬라이드 캐시 메모리 상한 (썸네일 + 원본 JPEG)
+    SLIDE_CACHE_MAX = 120  # 보관하는 최대 슬라이드 수
+    SLIDE_THUMB_WIDTH = 320  # 필름스트립 썸네일 너비 (픽셀)
+    SLIDE_THUMB_QUALITY = 70
+    SLIDE_JPEG_QUALITY = 85  # 원본 크기 슬라이드 JPEG 품질
+    RECORDING_DIR = None  # 세션 기록 디렉터리 (None 이면 기록하지 않음, 시작 시각별 하위 디렉터리 생성)
+    RECORDING_SEGMENT_BYTES = 64 * 1024 * 1024  # 기록 세그먼트 파일 크기 상한
+    RECORDING_MAX_SEGMENTS = 16  # 보관하는 최대 세그먼트 수 (넘으면 오래된 것부터 삭제)
+    RECORDING_MAX_PENDING = 32 * 1024 * 1024  # 기록 스레드가 아직 쓰지 않은 바이트 상한 (넘으면 버림)
+    MACRO_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'macros.json')  # 시작 시 컴파일하는 매크로 정의
 
 class MessageType(Enum):
     AUTH = 'auth'
@@ -43,19 +131,89 @@ class MessageType(Enum):
     KEEPALIVE_RESPONSE = 'keepalive_response'
     DISCONNECT = 'disconnect'
     FRAME = 'frame'
+    FRAME_DELTA = 'frame_delta'
+    CAPTURE_REGION = 'capture_region'
     REQUEST_FRAME = 'request_frame'
+    FRAME_NACK = 'frame_nack'
+    FRAME_ACK = 'frame_ack'
+    STREAM_START = 'stream_start'
+    STREAM_STOP = 'stream_stop'
+    STREAM_STATS = 'stream_stats'
+    LINK_STATS = 'link_stats'
+    BATCH = 'batch'
+    BATCH_ACK = 'batch_ack'
+    MACRO = 'macro'
+    MACRO_CANCEL = 'macro_cancel'
+    MACRO_LIST = 'macro_list'
+    MACRO_STATUS = 'macro_status'
+    CURSOR = 'cursor'
+    SLIDE = 'slide'
+    SLIDE_LIST = 'slide_list'
+
+_MESSAGE_TYPE_VALUES = frozenset(message_type.value for message_type in MessageType)
+
+class ServerMetrics:
+    """/metrics 로 노출하는 서버 지표 (핫 패스는 미리 만든 라벨별 시계열만 사용)"""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or MetricsRegistry('remote_control')
+        r = self.registry
+        self.datagrams = r.counter('datagrams_received_total', 'Datagrams received by message type', ['type'])
+        self.bytes_received = r.counter('bytes_received_total', 'UDP payload bytes received')
+        self.decode = r.histogram('decode_seconds', 'Datagram decode time', ['codec'])
+        self.dispatch = r.histogram('dispatch_seconds', 'Handler dispatch time by message type', ['type'])
+        self.injection = r.histogram('input_injection_latency_seconds',
+                                     'Receive to OS injection latency', ['kind'])
+        self.frame_capture = r.histogram('frame_capture_seconds', 'Time to obtain a captured frame')
+        self.frame_encode = r.histogram('frame_encode_seconds', 'Frame resize and encode time',
+                                        ['codec', 'kind'])
+        self.errors = r.counter('errors_total', 'Errors by kind', ['kind'])
+        self.batch_events = r.histogram('batch_events', 'Events carried per batch datagram',
+                                        buckets=(1, 2, 4, 8, 16, 32, 64))
+
+        self.decode_json = self.decode.labels(JSON_CODEC.name)
+        self.decode_binary = self.decode.labels(BINARY_CODEC.name)
+        self._injection = {kind: self.injection.labels(kind) for kind in ('move', 'click', 'key', 'macro')}
+        self._by_type: Dict[Optional[str], tuple] = {}
+
+    def for_type(self, msg_type: Optional[str]) -> tuple:
+        """메시지 타입별 (수신 카운터, 디스패치 히스토그램), 알 수 없는 타입은 하나로 묶음"""
+        children = self._by_type.get(msg_type)
+        if children is None:
+            label = msg_type if msg_type in _MESSAGE_TYPE_VALUES else 'unknown'
+            children = self._by_type[msg_type if label != 'unknown' else None] = (
+                self.datagrams.labels(label), self.dispatch.labels(label))
+        return children
+
+    def observe_injection(self, kind: str, latency: float):
+        # 인젝터 스레드에서 호출, 종류별 시계열은 이 스레드만 기록
+        self._injection[kind].observe(latency)
 
-@dataclass
-class ClientInfo:
-    address: tuple
-    last_activity: float
-    authenticated: bool = False
-    streaming_enabled: bool = False
+    def error(self, kind: str):
+        self.errors.labels(kind).inc()
+
+    def render(self) -> str:
+        return self.registry.render()
+
+# 보기 전용(viewer) 클라이언트에게 허용하지 않는 입력 메시지
+CONTROLLER_MESSAGES = frozenset({
+    MessageType.MOUSE_MOVE, MessageType.MOUSE_CLICK, MessageType.KEYBOARD,
+    MessageType.MACRO, MessageType.MACRO_CANCEL
+})
+
+# batch 안에 넣을 수 없는 메시지
+UNBATCHABLE_MESSAGES = frozenset({MessageType.AUTH, MessageType.BATCH})
+# batch 이벤트의 타입 문자열 -> MessageType (이벤트마다 Enum 변환/집합 확인을 하지 않도록)
+_BATCHABLE_TYPES = {message_type.value: message_type for message_type in MessageType
+                    if message_type not in UNBATCHABLE_MESSAGES}
 
 class UDPServerProtocol:
     def __init__(self, server):
         self.server = server
         self.transport = None
+        self.received_at = 0.0
+        self.bytes_sent = 0
+        self.metrics: ServerMetrics = server.metrics
         self.logger = logging.getLogger('UDPServerProtocol')
         self._message_handlers = {
             MessageType.AUTH: self._handle_auth,
@@ -65,30 +223,96 @@ class UDPServerProtocol:
             MessageType.KEEPALIVE: self._handle_keepalive,
             MessageType.DISCONNECT: self._handle_disconnect,
             MessageType.REQUEST_FRAME: self._handle_frame_request,
+            MessageType.FRAME_NACK: self._handle_frame_nack,
+            MessageType.FRAME_ACK: self._handle_frame_ack,
+            MessageType.STREAM_START: self._handle_stream_start,
+            MessageType.STREAM_STOP: self._handle_stream_stop,
+            MessageType.STREAM_STATS: self._handle_stream_stats,
+            MessageType.CAPTURE_REGION: self._handle_capture_region,
+            MessageType.LINK_STATS: self._handle_link_stats,
+            MessageType.BATCH: self._handle_batch,
+            MessageType.MACRO: self._handle_macro,
+            MessageType.MACRO_CANCEL: self._handle_macro_cancel,
+            MessageType.MACRO_LIST: self._handle_macro_list,
+            MessageType.SLIDE_LIST: self._handle_slide_list,
         }
+        # 진단 모드 구간 기록 (server.tracer 를 직접 보지 않고 set_tracing 으로 동기화)
+        self.tracer: Optional[TraceRecorder] = server.tracer
+
+    def set_tracing(self, tracer: Optional[TraceRecorder]):
+        # 속성을 새로 추가/삭제하지 않고 값만 바꿈 (인스턴스 dict 최적화 유지)
+        self.tracer = tracer
 
     def connection_made(self, transport):
-        self.transport = transport
+        # WebSocket 클라이언트 주소로의 송신은 허브가 해당 연결로 라우팅
+        websockets = self.server.websockets
+        self.transport = websockets.attach(transport) if websockets is not None else transport
         self.logger.info("UDP Server started")
 
     def datagram_received(self, data: bytes, addr: tuple):
+        # 입력 주입 지연 측정 기준 시각
+        self.received_at = time.monotonic()
+        metrics = self.metrics
+        metrics.bytes_received.inc(len(data))
+        started = time.perf_counter()
         try:
-            message = json.loads(data.decode())
-            self.logger.debug(f"Received from {addr}: {message}")
-            self._process_message(message, addr)
-        except json.JSONDecodeError:
-            self.logger.error(f"Invalid JSON from {addr}")
+            # 첫 바이트로 바이너리/JSON 프레이밍 구분
+            if is_binary(data):
+                message = BINARY_CODEC.decode(data)
+                decode_metric = metrics.decode_binary
+            else:
+                message = JSON_CODEC.decode(data)
+                decode_metric = metrics.decode_json
+            decoded = time.perf_counter()
+            decode_metric.observe(decoded - started)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Received from {addr}: {message}")
+
+            msg_type = message.get('type')
+            received, dispatch = metrics.for_type(msg_type)
+            received.inc()
+            recorder = self.server.recorder
+            if recorder is not None and msg_type != 'auth' and self.server.is_client_authenticated(addr):
+                # 인증 메시지(연결 코드 포함)는 기록하지 않음
+                recorder.record_input(addr, data)
+            # 진단 모드가 꺼져 있으면 None 비교 한 번만 남는다
+            if self.tracer is None:
+                self._process_message(message, addr)
+                dispatch.observe(time.perf_counter() - decoded)
+            else:
+                self._traced_dispatch(message, addr, started, decoded, dispatch)
+        except (json.JSONDecodeError, UnicodeDecodeError, ProtocolError) as e:
+            metrics.error('decode')
+            self.logger.error(f"Invalid message from {addr}: {e}")
             self._send_error(addr, "Invalid message format")
         except Exception as e:
+            metrics.error('processing')
             self.logger.error(f"Error processing message: {e}", exc_info=True)
             self._send_error(addr, str(e))
 
+    def _traced_dispatch(self, message: Dict[str, Any], addr: tuple,
+                         started: float, decoded: float, dispatch):
+        tracer = self.tracer
+        msg_type = message.get('type')
+        # 루프 정지 감지 시 원인 메시지 타입 보고
+        tracer.current = msg_type
+        try:
+            self._process_message(message, addr)
+        finally:
+            tracer.current = None
+        finished = time.perf_counter()
+        dispatch.observe(finished - decoded)
+        tracer.record('receive', 'udp', started, finished)
+        tracer.record('decode', 'udp', started, decoded)
+        tracer.record(str(msg_type), 'dispatch', decoded, finished)
+
     def _process_message(self, message: Dict[str, Any], addr: tuple):
         msg_type = MessageType(message.get('type', 'unknown'))
         
         # 인증 상태 확인
         if not self.server.is_client_authenticated(addr):
             if msg_type != MessageType.AUTH:
+                self.metrics.error('unauthorized')
                 self._send_error(addr, "Unauthorized")
                 return
             
@@ -98,129 +322,345 @@ class UDPServerProtocol:
             return
 
         # 인증된 클라이언트의 메시지 처리
-        self.server.update_client_activity(addr)
-        
+        self.server.update_client_activity(addr, self.received_at)
+
+        error = self._dispatch(msg_type, message, addr)
+        if error:
+            self._send_error(addr, error)
+
+    def _dispatch(self, msg_type: MessageType, message: Dict[str, Any], addr: tuple,
+                  client: Optional[ClientInfo] = None) -> Optional[str]:
+        """인증된 클라이언트의 메시지 하나 처리 (실패 시 클라이언트에 보낼 오류 메시지 반환)
+
+        client: 호출자가 이미 찾은 클라이언트 (batch 가 이벤트마다 다시 찾지 않게)
+        """
+        if msg_type in CONTROLLER_MESSAGES and not (client or self.server.get_client(addr)).is_controller:
+            return "Forbidden for view-only clients"
+
         handler = self._message_handlers.get(msg_type)
-        if handler:
-            try:
-                handler(message, addr)
-            except Exception as e:
-                self.logger.error(f"Error handling {msg_type}: {e}", exc_info=True)
-                self._send_error(addr, f"Command execution failed: {str(e)}")
-        else:
-            self._send_error(addr, f"Unknown message type: {msg_type}")
+        if handler is None:
+            return f"Unknown message type: {msg_type}"
+        try:
+            handler(message, addr)
+        except Exception as e:
+            self.metrics.error('handler')
+            self.logger.error(f"Error handling {msg_type}: {e}", exc_info=True)
+            return f"Command execution failed: {str(e)}"
+        return None
+
+    def _handle_batch(self, message: Dict[str, Any], addr: tuple):
+        """여러 이벤트를 순서대로 처리 (인증 확인/활동 갱신은 데이터그램당 한 번)
+
+        이벤트별 실패는 오류 패킷 대신 확인 응답의 errors 로 모아서 알린다.
+        """
+        events = message.get('events')
+        if not isinstance(events, list) or len(events) > Constants.MAX_BATCH_EVENTS:
+            self.metrics.error('batch')
+            self._send_error(addr, f"Batch must be a list of at most {Constants.MAX_BATCH_EVENTS} events")
+            return
+
+        client = self.server.get_client(addr)
+        acks = client.batch_acks
+        # 패킷 헤더의 seq 는 모든 메시지가 공유하므로 배치 전용 번호로 중복/누적 확인
+        batch_seq = message.get('batch_seq')
+        if batch_seq is not None and not acks.receive(int(batch_seq)):
+            # 재전송된 배치: 다시 실행하지 않고, 확인 응답을 못 받은 것이므로 바로 응답
+            self._send_batch_ack(addr, client)
+            return
+
+        self.metrics.batch_events.observe(len(events))
+        processed = 0
+        errors = []
+        for index, event in enumerate(events):
+            type_name = event.get('type') if isinstance(event, dict) else None
+            msg_type = _BATCHABLE_TYPES.get(type_name) if isinstance(type_name, str) else None
+            if msg_type is None:
+                errors.append({'index': index, 'message': f"{type_name} is not allowed in a batch"
+                               if type_name in (MessageType.AUTH.value, MessageType.BATCH.value)
+                               else 'Unknown message type'})
+                continue
+            error = self._dispatch(msg_type, event, addr, client)
+            if error:
+                errors.append({'index': index, 'message': error})
+            else:
+                processed += 1
+            if msg_type is MessageType.DISCONNECT:
+                # disconnect 이후 이벤트는 처리하지 않음
+                return
+
+        acks.executed(batch_seq, processed)
+        if errors or acks.unacked >= Constants.BATCH_ACK_EVERY:
+            self._send_batch_ack(addr, client, errors)
+        elif client.batch_ack_timer is None:
+            client.batch_ack_timer = asyncio.get_running_loop().call_later(
+                Constants.BATCH_ACK_DELAY, self._flush_batch_ack, addr, client)
+
+    def _flush_batch_ack(self, addr: tuple, client: ClientInfo):
+        # 타이머가 도는 동안 BATCH_ACK_EVERY 로 이미 보냈으면 남은 배치만 (없으면 보내지 않음)
+        client.batch_ack_timer = None
+        if self.server.get_client(addr) is client and client.batch_acks.unacked:
+            self._send_batch_ack(addr, client)
+
+    def _send_batch_ack(self, addr: tuple, client: ClientInfo, errors: Optional[List[Dict[str, Any]]] = None):
+        """지난 확인 이후 실행한 배치의 누적 확인 응답 (오류가 없으면 바이너리 코덱 레이아웃)"""
+        response = {
+            'type': MessageType.BATCH_ACK.value,
+            # ack: 이 번호까지의 배치는 모두 처리됨, processed: 지난 확인 이후 처리한 이벤트 수
+            **client.batch_acks.take(),
+            'timestamp': int(time.time() * 1000)
+        }
+        if errors:
+            response['errors'] = errors
+        self._send_message(addr, response)
 
     def _handle_auth(self, message: Dict[str, Any], addr: tuple):
-        code = message.get('code')
-        if code != self.server.connection_code:
+        # 인증된 클라이언트의 재인증(_dispatch 경유)도 같은 제한을 받음
+        if not self.server.allow_auth_attempt(addr):
+            self._send_error(addr, "Too many auth attempts")
+            return
+        # 연결 코드로 세션과 역할(컨트롤러/뷰어) 결정
+        resolved = self.server.sessions.resolve_code(message.get('code'))
+        if resolved is None:
             self.logger.warning(f"Invalid auth code from {addr}")
+            self.server.record_auth_failure(addr)
+            self.metrics.error('auth')
             self._send_error(addr, "Invalid connection code")
             return
+        session, role = resolved
+
+        # 와이어 코덱 협상 (미지원 클라이언트는 JSON 유지)
+        codec = negotiate_codec(message.get('codecs'), message.get('protocol_version'))
 
-        self.server.authenticate_client(addr)
-        self.logger.info(f"Client authenticated: {addr}")
+        # 청크 프레임 전송 지원 여부 (미지원 클라이언트는 base64 JSON 프레임)
+        # WebSocket 클라이언트는 항상 프레임 전체를 바이너리 메시지 하나로 받음
+        if self.server.websockets is not None and addr in self.server.websockets:
+            frame_transport = 'websocket'
+        else:
+            frame_transport = 'chunked' if message.get('frame_transport') == 'chunked' else 'json'
+        delta_frames = bool(message.get('delta_frames', False))
+
+        # 프레임 이미지 포맷 협상 (미지원 클라이언트는 JPEG)
+        frame_codec = negotiate_frame_codec(message.get('frame_codecs'))
+
+        try:
+            self.server.authenticate_client(addr, session, role, codec=codec,
+                                            frame_transport=frame_transport,
+                                            delta_frames=delta_frames, frame_codec=frame_codec)
+        except SessionError as e:
+            self._send_error(addr, str(e))
+            return
+        self.logger.info(f"Client authenticated: {addr} (session: {session.session_id}, "
+                         f"role: {role}, codec: {codec}, frames: {frame_transport})")
         
         self._send_message(addr, {
             'type': MessageType.AUTH_RESPONSE.value,
             'status': 'success',
+            'session_id': session.session_id,
+            'role': role,
+            'codec': codec,
+            'protocol_version': PROTOCOL_VERSION,
+            'frame_transport': frame_transport,
+            'chunk_size': Constants.FRAME_CHUNK_SIZE,
+            'delta_frames': delta_frames,
+            'frame_codec': frame_codec,
+            'frame_codecs': available_codecs(),
+            'capture_modes': list(CAPTURE_MODES),
+            'keepalive_interval': Constants.KEEPALIVE_INTERVAL,
+            'max_batch': Constants.MAX_BATCH_EVENTS,
+            'batch_ack_delay_ms': int(Constants.BATCH_ACK_DELAY * 1000),
+            'macros': list(self.server.macros.macros),
+            'cursor_stream': True,
+            'http_port': self.server.http_port,
+            'monitors': self.server.monitor_layout(),
             'timestamp': int(time.time() * 1000)
         })
 
     def _handle_mouse_move(self, message: Dict[str, Any], addr: tuple):
-        try:
-            if message.get('is_laser', False):
-                # 레이저 모드: 절대 좌표 처리
-                x = float(message.get('x', 0.5)) * self.server.screen_width
-                y = float(message.get('y', 0.5)) * self.server.screen_height
-                
-                # 화면 경계 확인
-                x = max(0, min(x, self.server.screen_width - 1))
-                y = max(0, min(y, self.server.screen_height - 1))
-                
-                print(f"    Laser pointer moved to: ({x:.2f}, {y:.2f})")
-                pyautogui.moveTo(int(x), int(y), duration=0)
-                
-            else:
-                # 일반 모드: 상대 좌표 처리
-                current_x, current_y = pyautogui.position()
-                dx = float(message.get('dx', 0))
-                dy = float(message.get('dy', 0))
-                
-                # 이동 거리 계산
-                new_x = int(current_x + dx)
-                new_y = int(current_y + dy)
-                
-                # 화면 경계 확인
-                new_x = max(0, min(new_x, self.server.screen_width - 1))
-                new_y = max(0, min(new_y, self.server.screen_height - 1))
-                
-                print(f"    Mouse moved to: ({new_x}, {new_y})")
-                pyautogui.moveTo(new_x, new_y, duration=0)
-            
-        except Exception as e:
-            self.logger.error(f"Mouse move error: {e}")
-            print(f"    Error moving mouse: {e}")
-
-    def _calculate_acceleration(self, dx: float, dy: float) -> float:
-        """가속도 기반 감도 계산"""
-        # 움직임의 크기 계산
-        movement = math.sqrt(dx * dx + dy * dy)
-        
-        # 기본 감도
-        base_sensitivity = 0.8  # 기본 감도를 낮춤
-        
-        # 미세 움직임
-        if movement < 0.1:  # 더 작은 임계값
-            return base_sensitivity * 0.3
-        # 일반 움직임
-        elif movement < 0.5:  # 임계값 조정
-            return base_sensitivity
-        # 빠른 움직임
-        else:
-            # 최대 1.5배로 제한
-            acceleration = min(1.5, 1.0 + (movement - 0.5) * 0.3)
-            return base_sensitivity * acceleration
+        # 병합 단계로 전달 (중복/역순 패킷 폐기, 틱 단위 합산)
+        self.server.pointer_pipeline.submit(addr, message, self.received_at)
 
     def _handle_mouse_click(self, message: Dict[str, Any], addr: tuple):
         click_type = message.get('click_type', 'left')
         self.logger.debug(f"Mouse click: {click_type}")
         
-        if click_type == 'double':
-            pyautogui.doubleClick()
-        elif click_type == 'right':
-            pyautogui.rightClick()
-        else:
-            pyautogui.click()
+        if not self.server.input_injector.submit_click(click_type, self.received_at):
+            self.metrics.error('input_queue_full')
+            self._send_error(addr, "Input queue full")
 
     def _handle_keyboard(self, message: Dict[str, Any], addr: tuple):
         key = message.get('key', '')
         self.logger.debug(f"Keyboard input: {key}")
         
         if key in ['f5', 'esc']:
-            asyncio.create_task(self.server.handle_presentation_toggle(message))
+            submitted = self.server.handle_presentation_toggle(key, addr, self.received_at)
         else:
-            pyautogui.press(key)
+            submitted = self.server.input_injector.submit_key(key, self.received_at)
+        if not submitted:
+            self.metrics.error('input_queue_full')
+            self._send_error(addr, "Input queue full")
+        elif key in Constants.SLIDE_KEYS:
+            self.server.schedule_slide_check(addr)
 
-    def _handle_keepalive(self, message: Dict[str, Any], addr: tuple):
+    def _handle_macro(self, message: Dict[str, Any], addr: tuple):
+        """이름으로 매크로 실행 (여러 키 입력을 패킷 하나로)"""
+        name = message.get('name')
+        try:
+            run = self.server.macro_runner.start(addr, name, message.get('args'), self.received_at)
+        except MacroError as e:
+            self.metrics.error('macro')
+            self._send_macro_status(addr, {'name': name, 'status': 'rejected', 'message': str(e)})
+            return
+        self._send_macro_status(addr, {'run_id': run.run_id, 'name': run.name, 'status': 'started'})
+
+    def _handle_macro_cancel(self, message: Dict[str, Any], addr: tuple):
+        # 취소 결과는 실행 종료 시 macro_status 로 전달
+        if not self.server.macro_runner.cancel(addr):
+            self._send_error(addr, "No macro running")
+
+    def _handle_slide_list(self, message: Dict[str, Any], addr: tuple):
+        """지금까지 표시된 슬라이드 (이미지는 HTTP 포트의 내용 해시 URL)"""
         self._send_message(addr, {
-            'type': MessageType.KEEPALIVE_RESPONSE.value,
+            'type': MessageType.SLIDE_LIST.value,
+            'http_port': self.server.http_port,
+            'slides': self.server.slides.listing()
+        })
+
+    def _handle_macro_list(self, message: Dict[str, Any], addr: tuple):
+        self._send_message(addr, {
+            'type': MessageType.MACRO_LIST.value,
+            'macros': self.server.macros.info(),
             'timestamp': int(time.time() * 1000)
         })
 
+    def _send_macro_status(self, addr: tuple, status: Dict[str, Any]):
+        status['type'] = MessageType.MACRO_STATUS.value
+        status['timestamp'] = int(time.time() * 1000)
+        self._send_message(addr, status)
+
+    def _handle_keepalive(self, message: Dict[str, Any], addr: tuple):
+        self.server.client_keepalive(addr, message, self.received_at)
+        response = {
+            'type': MessageType.KEEPALIVE_RESPONSE.value,
+            'timestamp': int(time.time() * 1000),
+            # 클라이언트가 다음 keepalive 의 echo 로 돌려줄 서버 단조 시각 (ms)
+            'server_ts': timestamp_ms()
+        }
+        if 'timestamp' in message:
+            # 클라이언트 측 RTT 측정용 echo (서버 보관 시간 포함)
+            response['echo'] = message['timestamp']
+            response['echo_delay'] = int((time.monotonic() - self.received_at) * 1000)
+        self._send_message(addr, response)
+
     def _handle_disconnect(self, message: Dict[str, Any], addr: tuple):
         self.server.remove_client(addr)
         self.logger.info(f"Client disconnected: {addr}")
 
     def _handle_frame_request(self, message: Dict[str, Any], addr: tuple):
+        client = self.server.get_client(addr)
+        if client and client.tile_differ and message.get('keyframe', False):
+            client.tile_differ.request_keyframe()
         asyncio.create_task(self.server.send_frame(addr))
 
+    def _handle_frame_nack(self, message: Dict[str, Any], addr: tuple):
+        missing = [int(index) for index in message.get('missing', [])]
+        client = self.server.get_client(addr)
+        if client and client.streaming_enabled and client.session.stream:
+            client.session.stream.on_loss()
+        asyncio.create_task(self.server.frame_sender.retransmit(
+            addr, int(message.get('frame_id', -1)), missing))
+
+    def _handle_frame_ack(self, message: Dict[str, Any], addr: tuple):
+        client = self.server.get_client(addr)
+        if client and client.streaming_enabled and client.session.stream:
+            client.session.stream.on_ack(int(message.get('frame_id', -1)))
+
+    def _handle_capture_region(self, message: Dict[str, Any], addr: tuple):
+        client = self.server.get_client(addr)
+        mode = message.get('mode', 'full')
+        if mode not in CAPTURE_MODES:
+            self._send_error(addr, f"Unknown capture mode: {mode}")
+            return
+        monitor = int(message.get('monitor', client.capture_monitor))
+        if mode == 'monitor' and not 0 <= monitor < len(self.server.monitor_layout()):
+            self._send_error(addr, f"Invalid monitor index: {monitor}")
+            return
+
+        client.capture_mode = mode
+        client.capture_monitor = monitor
+        client.capture_zoom = float(message.get('zoom', client.capture_zoom))
+        if client.tile_differ:
+            client.tile_differ.request_keyframe()
+        if client.is_controller:
+            # 세션 스트림은 컨트롤러의 캡처 영역을 따름
+            for differ in client.session.differs.values():
+                differ.request_keyframe()
+        self.logger.info(f"Capture mode for {addr}: {mode}")
+
+    def _handle_stream_start(self, message: Dict[str, Any], addr: tuple):
+        self.server.start_streaming(addr, message)
+
+    def _handle_stream_stop(self, message: Dict[str, Any], addr: tuple):
+        self.server.stop_streaming(addr)
+
+    def _handle_stream_stats(self, message: Dict[str, Any], addr: tuple):
+        client = self.server.get_client(addr)
+        session = client.session if client else None
+        self._send_message(addr, {
+            'type': MessageType.STREAM_STATS.value,
+            'streaming': bool(client and client.streaming_enabled),
+            'stats': session.stream.stats() if session and session.stream else None,
+            'viewers': len(session.streaming_members()) if session else 0,
+            'timestamp': int(time.time() * 1000)
+        })
+
+    def _handle_link_stats(self, message: Dict[str, Any], addr: tuple):
+        client = self.server.get_client(addr)
+        self._send_message(addr, {
+            'type': MessageType.LINK_STATS.value,
+            'stats': client.link.stats(),
+            'input_tick_ms': round(self.server.pointer_pipeline.tick_interval * 1000, 2),
+            'pointer_prediction_ms': round(self.server.motion_engine.prediction * 1000, 2),
+            'liveness_timeout_s': round(self.server._liveness_timeout(client), 2),
+            'timestamp': int(time.time() * 1000)
+        })
+
     def _send_message(self, addr: tuple, message: Dict[str, Any]):
+        tracer = self.tracer
+        started = time.perf_counter() if tracer is not None else 0.0
         try:
-            data = json.dumps(message).encode()
+            data = None
+            client = self.server.get_client(addr)
+            if client and client.codec == BINARY_CODEC.name:
+                # 바이너리 레이아웃이 없는 메시지는 JSON으로 폴백
+                data = BINARY_CODEC.encode(message, client.tx_seq)
+                if data is not None:
+                    client.tx_seq += 1
+            if data is None:
+                data = JSON_CODEC.encode(message)
             self.transport.sendto(data, addr)
+            self.bytes_sent += len(data)
+            if tracer is not None:
+                tracer.record('send', 'udp', started, time.perf_counter())
         except Exception as e:
+            self.metrics.error('send')
             self.logger.error(f"Error sending message to {addr}: {e}")
 
+    def broadcast_message(self, addrs: List[tuple], message: Dict[str, Any]):
+        """같은 메시지를 여러 클라이언트에 전송 (JSON 직렬화는 한 번만)"""
+        try:
+            data = JSON_CODEC.encode(message)
+        except Exception as e:
+            self.metrics.error('send')
+            self.logger.error(f"Error encoding broadcast message: {e}")
+            return
+        for addr in addrs:
+            try:
+                self.transport.sendto(data, addr)
+                self.bytes_sent += len(data)
+            except Exception as e:
+                self.metrics.error('send')
+                self.logger.error(f"Error sending message to {addr}: {e}")
+
     def _send_error(self, addr: tuple, message: str):
         self._send_message(addr, {
             'type': MessageType.ERROR.value,
@@ -235,26 +675,47 @@ class UDPServerProtocol:
         self.logger.warning(f'Connection lost: {exc}')
     
 class RemoteControlServer:
-    def __init__(self, udp_port=8080, http_port=8081):
+    def __init__(self, udp_port=8080, http_port=8081, input_backend=None, screen_source=None,
+                 udp_io=Constants.UDP_IO_BACKEND, recording_dir=Constants.RECORDING_DIR):
         # 로거 설정
         self.logger = logging.getLogger('RemoteControlServer')
         
         # 네트워크 설정
         self.udp_port = udp_port
         self.http_port = http_port
+        self.udp_io = udp_io
         self.connection_code = ''.join(random.choices(
             string.ascii_uppercase + string.digits, 
             k=6
         ))
         self.client_address = None
         
-        # 클라이언트 관리
-        self._clients = {}  # 클라이언트 관리를 위한 딕셔너리 추가
+        # 세션/클라이언트 관리 (기본 세션의 컨트롤러 코드가 connection_code)
+        self.sessions = SessionManager(
+            code_length=Constants.CONNECTION_CODE_LENGTH,
+            max_viewers=Constants.MAX_SESSION_VIEWERS
+        )
+        self.default_session = self.sessions.create_session(self.connection_code)
     
         # 시스템 설정
         self.os_type = platform.system()
-        pyautogui.FAILSAFE = False
-        self.screen_width, self.screen_height = pyautogui.size()
+        self.metrics = ServerMetrics()
+        if input_backend is None:
+            # pyautogui import 와 화면 크기 조회는 첫 사용(또는 시작 후 워밍업)까지 미룸
+            input_backend = LazyInputBackend(PyAutoGUIBackend, on_load=self._input_backend_loaded)
+            self.screen_width, self.screen_height = Constants.DEFAULT_SCREEN_SIZE
+            valid_keys = None
+        else:
+            self.screen_width, self.screen_height = input_backend.size()
+            valid_keys = input_backend.key_names()
+        self.input_backend = input_backend
+        self.input_injector = InputInjector(self.input_backend, max_queue=Constants.INPUT_QUEUE_SIZE,
+                                            observer=self.metrics.observe_injection)
+
+        # 매크로: 시작 시 한 번 검증/컴파일 (설정 오류는 서버 시작 실패)
+        # 지연 로드 백엔드는 키 이름/화면 크기를 로드 후 다시 검증 (_input_backend_loaded)
+        self.macros = self._load_macros(Constants.MACRO_FILE, valid_keys)
+        self.macro_runner = MacroRunner(self.macros, self.input_injector, on_finished=self._macro_finished)
         
         # 마우스 제어 설정
         self.mouse_speed_multiplier = 0.8    # 기본 감도
@@ -265,102 +726,182 @@ class RemoteControlServer:
         self.laser_smoothing = 0.2          # 레이저 모드 부드러움
         self.laser_sensitivity = 1.0        # 레이저 모드 감도
         
-        # 화면 캡처 설정
-        self.screen_capture = mss()
+        # 시스템별 설정
+        if self.os_type == 'Darwin':  # macOS
+            self.mouse_speed_multiplier *= 0.7  # macOS에서는 감도를 약간 낮춤
+        elif self.os_type == 'Windows':
+            self.mouse_speed_multiplier *= 1.2  # Windows에서는 감도를 약간 높임
+        
+        # 화면 캡처 설정 (캡처/인코딩은 워커 풀에서 수행, 파이프라인은 첫 사용 시 생성)
+        self.screen_source = screen_source
+        self._frame_pipeline: Optional['FramePipeline'] = None
+        self._monitor_layout: Optional[List[Dict[str, int]]] = None  # 시작 시 한 번 읽어 캐시
         self.compression_quality = 50       # JPEG 압축 품질 (1-100)
         self.scale_factor = 0.5            # 스트리밍 해상도 스케일
+        self.frame_sender = FrameSender(
+            chunk_size=Constants.FRAME_CHUNK_SIZE,
+            rate=Constants.FRAME_PACING_RATE,
+            burst=Constants.FRAME_PACING_BURST,
+            history=Constants.FRAME_HISTORY
+        )
+        # 스트리밍 클라이언트가 stream_start 의 cursor 옵션으로 구독하는 포인터 위치
+        self.cursor = CursorPublisher()
+        # 표시된 슬라이드 필름스트립 (키 입력마다 마지막 확인만 유지)
+        self.slides = SlideCache(
+            max_bytes=Constants.SLIDE_CACHE_BYTES,
+            max_slides=Constants.SLIDE_CACHE_MAX,
+            threshold=Constants.SLIDE_HASH_THRESHOLD
+        )
+        self._slide_task: Optional[asyncio.Task] = None
+        # 인코딩된 프레임/입력 기록 (늦게 참여한 시청자에게 마지막 키프레임을 재인코딩 없이 전송)
+        self.recorder = SessionRecorder(
+            # 같은 초에 다시 시작해도 겹치지 않게 프로세스 번호를 붙임
+            os.path.join(recording_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"),
+            segment_bytes=Constants.RECORDING_SEGMENT_BYTES,
+            max_segments=Constants.RECORDING_MAX_SEGMENTS,
+            max_pending=Constants.RECORDING_MAX_PENDING
+        ) if recording_dir else None
         
         # 서버 상태
         self.transport = None
         self.protocol = None
+        # /ws 클라이언트: 받은 메시지는 UDP 와 같은 디코드/디스패치 경로로
+        self.websockets = WebSocketHub(
+            on_message=lambda data, addr: self.protocol.datagram_received(data, addr),
+            on_close=self.remove_client,
+            max_messages=Constants.WS_MAX_MESSAGES,
+            high_water=Constants.WS_HIGH_WATER,
+            max_message_size=Constants.WS_MAX_MESSAGE_SIZE
+        )
         self.presentation_mode = False
         
-        # 활동 관리
-        self.last_activity_time = None
-        self.inactivity_timeout = 600      # 10분
+        # 활동 관리 (인증 시도/keepalive/비활성 만료를 루프 단조 시계 기반 타이밍 휠로 처리)
+        self.liveness = TimingWheel(tick=Constants.LIVENESS_TICK)
+        self._auth_failures: Dict[str, int] = {}  # 원격 IP -> AUTH_TIMEOUT 동안의 인증 실패 횟수
+        self._liveness_task = None
         
-        # QR 코드 생성
-        self._generate_qr_code()
+        # 연결 페이지/QR: 첫 요청 때 메모리에 한 번 렌더링 (경로 -> (본문, Content-Type, ETag))
+        self._connection_assets: Optional[asyncio.Future] = None
         
-        # 마우스 상태 추적
-        self._last_mouse_pos = pyautogui.position()
-        self._last_update_time = time.time()
+        # 마우스 상태 추적: 병합 단계(시퀀스 검사, 가속) -> 모션 엔진(고정 주기, 추정, 평활화) -> 인젝터
+        self.motion_engine = PointerMotionEngine(
+            self._inject_pointer,
+            (self.screen_width, self.screen_height),
+            rate=Constants.POINTER_MOTION_RATE,
+            min_cutoff=smoothing_cutoff(self.mouse_smoothing, Constants.POINTER_FILTER_CUTOFF),
+            laser_min_cutoff=smoothing_cutoff(self.laser_smoothing, Constants.POINTER_FILTER_CUTOFF),
+            beta=Constants.POINTER_FILTER_BETA,
+            prediction=Constants.POINTER_PREDICTION
+        )
+        self.pointer_pipeline = PointerInputPipeline(
+            (self.screen_width, self.screen_height),
+            get_position=self.input_backend.position,
+            move_to=self.motion_engine.update,
+            tick_interval=Constants.INPUT_TICK_INTERVAL,
+            resync_interval=Constants.POINTER_RESYNC_INTERVAL,
+            acceleration=AccelerationCurve(self.mouse_speed_multiplier),
+            laser_sensitivity=self.laser_sensitivity
+        )
         
         # 디버깅 설정
         self.debug_mode = False            # 디버그 모드
-        
-        # 시스템별 설정
-        if self.os_type == 'Darwin':  # macOS
-            self.mouse_speed_multiplier *= 0.7  # macOS에서는 감도를 약간 낮춤
-        elif self.os_type == 'Windows':
-            self.mouse_speed_multiplier *= 1.2  # Windows에서는 감도를 약간 높임
+        self.log_pointer_moves = Constants.LOG_POINTER_MOVES
+        self._register_metric_callbacks()
+
+        # 진단 모드 (활성화 전에는 None: 핫 패스는 None 비교만 수행)
+        self.tracer: Optional[TraceRecorder] = None
+        self.stall_monitor: Optional[LoopStallMonitor] = None
         
         self.logger.info(f"Initialized RemoteControlServer on {self.os_type}")
+        if not isinstance(self.input_backend, LazyInputBackend):
+            self.logger.info(f"Screen size: {self.screen_width}x{self.screen_height}")
+
+    @property
+    def frame_pipeline(self) -> 'FramePipeline':
+        """캡처/인코딩 파이프라인 (numpy/PIL/mss import 와 워커 풀 생성을 첫 사용까지 미룸)"""
+        if self._frame_pipeline is None:
+            from frame_pipeline import FramePipeline
+            self._frame_pipeline = FramePipeline(
+                max_workers=Constants.FRAME_WORKERS,
+                cache_interval=Constants.FRAME_CACHE_INTERVAL,
+                screen_source=self.screen_source
+            )
+        return self._frame_pipeline
+
+    def _input_backend_loaded(self, backend):
+        """지연 로드된 입력 백엔드 반영 (로드한 스레드에서, 첫 호출이 반환되기 전에 실행)"""
+        screen_size = backend.size()
+        self.screen_width, self.screen_height = screen_size
+        self.pointer_pipeline.screen_width, self.pointer_pipeline.screen_height = screen_size
+        self.motion_engine.screen_width, self.motion_engine.screen_height = screen_size
         self.logger.info(f"Screen size: {self.screen_width}x{self.screen_height}")
+        if os.path.exists(Constants.MACRO_FILE):
+            # 실제 키 이름/화면 크기로 다시 컴파일 (통과하지 못하면 매크로 비활성화)
+            try:
+                library = self._load_macros(Constants.MACRO_FILE, backend.key_names())
+            except MacroError:
+                library = MacroLibrary()
+            self.macros = self.macro_runner.library = library
 
-    def is_client_authenticated(self, addr):
-        """클라이언트 인증 상태 확인"""
-        return addr in self._clients
-        
-    def authenticate_client(self, addr):
-        """클라이언트 인증"""
-        self._clients[addr] = {
-            'last_activity': time.time(),
-            'authenticated': True
+    def _warm_up(self):
+        """포트를 연 뒤 백그라운드 스레드에서 입력 백엔드와 캡처 모듈 미리 로드 (첫 입력/프레임 지연 제거)"""
+        start = time.perf_counter()
+        try:
+            if isinstance(self.input_backend, LazyInputBackend):
+                self.input_backend.load()
+            importlib.import_module('frame_pipeline')
+        except Exception as e:
+            self.logger.error(f"Warm-up failed: {e}")
+            return
+        self.logger.info(f"Warm-up finished in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def _render_qr_png(self, local_ip: str) -> bytes:
+        """연결 정보 QR 코드 PNG"""
+        import qrcode
+
+        qr_data = {
+            'code': self.connection_code,
+            'port': self.udp_port,
+            'ip': local_ip
         }
         
-    def update_client_activity(self, addr):
-        """클라이언트 활동 시간 업데이트"""
-        if addr in self._clients:
-            self._clients[addr]['last_activity'] = time.time()
-            
-    def remove_client(self, addr):
-        """클라이언트 제거"""
-        if addr in self._clients:
-            del self._clients[addr]
+        qr = qrcode.QRCode(
+            version=1,
+            box_size=Constants.QR_CODE_SIZE,
+            border=Constants.QR_CODE_BORDER
+        )
+        qr.add_data(json.dumps(qr_data))
+        qr.make(fit=True)
+        
+        buffer = io.BytesIO()
+        qr.make_image(fill_color="black", back_color="white").save(buffer, format='PNG')
+        return buffer.getvalue()
 
-    def _generate_qr_code(self):
-        """QR 코드 생성"""
+    def _get_local_ip(self) -> str:
+        """로컬 IP 주소 얻기 (네트워크 인터페이스 열거, 사설 IPv4 우선)"""
         try:
-            local_ip = self._get_local_ip()
-            
-            qr_data = {
-                'code': self.connection_code,
-                'port': self.udp_port,
-                'ip': local_ip
-            }
-            
-            qr = qrcode.QRCode(
-                version=1,
-                box_size=Constants.QR_CODE_SIZE,
-                border=Constants.QR_CODE_BORDER
-            )
-            qr.add_data(json.dumps(qr_data))
-            qr.make(fit=True)
-            
-            qr_image = qr.make_image(fill_color="black", back_color="white")
-            qr_image.save('connection_qr.png')
-            
-            self.logger.info(f"QR code generated with IP: {local_ip}")
-            
+            import psutil
+            stats = psutil.net_if_stats()
+            candidates = []
+            for name, addresses in psutil.net_if_addrs().items():
+                if name in stats and not stats[name].isup:
+                    continue
+                for address in addresses:
+                    if address.family != socket.AF_INET:
+                        continue
+                    ip = ipaddress.IPv4Address(address.address)
+                    if ip.is_loopback or ip.is_link_local or ip.is_unspecified:
+                        continue
+                    candidates.append((not ip.is_private, address.address))
+            if candidates:
+                return min(candidates)[1]
         except Exception as e:
-            self.logger.error(f"Failed to generate QR code: {e}")
-            raise
+            self.logger.warning(f"Interface enumeration failed: {e}")
+        self.logger.warning("Could not determine local IP, using localhost")
+        return '127.0.0.1'
 
-    def _get_local_ip(self) -> str:
-        """로컬 IP 주소 얻기"""
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(('8.8.8.8', 80))
-            local_ip = s.getsockname()[0]
-            s.close()
-            return local_ip
-        except Exception:
-            self.logger.warning("Could not determine local IP, using localhost")
-            return '127.0.0.1'
-
-    def create_html(self):
-        """연결 페이지 HTML 생성"""
+    def _render_html(self) -> str:
+        """연결 페이지 HTML"""
         html_content = f"""
         <!DOCTYPE html>
         <html>
@@ -411,6 +952,7 @@ class RemoteControlServer:
             <div class="container">
                 <h2>연결 정보</h2>
                 <p class="code">Connection Code: {self.connection_code}</p>
+                <p class="info">Viewer Code (보기 전용): {self.default_session.viewer_code}</p>
                 <p class="info">UDP Port: {self.udp_port}</p>
                 <h3>QR 코드로 연결하기</h3>
                 <img src="connection_qr.png" alt="Connection QR Code">
@@ -419,32 +961,68 @@ class RemoteControlServer:
         </body>
         </html>
         """
-        with open('connection.html', 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        return html_content
+
+    def _render_connection_assets(self) -> Dict[str, Tuple[bytes, str, str]]:
+        """연결 페이지와 QR 코드를 메모리에 렌더링 (경로 -> (본문, Content-Type, ETag))"""
+        local_ip = self._get_local_ip()
+        assets = {
+            '/': (self._render_html().encode('utf-8'), 'text/html; charset=utf-8'),
+            '/connection_qr.png': (self._render_qr_png(local_ip), 'image/png'),
+        }
+        self.logger.info(f"QR code generated with IP: {local_ip}")
+        return {path: (body, content_type, f'"{hashlib.sha256(body).hexdigest()[:16]}"')
+                for path, (body, content_type) in assets.items()}
+
+    async def _handle_connection_asset(self, request: web.Request) -> web.Response:
+        """연결 페이지/QR (렌더링은 첫 요청 때 워커 스레드에서 한 번, ETag 가 같으면 304)"""
+        if self._connection_assets is None:
+            self._connection_assets = asyncio.get_running_loop().run_in_executor(
+                None, self._render_connection_assets)
+        try:
+            assets = await asyncio.shield(self._connection_assets)
+        except Exception as e:
+            self.logger.error(f"Failed to render connection page: {e}")
+            self._connection_assets = None
+            raise web.HTTPInternalServerError()
+        body, content_type, etag = assets[request.path]
+        # 연결 코드는 서버 실행마다 바뀌므로 캐시해 두되 매번 ETag 로 재검증
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if_none_match = request.headers.get('If-None-Match', '')
+        if if_none_match.strip() == '*' or etag in (tag.strip() for tag in if_none_match.split(',')):
+            return web.Response(status=304, headers=headers)
+        headers['Content-Type'] = content_type
+        return web.Response(body=body, headers=headers)
 
     async def start(self):
         """서버 시작"""
         try:
-            self.create_html()
-            
             # HTTP 서버 설정
             app = web.Application()
-            app.router.add_get('/', lambda r: web.FileResponse('connection.html'))
-            app.router.add_get('/connection_qr.png', lambda r: web.FileResponse('connection_qr.png'))
+            app.router.add_get('/', self._handle_connection_asset)
+            app.router.add_get('/connection_qr.png', self._handle_connection_asset)
+            app.router.add_get('/metrics', self._handle_metrics)
+            app.router.add_get('/sessions', self._handle_list_sessions)
+            app.router.add_post('/sessions', self._handle_create_session)
+            app.router.add_delete('/sessions/{session_id}', self._handle_delete_session)
+            app.router.add_get('/debug/diagnostics', self._handle_diagnostics)
+            app.router.add_post('/debug/diagnostics', self._handle_diagnostics)
+            app.router.add_get('/debug/trace', self._handle_trace)
+            app.router.add_get('/ws', self._handle_websocket)
+            app.router.add_get('/slides/{name}', self._handle_slide_image)
 
-            # 브라우저 자동 실행
-            import webbrowser
-            webbrowser.open(f'http://localhost:{self.http_port}')
-            
             self.logger.info("="*50)
             self.logger.info("=== Remote Control Server ===")
             
+            # 입력 주입 스레드 시작
+            self.input_injector.start()
+
+            # 모니터 배치는 인증마다 읽지 않고 시작 시 한 번 실행기에서 읽음
+            loop = asyncio.get_running_loop()
+            loop.run_in_executor(None, self._load_monitor_layout)
+
             # UDP 서버 시작
-            loop = asyncio.get_event_loop()
-            self.transport, self.protocol = await loop.create_datagram_endpoint(
-                lambda: UDPServerProtocol(self),
-                local_addr=('0.0.0.0', self.udp_port)
-            )
+            await self._start_udp()
             
             # HTTP 서버 시작
             runner = web.AppRunner(app)
@@ -455,15 +1033,27 @@ class RemoteControlServer:
             # 서버 정보 출력
             self.logger.info(f"Server is running")
             self.logger.info(f"Connection Code: {self.connection_code}")
+            self.logger.info(f"Viewer Code: {self.default_session.viewer_code}")
             self.logger.info(f"UDP Port: {self.udp_port}")
             self.logger.info(f"HTTP Port: {self.http_port}")
-            self.logger.info(f"QR Code: connection_qr.png")
+            self.logger.info(f"QR Code: http://localhost:{self.http_port}/connection_qr.png")
             self.logger.info(f"Web interface: http://localhost:{self.http_port}")
             self.logger.info("Waiting for connections...")
             self.logger.info("="*50)
+
+            if Constants.STARTUP_WARMUP:
+                loop.run_in_executor(None, self._warm_up)
+
+            # 브라우저 자동 실행 (프로세스 실행은 루프 밖에서)
+            if Constants.OPEN_BROWSER:
+                import webbrowser
+                loop.run_in_executor(None, webbrowser.open, f'http://localhost:{self.http_port}')
             
-            # 비활성 체크 시작
-            self._inactivity_check_task = asyncio.create_task(self._check_inactivity())
+            # 만료 스케줄러 시작
+            self._liveness_task = asyncio.create_task(self._run_liveness())
+
+            if Constants.DIAGNOSTICS_ENABLED:
+                self.enable_diagnostics()
             
             # 서버 실행 유지
             await asyncio.Future()  # 영원히 실행
@@ -474,18 +1064,72 @@ class RemoteControlServer:
         finally:
             await self.stop()
 
+    async def _start_udp(self):
+        """UDP 포트 열기 (batched 는 준비 이벤트당 여러 데이터그램 처리, 프로토콜은 동일)"""
+        local_addr = ('0.0.0.0', self.udp_port)
+        if self.udp_io == 'batched':
+            self.transport, self.protocol = await create_batched_endpoint(
+                lambda: UDPServerProtocol(self), local_addr,
+                batch=Constants.UDP_IO_BATCH,
+                rcvbuf=Constants.UDP_RECV_BUFFER,
+                sndbuf=Constants.UDP_SEND_BUFFER,
+                use_mmsg=Constants.UDP_IO_MMSG
+            )
+            rcvbuf, sndbuf = configure_socket_buffers(self.transport.get_extra_info('socket'))
+            io_mode = 'batched (recvmmsg/sendmmsg)' if Constants.UDP_IO_MMSG and mmsg_available() else 'batched'
+        else:
+            loop = asyncio.get_event_loop()
+            self.transport, self.protocol = await loop.create_datagram_endpoint(
+                lambda: UDPServerProtocol(self),
+                local_addr=local_addr
+            )
+            rcvbuf, sndbuf = configure_socket_buffers(self.transport.get_extra_info('socket'),
+                                                      Constants.UDP_RECV_BUFFER, Constants.UDP_SEND_BUFFER)
+            io_mode = 'asyncio'
+        self.frame_sender.transport = self.transport
+        self.cursor.transport = self.protocol.transport
+        self.logger.info(f"UDP I/O: {io_mode}, SO_RCVBUF {rcvbuf}, SO_SNDBUF {sndbuf}")
+
     async def stop(self):
         """서버 중지"""
         self.logger.info("Shutting down server...")
         
-        if self._inactivity_check_task:
-            self._inactivity_check_task.cancel()
+        if self._liveness_task:
+            self._liveness_task.cancel()
+        if self._slide_task:
+            self._slide_task.cancel()
+
+        if self.tracer is not None:
+            self.logger.info(f"Trace written to {self.dump_trace()}")
+            self.disable_diagnostics()
+
+        self.pointer_pipeline.cancel()
+        self.motion_engine.cancel()
+        self.macro_runner.cancel_all()
+        self.input_injector.stop()
+        if self._frame_pipeline is not None:
+            self._frame_pipeline.shutdown()
+            self.logger.info(f"Frame pipeline stats: {self._frame_pipeline.stats()}")
+        self.logger.info(f"Pointer pipeline stats: {self.pointer_pipeline.stats()}")
+        self.logger.info(f"Pointer motion stats: {self.motion_engine.stats()}")
+        self.logger.info(f"Input injector stats: {self.input_injector.stats()}")
+        self.logger.info(f"Macro stats: {self.macro_runner.stats()}")
+        self.logger.info(f"Cursor stream stats: {self.cursor.stats()}")
+        self.logger.info(f"Slide cache stats: {self.slides.stats()}")
+        if self.recorder is not None:
+            self.recorder.close()
+            self.logger.info(f"Recording stats ({self.recorder.directory}): {self.recorder.stats()}")
+        if isinstance(self.transport, BatchedDatagramTransport):
+            self.logger.info(f"UDP I/O stats: {self.transport.stats()}")
         
+        self.websockets.close_all()
         if self.transport:
             self.transport.close()
         
         # 연결된 클라이언트들에게 종료 알림
-        for addr in list(self._clients.keys()):
+        for client in self.sessions.clients():
+            addr = client.address
+            self.stop_streaming(addr)
             try:
                 self.protocol._send_message(addr, {
                     'type': MessageType.ERROR.value,
@@ -493,78 +1137,751 @@ class RemoteControlServer:
                 })
             except:
                 pass
-        
-        # 임시 파일 정리
-        try:
-            os.remove('connection_qr.png')
-            os.remove('connection.html')
-        except:
-            pass
 
-    async def _check_inactivity(self):
-        """비활성 클라이언트 체크"""
+    async def _run_liveness(self):
+        """마감이 지난 인증 시도/클라이언트 만료 (tick 마다 지나간 슬롯만 확인)"""
+        loop = asyncio.get_running_loop()
         while True:
             try:
-                await asyncio.sleep(60)  # 1분마다 체크
-                current_time = time.time()
-                
-                for addr, client in list(self._clients.items()):
-                    if current_time - client.last_activity > Constants.INACTIVITY_TIMEOUT:
-                        self.logger.info(f"Client {addr} timed out due to inactivity")
-                        self.remove_client(addr)
-                
+                await asyncio.sleep(Constants.LIVENESS_TICK)
+                # 기본 이벤트 루프의 loop.time() 은 수신 시각(received_at)과 같은 time.monotonic()
+                now = loop.time()
+                for kind, addr in self.liveness.advance(now, Constants.LIVENESS_BUDGET):
+                    if kind == 'auth':
+                        self._auth_failures.pop(addr, None)
+                        continue
+                    if kind == 'session':
+                        session = self.sessions.sessions.get(addr)
+                        if session is not None and next(session.members(), None) is None:
+                            self.close_session(session, 'idle')
+                        continue
+
+                    client = self.get_client(addr)
+                    if client is None:
+                        continue
+                    deadline = client.last_activity + self._liveness_timeout(client)
+                    if deadline > now:
+                        # 마지막 만료 예약 이후 활동이 있었음: 실제 마감으로 재등록
+                        self.liveness.add(('client', addr), deadline)
+                        continue
+                    reason = 'missed keepalives' if client.keepalive_seen else 'inactivity'
+                    self.logger.info(f"Client {addr} timed out due to {reason}")
+                    self.remove_client(addr)
+
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                self.logger.error(f"Error in inactivity check: {e}")
+                self.logger.error(f"Error in liveness check: {e}")
+
+    def _liveness_timeout(self, client: ClientInfo) -> float:
+        if client.keepalive_seen:
+            # 느린 링크에서 마지막 keepalive 가 도착 중일 수 있으므로 RTO 만큼 여유
+            return Constants.KEEPALIVE_INTERVAL * Constants.KEEPALIVE_MISSES + client.link.rto
+        return Constants.INACTIVITY_TIMEOUT
+
+    @staticmethod
+    def _auth_key(addr: tuple) -> str:
+        """인증 실패 집계 키: 원격 IP (포트 변경/WebSocket 재연결로 초기화되지 않도록)"""
+        host = str(addr[0])
+        return host[len('ws:'):] if host.startswith('ws:') else host
+
+    def allow_auth_attempt(self, addr: tuple) -> bool:
+        return self._auth_failures.get(self._auth_key(addr), 0) < Constants.MAX_AUTH_ATTEMPTS
+
+    def record_auth_failure(self, addr: tuple):
+        """AUTH_TIMEOUT 동안의 IP 별 인증 실패 횟수 기록 (첫 실패 시 만료 예약)"""
+        key = self._auth_key(addr)
+        failures = self._auth_failures.get(key, 0)
+        if failures == 0:
+            self.liveness.add(('auth', key), time.monotonic() + Constants.AUTH_TIMEOUT)
+        self._auth_failures[key] = failures + 1
+
+    def client_keepalive(self, addr: tuple, message: Dict[str, Any], received_at: float):
+        """keepalive 로 링크 추정치 갱신 (keepalive 를 보내는 클라이언트는 더 짧은 마감으로 감시)"""
+        client = self.get_client(addr)
+        if client is None:
+            return
+        timestamp = message.get('timestamp')
+        client.link.on_keepalive(
+            received_at,
+            seq=message.get('seq'),
+            timestamp=timestamp if isinstance(timestamp, (int, float)) else None,
+            echo=message.get('echo'),
+            echo_delay=message.get('echo_delay')
+        )
+        if client.is_controller:
+            # 도착 간격이 흔들리는 만큼 늦은 패킷 사이를 더 길게 추정
+            self.motion_engine.prediction = min(
+                Constants.POINTER_PREDICTION_MAX, Constants.POINTER_PREDICTION + client.link.jitter)
+        if not client.keepalive_seen:
+            client.keepalive_seen = True
+            self.liveness.add(('client', addr), client.last_activity + self._liveness_timeout(client))
 
     # 클라이언트 관리 메서드들
-    def authenticate_client(self, addr: tuple):
-        self._clients[addr] = ClientInfo(
+    def authenticate_client(self, addr: tuple, session: Session, role: str,
+                            codec: str = JSON_CODEC.name, frame_transport: str = 'json',
+                            delta_frames: bool = False, frame_codec: str = 'jpeg'):
+        """세션에 클라이언트 추가 (같은 세션의 기존 컨트롤러는 대체)"""
+        if self.sessions.get(addr) is not None:
+            # 재인증: 이전 레코드의 스트리밍/재전송 상태 정리
+            self.remove_client(addr)
+
+        if delta_frames:
+            from frame_diff import TileDiffer
+        client = ClientInfo(
             address=addr,
-            last_activity=time.time(),
-            authenticated=True
+            last_activity=time.monotonic(),
+            session=session,
+            role=role,
+            authenticated=True,
+            codec=codec,
+            frame_transport=frame_transport,
+            frame_codec=frame_codec,
+            tile_differ=TileDiffer(
+                tile_size=Constants.FRAME_TILE_SIZE,
+                keyframe_interval=Constants.KEYFRAME_INTERVAL
+            ) if delta_frames else None,
+            capture_zoom=Constants.POINTER_ZOOM
         )
+        replaced = self.sessions.join(client)
+        if replaced is not None:
+            self.logger.info(f"Controller {replaced.address} replaced by {addr} "
+                             f"in session {session.session_id}")
+            self._release_client(replaced)
+            self.protocol._send_error(replaced.address, "Controller replaced by another client")
+        if self.recorder is not None:
+            self.recorder.record_join(addr, {
+                'session_id': session.session_id,
+                'role': role,
+                'codec': codec,
+                'frame_transport': frame_transport,
+                'delta_frames': delta_frames,
+                'frame_codec': frame_codec,
+            })
+        # 인증 실패 횟수는 성공해도 초기화하지 않음 (뷰어 코드로 인증하며 컨트롤러 코드 대입 방지)
+        self.liveness.discard(('session', session.session_id))
+        self.liveness.add(('client', addr), client.last_activity + self._liveness_timeout(client))
+
+    def get_client(self, addr: tuple) -> Optional[ClientInfo]:
+        return self.sessions.get(addr)
 
     def remove_client(self, addr: tuple):
-        self._clients.pop(addr, None)
+        self.stop_streaming(addr)
+        client = self.sessions.leave(addr)
+        if client is not None:
+            self._release_client(client)
+            session = client.session
+            if session is not self.default_session and next(session.members(), None) is None:
+                # 재연결할 시간을 두고, 그동안 아무도 참여하지 않으면 세션 종료
+                self.liveness.add(('session', session.session_id),
+                                  time.monotonic() + Constants.SESSION_IDLE_TIMEOUT)
+
+    def close_session(self, session: Session, reason: str):
+        """세션 종료 (남은 참가자는 알림 후 제거, 기본 세션은 닫지 않음)"""
+        for client in session.members():
+            self.stop_streaming(client.address)
+        if session.stream_task:
+            session.stream_task.cancel()
+            session.stream_task = None
+        for client in self.sessions.close_session(session):
+            self._release_client(client)
+            self.protocol._send_error(client.address, "Session closed")
+        self.liveness.discard(('session', session.session_id))
+        self.logger.info(f"Session closed: {session.session_id} ({reason})")
+
+    def _release_client(self, client: ClientInfo):
+        """세션에서 빠진 클라이언트의 입력/전송 상태 정리"""
+        client.streaming_enabled = False
+        self.liveness.discard(('client', client.address))
+        self.pointer_pipeline.forget(client.address)
+        self.frame_sender.forget(client.address)
+        self.websockets.forget(client.address)
+        self.cursor.unsubscribe(client.address)
+        self.macro_runner.cancel(client.address)
+        if client.batch_ack_timer is not None:
+            client.batch_ack_timer.cancel()
+            client.batch_ack_timer = None
+        if self.recorder is not None:
+            self.recorder.record_leave(client.address)
+
+    def _load_macros(self, path: str, valid_keys=None) -> MacroLibrary:
+        if not os.path.exists(path):
+            self.logger.warning(f"Macro file not found: {path}")
+            return MacroLibrary()
+        try:
+            library = MacroLibrary.load(path, (self.screen_width, self.screen_height),
+                                        valid_keys=valid_keys)
+        except MacroError as e:
+            self.logger.error(f"Invalid macro file: {e}")
+            raise
+        self.logger.info(f"Loaded {len(library)} macros from {path}")
+        return library
+
+    def _macro_finished(self, run: MacroRun):
+        if run.moves_pointer:
+            # 매크로 move/click 은 인젝터가 바로 주입하므로 병합 단계/모션 엔진 위치를 맞춤
+            self.resync_pointer()
+        if self.protocol and self.sessions.get(run.owner):
+            self.protocol._send_macro_status(run.owner, {
+                'run_id': run.run_id, 'name': run.name, 'status': run.status
+            })
+
+    def handle_presentation_toggle(self, key: str, addr: tuple, received_at: float) -> bool:
+        """f5/esc: 발표 시작/종료 (매크로가 정의되어 있으면 매크로로 실행)"""
+        self.presentation_mode = key == 'f5'
+        name = 'start_presentation' if self.presentation_mode else 'end_presentation'
+        self.logger.info(f"Presentation mode: {self.presentation_mode}")
+        if name in self.macros:
+            try:
+                self.macro_runner.start(addr, name, received_at=received_at)
+                return True
+            except MacroError as e:
+                # 다른 매크로가 실행 중이면 키만 입력
+                self.logger.debug(f"Presentation macro skipped: {e}")
+        return self.input_injector.submit_key(key, received_at)
 
-    def update_client_activity(self, addr: tuple):
-        if client := self._clients.get(addr):
-            client.last_activity = time.time()
+    def update_client_activity(self, addr: tuple, now: float):
+        """수신 시각만 기록 (만료 휠은 마감 시점에 다시 계산하므로 패킷당 O(1))"""
+        if client := self.sessions.get(addr):
+            client.last_activity = now
 
     def is_client_authenticated(self, addr: tuple) -> bool:
-        if client := self._clients.get(addr):
+        if client := self.sessions.get(addr):
             return client.authenticated
         return False
 
-    async def send_frame(self, addr: tuple):
-        """화면 캡처 및 전송"""
+    async def _handle_websocket(self, request):
+        """UDP 가 막힌 네트워크용 WebSocket 전송 (인증 포함 메시지 형식은 UDP 와 동일)"""
+        if self.protocol is None:
+            raise web.HTTPServiceUnavailable()
+        return await self.websockets.handle(request)
+
+    def _is_local_request(self, request) -> bool:
+        return request.remote in ('127.0.0.1', '::1')
+
+    async def _handle_list_sessions(self, request):
+        if not self._is_local_request(request):
+            raise web.HTTPForbidden()
+        return web.json_response([session.info() for session in self.sessions.sessions.values()])
+
+    async def _handle_create_session(self, request):
+        """새 발표 세션 생성 (서버 PC 에서만 허용)"""
+        if not self._is_local_request(request):
+            raise web.HTTPForbidden()
+        session = self.sessions.create_session()
+        # 아무도 참여하지 않은 세션도 SESSION_IDLE_TIMEOUT 후 종료
+        self.liveness.add(('session', session.session_id), time.monotonic() + Constants.SESSION_IDLE_TIMEOUT)
+        self.logger.info(f"Session created: {session.session_id}")
+        return web.json_response(session.info())
+
+    async def _handle_delete_session(self, request):
+        """발표 세션 종료 (서버 PC 에서만 허용, 기본 세션은 종료 불가)"""
+        if not self._is_local_request(request):
+            raise web.HTTPForbidden()
+        session = self.sessions.sessions.get(request.match_info['session_id'])
+        if session is None:
+            raise web.HTTPNotFound()
+        if session is self.default_session:
+            raise web.HTTPConflict(text="The default session cannot be closed")
+        info = session.info()
+        self.close_session(session, 'deleted')
+        return web.json_response(info)
+
+    def _register_metric_callbacks(self):
+        """구성 요소들이 이미 세고 있는 통계는 스크레이프 시점에 읽어서 노출"""
+        r = self.metrics.registry
+        r.callback('bytes_sent_total', 'UDP payload bytes sent', 'counter', lambda: {
+            ('message',): self.protocol.bytes_sent if self.protocol else 0,
+            ('frame',): self.frame_sender.bytes_sent,
+        }, ['channel'])
+        r.callback('frame_chunks_retransmitted_total', 'Frame chunks resent after NACK', 'counter',
+                   lambda: self.frame_sender.chunks_retransmitted)
+        r.callback('frame_pipeline_total', 'Frame pipeline captures/encodes and shared results', 'counter',
+                   lambda: {(key,): value for key, value in self._frame_pipeline.stats().items()}
+                   if self._frame_pipeline is not None else {}, ['event'])
+        r.callback('pointer_events_total', 'Pointer pipeline events', 'counter',
+                   lambda: {(key,): value for key, value in self.pointer_pipeline.stats().items()}, ['event'])
+        r.callback('pointer_motion_total', 'Pointer motion engine ticks and injections', 'counter',
+                   lambda: {(key,): value for key, value in self.motion_engine.stats().items()
+                            if key != 'filter_lag_ms'}, ['event'])
+        r.callback('pointer_filter_lag_seconds', 'Smoothed lag of filtered pointer output while moving',
+                   'gauge', lambda: self.motion_engine.filter_lag)
+        r.callback('input_queue_depth', 'Pending input events', 'gauge', self.input_injector.queue_depth)
+        r.callback('input_injection_errors_total', 'OS input injection failures', 'counter',
+                   lambda: self.input_injector.errors)
+        r.callback('macros_total', 'Macro runs by outcome', 'counter',
+                   lambda: {(key,): value for key, value in self.macro_runner.stats().items()
+                            if key != 'running'}, ['event'])
+        r.callback('udp_io_total', 'Batched UDP transport datagrams, system calls and drops', 'counter',
+                   lambda: {(key,): value for key, value in self.transport.stats().items() if key != 'queued_bytes'}
+                   if isinstance(self.transport, BatchedDatagramTransport) else {}, ['event'])
+        r.callback('cursor_total', 'Cursor position updates and messages sent', 'counter',
+                   lambda: {(key,): value for key, value in self.cursor.stats().items()
+                            if key != 'subscribers'}, ['event'])
+        r.callback('cursor_subscribers', 'Clients subscribed to the cursor stream', 'gauge',
+                   lambda: len(self.cursor.subscribers))
+        r.callback('slide_cache_total', 'Slide cache additions, matches and evictions', 'counter',
+                   lambda: {(key,): value for key, value in self.slides.stats().items()
+                            if key not in ('slides', 'bytes')}, ['event'])
+        r.callback('slide_cache_bytes', 'Bytes held by the slide cache', 'gauge',
+                   lambda: self.slides.nbytes)
+        r.callback('recording_total', 'Recorded frames, inputs and bytes', 'counter',
+                   lambda: {(key,): value for key, value in self.recorder.stats().items()
+                            if key != 'segments'} if self.recorder is not None else {}, ['event'])
+        r.callback('websocket_total', 'WebSocket messages and frames sent or dropped', 'counter',
+                   lambda: {(key,): value for key, value in self.websockets.stats().items()
+                            if key != 'connections'}, ['event'])
+        r.callback('websocket_connections', 'Open WebSocket connections', 'gauge',
+                   lambda: len(self.websockets.connections))
+        r.callback('clients', 'Authenticated clients', 'gauge', lambda: len(self.sessions))
+        r.callback('sessions', 'Presentation sessions', 'gauge', lambda: len(self.sessions.sessions))
+
+    async def _handle_metrics(self, request):
+        return web.Response(body=self.metrics.render().encode('utf-8'),
+                            headers={'Content-Type': MetricsRegistry.CONTENT_TYPE})
+
+    def enable_diagnostics(self, capacity: int = Constants.TRACE_CAPACITY,
+                           stall_threshold: float = Constants.LOOP_STALL_THRESHOLD):
+        """구간 기록과 루프 정지 감지 시작 (이벤트 루프 안에서 호출)"""
+        if self.tracer is not None:
+            return
+        tracer = TraceRecorder(capacity)
+        self.input_injector.backend = TracingInputBackend(self.input_backend, tracer)
+        self.stall_monitor = LoopStallMonitor(stall_threshold, tracer)
+        self.stall_monitor.start()
+        self.tracer = tracer
+        if self.protocol is not None:
+            self.protocol.set_tracing(tracer)
+        self.logger.info(f"Diagnostics enabled (stall threshold {stall_threshold * 1000:.0f} ms)")
+
+    def disable_diagnostics(self):
+        if self.tracer is None:
+            return
+        self.tracer = None
+        if self.protocol is not None:
+            self.protocol.set_tracing(None)
+        self.input_injector.backend = self.input_backend
+        self.stall_monitor.stop()
+        self.logger.info("Diagnostics disabled")
+
+    def diagnostics_stats(self) -> Dict[str, Any]:
+        if self.tracer is None:
+            return {'enabled': False}
+        return {
+            'enabled': True,
+            'spans_recorded': self.tracer.recorded,
+            'capacity': self.tracer.capacity,
+            'loop_stalls': self.stall_monitor.stats(),
+        }
+
+    def dump_trace(self, path: str = Constants.TRACE_FILE) -> Optional[str]:
+        """기록된 구간을 Chrome trace 파일로 저장"""
+        if self.tracer is None:
+            return None
+        return self.tracer.dump(path)
+
+    async def _handle_diagnostics(self, request):
+        """GET: 진단 상태, POST ?enable=0|1: 진단 모드 전환 (서버 PC 에서만 허용)"""
+        if not self._is_local_request(request):
+            raise web.HTTPForbidden()
+        if request.method == 'POST':
+            if request.query.get('enable', '1') in ('0', 'false'):
+                self.disable_diagnostics()
+            else:
+                self.enable_diagnostics()
+        return web.json_response(self.diagnostics_stats())
+
+    async def _handle_trace(self, request):
+        """현재 링 버퍼를 Chrome trace JSON 으로 내려받기 (chrome://tracing, Perfetto)"""
+        if not self._is_local_request(request):
+            raise web.HTTPForbidden()
+        if self.tracer is None:
+            raise web.HTTPConflict(text='Diagnostics are disabled')
+        return web.json_response(self.tracer.to_chrome_trace(), headers={
+            'Content-Disposition': f'attachment; filename="{Constants.TRACE_FILE}"'
+        })
+
+    def _inject_pointer(self, x: int, y: int, received_at: Optional[float] = None):
+        """모션 엔진이 출력한 포인터 위치를 인젝터 스레드로 전달"""
+        if self.log_pointer_moves:
+            print(f"    Mouse moved to: ({x}, {y})")
+        self.input_injector.submit_move(x, y, received_at)
+        self.cursor.publish(x, y, self.motion_engine.laser)
+
+    def resync_pointer(self):
+        """인젝터가 포인터를 직접 옮긴 뒤 병합 단계/모션 엔진의 추적 위치를 OS 위치로 맞춤"""
+        self.pointer_pipeline.resync()
+        x, y = self.pointer_pipeline.position
+        self.motion_engine.reset(x, y)
+        self.cursor.publish(x, y, False)
+
+    def schedule_slide_check(self, addr: tuple):
+        """슬라이드 이동 키 이후 변화 확인 예약 (연속 입력은 마지막 것만 확인)"""
+        client = self.get_client(addr)
+        if client is None or not Constants.SLIDE_CACHE_ENABLED:
+            return
+        if self._slide_task is not None and not self._slide_task.done():
+            self._slide_task.cancel()
+        self._slide_task = asyncio.create_task(self._detect_slide(client.session))
+
+    async def _detect_slide(self, session: Session):
+        """화면이 안정되면 지각 해시로 슬라이드를 찾고, 처음 보는 슬라이드만 인코딩하여 저장"""
+        from frame_codecs import encode_frame, perceptual_hash
+        from slide_cache import hamming_distance
         try:
-            screen = self.screen_capture.grab(self.screen_capture.monitors[0])
-            img = Image.frombytes('RGB', screen.size, screen.rgb)
-            
-            # 리사이즈
-            new_size = (
-                int(screen.width * self.scale_factor),
-                int(screen.height * self.scale_factor)
+            await asyncio.sleep(Constants.SLIDE_SETTLE_DELAY)
+            previous = None
+            for _ in range(Constants.SLIDE_STABLE_ATTEMPTS):
+                frame = await self._capture(None)
+                phash = await self.frame_pipeline.run(perceptual_hash, frame)
+                if previous is not None and hamming_distance(previous, phash) <= Constants.SLIDE_HASH_THRESHOLD:
+                    break
+                previous = phash
+                await asyncio.sleep(Constants.SLIDE_STABLE_INTERVAL)
+            else:
+                # 전환 효과/동영상 등으로 계속 변하는 화면은 슬라이드로 저장하지 않음
+                self.logger.debug("Slide check skipped: screen not stable")
+                return
+
+            entry = self.slides.match(phash)
+            new = entry is None
+            if new:
+                thumb_scale = min(1.0, Constants.SLIDE_THUMB_WIDTH / frame.size[0])
+                thumb, full = await asyncio.gather(
+                    self.frame_pipeline.run(encode_frame, frame, Constants.SLIDE_THUMB_QUALITY, thumb_scale, 'jpeg'),
+                    self.frame_pipeline.run(encode_frame, frame, Constants.SLIDE_JPEG_QUALITY, 1.0, 'jpeg'))
+                entry = self.slides.add(phash, frame.size, thumb, full)
+                if entry is None:
+                    return
+            else:
+                self.slides.touch(entry)
+
+            self.protocol.broadcast_message([client.address for client in session.members()], dict(
+                entry.info(), type=MessageType.SLIDE.value, new=new, http_port=self.http_port))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.metrics.error('slide')
+            self.logger.error(f"Slide detection error: {e}")
+
+    async def _handle_slide_image(self, request: web.Request) -> web.Response:
+        """슬라이드 썸네일/원본 (URL 이 내용 해시이므로 immutable 캐시)"""
+        digest, _, extension = request.match_info['name'].partition('.')
+        data = self.slides.content(digest) if extension == 'jpg' else None
+        if data is None:
+            raise web.HTTPNotFound()
+        etag = f'"{digest}"'
+        # 화면 내용이므로 공유 캐시에는 저장하지 않음
+        headers = {'ETag': etag, 'Cache-Control': 'private, max-age=31536000, immutable'}
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=data, content_type='image/jpeg', headers=headers)
+
+    def start_streaming(self, addr: tuple, options: Dict[str, Any]):
+        """푸시 스트리밍 참여 (세션마다 스트림 루프 하나가 모든 시청자에게 전송)"""
+        client = self.get_client(addr)
+        if client is None or client.streaming_enabled:
+            return
+
+        session = client.session
+        client.streaming_enabled = True
+        if options.get('cursor'):
+            # 포인터는 클라이언트가 그리므로 커서 이동만으로는 프레임을 보내지 않음
+            self.cursor.subscribe(addr, client.codec)
+        differ = session.differs.get(client.frame_codec)
+        if client.tile_differ and differ:
+            # 중간 참여 시청자는 이전 프레임이 없으므로 키프레임부터
+            differ.request_keyframe()
+        keyframe = self.recorder.latest_keyframe(client.frame_codec, session.session_id) \
+            if self.recorder is not None else None
+        if keyframe is not None:
+            # 다음 캡처를 기다리지 않고 기록된 마지막 키프레임을 바로 전송 (재인코딩 없음)
+            asyncio.create_task(self._deliver_frame(
+                [client], self.frame_sender.allocate_frame_id(), client.frame_codec,
+                (True, keyframe, [], None), record=False))
+
+        if session.stream_task is None:
+            target_ms = options.get('target_latency_ms')
+            session.stream = AdaptiveStreamController(
+                target_latency=float(target_ms) / 1000 if target_ms else Constants.STREAM_TARGET_LATENCY,
+                fps_range=(Constants.STREAM_FPS_RANGE[0],
+                           float(options.get('max_fps', Constants.STREAM_FPS_RANGE[1]))),
+                quality_range=Constants.STREAM_QUALITY_RANGE,
+                scale_range=Constants.STREAM_SCALE_RANGE,
+                initial_quality=self.compression_quality,
+                initial_scale=self.scale_factor,
+                use_acks=bool(options.get('acks', True))
             )
-            img = img.resize(new_size, Image.LANCZOS)
-            
-            # 압축
-            buffer = io.BytesIO()
-            img.save(buffer, format='JPEG', quality=self.compression_quality)
-            compressed_image = buffer.getvalue()
-            
-            # 전송
-            base64_frame = base64.b64encode(compressed_image).decode('utf-8')
-            self.protocol._send_message(addr, {
-                'type': MessageType.FRAME.value,
-                'data': base64_frame
-            })
+            session.stream_task = asyncio.create_task(self._session_stream_loop(session))
+        self.logger.info(f"Streaming started for {addr} (session: {session.session_id})")
+
+    def stop_streaming(self, addr: tuple):
+        client = self.get_client(addr)
+        if client is None or not client.streaming_enabled:
+            return
+        client.streaming_enabled = False
+        self.cursor.unsubscribe(addr)
+        session = client.session
+        if not session.streaming_members() and session.stream_task:
+            session.stream_task.cancel()
+            session.stream_task = None
+            self.logger.info(f"Session {session.session_id} streaming stopped: {session.stream.stats()}")
+        self.logger.info(f"Streaming stopped for {addr}")
+
+    async def _session_stream_loop(self, session: Session):
+        """서버 측 일정에 따라 세션 프레임 푸시 (캡처/인코딩 한 번, 시청자 전원에게 전송)"""
+        loop = asyncio.get_running_loop()
+        stream = session.stream
+        try:
+            while True:
+                members = session.streaming_members()
+                if not members:
+                    break
+                # 가장 느린 시청자의 왕복 추정치를 목표 지연 하한으로
+                bounds = [client.link.latency_bound for client in members
+                          if client.link.latency_bound is not None]
+                stream.set_path_latency(max(bounds) if bounds else None)
+
+                started = loop.time()
+                sent = await self._broadcast_frame(session, members, stream.quality, stream.scale)
+                elapsed = loop.time() - started
+                if sent:
+                    frame_ids, size = sent
+                    stream.on_frame_sent(frame_ids[0], elapsed, size, frame_ids[1:])
+                stream.adjust()
+                await asyncio.sleep(max(0.0, stream.frame_interval - elapsed))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Streaming error for session {session.session_id}: {e}")
+        finally:
+            if session.stream_task is asyncio.current_task():
+                session.stream_task = None
+
+    async def _broadcast_frame(self, session: Session, members: List[ClientInfo],
+                               quality: int, scale: float) -> Optional[Tuple[List[int], int]]:
+        """세션 프레임 한 장을 캡처하여 (프레임 코덱, 델타 여부) 그룹별로 한 번씩 인코딩 후 전송
+
+        그룹마다 전송 프레임 ID 를 따로 할당 (재전송 보관/송신 버퍼가 그룹별), 보낸 ID 목록과 총 크기 반환
+        """
+        try:
+            source = session.controller or members[0]
+            region = self._resolve_capture_region(source)
+            for client in members:
+                self._notify_capture_region(client, region, source.capture_mode)
+
+            frame = await self._capture(region)
+
+            groups: Dict[Tuple[str, bool], List[ClientInfo]] = {}
+            for client in members:
+                groups.setdefault((client.frame_codec, client.tile_differ is not None), []).append(client)
+
+            keys = list(groups)
+            encoded = await asyncio.gather(*[
+                self._encode_frame(frame, quality, scale, codec,
+                                   self._session_differ(session, codec) if delta else None)
+                for codec, delta in keys
+            ])
+
+            # 같은 캡처의 그룹별 프레임 ID 는 스트림 컨트롤러가 하나의 프레임으로 확인 응답을 집계
+            frame_ids = []
+            size = 0
+            for key, result in zip(keys, encoded):
+                if result is None:
+                    continue
+                frame_id = self.frame_sender.allocate_frame_id()
+                frame_ids.append(frame_id)
+                await self._deliver_frame(groups[key], frame_id, key[0], result)
+                size += len(result[1])
+            return (frame_ids, size) if frame_ids else None
+
+        except Exception as e:
+            self.metrics.error('frame')
+            self.logger.error(f"Session frame error ({session.session_id}): {e}")
+            return None
+
+    def _session_differ(self, session: Session, codec: str) -> 'TileDiffer':
+        differ = session.differs.get(codec)
+        if differ is None:
+            from frame_diff import TileDiffer
+            differ = session.differs[codec] = TileDiffer(
+                tile_size=Constants.FRAME_TILE_SIZE,
+                keyframe_interval=Constants.KEYFRAME_INTERVAL
+            )
+        return differ
+
+    async def send_frame(self, addr: tuple, quality: Optional[int] = None,
+                         scale: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        """화면 캡처 및 전송 (성공 시 프레임 ID와 바이트 수 반환)
+
+        이전 프레임을 전송 중인 클라이언트의 요청은 대기열에 쌓지 않고,
+        진행 중인 전송이 끝난 뒤 최신 프레임 한 장으로 대체한다.
+        델타 프레임 클라이언트는 화면 변화가 없으면 아무것도 전송하지 않는다.
+        """
+        client = self.get_client(addr)
+        if client is None:
+            return None
+        if client.frame_in_flight:
+            if client.frame_pending:
+                client.frames_dropped += 1
+            client.frame_pending = True
+            return None
+
+        client.frame_in_flight = True
+        try:
+            result = await self._capture_and_send(client, quality, scale)
+            while client.frame_pending:
+                client.frame_pending = False
+                result = await self._capture_and_send(client, quality, scale)
+            return result
+        finally:
+            client.frame_in_flight = False
+
+    def _load_monitor_layout(self):
+        """모니터 배치를 한 번 읽어 캐시 (mss import/열기가 있으므로 실행기 스레드에서 호출)"""
+        try:
+            monitors = read_monitors(self.screen_source)
+        except Exception as e:
+            # 헤드리스 호스트에서는 매번 실패하므로 한 번만 알리고 빈 배치로 캐시
+            self.logger.warning(f"Could not read monitor layout: {e}")
+            monitors = []
+        self._monitor_layout = [dict(monitor, index=index) for index, monitor in enumerate(monitors)]
+
+    def monitor_layout(self):
+        """인증 응답으로 알리는 모니터 배치 (캐시만 사용: 이벤트 루프에서 mss 를 열지 않음)"""
+        if self._monitor_layout is None:
+            if self.screen_source is None:
+                return []  # 시작 시 읽기가 아직 끝나지 않음
+            self._load_monitor_layout()  # 주입된 화면 소스는 메모리에서 바로 읽음
+        return self._monitor_layout
+
+    def _resolve_capture_region(self, client: ClientInfo) -> Optional[Dict[str, int]]:
+        """클라이언트 캡처 모드를 이번 프레임의 화면 좌표 영역으로 변환 (None: 전체 화면)"""
+        monitors = self.frame_pipeline.monitors()
+        if client.capture_mode == 'monitor':
+            return monitors[client.capture_monitor]
+        if client.capture_mode == 'window':
+            rect = active_window_rect()
+            return clamp_region(rect, monitors[0]) if rect else None
+        if client.capture_mode == 'pointer':
+            position = self.pointer_pipeline.position or self.input_backend.position()
+            return pointer_region(monitors, position, client.capture_zoom)
+        return None
+
+    def _notify_capture_region(self, client: ClientInfo, region: Optional[Dict[str, int]], mode: str):
+        """클라이언트가 좌표를 매핑할 수 있도록 영역 변경 알림"""
+        if region_key(region) == client.capture_region:
+            return
+        client.capture_region = region_key(region)
+        self.protocol._send_message(client.address, {
+            'type': MessageType.CAPTURE_REGION.value,
+            'mode': mode,
+            'region': region or self.frame_pipeline.monitors()[0]
+        })
+
+    async def _encode_frame(self, frame, quality: int, scale: float, codec: str,
+                            differ: Optional['TileDiffer']):
+        """(키프레임 여부, 페이로드, 타일 목록, 출력 크기) 반환, 델타 인코딩에서 변화가 없으면 None"""
+        started = time.perf_counter()
+        if differ:
+            # 변경 영역 인코딩 (differ 상태가 필요하므로 공유 캐시를 거치지 않음)
+            from frame_pipeline import encode_delta
+            encoded = await self.frame_pipeline.run(
+                encode_delta, differ, frame, quality, scale, codec, Constants.FRAME_RESIZE_MODE)
+            self._observe_frame_stage(f'encode:{codec}:delta', started,
+                                      self.metrics.frame_encode.labels(codec, 'delta'))
+            return encoded
+        # 같은 캡처/파라미터 요청끼리 인코딩 결과 공유
+        compressed_image = await self.frame_pipeline.encode(
+            frame, quality, scale, codec, Constants.FRAME_RESIZE_MODE)
+        self._observe_frame_stage(f'encode:{codec}:full', started,
+                                  self.metrics.frame_encode.labels(codec, 'full'))
+        return True, compressed_image, [], None
+
+    async def _capture(self, region: Optional[Dict[str, int]]):
+        started = time.perf_counter()
+        frame = await self.frame_pipeline.capture(region)
+        self._observe_frame_stage('capture', started, self.metrics.frame_capture)
+        return frame
+
+    def _observe_frame_stage(self, name: str, started: float, histogram=None):
+        """프레임 단계 소요 시간을 지표와 (진단 모드이면) 프레임 트랙 구간으로 기록"""
+        finished = time.perf_counter()
+        if histogram is not None:
+            histogram.observe(finished - started)
+        tracer = self.tracer
+        if tracer is not None:
+            tracer.record(name, 'frame', started, finished, tid=tracer.track('frame pipeline'))
+
+    async def _deliver_frame(self, clients: List[ClientInfo], frame_id: int, codec: str, encoded,
+                             record: bool = True):
+        """인코딩된 프레임을 전송 방식별로 한 번씩 만들어 여러 클라이언트에 전송
+
+        세션 스트림/요청 프레임 모두 여기서 기록 (record=False: 기록에서 다시 읽은 키프레임)
+        """
+        keyframe, compressed_image, tiles, new_size = encoded
+        started = time.perf_counter()
+        if record and self.recorder is not None:
+            self.recorder.record_frame(frame_id, codec, keyframe, compressed_image,
+                                       clients[0].session.session_id)
+
+        json_clients = [client.address for client in clients if client.frame_transport == 'json']
+        if json_clients:
+            if keyframe:
+                message = {
+                    'type': MessageType.FRAME.value,
+                    'frame_id': frame_id,
+                    'format': codec,
+                    'data': base64.b64encode(compressed_image).decode('utf-8')
+                }
+            else:
+                message = {
+                    'type': MessageType.FRAME_DELTA.value,
+                    'frame_id': frame_id,
+                    'format': codec,
+                    'width': new_size[0],
+                    'height': new_size[1],
+                    'tiles': [
+                        {'x': x, 'y': y, 'w': w, 'h': h,
+                         'data': base64.b64encode(data).decode('utf-8')}
+                        for (x, y, w, h), data in tiles
+                    ]
+                }
+            self.protocol.broadcast_message(json_clients, message)
+
+        # 청크 지원 클라이언트는 원본 바이트를 분할 전송 (청크는 한 번만 기록)
+        chunked_clients = [client.address for client in clients if client.frame_transport == 'chunked']
+        if chunked_clients:
+            await self.frame_sender.broadcast(chunked_clients, compressed_image, frame_id)
+
+        # WebSocket 클라이언트는 분할/페이싱 없이 바이너리 메시지 하나 (느린 연결은 최신 프레임만)
+        for client in clients:
+            if client.frame_transport == 'websocket':
+                self.websockets.send_frame(client.address, frame_id, compressed_image)
+        self._observe_frame_stage('send', started)
+
+    async def _capture_and_send(self, client: ClientInfo, quality: Optional[int],
+                                scale: Optional[float]) -> Optional[Tuple[int, int]]:
+        quality = quality or self.compression_quality
+        scale = scale or self.scale_factor
+        try:
+            region = self._resolve_capture_region(client)
+            self._notify_capture_region(client, region, client.capture_mode)
+
+            frame = await self._capture(region)
+            encoded = await self._encode_frame(frame, quality, scale, client.frame_codec,
+                                               client.tile_differ)
+            if encoded is None:
+                return None
+
+            frame_id = self.frame_sender.allocate_frame_id()
+            await self._deliver_frame([client], frame_id, client.frame_codec, encoded)
+            return frame_id, len(encoded[1])
             
         except Exception as e:
+            self.metrics.error('frame')
             self.logger.error(f"Frame capture error: {e}")
+            return None
 
 async def main():
     """메인 함수"""
@@ -0,0 +1,422 @@
+import bisect
+import collections
+import glob
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# 세그먼트 파일: 헤더(매직, 기록 시작 벽시계 시각) 뒤에 레코드를 이어 붙인다
+SEGMENT_MAGIC = b'RCREC001'
+SEGMENT_HEADER = struct.Struct('<8sd')
+# 레코드: 종류, 플래그, 출처(입력: 클라이언트 번호, 프레임: 코덱 번호), 프레임 ID,
+# 기록 시작 후 경과 시간(초), 페이로드 길이
+RECORD_HEADER = struct.Struct('<BBHIdI')
+# 키프레임 색인 (세그먼트마다 .idx): 경과 시간, 세그먼트 내 페이로드 오프셋, 길이, 코덱 번호
+INDEX_ENTRY = struct.Struct('<dQIB3x')
+
+KIND_FRAME = 1   # 인코딩된 프레임 (키프레임 또는 델타)
+KIND_INPUT = 2   # 인증된 클라이언트가 보낸 데이터그램 원본
+KIND_JOIN = 3    # 클라이언트 참여 (역할/코덱 JSON, 연결 코드는 기록하지 않음)
+KIND_LEAVE = 4   # 클라이언트 제거
+
+FLAG_KEYFRAME = 0x01
+
+FRAME_CODECS = ('jpeg', 'webp', 'png')  # frame_codecs.CODECS 이름 (코덱 번호 = 인덱스)
+_CODEC_IDS = {name: index for index, name in enumerate(FRAME_CODECS)}
+
+class Record(NamedTuple):
+    kind: int
+    flags: int
+    source: int
+    frame_id: int
+    t: float
+    data: bytes
+
+class KeyframeEntry(NamedTuple):
+    t: float
+    segment: str
+    offset: int
+    length: int
+    codec: str
+
+def _segment_path(directory: str, index: int) -> str:
+    return os.path.join(directory, f'segment-{index:06d}.log')
+
+def _segment_indexes(directory: str) -> List[int]:
+    return [int(os.path.basename(path)[len('segment-'):-len('.log')])
+            for path in glob.glob(os.path.join(directory, 'segment-[0-9]*.log'))]
+
+def _index_path(segment: str) -> str:
+    return segment[:-len('.log')] + '.idx'
+
+def _map(path: str) -> Optional[mmap.mmap]:
+    """읽기 전용 메모리 매핑 (빈 파일은 None)"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+class SessionRecorder:
+    """프레임/입력 이벤트를 세그먼트 로그에 추가만 하는 기록기
+
+    record_* 는 이벤트 루프 스레드에서 시각만 찍어 대기열에 넣고, 파일 쓰기는 기록
+    스레드가 모아서 한다 (디스크가 느려도 루프가 막히지 않음). 대기열이 max_pending
+    바이트를 넘으면 새 레코드를 버린다. 세그먼트가 segment_bytes 를 넘으면 다음
+    세그먼트로 넘어가고, max_segments 를 넘으면 가장 오래된 세그먼트를 지운다.
+    키프레임은 세그먼트별 고정 크기 색인에도 기록하여 리더가 로그 전체를 훑지 않고
+    찾는다. 늦게 참여하거나 다시 연결한 클라이언트에는 latest_keyframe() 으로 마지막
+    키프레임을 로그에서 메모리 매핑으로 읽어 재인코딩 없이 보낸다 (기록 스레드가 쓰고
+    flush 한 뒤에 보임). 쓰기는 OS 페이지 캐시까지만 (fsync 하지 않음).
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 64 * 1024 * 1024, max_segments: int = 16,
+                 max_pending: int = 32 * 1024 * 1024):
+        self.logger = logging.getLogger('SessionRecorder')
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.max_pending = max_pending
+        os.makedirs(directory, exist_ok=True)
+
+        self.started_at = time.monotonic()
+        self.started_wall = time.time()
+        self.enabled = True
+        # 이미 세그먼트가 있는 디렉터리면 그 뒤 번호부터 이어 씀 (기존 파일에 덧붙이지 않음)
+        self._segment_index = max(_segment_indexes(directory), default=0)
+        if self._segment_index:
+            self.logger.warning(f"Recording directory {directory} already has segments, "
+                                f"starting at segment {self._segment_index + 1}")
+        self._oldest_index = self._segment_index + 1
+        self._last_t = 0.0
+        self._segment: Optional[str] = None
+        self._file = None
+        self._index_file = None
+        self._offset = 0
+        self._sources: Dict[tuple, int] = {}
+        # (스트림, 코덱)별 마지막 키프레임 위치와 그 세그먼트의 매핑 (다음 키프레임까지 재사용)
+        self._latest: Dict[Tuple[str, str], Tuple[str, int, int]] = {}
+        self._mapped: Optional[Tuple[str, mmap.mmap]] = None
+        # _latest/_mapped 는 기록 스레드(세그먼트 교체/삭제)와 루프 스레드(latest_keyframe)가 공유
+        self._lock = threading.Lock()
+
+        # 기록 스레드 대기열: (종류, 플래그, 출처, 프레임 ID, 경과 시간, 페이로드, latest 키)
+        self._pending: Deque[tuple] = collections.deque()
+        self._pending_bytes = 0
+        self._cond = threading.Condition()
+        self._closing = False
+
+        # 통계
+        self.frames = 0
+        self.keyframes = 0
+        self.inputs = 0
+        self.bytes_written = 0
+        self.keyframes_served = 0
+        self.segments_removed = 0
+        self.dropped = 0
+        self.errors = 0
+
+        self._open_segment()
+        self._thread = threading.Thread(target=self._run, name='SessionRecorder', daemon=True)
+        self._thread.start()
+
+    def _open_segment(self):
+        self._segment_index += 1
+        self._segment = _segment_path(self.directory, self._segment_index)
+        # 'xb': 같은 이름의 세그먼트가 있으면 헤더를 중간에 덧붙이지 않고 실패
+        self._file = open(self._segment, 'xb')
+        self._index_file = open(_index_path(self._segment), 'xb')
+        self._file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, self.started_wall))
+        self._file.flush()
+        self._offset = SEGMENT_HEADER.size
+        self._remove_old_segments()
+
+    def _close_segment(self):
+        for f in (self._file, self._index_file):
+            if f is not None:
+                f.close()
+        self._file = self._index_file = None
+
+    def _remove_old_segments(self):
+        while self.max_segments and self._segment_index - self._oldest_index >= self.max_segments:
+            segment = _segment_path(self.directory, self._oldest_index)
+            self._oldest_index += 1
+            with self._lock:
+                self._release_mapping(segment)
+                self._latest = {key: entry for key, entry in self._latest.items() if entry[0] != segment}
+            for path in (segment, _index_path(segment)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.segments_removed += 1
+
+    def _enqueue(self, kind: int, flags: int, source: int, frame_id: int, data: bytes,
+                 latest: Optional[Tuple[str, str]] = None):
+        """레코드를 기록 스레드 대기열에 추가 (시각은 호출 시점)"""
+        if not self.enabled:
+            return
+        t = time.monotonic() - self.started_at
+        with self._cond:
+            if self._pending_bytes + len(data) > self.max_pending:
+                self.dropped += 1
+                return
+            self._pending.append((kind, flags, source, frame_id, t, data, latest))
+            self._pending_bytes += len(data)
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, collections.deque()
+                self._pending_bytes = 0
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: Deque[tuple]):
+        """대기열에서 꺼낸 레코드를 순서대로 쓰고 한 번에 flush"""
+        latest, waiters = {}, []
+        for item in batch:
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                continue
+            kind, flags, source, frame_id, t, data, key = item
+            offset = self._write(kind, flags, source, frame_id, t, data)
+            if offset is None:
+                continue
+            if kind == KIND_FRAME:
+                self.frames += 1
+                if flags & FLAG_KEYFRAME:
+                    self._write_index(t, offset, len(data), source)
+                    latest[key] = (self._segment, offset, len(data))
+            elif kind == KIND_INPUT:
+                self.inputs += 1
+        try:
+            # 같은 프로세스의 메모리 매핑 리더가 바로 볼 수 있도록 페이지 캐시로
+            self._file.flush()
+            self._index_file.flush()
+        except (OSError, ValueError) as e:
+            self._stop(e)
+        if latest and self.enabled:
+            with self._lock:
+                self._latest.update(latest)
+        for waiter in waiters:
+            waiter.set()
+
+    def _write(self, kind: int, flags: int, source: int, frame_id: int, t: float,
+               data: bytes) -> Optional[int]:
+        """레코드 하나 추가 (페이로드 오프셋 반환, 쓰기 실패 시 기록 중지 후 None)"""
+        if not self.enabled:
+            return None
+        try:
+            if self._offset + RECORD_HEADER.size + len(data) > self.segment_bytes and \
+                    self._offset > SEGMENT_HEADER.size:
+                self._close_segment()
+                self._open_segment()
+            self._file.write(RECORD_HEADER.pack(kind, flags, source, frame_id % (1 << 32), t, len(data)))
+            self._file.write(data)
+        except (OSError, ValueError) as e:
+            self._stop(e)
+            return None
+        offset = self._offset + RECORD_HEADER.size
+        self._offset = offset + len(data)
+        self.bytes_written += RECORD_HEADER.size + len(data)
+        return offset
+
+    def _write_index(self, t: float, offset: int, length: int, codec_id: int):
+        self.keyframes += 1
+        try:
+            self._index_file.write(INDEX_ENTRY.pack(t, offset, length, codec_id))
+        except OSError as e:
+            self.errors += 1
+            self.logger.error(f"Keyframe index write failed: {e}")
+
+    def _stop(self, error: Exception):
+        self.errors += 1
+        self.enabled = False
+        self.logger.error(f"Recording stopped: {error}")
+
+    def _source(self, addr: tuple) -> int:
+        source = self._sources.get(addr)
+        if source is None:
+            source = self._sources[addr] = len(self._sources) % 0xFFFF + 1
+        return source
+
+    def record_frame(self, frame_id: int, codec: str, keyframe: bool, data: bytes, stream: str = ''):
+        """인코딩된 프레임 추가 (stream: 프레임을 만든 세션, latest_keyframe 구분용)"""
+        self._enqueue(KIND_FRAME, FLAG_KEYFRAME if keyframe else 0, _CODEC_IDS.get(codec, 0), frame_id,
+                      data, (stream, codec))
+
+    def record_input(self, addr: tuple, data: bytes):
+        self._enqueue(KIND_INPUT, 0, self._source(addr), 0, data)
+
+    def record_join(self, addr: tuple, info: Dict[str, object]):
+        self._enqueue(KIND_JOIN, 0, self._source(addr), 0, json.dumps(info).encode('utf-8'))
+
+    def record_leave(self, addr: tuple):
+        source = self._sources.get(addr)
+        if source is not None:
+            self._enqueue(KIND_LEAVE, 0, source, 0, b'')
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """지금까지 넣은 레코드가 모두 쓰일 때까지 대기 (시간 안에 끝나면 True)"""
+        done = threading.Event()
+        with self._cond:
+            if not self._thread.is_alive():
+                return not self._pending
+            # 기록 스레드가 앞선 레코드를 쓰고 flush 한 뒤에 set
+            self._pending.append(done)
+            self._cond.notify()
+        return done.wait(timeout)
+
+    def _release_mapping(self, segment: Optional[str] = None):
+        if self._mapped is not None and (segment is None or self._mapped[0] == segment):
+            self._mapped[1].close()
+            self._mapped = None
+
+    def latest_keyframe(self, codec: str, stream: str = '') -> Optional[bytes]:
+        """스트림/코덱이 같은 마지막 키프레임 (세그먼트를 메모리 매핑하여 읽음, 없으면 None)"""
+        with self._lock:
+            latest = self._latest.get((stream, codec))
+            if latest is None:
+                return None
+            segment, offset, length = latest
+            mapped = self._mapped
+            if mapped is None or mapped[0] != segment or len(mapped[1]) < offset + length:
+                # 다른 세그먼트이거나 매핑 이후에 추가된 레코드면 다시 매핑
+                self._release_mapping()
+                try:
+                    mapped = self._mapped = (segment, _map(segment))
+                except (OSError, ValueError) as e:
+                    self.errors += 1
+                    self.logger.error(f"Could not map {segment}: {e}")
+                    return None
+            self.keyframes_served += 1
+            return mapped[1][offset:offset + length]
+
+    def close(self, timeout: float = 5.0):
+        """대기열에 남은 레코드를 쓰고 기록 스레드를 멈춘 뒤 파일을 닫음"""
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            self.logger.warning("Recorder writer did not finish in time")
+            return
+        self.enabled = False
+        with self._lock:
+            self._release_mapping()
+        self._close_segment()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'frames': self.frames,
+            'keyframes': self.keyframes,
+            'inputs': self.inputs,
+            'bytes_written': self.bytes_written,
+            'keyframes_served': self.keyframes_served,
+            'segments': self._segment_index - self._oldest_index + 1,
+            'segments_removed': self.segments_removed,
+            'dropped': self.dropped,
+            'errors': self.errors,
+        }
+
+class RecordingReader:
+    """기록 디렉터리 읽기 (세그먼트/색인을 메모리 매핑, 잘린 마지막 레코드는 무시)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.segments: List[str] = sorted(glob.glob(os.path.join(directory, 'segment-*.log')))
+        self.started_wall: Optional[float] = None
+        for segment in self.segments:
+            with open(segment, 'rb') as f:
+                header = f.read(SEGMENT_HEADER.size)
+            if len(header) == SEGMENT_HEADER.size:
+                magic, self.started_wall = SEGMENT_HEADER.unpack(header)
+                if magic != SEGMENT_MAGIC:
+                    raise ValueError(f"Not a session recording segment: {segment}")
+                break
+
+    def records(self, kinds: Optional[Tuple[int, ...]] = None) -> Iterator[Record]:
+        for segment in self.segments:
+            mapped = _map(segment)
+            if mapped is None:
+                continue
+            try:
+                offset, size = SEGMENT_HEADER.size, len(mapped)
+                while offset + RECORD_HEADER.size <= size:
+                    kind, flags, source, frame_id, t, length = RECORD_HEADER.unpack_from(mapped, offset)
+                    start = offset + RECORD_HEADER.size
+                    if start + length > size:
+                        break  # 기록 중 종료로 잘린 레코드
+                    if kinds is None or kind in kinds:
+                        yield Record(kind, flags, source, frame_id, t, mapped[start:start + length])
+                    offset = start + length
+            finally:
+                mapped.close()
+
+    def keyframes(self) -> List[KeyframeEntry]:
+        """색인 파일만 읽은 키프레임 목록 (시간순)"""
+        entries = []
+        for segment in self.segments:
+            index = _index_path(segment)
+            if not os.path.exists(index):
+                continue
+            mapped = _map(index)
+            if mapped is None:
+                continue
+            try:
+                for position in range(0, len(mapped) - INDEX_ENTRY.size + 1, INDEX_ENTRY.size):
+                    t, offset, length, codec_id = INDEX_ENTRY.unpack_from(mapped, position)
+                    entries.append(KeyframeEntry(t, segment, offset, length, FRAME_CODECS[codec_id]))
+            finally:
+                mapped.close()
+        return entries
+
+    def keyframe_at(self, t: float, codec: Optional[str] = None) -> Optional[Tuple[KeyframeEntry, bytes]]:
+        """t 시점에 화면에 있던 키프레임 (t 이전의 마지막 키프레임)"""
+        entries = [entry for entry in self.keyframes() if codec is None or entry.codec == codec]
+        position = bisect.bisect_right([entry.t for entry in entries], t)
+        if position == 0:
+            return None
+        entry = entries[position - 1]
+        return entry, self.keyframe_data(entry)
+
+    def keyframe_data(self, entry: KeyframeEntry) -> bytes:
+        mapped = _map(entry.segment)
+        if mapped is None:
+            return b''
+        try:
+            return mapped[entry.offset:entry.offset + entry.length]
+        finally:
+            mapped.close()
+
+    def summary(self) -> Dict[str, object]:
+        counts = {KIND_FRAME: 0, KIND_INPUT: 0, KIND_JOIN: 0, KIND_LEAVE: 0}
+        keyframes = frame_bytes = 0
+        duration = 0.0
+        for record in self.records():
+            counts[record.kind] = counts.get(record.kind, 0) + 1
+            duration = max(duration, record.t)
+            if record.kind == KIND_FRAME:
+                frame_bytes += len(record.data)
+                keyframes += bool(record.flags & FLAG_KEYFRAME)
+        return {
+            'segments': len(self.segments),
+            'bytes': sum(os.path.getsize(segment) for segment in self.segments),
+            'started': self.started_wall,
+            'duration_s': round(duration, 3),
+            'frames': counts[KIND_FRAME],
+            'keyframes': keyframes,
+            'indexed_keyframes': len(self.keyframes()),
+            'frame_bytes': frame_bytes,
+            'inputs': counts[KIND_INPUT],
+            'clients': counts[KIND_JOIN],
+        }
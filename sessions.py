@@ -0,0 +1,190 @@
+import random
+import string
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from link_stats import LinkEstimator
+from wire_protocol import CumulativeAck
+
+ROLE_CONTROLLER = 'controller'
+ROLE_VIEWER = 'viewer'
+
+class SessionError(Exception):
+    """세션 참가/관리 실패 (메시지는 클라이언트에 그대로 전달)"""
+
+class ClientInfo:
+    """인증된 클라이언트 상태 (수백 개 유지를 고려해 __slots__ 사용)"""
+    __slots__ = (
+        'address', 'last_activity', 'keepalive_seen', 'link', 'authenticated', 'session', 'role',
+        'codec', 'tx_seq', 'batch_acks', 'batch_ack_timer',
+        'frame_transport', 'frame_codec', 'tile_differ',
+        'capture_mode', 'capture_monitor', 'capture_zoom', 'capture_region',
+        'streaming_enabled', 'frame_in_flight', 'frame_pending', 'frames_dropped',
+    )
+
+    def __init__(self, address: tuple, last_activity: float,
+                 session: Optional['Session'] = None, role: str = ROLE_CONTROLLER,
+                 authenticated: bool = False, codec: str = 'json',
+                 frame_transport: str = 'json', frame_codec: str = 'jpeg',
+                 tile_differ=None, capture_zoom: float = 2.0):
+        self.address = address
+        self.last_activity = last_activity     # 마지막 수신 시각 (time.monotonic)
+        self.keepalive_seen = False            # keepalive 를 보내는 클라이언트인지
+        self.link = LinkEstimator()            # keepalive 기반 RTT/지터/손실 추정
+        self.authenticated = authenticated
+        self.session = session
+        self.role = role
+
+        # 와이어 프로토콜
+        self.codec = codec                      # 협상된 와이어 코덱
+        self.tx_seq = 0                         # 바이너리 송신 시퀀스 번호
+        self.batch_acks = CumulativeAck()       # batch 메시지 누적 확인 응답 / 재전송 중복 제거
+        self.batch_ack_timer = None             # 지연 확인 응답 타이머 (asyncio.TimerHandle)
+
+        # 프레임 전송
+        self.frame_transport = frame_transport  # 'json' (base64) 또는 'chunked'
+        self.frame_codec = frame_codec          # 협상된 프레임 이미지 포맷
+        self.tile_differ = tile_differ          # 델타 프레임 지원 클라이언트만
+
+        # 캡처 영역 (capture_regions.CAPTURE_MODES)
+        self.capture_mode = 'full'
+        self.capture_monitor = 0
+        self.capture_zoom = capture_zoom
+        self.capture_region: Optional[tuple] = None  # 마지막으로 알린 캡처 영역
+
+        # 스트리밍 / 프레임 요청 상태
+        self.streaming_enabled = False
+        self.frame_in_flight = False            # 프레임 전송 진행 중
+        self.frame_pending = False              # 진행 중에 들어온 요청 (최신 1건만 유지)
+        self.frames_dropped = 0
+
+    @property
+    def is_controller(self) -> bool:
+        return self.role == ROLE_CONTROLLER
+
+class Session:
+    """발표 세션: 컨트롤러 한 명과 보기 전용 뷰어 여러 명"""
+    __slots__ = (
+        'session_id', 'controller_code', 'viewer_code', 'created_at',
+        'controller', 'viewers', 'stream', 'stream_task', 'differs',
+    )
+
+    def __init__(self, session_id: str, controller_code: str, viewer_code: str):
+        self.session_id = session_id
+        self.controller_code = controller_code
+        self.viewer_code = viewer_code
+        self.created_at = time.time()
+        self.controller: Optional[ClientInfo] = None
+        self.viewers: Dict[tuple, ClientInfo] = {}
+
+        # 세션 단위 스트리밍 (프레임을 한 번 인코딩해 모든 시청자에게 전송)
+        self.stream = None
+        self.stream_task = None
+        self.differs: Dict[str, object] = {}  # 프레임 코덱별 공유 TileDiffer
+
+    def members(self) -> Iterator[ClientInfo]:
+        if self.controller is not None:
+            yield self.controller
+        yield from self.viewers.values()
+
+    def streaming_members(self) -> List[ClientInfo]:
+        return [client for client in self.members() if client.streaming_enabled]
+
+    def info(self) -> Dict[str, object]:
+        return {
+            'session_id': self.session_id,
+            'controller_code': self.controller_code,
+            'viewer_code': self.viewer_code,
+            'controller': self.controller.address if self.controller else None,
+            'viewers': len(self.viewers),
+        }
+
+class SessionManager:
+    """세션과 세션별 연결 코드, 주소별 클라이언트 레코드 관리"""
+
+    def __init__(self, code_length: int = 6, max_viewers: int = 256):
+        self.code_length = code_length
+        self.max_viewers = max_viewers
+        self.sessions: Dict[str, Session] = {}
+        self._codes: Dict[str, Tuple[Session, str]] = {}
+        self._clients: Dict[tuple, ClientInfo] = {}
+
+    def _new_code(self) -> str:
+        while True:
+            code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=self.code_length))
+            if code not in self._codes:
+                return code
+
+    def create_session(self, controller_code: Optional[str] = None) -> Session:
+        controller_code = controller_code or self._new_code()
+        if controller_code in self._codes:
+            raise SessionError("Connection code already in use")
+        session = Session(
+            session_id=f"s{len(self.sessions) + 1}-{self._new_code().lower()}",
+            controller_code=controller_code,
+            viewer_code=self._new_code()
+        )
+        self.sessions[session.session_id] = session
+        self._codes[session.controller_code] = (session, ROLE_CONTROLLER)
+        self._codes[session.viewer_code] = (session, ROLE_VIEWER)
+        return session
+
+    def close_session(self, session: Session) -> List[ClientInfo]:
+        """세션 종료, 남아 있던 클라이언트 목록 반환"""
+        members = list(session.members())
+        for client in members:
+            self._clients.pop(client.address, None)
+        self._codes.pop(session.controller_code, None)
+        self._codes.pop(session.viewer_code, None)
+        self.sessions.pop(session.session_id, None)
+        return members
+
+    def resolve_code(self, code: Optional[str]) -> Optional[Tuple[Session, str]]:
+        return self._codes.get(code)
+
+    def join(self, client: ClientInfo) -> Optional[ClientInfo]:
+        """클라이언트를 세션에 추가
+
+        컨트롤러 코드로 새로 들어온 클라이언트는 기존 컨트롤러를 대체한다
+        (휴대폰 재연결로 포트가 바뀐 경우). 대체된 컨트롤러를 반환한다.
+        """
+        session = client.session
+        replaced = None
+
+        # 같은 주소의 이전 레코드 정리 (재인증)
+        previous = self._clients.get(client.address)
+        if previous is not None:
+            self.leave(client.address)
+
+        if client.is_controller:
+            replaced = session.controller
+            if replaced is not None:
+                self._clients.pop(replaced.address, None)
+            session.controller = client
+        else:
+            if len(session.viewers) >= self.max_viewers:
+                raise SessionError("Session is full")
+            session.viewers[client.address] = client
+
+        self._clients[client.address] = client
+        return replaced
+
+    def leave(self, addr: tuple) -> Optional[ClientInfo]:
+        client = self._clients.pop(addr, None)
+        if client is None:
+            return None
+        session = client.session
+        if session.controller is client:
+            session.controller = None
+        else:
+            session.viewers.pop(addr, None)
+        return client
+
+    def get(self, addr: tuple) -> Optional[ClientInfo]:
+        return self._clients.get(addr)
+
+    def clients(self) -> List[ClientInfo]:
+        return list(self._clients.values())
+
+    def __len__(self) -> int:
+        return len(self._clients)
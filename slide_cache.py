@@ -0,0 +1,125 @@
+import collections
+import hashlib
+import itertools
+import time
+from typing import Dict, List, Optional, Tuple
+
+SLIDE_URL_PREFIX = '/slides/'
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+def content_digest(data: bytes) -> str:
+    """내용 해시 (URL 에 사용, 같은 내용이면 같은 URL)"""
+    return hashlib.sha256(data).hexdigest()[:24]
+
+class SlideEntry:
+    """한 슬라이드의 썸네일과 원본 크기 JPEG"""
+    __slots__ = ('slide_id', 'phash', 'size', 'thumb', 'full', 'thumb_digest', 'full_digest',
+                 'first_seen', 'last_seen', 'shown')
+
+    def __init__(self, slide_id: int, phash: int, size: Tuple[int, int], thumb: bytes, full: bytes):
+        self.slide_id = slide_id
+        self.phash = phash
+        self.size = size
+        self.thumb = thumb
+        self.full = full
+        self.thumb_digest = content_digest(thumb)
+        self.full_digest = content_digest(full)
+        self.first_seen = self.last_seen = time.time()
+        self.shown = 1
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.thumb) + len(self.full)
+
+    def info(self) -> Dict[str, object]:
+        return {
+            'id': self.slide_id,
+            'thumb': f'{SLIDE_URL_PREFIX}{self.thumb_digest}.jpg',
+            'full': f'{SLIDE_URL_PREFIX}{self.full_digest}.jpg',
+            'width': self.size[0],
+            'height': self.size[1],
+        }
+
+class SlideCache:
+    """지각 해시로 구분한 슬라이드의 LRU 캐시 (슬라이드 수와 총 바이트 상한)
+
+    perceptual hash 의 해밍 거리가 threshold 이하인 캡처는 같은 슬라이드로 보고
+    한 번만 저장한다. 이미지는 내용 해시 URL 로 제공되므로 한 번 받은 클라이언트는
+    다시 받을 필요가 없다 (immutable 캐시). 상한을 넘으면 가장 오래 보지 않은
+    슬라이드부터 제거한다.
+    """
+
+    def __init__(self, max_bytes: int = 48 * 1024 * 1024, max_slides: int = 120, threshold: int = 10):
+        self.max_bytes = max_bytes
+        self.max_slides = max_slides
+        self.threshold = threshold
+        self._entries: 'collections.OrderedDict[int, SlideEntry]' = collections.OrderedDict()
+        self._contents: Dict[str, bytes] = {}  # 내용 해시 -> JPEG
+        self._ids = itertools.count(1)
+        self.nbytes = 0
+
+        # 통계
+        self.added = 0
+        self.matched = 0
+        self.evicted = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def match(self, phash: int) -> Optional[SlideEntry]:
+        """해밍 거리가 가장 가까운 같은 슬라이드 (threshold 초과면 None)"""
+        best, best_distance = None, self.threshold + 1
+        for entry in self._entries.values():
+            distance = hamming_distance(entry.phash, phash)
+            if distance < best_distance:
+                best, best_distance = entry, distance
+        return best
+
+    def touch(self, entry: SlideEntry):
+        """다시 표시된 슬라이드 (LRU 최신으로)"""
+        entry.last_seen = time.time()
+        entry.shown += 1
+        self._entries.move_to_end(entry.slide_id)
+        self.matched += 1
+
+    def add(self, phash: int, size: Tuple[int, int], thumb: bytes, full: bytes) -> Optional[SlideEntry]:
+        """새 슬라이드 저장 (혼자서 상한을 넘는 크기면 저장하지 않고 None)"""
+        entry = SlideEntry(next(self._ids), phash, size, thumb, full)
+        if entry.nbytes > self.max_bytes:
+            self.rejected += 1
+            return None
+        self._entries[entry.slide_id] = entry
+        self._contents[entry.thumb_digest] = thumb
+        self._contents[entry.full_digest] = full
+        self.nbytes += entry.nbytes
+        self.added += 1
+        while self.nbytes > self.max_bytes or len(self._entries) > self.max_slides:
+            self._evict()
+        return entry
+
+    def _evict(self):
+        _, entry = self._entries.popitem(last=False)
+        self._contents.pop(entry.thumb_digest, None)
+        self._contents.pop(entry.full_digest, None)
+        self.nbytes -= entry.nbytes
+        self.evicted += 1
+
+    def content(self, digest: str) -> Optional[bytes]:
+        return self._contents.get(digest)
+
+    def listing(self) -> List[Dict[str, object]]:
+        """표시된 순서(첫 표시 기준)의 슬라이드 목록"""
+        return [entry.info() for entry in sorted(self._entries.values(), key=lambda entry: entry.slide_id)]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'slides': len(self._entries),
+            'bytes': self.nbytes,
+            'added': self.added,
+            'matched': self.matched,
+            'evicted': self.evicted,
+            'rejected': self.rejected,
+        }
@@ -0,0 +1,153 @@
+import collections
+import time
+from typing import Deque, Dict, Optional, Sequence
+
+class AdaptiveStreamController:
+    """클라이언트별 푸시 스트리밍의 FPS / 품질 / 스케일 자동 조정
+
+    측정 지연(ACK 왕복 또는 ACK 미지원 시 캡처+전송 시간)과 손실을 목표 지연과
+    비교하여 AIMD 방식으로 조정한다. 악화 시에는 FPS -> 품질 -> 스케일 순으로
+    줄이고, 여유가 생기면 역순으로 회복한다.
+    """
+
+    def __init__(self,
+                 target_latency: float = 0.1,
+                 fps_range: tuple = (2.0, 30.0),
+                 quality_range: tuple = (20, 80),
+                 scale_range: tuple = (0.25, 1.0),
+                 initial_quality: int = 50,
+                 initial_scale: float = 0.5,
+                 use_acks: bool = True):
+        self.target_latency = target_latency
+        self.base_target_latency = target_latency
+        self.min_fps, self.max_fps = fps_range
+        self.min_quality, self.max_quality = quality_range
+        self.min_scale, self.max_scale = scale_range
+        self.use_acks = use_acks
+
+        self.fps = self.max_fps / 2
+        self.quality = max(self.min_quality, min(initial_quality, self.max_quality))
+        self.scale = max(self.min_scale, min(initial_scale, self.max_scale))
+
+        # 지연 / 손실 추정
+        self.smoothed_latency: Optional[float] = None
+        self._unacked: Dict[int, float] = {}
+        # 같은 캡처를 다른 그룹(코덱/델타)으로 보낸 프레임 ID -> 집계용 대표 프레임 ID
+        self._aliases: Dict[int, int] = {}
+        self._loss_events: Deque[bool] = collections.deque(maxlen=32)
+
+        # 통계
+        self.frames_sent = 0
+        self.frames_acked = 0
+        self.frames_lost = 0
+        self.bytes_sent = 0
+        self.last_send_time = 0.0
+
+    def set_path_latency(self, latency: Optional[float]):
+        """네트워크 왕복 추정치(SRTT + 4*RTTVAR)를 목표 지연의 하한으로 반영
+
+        왕복 시간보다 짧은 목표는 달성할 수 없으므로, 그 상태에서 품질을 계속
+        깎지 않도록 목표를 경로 지연 이상으로 올린다.
+        """
+        if latency is None:
+            self.target_latency = self.base_target_latency
+        else:
+            self.target_latency = max(self.base_target_latency, latency)
+
+    def _sample_latency(self, sample: float):
+        if self.smoothed_latency is None:
+            self.smoothed_latency = sample
+        else:
+            self.smoothed_latency += 0.125 * (sample - self.smoothed_latency)
+
+    def on_frame_sent(self, frame_id: int, send_time: float, size: int, aliases: Sequence[int] = ()):
+        """프레임 캡처+전송 완료 (send_time: 소요 시간, 초)
+
+        aliases: 같은 캡처를 다른 그룹으로 보낸 프레임 ID (어느 것의 ACK 든 이 프레임으로 집계)
+        """
+        self.frames_sent += 1
+        self.bytes_sent += size
+        self.last_send_time = send_time
+        if self.use_acks:
+            self._unacked[frame_id] = time.monotonic()
+            for alias in aliases:
+                self._aliases[alias] = frame_id
+        else:
+            self._sample_latency(send_time)
+            self._loss_events.append(False)
+
+    def on_ack(self, frame_id: int):
+        frame_id = self._aliases.pop(frame_id, frame_id)
+        sent_at = self._unacked.pop(frame_id, None)
+        if sent_at is None:
+            return
+        self.frames_acked += 1
+        self._loss_events.append(False)
+        self._sample_latency(time.monotonic() - sent_at)
+
+    def on_loss(self, count: int = 1):
+        """NACK 등 외부에서 감지한 손실 보고"""
+        self.frames_lost += count
+        self._loss_events.extend([True] * count)
+
+    def _expire_unacked(self):
+        # 목표 지연의 4배 안에 ACK 가 없으면 손실로 간주
+        deadline = time.monotonic() - max(self.target_latency * 4, 0.5)
+        expired = [frame_id for frame_id, sent_at in self._unacked.items() if sent_at < deadline]
+        for frame_id in expired:
+            del self._unacked[frame_id]
+        if self._aliases:
+            # 대표 프레임이 확인/만료된 별칭 정리
+            self._aliases = {alias: frame_id for alias, frame_id in self._aliases.items()
+                             if frame_id in self._unacked}
+        if expired:
+            self.on_loss(len(expired))
+
+    @property
+    def loss_rate(self) -> float:
+        if not self._loss_events:
+            return 0.0
+        return sum(self._loss_events) / len(self._loss_events)
+
+    def adjust(self):
+        """다음 프레임 전 파라미터 조정"""
+        if self.use_acks:
+            self._expire_unacked()
+        if self.smoothed_latency is None:
+            return
+
+        if self.smoothed_latency > self.target_latency or self.loss_rate > 0.1:
+            # 곱셈 감소: FPS -> 품질 -> 스케일
+            if self.fps > self.min_fps:
+                self.fps = max(self.min_fps, self.fps * 0.8)
+            elif self.quality > self.min_quality:
+                self.quality = max(self.min_quality, self.quality - 10)
+            else:
+                self.scale = max(self.min_scale, round(self.scale - 0.1, 2))
+        elif self.smoothed_latency < self.target_latency * 0.7 and self.loss_rate < 0.02:
+            # 덧셈 증가: 스케일 -> 품질 -> FPS
+            if self.scale < self.max_scale:
+                self.scale = min(self.max_scale, round(self.scale + 0.05, 2))
+            elif self.quality < self.max_quality:
+                self.quality = min(self.max_quality, self.quality + 5)
+            else:
+                self.fps = min(self.max_fps, self.fps + 1)
+
+    @property
+    def frame_interval(self) -> float:
+        return 1.0 / self.fps
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'fps': round(self.fps, 2),
+            'quality': self.quality,
+            'scale': self.scale,
+            'latency_ms': round((self.smoothed_latency or 0.0) * 1000, 2),
+            'target_latency_ms': round(self.target_latency * 1000, 2),
+            'loss_rate': round(self.loss_rate, 4),
+            'send_time_ms': round(self.last_send_time * 1000, 2),
+            'frames_sent': self.frames_sent,
+            'frames_acked': self.frames_acked,
+            'frames_lost': self.frames_lost,
+            'bytes_sent': self.bytes_sent,
+        }
@@ -0,0 +1,430 @@
+import asyncio
+import collections
+import ctypes
+import ctypes.util
+import errno
+import logging
+import socket
+import struct
+import sys
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+MSG_DONTWAIT = getattr(socket, 'MSG_DONTWAIT', 0x40)
+MSG_TRUNC = getattr(socket, 'MSG_TRUNC', 0x20)
+SOCKADDR_SIZE = 128  # sizeof(struct sockaddr_storage)
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_name', ctypes.c_void_p),
+        ('msg_namelen', ctypes.c_uint32),
+        ('msg_iov', ctypes.POINTER(_IOVec)),
+        ('msg_iovlen', ctypes.c_size_t),
+        ('msg_control', ctypes.c_void_p),
+        ('msg_controllen', ctypes.c_size_t),
+        ('msg_flags', ctypes.c_int),
+    ]
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [('msg_hdr', _MsgHdr), ('msg_len', ctypes.c_uint)]
+
+def _load_libc():
+    """recvmmsg/sendmmsg 를 제공하는 libc (Linux 외에는 None)"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        for name in ('recvmmsg', 'sendmmsg'):
+            func = getattr(libc, name)
+            func.restype = ctypes.c_int
+        libc.recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint,
+                                  ctypes.c_int, ctypes.c_void_p]
+        libc.sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+_LIBC = _load_libc()
+
+def mmsg_available() -> bool:
+    return _LIBC is not None
+
+def encode_sockaddr(addr: tuple) -> bytes:
+    """(host, port[, flowinfo, scope_id]) -> struct sockaddr_in/in6"""
+    host, port = addr[0], addr[1]
+    if ':' in host:
+        flowinfo, scope_id = (addr[2], addr[3]) if len(addr) >= 4 else (0, 0)
+        return (struct.pack('=H', socket.AF_INET6) + struct.pack('!HI', port, flowinfo)
+                + socket.inet_pton(socket.AF_INET6, host) + struct.pack('=I', scope_id))
+    return struct.pack('=H', socket.AF_INET) + struct.pack('!H', port) + socket.inet_aton(host) + bytes(8)
+
+def decode_sockaddr(raw: bytes) -> tuple:
+    family = struct.unpack_from('=H', raw)[0]
+    port = struct.unpack_from('!H', raw, 2)[0]
+    if family == socket.AF_INET6:
+        flowinfo = struct.unpack_from('!I', raw, 4)[0]
+        scope_id = struct.unpack_from('=I', raw, 24)[0]
+        return socket.inet_ntop(socket.AF_INET6, raw[8:24]), port, flowinfo, scope_id
+    return socket.inet_ntoa(raw[4:8]), port
+
+# mmsghdr/iovec 배열을 ctypes 필드 대신 struct 로 직접 읽고 쓰기 위한 오프셋
+_MMSG_SIZE = ctypes.sizeof(_MMsgHdr)
+_IOV_SIZE = ctypes.sizeof(_IOVec)
+_NAME = struct.Struct('@P')
+_UINT = struct.Struct('@I')
+_FLAGS = struct.Struct('@i')
+_IOV = struct.Struct('@PN')
+_O_NAME = _MsgHdr.msg_name.offset
+_O_NAMELEN = _MsgHdr.msg_namelen.offset
+_O_FLAGS = _MsgHdr.msg_flags.offset
+_O_LEN = _MMsgHdr.msg_len.offset
+
+class MMsgSocket:
+    """recvmmsg/sendmmsg 로 시스템 호출 한 번에 여러 데이터그램을 주고받는 래퍼
+
+    헤더/버퍼 배열은 미리 할당해 재사용하고 (ctypes 필드 접근 대신 struct 로
+    직접 읽고 씀), 송신 데이터는 하나의 송신 버퍼에 복사해 보낸다. 주소 변환
+    결과는 캐시한다.
+    """
+
+    def __init__(self, sock: socket.socket, batch: int = 64, recv_size: int = 65536,
+                 send_size: int = 1024 * 1024):
+        self.fd = sock.fileno()
+        self.batch = batch
+        self.recv_size = recv_size
+        self.send_size = send_size
+
+        self._recv_buffer = ctypes.create_string_buffer(batch * recv_size)
+        self._recv_names = ctypes.create_string_buffer(batch * SOCKADDR_SIZE)
+        self._recv_iov = (_IOVec * batch)()
+        self._recv_msgs = (_MMsgHdr * batch)()
+        self._send_buffer = ctypes.create_string_buffer(send_size)
+        self._send_iov = (_IOVec * batch)()
+        self._send_msgs = (_MMsgHdr * batch)()
+
+        buffer_base = ctypes.addressof(self._recv_buffer)
+        names_base = ctypes.addressof(self._recv_names)
+        for i in range(batch):
+            self._recv_iov[i].iov_base = buffer_base + i * recv_size
+            self._recv_iov[i].iov_len = recv_size
+            hdr = self._recv_msgs[i].msg_hdr
+            hdr.msg_name = names_base + i * SOCKADDR_SIZE
+            hdr.msg_namelen = SOCKADDR_SIZE
+            hdr.msg_iov = ctypes.pointer(self._recv_iov[i])
+            hdr.msg_iovlen = 1
+            hdr = self._send_msgs[i].msg_hdr
+            hdr.msg_iov = ctypes.pointer(self._send_iov[i])
+            hdr.msg_iovlen = 1
+
+        self._recv_view = memoryview(self._recv_msgs).cast('B')
+        self._recv_data = memoryview(self._recv_buffer).cast('B')
+        self._recv_name_view = memoryview(self._recv_names).cast('B')
+        self._send_view = memoryview(self._send_msgs).cast('B')
+        self._send_iov_view = memoryview(self._send_iov).cast('B')
+        self._send_data = memoryview(self._send_buffer).cast('B')
+        self._send_base = ctypes.addressof(self._send_buffer)
+
+        # 주소 변환 캐시 (클라이언트 수 만큼만 늘어나도록 상한)
+        self._addr_cache: Dict[bytes, tuple] = {}
+        self._name_cache: Dict[tuple, Tuple[int, int, ctypes.Array]] = {}
+        self.truncated = 0
+
+    def recv(self) -> List[Tuple[bytes, tuple]]:
+        """대기 중인 데이터그램을 최대 batch 개 수신 (없으면 빈 목록)"""
+        count = _LIBC.recvmmsg(self.fd, self._recv_msgs, self.batch, MSG_DONTWAIT, None)
+        if count < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return []
+            raise OSError(err, f"recvmmsg: {errno.errorcode.get(err, err)}")
+
+        received = []
+        msgs = self._recv_view
+        data = self._recv_data
+        names = self._recv_name_view
+        addr_cache = self._addr_cache
+        recv_size = self.recv_size
+        for i in range(count):
+            base = i * _MMSG_SIZE
+            if _FLAGS.unpack_from(msgs, base + _O_FLAGS)[0] & MSG_TRUNC:
+                self.truncated += 1
+            else:
+                name = i * SOCKADDR_SIZE
+                raw = bytes(names[name:name + _UINT.unpack_from(msgs, base + _O_NAMELEN)[0]])
+                addr = addr_cache.get(raw)
+                if addr is None:
+                    if len(addr_cache) >= 4096:
+                        addr_cache.clear()
+                    addr = addr_cache[raw] = decode_sockaddr(raw)
+                start = i * recv_size
+                received.append((bytes(data[start:start + _UINT.unpack_from(msgs, base + _O_LEN)[0]]), addr))
+            # 커널이 덮어쓴 주소 길이 복원
+            _UINT.pack_into(msgs, base + _O_NAMELEN, SOCKADDR_SIZE)
+        return received
+
+    def _name(self, addr: tuple) -> Tuple[int, int, ctypes.Array]:
+        name = self._name_cache.get(addr)
+        if name is None:
+            if len(self._name_cache) >= 4096:
+                self._name_cache.clear()
+            raw = encode_sockaddr(addr)
+            buffer = ctypes.create_string_buffer(raw, len(raw))
+            name = self._name_cache[addr] = (ctypes.addressof(buffer), len(raw), buffer)
+        return name
+
+    def send(self, items: List[Tuple[bytes, tuple]]) -> int:
+        """앞에서부터 최대 batch 개 (송신 버퍼 크기까지)를 한 번에 송신하고 보낸 개수 반환
+
+        보낼 수 없으면 (소켓 버퍼 가득) 0, 첫 데이터그램이 오류면 OSError.
+        """
+        msgs = self._send_view
+        iov = self._send_iov_view
+        buffer = self._send_data
+        base = self._send_base
+        offset = 0
+        count = 0
+        for data, addr in items[:self.batch]:
+            size = len(data)
+            if offset + size > self.send_size and count:
+                break
+            buffer[offset:offset + size] = data
+            _IOV.pack_into(iov, count * _IOV_SIZE, base + offset, size)
+            name, namelen, _ = self._name(addr)
+            header = count * _MMSG_SIZE
+            _NAME.pack_into(msgs, header + _O_NAME, name)
+            _UINT.pack_into(msgs, header + _O_NAMELEN, namelen)
+            offset += size
+            count += 1
+        sent = _LIBC.sendmmsg(self.fd, self._send_msgs, count, MSG_DONTWAIT)
+        if sent < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR, errno.ENOBUFS):
+                return 0
+            raise OSError(err, f"sendmmsg: {errno.errorcode.get(err, err)}")
+        return sent
+
+def configure_socket_buffers(sock, rcvbuf: Optional[int] = None,
+                             sndbuf: Optional[int] = None) -> Tuple[int, int]:
+    """SO_RCVBUF/SO_SNDBUF 설정 후 실제 적용된 크기 반환 (커널 상한에 따라 줄어들 수 있음)"""
+    if rcvbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    if sndbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf)
+    return (sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF),
+            sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF))
+
+class BatchedDatagramTransport(asyncio.DatagramTransport):
+    """읽기 준비 이벤트마다 여러 데이터그램을 처리하고 송신은 모아서 보내는 UDP 전송
+
+    asyncio 기본 전송은 준비 이벤트당 recvfrom 한 번, sendto 마다 시스템 호출
+    한 번을 한다. 이 전송은
+
+    - 준비 이벤트마다 소켓이 빌 때까지 (최대 batch * max_batches 개) 수신
+    - use_mmsg 이면 (Linux) recvmmsg/sendmmsg 로 시스템 호출 한 번에 batch 개 처리하고,
+      sendto 는 큐에 넣어 루프 반복마다 한 번 모아서 송신 (프레임 팬아웃, 배치 응답)
+    - 아니면 sendto 는 바로 송신하고 소켓 버퍼가 가득 찼을 때만 큐에 보관
+
+    루프백에서는 ctypes 호출과 헤더 파싱 비용이 절약되는 시스템 호출 비용보다 커서
+    use_mmsg 는 기본으로 끈다 (benchmarks/bench_udp_io.py 로 환경별 비교).
+
+    프로토콜 인터페이스(connection_made, datagram_received, error_received,
+    connection_lost)는 그대로다. 송신 큐가 max_buffer 를 넘으면 새 데이터그램을
+    버린다 (UDP 손실과 같음, 프레임 전송은 NACK 로 복구).
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, sock: socket.socket, protocol,
+                 batch: int = 64, max_batches: int = 4, recv_size: int = 65536,
+                 max_buffer: int = 4 * 1024 * 1024, use_mmsg: bool = False):
+        super().__init__(extra={'socket': sock, 'sockname': sock.getsockname()})
+        self.logger = logging.getLogger('BatchedDatagramTransport')
+        self._loop = loop
+        self._sock = sock
+        self._fd = sock.fileno()
+        self._protocol = protocol
+        self.batch = batch
+        self.max_batches = max_batches
+        self.recv_size = recv_size
+        self.max_buffer = max_buffer
+        self._mmsg = MMsgSocket(sock, batch, recv_size) if use_mmsg and mmsg_available() else None
+
+        self._queue: Deque[Tuple[bytes, tuple]] = collections.deque()
+        self._buffer_size = 0
+        self._flush_scheduled = False
+        self._writing = False
+        self._closing = False
+
+        # 통계
+        self.datagrams_received = 0
+        self.datagrams_sent = 0
+        self.recv_calls = 0
+        self.send_calls = 0
+        self.dropped = 0
+
+        sock.setblocking(False)
+        loop.add_reader(self._fd, self._read_ready)
+        loop.call_soon(protocol.connection_made, self)
+
+    # 수신
+    def _receive_batch(self) -> List[Tuple[bytes, tuple]]:
+        if self._mmsg is not None:
+            return self._mmsg.recv()
+        received = []
+        recvfrom = self._sock.recvfrom
+        for _ in range(self.batch):
+            try:
+                received.append(recvfrom(self.recv_size))
+            except (BlockingIOError, InterruptedError):
+                break
+        return received
+
+    def _read_ready(self):
+        protocol = self._protocol
+        for _ in range(self.max_batches):
+            try:
+                received = self._receive_batch()
+            except OSError as e:
+                protocol.error_received(e)
+                return
+            self.recv_calls += 1
+            for data, addr in received:
+                protocol.datagram_received(data, addr)
+                if self._closing:
+                    return
+            self.datagrams_received += len(received)
+            if len(received) < self.batch:
+                break
+
+    # 송신
+    def sendto(self, data, addr=None):
+        if self._closing:
+            return
+        if self._mmsg is None and not self._queue:
+            # 시스템 호출을 묶을 수 없으면 바로 송신 (소켓 버퍼가 가득 찼을 때만 큐 사용)
+            try:
+                self._sock.sendto(data, addr)
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError as e:
+                self._protocol.error_received(e)
+                return
+            else:
+                self.send_calls += 1
+                self.datagrams_sent += 1
+                return
+        if self._buffer_size + len(data) > self.max_buffer:
+            self.dropped += 1
+            return
+        if self._writing:
+            # 소켓이 쓰기 가능해질 때까지 대기: 재사용되는 송신 버퍼는 복사
+            data = bytes(data)
+        self._queue.append((data, addr))
+        self._buffer_size += len(data)
+        if not self._flush_scheduled and not self._writing:
+            self._flush_scheduled = True
+            self._loop.call_soon(self._flush)
+
+    def _send_batch(self, items: List[Tuple[bytes, tuple]]) -> int:
+        if self._mmsg is not None:
+            return self._mmsg.send(items)
+        sent = 0
+        for data, addr in items:
+            try:
+                self._sock.sendto(data, addr)
+            except (BlockingIOError, InterruptedError):
+                break
+            sent += 1
+        return sent
+
+    def _flush(self):
+        self._flush_scheduled = False
+        queue = self._queue
+        while queue:
+            items = [queue[i] for i in range(min(len(queue), self.batch))]
+            try:
+                sent = self._send_batch(items)
+            except OSError as e:
+                # 첫 데이터그램 오류 (예: ICMP 로 받은 ECONNREFUSED): 그것만 버리고 계속
+                sent = 1
+                self._protocol.error_received(e)
+            else:
+                self.send_calls += 1
+                self.datagrams_sent += sent
+            if sent == 0:
+                break
+            for _ in range(sent):
+                data, _ = queue.popleft()
+                self._buffer_size -= len(data)
+
+        if queue and not self._writing:
+            # 소켓 버퍼가 가득 참: 호출자가 재사용할 수 있는 버퍼는 복사해 두고 쓰기 가능할 때 재개
+            self._queue = collections.deque((bytes(data), addr) for data, addr in queue)
+            self._writing = True
+            self._loop.add_writer(self._fd, self._write_ready)
+        elif not queue and self._writing:
+            self._writing = False
+            self._loop.remove_writer(self._fd)
+
+    def _write_ready(self):
+        self._flush()
+
+    def get_write_buffer_size(self) -> int:
+        return self._buffer_size
+
+    # 종료
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self):
+        if self._closing:
+            return
+        # 남은 송신(종료 알림 등)은 한 번 시도
+        self._flush()
+        self._closing = True
+        self._loop.remove_reader(self._fd)
+        if self._writing:
+            self._loop.remove_writer(self._fd)
+        self._queue.clear()
+        self._buffer_size = 0
+        self._loop.call_soon(self._finish_close)
+
+    def abort(self):
+        self._queue.clear()
+        self._buffer_size = 0
+        self.close()
+
+    def _finish_close(self):
+        try:
+            self._protocol.connection_lost(None)
+        finally:
+            self._sock.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'datagrams_received': self.datagrams_received,
+            'datagrams_sent': self.datagrams_sent,
+            'recv_calls': self.recv_calls,
+            'send_calls': self.send_calls,
+            'dropped': self.dropped,
+            'truncated': self._mmsg.truncated if self._mmsg is not None else 0,
+            'queued_bytes': self._buffer_size,
+        }
+
+async def create_batched_endpoint(protocol_factory: Callable[[], asyncio.DatagramProtocol],
+                                  local_addr: tuple, batch: int = 64,
+                                  rcvbuf: Optional[int] = None, sndbuf: Optional[int] = None,
+                                  use_mmsg: bool = False):
+    """loop.create_datagram_endpoint 와 같은 (transport, protocol) 반환"""
+    loop = asyncio.get_running_loop()
+    family = socket.AF_INET6 if ':' in local_addr[0] else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_DGRAM)
+    try:
+        configure_socket_buffers(sock, rcvbuf, sndbuf)
+        sock.bind(local_addr)
+    except OSError:
+        sock.close()
+        raise
+    protocol = protocol_factory()
+    transport = BatchedDatagramTransport(loop, sock, protocol, batch=batch, use_mmsg=use_mmsg)
+    return transport, protocol
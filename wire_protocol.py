@@ -0,0 +1,402 @@
+import json
+import struct
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Set
+
+# 바이너리 프로토콜 버전
+# JSON 메시지는 항상 '{' (0x7B)로 시작하므로 버전 바이트와 겹치지 않는다
+PROTOCOL_VERSION = 1
+
+# 공통 헤더: 버전(1B), 오프코드(1B), 시퀀스 번호(4B)
+HEADER = struct.Struct('!BBI')
+SEQ_MODULO = 1 << 32  # 시퀀스 번호는 32비트에서 순환
+_SEQ_HALF = SEQ_MODULO // 2
+
+# 오프코드별 고정 레이아웃 페이로드
+MOUSE_MOVE_PAYLOAD = struct.Struct('!Bff')   # flags, dx|x, dy|y
+MOUSE_CLICK_PAYLOAD = struct.Struct('!B')    # click type
+KEYBOARD_PAYLOAD = struct.Struct('!16s')     # NUL 패딩된 키 이름
+KEEPALIVE_PAYLOAD = struct.Struct('!Q')      # 타임스탬프 (ms)
+# RTT 측정용 확장 keepalive: 송신 측 타임스탬프(ms), 상대 타임스탬프 echo(ms, 32비트),
+# echo 를 받은 뒤 보내기까지 보관한 시간(ms). 페이로드 길이로 기본 레이아웃과 구분
+KEEPALIVE_ECHO_PAYLOAD = struct.Struct('!QII')
+# 배치: 배치 번호(4B), 이벤트 수(1B) 뒤에 (길이(1B) + 헤더 포함 이벤트 패킷) 반복
+# 배치 번호는 헤더의 패킷 시퀀스 번호와 별개 (패킷 번호는 모든 메시지가 함께 씀)
+BATCH_HEADER = struct.Struct('!IB')
+BATCH_ITEM_LENGTH = struct.Struct('!B')
+# 서버 -> 클라이언트 배치 누적 확인: 누적 확인 번호, 마지막으로 받은 배치 번호,
+# 지난 확인 이후 처리한 이벤트 수 (이벤트 오류가 있는 확인 응답은 JSON)
+BATCH_ACK_PAYLOAD = struct.Struct('!IIH')
+# 서버 -> 클라이언트 커서 위치: flags, 화면 좌표 x, y (다중 모니터 가상 화면은 음수 가능)
+CURSOR_PAYLOAD = struct.Struct('!Bhh')
+
+FLAG_LASER = 0x01
+
+CLICK_TYPES = ('left', 'right', 'double')
+_CLICK_TYPE_IDS = {name: index for index, name in enumerate(CLICK_TYPES)}
+
+class Opcode(IntEnum):
+    MOUSE_MOVE = 0x01
+    MOUSE_CLICK = 0x02
+    KEYBOARD = 0x03
+    KEEPALIVE = 0x04
+    KEEPALIVE_RESPONSE = 0x05
+    BATCH = 0x06
+    CURSOR = 0x07
+    BATCH_ACK = 0x08
+    FRAME_CHUNK = 0x10  # frame_transport.CHUNK_HEADER 참고
+
+# 오프코드 <-> JSON 메시지 타입 (remote_server.MessageType 값과 동일)
+_OPCODE_TYPES = {
+    Opcode.MOUSE_MOVE: 'mouse_move_relative',
+    Opcode.MOUSE_CLICK: 'mouse_click',
+    Opcode.KEYBOARD: 'keyboard',
+    Opcode.KEEPALIVE: 'keepalive',
+    Opcode.KEEPALIVE_RESPONSE: 'keepalive_response',
+    Opcode.BATCH: 'batch',
+    Opcode.CURSOR: 'cursor',
+    Opcode.BATCH_ACK: 'batch_ack',
+}
+_TYPE_OPCODES = {msg_type: opcode for opcode, msg_type in _OPCODE_TYPES.items()}
+
+class ProtocolError(ValueError):
+    """잘못된 바이너리 패킷"""
+
+def is_binary(data: bytes) -> bool:
+    """바이너리 프레이밍 여부 확인"""
+    return len(data) > 0 and data[0] == PROTOCOL_VERSION
+
+def seq_delta(seq: int, last: int) -> int:
+    """순환 시퀀스 번호 차이 (RFC 1982 방식, 음수면 이전 패킷)"""
+    delta = (seq - last) % SEQ_MODULO
+    return delta - SEQ_MODULO if delta >= _SEQ_HALF else delta
+
+class JsonCodec:
+    """기존 JSON 코덱 (폴백)"""
+    name = 'json'
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        return json.loads(data.decode())
+
+    def encode(self, message: Dict[str, Any], seq: int = 0) -> bytes:
+        return json.dumps(message).encode()
+
+def _message_layout(payload: struct.Struct) -> struct.Struct:
+    """공통 헤더와 페이로드를 한 번에 푸는 레이아웃"""
+    return struct.Struct(HEADER.format + payload.format.lstrip('!'))
+
+# 헤더 포함 레이아웃별 메시지 생성 (값: 버전, 오프코드, 시퀀스 번호, 페이로드 필드...)
+def _mouse_move(values: tuple) -> Dict[str, Any]:
+    _, _, seq, flags, a, b = values
+    if flags & FLAG_LASER:
+        return {'type': 'mouse_move_relative', 'seq': seq, 'is_laser': True, 'x': a, 'y': b}
+    return {'type': 'mouse_move_relative', 'seq': seq, 'dx': a, 'dy': b}
+
+def _mouse_click(values: tuple) -> Dict[str, Any]:
+    _, _, seq, click_id = values
+    if click_id >= len(CLICK_TYPES):
+        raise ProtocolError(f"Unknown click type: {click_id}")
+    return {'type': 'mouse_click', 'seq': seq, 'click_type': CLICK_TYPES[click_id]}
+
+def _keyboard(values: tuple) -> Dict[str, Any]:
+    _, _, seq, raw_key = values
+    return {'type': 'keyboard', 'seq': seq, 'key': raw_key.rstrip(b'\x00').decode('ascii')}
+
+def _keepalive(values: tuple) -> Dict[str, Any]:
+    _, opcode, seq, timestamp = values
+    return {'type': _OPCODE_TYPES[opcode], 'seq': seq, 'timestamp': timestamp}
+
+def _keepalive_echo(values: tuple) -> Dict[str, Any]:
+    _, opcode, seq, timestamp, echo, echo_delay = values
+    return {'type': _OPCODE_TYPES[opcode], 'seq': seq, 'timestamp': timestamp,
+            'echo': echo, 'echo_delay': echo_delay}
+
+def _cursor(values: tuple) -> Dict[str, Any]:
+    _, _, seq, flags, x, y = values
+    return {'type': 'cursor', 'seq': seq, 'x': x, 'y': y, 'laser': bool(flags & FLAG_LASER)}
+
+def _batch_ack(values: tuple) -> Dict[str, Any]:
+    _, _, seq, ack, batch_seq, processed = values
+    return {'type': 'batch_ack', 'seq': seq, 'ack': ack, 'batch_seq': batch_seq, 'processed': processed}
+
+BATCH_LAYOUT = _message_layout(BATCH_HEADER)
+
+# 오프코드 -> (헤더 포함 레이아웃, 생성 함수) 목록, 남은 길이가 맞는 첫 레이아웃 사용
+# (keepalive 는 확장 레이아웃을 먼저 확인)
+_DECODERS = {
+    Opcode.MOUSE_MOVE: ((_message_layout(MOUSE_MOVE_PAYLOAD), _mouse_move),),
+    Opcode.MOUSE_CLICK: ((_message_layout(MOUSE_CLICK_PAYLOAD), _mouse_click),),
+    Opcode.KEYBOARD: ((_message_layout(KEYBOARD_PAYLOAD), _keyboard),),
+    Opcode.KEEPALIVE: ((_message_layout(KEEPALIVE_ECHO_PAYLOAD), _keepalive_echo),
+                       (_message_layout(KEEPALIVE_PAYLOAD), _keepalive)),
+    Opcode.CURSOR: ((_message_layout(CURSOR_PAYLOAD), _cursor),),
+    Opcode.BATCH_ACK: ((_message_layout(BATCH_ACK_PAYLOAD), _batch_ack),),
+}
+_DECODERS[Opcode.KEEPALIVE_RESPONSE] = _DECODERS[Opcode.KEEPALIVE]
+
+# (오프코드 << 8 | 패킷 길이) -> 그 길이에 꼭 맞는 레이아웃 (단일 패킷과 batch 이벤트 공용)
+_EVENT_DECODERS = {opcode << 8 | layout.size: (layout, build)
+                   for opcode, layouts in _DECODERS.items() for layout, build in layouts}
+
+class BinaryCodec:
+    """고정 레이아웃 struct 기반 바이너리 코덱"""
+    name = 'binary'
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        size = len(data)
+        if size < HEADER.size:
+            raise ProtocolError("Truncated header")
+        version, opcode = data[0], data[1]
+        if version != PROTOCOL_VERSION:
+            raise ProtocolError(f"Unsupported protocol version: {version}")
+
+        try:
+            # 인코더가 만든 정확한 길이면 사전 조회 한 번으로 레이아웃 선택
+            exact = _EVENT_DECODERS.get(opcode << 8 | size)
+            if exact is not None:
+                layout, build = exact
+                return build(layout.unpack_from(data))
+
+            if opcode == Opcode.BATCH:
+                _, _, seq, batch_seq, count = BATCH_LAYOUT.unpack_from(data)
+                return {'type': 'batch', 'seq': seq, 'batch_seq': batch_seq,
+                        'events': self._decode_events(data, BATCH_LAYOUT.size, count)}
+
+            layouts = _DECODERS.get(opcode)
+            if layouts is None:
+                raise ProtocolError(f"Unknown opcode: {opcode}")
+            for layout, build in layouts:
+                if size >= layout.size:
+                    return build(layout.unpack_from(data))
+            raise ProtocolError(f"Malformed payload for opcode {opcode}: "
+                                f"{size} bytes, need {layouts[-1][0].size}")
+
+        except (struct.error, UnicodeDecodeError) as e:
+            raise ProtocolError(f"Malformed payload for opcode {opcode}: {e}") from e
+
+    def _decode_events(self, data: bytes, offset: int, count: int) -> List[Dict[str, Any]]:
+        """batch 이벤트 (길이 1B + 헤더 포함 이벤트 패킷) 디코딩
+
+        인코더가 만드는 정확한 길이의 이벤트는 잘라내지 않고 헤더와 페이로드를 한 번에 풀고,
+        그 밖의 이벤트는 잘라서 단일 패킷처럼 디코딩한다.
+        """
+        events = []
+        end = len(data)
+        for _ in range(count):
+            if offset >= end:
+                raise ProtocolError("Truncated batch event")
+            length = data[offset]
+            start = offset + 1
+            offset = start + length
+            if offset > end:
+                raise ProtocolError("Truncated batch event")
+            fast = _EVENT_DECODERS.get(data[start + 1] << 8 | length) if length > 1 else None
+            if fast is not None and data[start] == PROTOCOL_VERSION:
+                layout, build = fast
+                events.append(build(layout.unpack_from(data, start)))
+                continue
+            item = data[start:offset]
+            if length > 1 and item[1] == Opcode.BATCH:
+                raise ProtocolError("Nested batch")
+            events.append(self.decode(item))
+        return events
+
+    def encode(self, message: Dict[str, Any], seq: int = 0) -> Optional[bytes]:
+        """바이너리 레이아웃이 없는 메시지는 None 반환 (호출자가 JSON으로 폴백)"""
+        opcode = _TYPE_OPCODES.get(message.get('type'))
+        if opcode is None:
+            return None
+
+        header = HEADER.pack(PROTOCOL_VERSION, opcode, seq % SEQ_MODULO)
+
+        if opcode == Opcode.BATCH:
+            payload = self._encode_events(int(message.get('batch_seq', 0)), message.get('events', []))
+            if payload is None:
+                return None
+        elif opcode == Opcode.MOUSE_MOVE:
+            if message.get('is_laser', False):
+                payload = MOUSE_MOVE_PAYLOAD.pack(
+                    FLAG_LASER, float(message.get('x', 0.5)), float(message.get('y', 0.5)))
+            else:
+                payload = MOUSE_MOVE_PAYLOAD.pack(
+                    0, float(message.get('dx', 0)), float(message.get('dy', 0)))
+        elif opcode == Opcode.MOUSE_CLICK:
+            payload = MOUSE_CLICK_PAYLOAD.pack(
+                _CLICK_TYPE_IDS.get(message.get('click_type', 'left'), 0))
+        elif opcode == Opcode.KEYBOARD:
+            try:
+                key = message.get('key', '').encode('ascii')
+            except UnicodeEncodeError:
+                return None
+            if len(key) > KEYBOARD_PAYLOAD.size:
+                return None
+            payload = KEYBOARD_PAYLOAD.pack(key)
+        elif opcode == Opcode.CURSOR:
+            try:
+                payload = CURSOR_PAYLOAD.pack(FLAG_LASER if message.get('laser') else 0,
+                                              int(message['x']), int(message['y']))
+            except (KeyError, struct.error):
+                return None
+        elif opcode == Opcode.BATCH_ACK:
+            if message.get('errors') or message.get('ack') is None or message.get('batch_seq') is None:
+                return None
+            payload = BATCH_ACK_PAYLOAD.pack(int(message['ack']) % SEQ_MODULO,
+                                             int(message['batch_seq']) % SEQ_MODULO,
+                                             min(int(message.get('processed', 0)), 0xFFFF))
+        elif 'echo' in message:
+            # 서버 응답은 벽시계 timestamp 대신 클라이언트가 echo 할 server_ts 를 싣는다
+            payload = KEEPALIVE_ECHO_PAYLOAD.pack(
+                int(message.get('server_ts', message.get('timestamp', 0))),
+                int(message['echo']) % (1 << 32),
+                int(message.get('echo_delay', 0)))
+        else:
+            payload = KEEPALIVE_PAYLOAD.pack(int(message.get('timestamp', 0)))
+
+        return header + payload
+
+    def _encode_events(self, batch_seq: int, events: List[Dict[str, Any]]) -> Optional[bytes]:
+        """배치 이벤트 인코딩 (하나라도 바이너리 레이아웃이 없으면 None)"""
+        if len(events) > 0xFF:
+            return None
+        parts = [BATCH_HEADER.pack(batch_seq % SEQ_MODULO, len(events))]
+        for event in events:
+            if event.get('type') == 'batch':
+                return None
+            item = self.encode(event, int(event.get('seq', 0)))
+            if item is None:
+                return None
+            parts.append(BATCH_ITEM_LENGTH.pack(len(item)))
+            parts.append(item)
+        return b''.join(parts)
+
+JSON_CODEC = JsonCodec()
+BINARY_CODEC = BinaryCodec()
+
+# 협상 가능한 코덱 (선호 순서는 클라이언트가 결정)
+CODECS = {
+    JSON_CODEC.name: JSON_CODEC,
+    BINARY_CODEC.name: BINARY_CODEC,
+}
+
+def negotiate_codec(offered, version: Optional[int] = None) -> str:
+    """클라이언트가 제시한 코덱 목록 중 첫 번째 지원 코덱 선택"""
+    if not isinstance(offered, (list, tuple)):
+        return JSON_CODEC.name
+    for name in offered:
+        if name == BINARY_CODEC.name and version not in (None, PROTOCOL_VERSION):
+            continue
+        if name in CODECS:
+            return name
+    return JSON_CODEC.name
+
+class CumulativeAck:
+    """배치 번호(batch_seq)의 누적 확인 응답 (TCP ACK 처럼 '여기까지 모두 받음')
+
+    순서가 어긋나 먼저 도착한 배치도 바로 실행하고, 확인 응답(acked)만 빈칸이 채워질
+    때까지 멈춘다. 빈칸이 window 개 넘게 채워지지 않으면 클라이언트가 포기한 것으로
+    보고 건너뛴다. 기준(acked)보다 앞선 번호라도 처리한 기록이 없으면 늦게 도착한
+    새 배치로 보고 실행한다 (처음 받은 배치보다 앞선 번호, 건너뛴 빈칸).
+    중복 판정은 acked 이전 2 * window 개까지의 처리 기록으로 하고 (건너뛴 빈칸은
+    acked 보다 window 개 이상 앞에 있으므로), 그보다 오래된 번호는 구분할 수 없어
+    재전송으로 본다.
+    확인 응답은 배치마다 보내지 않고 모아서 보내므로 마지막 확인 이후 받은 배치 수와
+    처리한 이벤트 수도 함께 센다 (보내는 쪽이 take() 로 가져가며 초기화).
+    """
+
+    def __init__(self, window: int = 64):
+        self.window = window
+        self.acked: Optional[int] = None
+        self._above: Set[int] = set()   # acked 이후 처리한 번호
+        self._below: Set[int] = set()   # acked 이하에서 처리한 번호 (2 * window 개 범위)
+
+        # 마지막 확인 응답 이후
+        self.latest: Optional[int] = None  # 마지막으로 받은 배치 번호
+        self.unacked = 0                   # 확인하지 않은 배치 수
+        self.processed = 0                 # 처리한 이벤트 수
+
+    def receive(self, seq: int) -> bool:
+        """새 배치이면 True (바로 실행), 이미 처리한 배치(재전송)이면 False"""
+        seq %= SEQ_MODULO
+        if self.acked is None:
+            self.acked = seq
+            self._below.add(seq)
+            return True
+        if not self._above and seq == (self.acked + 1) % SEQ_MODULO:
+            # 빈칸 없이 순서대로 도착 (대부분의 경우)
+            self.acked = seq
+            self._below.add(seq)
+            if len(self._below) > 4 * self.window:
+                self._prune()
+            return True
+        if seq in self._above or seq in self._below:
+            return False
+        delta = seq_delta(seq, self.acked)
+        if delta <= 0:
+            if -delta >= 2 * self.window:
+                return False
+            self._below.add(seq)
+            return True
+        self._above.add(seq)
+        if len(self._above) > self.window:
+            # 가장 오래된 빈칸 건너뛰기
+            oldest = min(self._above, key=lambda pending: seq_delta(pending, self.acked))
+            self.acked = (oldest - 1) % SEQ_MODULO
+        self._advance()
+        return True
+
+    def _advance(self):
+        following = (self.acked + 1) % SEQ_MODULO
+        while following in self._above:
+            self._above.discard(following)
+            self._below.add(following)
+            self.acked = following
+            following = (following + 1) % SEQ_MODULO
+        if len(self._below) > 4 * self.window:
+            self._prune()
+
+    def _prune(self):
+        acked, history = self.acked, 2 * self.window
+        self._below = {seq for seq in self._below if -history < seq_delta(seq, acked) <= 0}
+
+    @property
+    def pending(self) -> int:
+        """빈칸 뒤에 받아 둔 배치 수"""
+        return len(self._above)
+
+    def executed(self, seq: Optional[int], processed: int):
+        """실행한 배치 기록 (확인 응답 대기)"""
+        self.latest = seq
+        self.unacked += 1
+        self.processed += processed
+
+    def take(self) -> Dict[str, Any]:
+        """확인 응답 필드 (누적 확인 번호, 마지막 배치 번호, 처리한 이벤트 수) 후 카운터 초기화"""
+        fields = {'ack': self.acked, 'batch_seq': self.latest, 'processed': self.processed}
+        self.unacked = self.processed = 0
+        return fields
+
+class BatchBuilder:
+    """클라이언트 측 입력 묶음: 최대 크기에 도달하거나 flush 할 때 batch 메시지 생성
+
+    서버가 인증 응답의 max_batch 로 알려준 크기를 넘지 않게 묶는다.
+    """
+
+    def __init__(self, max_batch: int, start_seq: int = 0):
+        self.max_batch = max_batch
+        self.batch_seq = start_seq % SEQ_MODULO  # 패킷 시퀀스 번호와 별개인 배치 번호
+        self.events: List[Dict[str, Any]] = []
+
+    def add(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """이벤트 추가, 묶음이 가득 차면 완성된 batch 메시지 반환"""
+        self.events.append(event)
+        if len(self.events) >= self.max_batch:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        if not self.events:
+            return None
+        message = {'type': 'batch', 'batch_seq': self.batch_seq, 'events': self.events}
+        self.batch_seq = (self.batch_seq + 1) % SEQ_MODULO
+        self.events = []
+        return message
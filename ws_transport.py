@@ -0,0 +1,195 @@
+import asyncio
+import collections
+import itertools
+import logging
+from typing import Callable, Deque, Dict, Optional, Union
+
+from aiohttp import WSMsgType, web
+
+from frame_transport import CHUNK_HEADER
+from wire_protocol import PROTOCOL_VERSION, Opcode, is_binary
+
+DRAIN_POLL = 0.005  # 쓰기 버퍼가 high_water 아래로 내려가길 기다리는 확인 간격 (초)
+
+def pack_ws_frame(frame_id: int, data: bytes) -> bytes:
+    """프레임 전체를 청크 하나(인덱스 0, 수 1)로 (클라이언트는 UDP 청크와 같은 파서 사용)"""
+    return CHUNK_HEADER.pack(PROTOCOL_VERSION, Opcode.FRAME_CHUNK, frame_id, 0, 1) + data
+
+class WebSocketConnection:
+    """WebSocket 연결 하나의 송신 측
+
+    제어 메시지는 순서대로 보내되 max_messages 를 넘으면 새 메시지를 버린다 (UDP
+    손실과 같은 의미). 프레임은 슬롯 하나만 두어 아직 보내지 못한 프레임을 새
+    프레임이 대체하고, 소켓 쓰기 버퍼가 high_water 를 넘으면 줄어들 때까지 프레임을
+    보내지 않는다. 느린 연결에는 오래된 프레임이 쌓이지 않고 최신 화면만 간다.
+
+    JSON 코덱 메시지는 텍스트 프레임으로 보내고 (웹 클라이언트가 문자열로 받아
+    json.decode), 바이너리 코덱 메시지와 화면 프레임만 바이너리 프레임으로 보낸다.
+    """
+
+    def __init__(self, ws: web.WebSocketResponse, address: tuple, transport,
+                 max_messages: int = 256, high_water: int = 256 * 1024):
+        self.ws = ws
+        self.address = address
+        self._transport = transport
+        self.max_messages = max_messages
+        self.high_water = high_water
+        self._messages: Deque[Union[bytes, str]] = collections.deque()  # str 은 텍스트 프레임
+        self._frame: Optional[bytes] = None
+        self._ready = asyncio.Event()
+
+        # 통계
+        self.messages_sent = 0
+        self.messages_dropped = 0
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.bytes_sent = 0
+
+    def send(self, data: bytes):
+        if len(self._messages) >= self.max_messages:
+            self.messages_dropped += 1
+            return
+        # JSON 은 '{' 로 시작하므로 첫 바이트로 바이너리 프레이밍과 구분 (udp 수신 측과 같은 기준)
+        self._messages.append(bytes(data) if is_binary(data) else bytes(data).decode('utf-8'))
+        self._ready.set()
+
+    def send_frame(self, frame_id: int, data: bytes):
+        if self._frame is not None:
+            self.frames_dropped += 1
+        self._frame = pack_ws_frame(frame_id, data)
+        self._ready.set()
+
+    def write_buffer_size(self) -> int:
+        transport = self._transport
+        return transport.get_write_buffer_size() if transport is not None and not transport.is_closing() else 0
+
+    async def run_writer(self):
+        ws = self.ws
+        try:
+            while not ws.closed:
+                await self._ready.wait()
+                self._ready.clear()
+                while self._messages:
+                    data = self._messages.popleft()
+                    if isinstance(data, str):
+                        await ws.send_str(data)
+                    else:
+                        await ws.send_bytes(data)
+                    self.messages_sent += 1
+                    self.bytes_sent += len(data)
+                if self._frame is None:
+                    continue
+                if self.write_buffer_size() > self.high_water:
+                    # 쓰기 버퍼가 빠질 때까지 대기 (그동안 온 프레임이 슬롯을 대체, 제어 메시지는 먼저)
+                    await asyncio.sleep(DRAIN_POLL)
+                    self._ready.set()
+                    continue
+                frame, self._frame = self._frame, None
+                await ws.send_bytes(frame)
+                self.frames_sent += 1
+                self.bytes_sent += len(frame)
+        except (ConnectionResetError, RuntimeError):
+            # 전송 중 연결 종료
+            pass
+
+class WebSocketHub:
+    """/ws 엔드포인트와 WebSocket 클라이언트 주소로의 송신 라우팅
+
+    WebSocket 연결마다 ('ws:<원격 IP>', 연결 번호) 주소를 부여하고, 받은 메시지는
+    on_message(data, addr) 로 UDP 와 같은 디코드/디스패치 경로에 넘긴다. attach() 로
+    UDP 전송을 감싸면 sendto 가 주소에 따라 UDP 또는 해당 WebSocket 으로 간다.
+    """
+
+    def __init__(self, on_message: Callable[[bytes, tuple], None],
+                 on_close: Callable[[tuple], None],
+                 max_messages: int = 256, high_water: int = 256 * 1024,
+                 max_message_size: int = 64 * 1024):
+        self.logger = logging.getLogger('WebSocketHub')
+        self.on_message = on_message
+        self.on_close = on_close
+        self.max_messages = max_messages
+        self.high_water = high_water
+        self.max_message_size = max_message_size
+        self.connections: Dict[tuple, WebSocketConnection] = {}
+        self.udp = None
+        self._ids = itertools.count(1)
+        self._closed_totals = collections.Counter()  # 닫힌 연결의 누적 통계
+
+    def attach(self, udp_transport) -> 'WebSocketHub':
+        self.udp = udp_transport
+        return self
+
+    def __contains__(self, addr) -> bool:
+        return addr in self.connections
+
+    def sendto(self, data, addr):
+        connection = self.connections.get(addr)
+        if connection is not None:
+            connection.send(data)
+        else:
+            self.udp.sendto(data, addr)
+
+    def send_frame(self, addr: tuple, frame_id: int, data: bytes) -> bool:
+        connection = self.connections.get(addr)
+        if connection is None:
+            return False
+        connection.send_frame(frame_id, data)
+        return True
+
+    def get_extra_info(self, name, default=None):
+        return self.udp.get_extra_info(name, default)
+
+    def close_all(self):
+        for addr in list(self.connections):
+            self.forget(addr)
+
+    def forget(self, addr: tuple):
+        """서버가 제거한 클라이언트의 WebSocket 닫기"""
+        connection = self.connections.get(addr)
+        if connection is not None and not connection.ws.closed:
+            asyncio.ensure_future(connection.ws.close())
+
+    async def handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=self.max_message_size)
+        await ws.prepare(request)
+        addr = (f'ws:{request.remote}', next(self._ids))
+        connection = WebSocketConnection(ws, addr, request.transport,
+                                         max_messages=self.max_messages, high_water=self.high_water)
+        self.connections[addr] = connection
+        writer = asyncio.create_task(connection.run_writer())
+        self.logger.info(f"WebSocket connected: {addr}")
+        try:
+            async for message in ws:
+                if message.type == WSMsgType.BINARY:
+                    self.on_message(message.data, addr)
+                elif message.type == WSMsgType.TEXT:
+                    self.on_message(message.data.encode('utf-8'), addr)
+                elif message.type == WSMsgType.ERROR:
+                    self.logger.warning(f"WebSocket error from {addr}: {ws.exception()}")
+                    break
+        finally:
+            del self.connections[addr]
+            writer.cancel()
+            self.on_close(addr)
+            stats = self._connection_stats(connection)
+            self._closed_totals.update(stats)
+            self.logger.info(f"WebSocket closed: {addr} {stats}")
+        return ws
+
+    @staticmethod
+    def _connection_stats(connection: WebSocketConnection) -> Dict[str, int]:
+        return {
+            'messages_sent': connection.messages_sent,
+            'messages_dropped': connection.messages_dropped,
+            'frames_sent': connection.frames_sent,
+            'frames_dropped': connection.frames_dropped,
+            'bytes_sent': connection.bytes_sent,
+        }
+
+    def stats(self) -> Dict[str, int]:
+        totals = collections.Counter(self._closed_totals)
+        for connection in self.connections.values():
+            totals.update(self._connection_stats(connection))
+        stats = dict(totals)
+        stats['connections'] = len(self.connections)
+        return stats